@@ -1,4 +1,5 @@
 import glob
+import importlib
 import inspect
 import os
 import re
@@ -14,7 +15,9 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 
 from biomni.config import default_config
+from biomni.datalake.convert import convert_data_lake
 from biomni.env_desc import data_lake_dict, library_content_dict
+from biomni.jobs import submit_job
 from biomni.llm import SourceType, get_llm
 from biomni.model.retriever import ToolRetriever
 from biomni.tool.support_tools import run_python_repl
@@ -36,6 +39,20 @@ if os.path.exists(".env"):
     print("Loaded environment variables from .env")
 
 
+def _call_biomni_tool(module_name: str, tool_name: str, kwargs: dict, fallback=None):
+    """Import a Biomni tool module on first use and call one of its functions.
+
+    The module's function takes precedence; fallback (e.g. a custom function added with
+    add_tool) is only called when the module does not define the tool. Defined at module
+    level so it can be sent to a process pool worker.
+    """
+    module = importlib.import_module(module_name)
+    fn = getattr(module, tool_name, None) or fallback
+    if fn is None:
+        raise AttributeError(f"Could not find function '{tool_name}' in module '{module_name}'")
+    return fn(**kwargs)
+
+
 class AgentState(TypedDict):
     messages: list[BaseMessage]
     next_step: str | None
@@ -134,6 +151,10 @@ class A1:
             folder="data_lake",
         )
 
+        if default_config.data_lake_parquet and default_config.data_lake_parquet_eager:
+            # Parse the large text tables into Parquet once, while the agent starts working
+            submit_job(convert_data_lake, data_lake_dir, name="data lake Parquet conversion")
+
         # Check if benchmark directory structure is complete
         benchmark_ok = False
         if os.path.isdir(benchmark_dir):
@@ -1113,6 +1134,22 @@ Each item is listed with its description to help you understand its contents.
 ----
 {data_lake_content}
 ----
+Tabular files (.parquet, .csv, .tsv) can be queried without loading them whole. Only the requested columns and the matching rows are read, which is much faster and lighter than pd.read_parquet / pd.read_csv when you need part of a table:
+  from biomni.datalake import query_table, table_schema
+  table_schema("gene_info.parquet", data_lake_path="{data_lake_path}")  # column names and types
+  df = query_table("gene_info.parquet", columns=[...], filters=[("column", "in", [...]), ("other_column", ">", 0.5)], data_lake_path="{data_lake_path}", as_pandas=True)
+To collect everything the data lake holds about some genes, use the gene index instead of scanning tables one by one:
+  from biomni.datalake import find_gene_rows
+  hits = find_gene_rows(["TP53", "MDM2"], data_lake_path="{data_lake_path}", as_pandas=True)  # file name -> matching rows
+For questions about the knowledge graph (kg.csv), use the graph engine rather than loading kg.csv into pandas:
+  from biomni.datalake import get_knowledge_graph
+  kg = get_knowledge_graph("{data_lake_path}")  # kg.relations and kg.node_types list the valid filters
+  kg.neighbors("TP53", relation="disease_protein"); kg.k_hop("TP53", k=2); kg.shortest_path("TP53", "breast cancer")
+  kg.metapath("TP53", ["disease_protein", "indication"])  # drugs indicated for diseases linked to TP53
+GTEx tissue expression and the DepMap expression, gene effect and gene dependency matrices are available as memory-mapped gene-by-sample arrays ("gtex", "depmap_expression", "depmap_effect", "depmap_dependency"):
+  from biomni.datalake import get_expression_matrix
+  effect = get_expression_matrix("depmap_effect", data_lake_path="{data_lake_path}")
+  effect.top_correlated("TP53", k=20); effect.get(["TP53", "MDM2"]); get_expression_matrix("gtex", data_lake_path="{data_lake_path}").rank_samples("ALB")
 
 - Software Library:
 {library_intro}
@@ -1725,155 +1762,201 @@ Each library is listed with its description to help you understand its functiona
                 builtins._biomni_custom_functions = {}
             builtins._biomni_custom_functions.update(self._custom_functions)
 
-    def create_mcp_server(self, tool_modules=None):
+    def create_mcp_server(
+        self,
+        tool_modules=None,
+        max_workers: int | None = None,
+        executor: Literal["thread", "process"] = "thread",
+        max_concurrent_per_tool: int = 4,
+        tool_timeout: float | None = None,
+        tool_limits: dict[str, dict] | None = None,
+    ):
         """
         Create an MCP server object that exposes internal Biomni tools.
         This gives you control over when and how to run the server.
 
+        Tool bodies run in a bounded worker pool so that long-running tools
+        (e.g. blast_sequence) do not block the server's event loop, and tool
+        modules are only imported the first time one of their tools is called.
+
         Args:
             tool_modules: List of module names to expose (default: all in self.module2api)
+            max_workers: Size of the worker pool shared by all tools (default: executor default)
+            executor: "thread" to run tools in a thread pool, or "process" to run them in a process pool.
+                Tools that have a custom function added with add_tool always run in the thread pool;
+                the module's own function still takes precedence over the custom one.
+            max_concurrent_per_tool: Maximum number of concurrent calls of a single tool
+            tool_timeout: Seconds before a tool call is abandoned (default: self.timeout_seconds)
+            tool_limits: Per-tool overrides, e.g. {"blast_sequence": {"max_concurrent": 1, "timeout": 1200}}
 
         Returns:
-            FastMCP server object that you can run manually
+            FastMCP server object that you can run manually. The worker pools are shut down when
+            the server exits.
         """
-        import importlib
-        import inspect
+        import contextlib
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
         from mcp.server.fastmcp import FastMCP
 
-        mcp = FastMCP("BiomniTools")
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor '{executor}'. Use 'thread' or 'process'.")
+
+        thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="biomni-mcp")
+        process_pool = ProcessPoolExecutor(max_workers=max_workers) if executor == "process" else None
+
+        @contextlib.asynccontextmanager
+        async def shutdown_pools(server):
+            try:
+                yield
+            finally:
+                # Abandoned (timed out) calls are not waited for
+                for pool in (thread_pool, process_pool):
+                    if pool is not None:
+                        pool.shutdown(wait=False, cancel_futures=True)
+
+        mcp = FastMCP("BiomniTools", lifespan=shutdown_pools)
         modules = tool_modules or list(self.module2api.keys())
+        tool_limits = tool_limits or {}
+        if tool_timeout is None:
+            tool_timeout = self.timeout_seconds
+        custom_functions = getattr(self, "_custom_functions", {})
 
         registered_tools = 0
 
         for module_name in modules:
-            try:
-                # Import the actual module
-                module = importlib.import_module(module_name)
-                # Get tools for this module
-                module_tools = self.module2api.get(module_name, [])
-
-                for tool_schema in module_tools:
-                    tool_name = tool_schema.get("name")
-                    if not tool_name:
-                        continue
+            # Get tools for this module; the module itself is imported lazily on first call
+            module_tools = self.module2api.get(module_name, [])
 
-                    try:
-                        # Get the actual function
-                        fn = getattr(module, tool_name, None)
-                        if fn is None:
-                            fn = getattr(self, "_custom_functions", {}).get(tool_name)
-
-                        if fn is None:
-                            print(f"Warning: Could not find function '{tool_name}' in module '{module_name}'")
-                            continue
-
-                        # Extract parameters from your specific schema format
-                        required_params = tool_schema.get("required_parameters", [])
-                        optional_params = tool_schema.get("optional_parameters", [])
-
-                        # Generate the wrapper function
-                        wrapper_func = self._generate_mcp_wrapper_from_biomni_schema(
-                            fn, tool_name, required_params, optional_params
-                        )
+            for tool_schema in module_tools:
+                tool_name = tool_schema.get("name")
+                if not tool_name:
+                    continue
 
-                        # Register with MCP
-                        mcp.tool()(wrapper_func)
-                        registered_tools += 1
+                try:
+                    limits = tool_limits.get(tool_name, {})
+                    custom_fn = custom_functions.get(tool_name)
+
+                    # Custom functions only exist in this process, so they cannot be sent to a process pool
+                    pool = process_pool if process_pool is not None and custom_fn is None else thread_pool
+
+                    # Generate the wrapper function
+                    wrapper_func = self._generate_mcp_wrapper_from_biomni_schema(
+                        module_name,
+                        tool_name,
+                        tool_schema.get("required_parameters", []),
+                        tool_schema.get("optional_parameters", []),
+                        description=tool_schema.get("description"),
+                        pool=pool,
+                        fallback_func=custom_fn,
+                        max_concurrent=limits.get("max_concurrent", max_concurrent_per_tool),
+                        timeout=limits.get("timeout", tool_timeout),
+                    )
 
-                    except Exception as e:
-                        print(f"Warning: Failed to register tool '{tool_name}': {e}")
-                        continue
+                    # Register with MCP
+                    mcp.tool()(wrapper_func)
+                    registered_tools += 1
 
-            except ImportError as e:
-                print(f"Warning: Could not import module '{module_name}': {e}")
-                continue
+                except Exception as e:
+                    print(f"Warning: Failed to register tool '{tool_name}': {e}")
+                    continue
 
         print(f"Created MCP server with {registered_tools} tools")
         return mcp
 
-    def _generate_mcp_wrapper_from_biomni_schema(self, original_func, func_name, required_params, optional_params):
-        """Generate wrapper function based on Biomni schema format."""
+    def _generate_mcp_wrapper_from_biomni_schema(
+        self,
+        module_name,
+        func_name,
+        required_params,
+        optional_params,
+        description=None,
+        pool=None,
+        fallback_func=None,
+        max_concurrent=4,
+        timeout=None,
+    ):
+        """Generate an async wrapper function based on Biomni schema format.
+
+        The wrapper limits concurrent calls of the tool with a semaphore and runs
+        the tool body in ``pool`` so the MCP event loop stays responsive. A call that
+        times out is reported to the client right away, but keeps its semaphore slot
+        until its worker actually finishes, so abandoned calls cannot pile up.
+        """
+        import asyncio
+        import functools
         import inspect
 
-        # Combine all parameters
         all_params = required_params + optional_params
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
 
-        if not all_params:
-            # No parameters
-            def wrapper() -> dict:
-                try:
-                    result = original_func()
-                    if isinstance(result, dict):
-                        return result
-                    return {"result": result}
-                except Exception as e:
-                    return {"error": str(e)}
+        async def wrapper(**kwargs) -> dict:
+            # Keep only known parameters that were actually provided
+            filtered_kwargs = {}
+            for param_info in all_params:
+                param_name = param_info["name"]
+                if param_name in kwargs and kwargs[param_name] is not None:
+                    filtered_kwargs[param_name] = kwargs[param_name]
 
-            wrapper.__name__ = func_name
-            wrapper.__doc__ = original_func.__doc__
-            return wrapper
+            await semaphore.acquire()
+            loop = asyncio.get_running_loop()
+            try:
+                # Module-level callable so the same call works for thread and process pools
+                call = functools.partial(_call_biomni_tool, module_name, func_name, filtered_kwargs)
+                if fallback_func is not None:
+                    call = functools.partial(call, fallback=fallback_func)
+                future = pool.submit(call)
+            except BaseException:
+                semaphore.release()
+                raise
 
-        else:
-            # Has parameters
-            def wrapper(**kwargs) -> dict:
-                try:
-                    # Build arguments dict
-                    filtered_kwargs = {}
-
-                    # Add required parameters
-                    for param_info in required_params:
-                        param_name = param_info["name"]
-                        if param_name in kwargs and kwargs[param_name] is not None:
-                            filtered_kwargs[param_name] = kwargs[param_name]
-
-                    # Add optional parameters only if provided and not None
-                    for param_info in optional_params:
-                        param_name = param_info["name"]
-                        if param_name in kwargs and kwargs[param_name] is not None:
-                            filtered_kwargs[param_name] = kwargs[param_name]
-
-                    result = original_func(**filtered_kwargs)
-                    if isinstance(result, dict):
-                        return result
-                    return {"result": result}
-                except Exception as e:
-                    return {"error": str(e)}
+            try:
+                result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except TimeoutError:
+                if future.cancel():
+                    semaphore.release()
+                else:
+                    # Still running: release the slot only once the worker is free again
+                    future.add_done_callback(lambda _: loop.call_soon_threadsafe(semaphore.release))
+                return {"error": f"Tool '{func_name}' timed out after {timeout} seconds"}
+            except Exception as e:
+                semaphore.release()
+                return {"error": str(e)}
+            semaphore.release()
 
-            # Set function metadata
-            wrapper.__name__ = func_name
-            wrapper.__doc__ = original_func.__doc__
+            if isinstance(result, dict):
+                return result
+            return {"result": result}
 
-            # Create proper signature
-            new_params = []
+        # Set function metadata
+        wrapper.__name__ = func_name
+        wrapper.__doc__ = description
 
-            # Map your types to Python types
-            type_map = {"str": str, "int": int, "float": float, "bool": bool, "List[str]": list[str], "dict": dict}
+        # Create proper signature
+        new_params = []
 
-            # Add required parameters
-            for param_info in required_params:
-                param_name = param_info["name"]
-                param_type_str = param_info["type"]
-                param_type = type_map.get(param_type_str, str)
+        # Map your types to Python types
+        type_map = {"str": str, "int": int, "float": float, "bool": bool, "List[str]": list[str], "dict": dict}
 
-                new_params.append(inspect.Parameter(param_name, inspect.Parameter.KEYWORD_ONLY, annotation=param_type))
+        # Add required parameters
+        for param_info in required_params:
+            param_name = param_info["name"]
+            param_type = type_map.get(param_info["type"], str)
 
-            # Add optional parameters
-            for param_info in optional_params:
-                param_name = param_info["name"]
-                param_type_str = param_info["type"]
-                param_type = type_map.get(param_type_str, str)
+            new_params.append(inspect.Parameter(param_name, inspect.Parameter.KEYWORD_ONLY, annotation=param_type))
 
-                # Make it optional
-                optional_type = param_type | None
+        # Add optional parameters
+        for param_info in optional_params:
+            param_name = param_info["name"]
+            param_type = type_map.get(param_info["type"], str)
 
-                new_params.append(
-                    inspect.Parameter(
-                        param_name, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=optional_type
-                    )
-                )
+            # Make it optional
+            optional_type = param_type | None
+
+            new_params.append(
+                inspect.Parameter(param_name, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=optional_type)
+            )
 
-            # Set the signature
-            wrapper.__signature__ = inspect.Signature(new_params, return_annotation=dict)
+        # Set the signature
+        wrapper.__signature__ = inspect.Signature(new_params, return_annotation=dict)
 
-            return wrapper
+        return wrapper
@@ -0,0 +1,672 @@
+"""
+Biomni Persistent Caches
+
+On-disk caches shared across agent sessions. The HTTP response cache stores
+successful responses from the database and literature helpers in SQLite,
+keyed by method, URL, query parameters, body and Accept header. The translation
+cache stores the natural language -> API query translations made by the
+database tools, independently of whether the HTTP result is still fresh. The
+artifact cache stores downloaded files (structures, diagrams, supplementary
+data) by content hash and copies them into the directories tools write to.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+from biomni.config import default_config
+
+try:
+    import fcntl
+except ImportError:  # Windows: placed files are plain copies
+    fcntl = None
+
+# Default freshness lifetimes, in seconds, by API host. Entries apply when the
+# response carries no Cache-Control max-age, and override it when present in
+# default_config.http_cache_ttl_overrides.
+DEFAULT_TTL_BY_HOST = {
+    "eutils.ncbi.nlm.nih.gov": 3600,  # ESearch WebEnv handles expire after a few hours
+    "rest.uniprot.org": 7 * 86400,
+    "rest.ensembl.org": 7 * 86400,
+    "rest.kegg.jp": 7 * 86400,
+    "reactome.org": 7 * 86400,
+    "www.ebi.ac.uk": 7 * 86400,
+    "alphafold.ebi.ac.uk": 30 * 86400,
+    "data.rcsb.org": 7 * 86400,
+    "search.rcsb.org": 86400,
+    "api.platform.opentargets.org": 7 * 86400,
+    "api.fda.gov": 86400,
+}
+
+
+def _cache_dir() -> str:
+    path = os.path.expanduser(default_config.cache_dir)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _parse_cache_control(value: str | None) -> dict[str, str | None]:
+    directives = {}
+    for part in (value or "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip()] = arg.strip().strip('"') or None
+    return directives
+
+
+class HTTPCache:
+    """SQLite-backed HTTP response cache with TTLs, validators and an LRU size cap.
+
+    Only successful (200) responses are stored. Freshness comes from the per-host
+    TTL overrides, else Cache-Control max-age, else the default TTL. Stale entries
+    that carry an ETag or Last-Modified validator are kept so they can be
+    revalidated with a conditional request.
+
+    Bodies live in their own table and the total stored size is kept up to date by
+    triggers, so bookkeeping (hits, size checks, eviction) never reads body pages.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_bytes: int | None = None,
+        default_ttl: int | None = None,
+        ttl_overrides: dict[str, int] | None = None,
+    ):
+        self.path = path or os.path.join(_cache_dir(), "http_cache.sqlite")
+        self.max_bytes = max_bytes if max_bytes is not None else default_config.http_cache_max_mb * 1024**2
+        self.default_ttl = default_ttl if default_ttl is not None else default_config.http_cache_ttl
+        self.ttl_overrides = ttl_overrides if ttl_overrides is not None else default_config.http_cache_ttl_overrides
+        self._local = threading.local()
+        self._evict_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        with self._connection() as conn:
+            # Earlier layout kept bodies inline with the metadata; it is a cache, so just drop it
+            conn.execute("DROP TABLE IF EXISTS responses")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS response_meta (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    encoding TEXT,
+                    size INTEGER NOT NULL,
+                    expires REAL NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS response_meta_last_access ON response_meta (last_access)")
+            conn.execute("CREATE TABLE IF NOT EXISTS response_bodies (key TEXT PRIMARY KEY, body BLOB NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+            )
+            conn.execute("INSERT OR IGNORE INTO response_size VALUES (0, 0)")
+            conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS response_meta_insert AFTER INSERT ON response_meta BEGIN
+                    UPDATE response_size SET total = total + NEW.size;
+                END
+                """
+            )
+            conn.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS response_meta_delete AFTER DELETE ON response_meta BEGIN
+                    UPDATE response_size SET total = total - OLD.size;
+                    DELETE FROM response_bodies WHERE key = OLD.key;
+                END
+                """
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; SQLite connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(method: str, url: str, body: bytes | str | None = None, accept: str | None = None) -> str:
+        """Build a cache key from a prepared request's method, full URL (including params), body and Accept header."""
+        if isinstance(body, str):
+            body = body.encode()
+        digest = hashlib.sha256()
+        for part in (method.upper().encode(), url.encode(), body or b"", (accept or "").encode()):
+            digest.update(part)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def ttl_for(self, url: str, cache_control: str | None = None) -> int | None:
+        """Return the freshness lifetime for a response, or None if it must not be stored."""
+        host = urlsplit(url).netloc.lower()
+        for pattern, ttl in self.ttl_overrides.items():
+            if pattern in host:
+                return ttl
+
+        directives = _parse_cache_control(cache_control)
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0
+        max_age = directives.get("s-maxage") or directives.get("max-age")
+        if max_age is not None and max_age.isdigit():
+            return int(max_age)
+
+        return DEFAULT_TTL_BY_HOST.get(host, self.default_ttl)
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached entry for a key, or None. The entry's "fresh" flag tells whether it is still valid."""
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT url, status, headers, encoding, body, expires, etag, last_modified"
+            " FROM response_meta JOIN response_bodies USING (key) WHERE key = ?",
+            (key,),
+        ).fetchone()
+        now = time.time()
+        fresh = row is not None and row[5] > now
+        with self._counter_lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if row is None:
+            return None
+
+        with conn:
+            conn.execute("UPDATE response_meta SET last_access = ? WHERE key = ?", (now, key))
+        url, status, headers, encoding, body, expires, etag, last_modified = row
+        return {
+            "url": url,
+            "status": status,
+            "headers": json.loads(headers),
+            "encoding": encoding,
+            "body": body,
+            "fresh": fresh,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+
+    def set(
+        self,
+        key: str,
+        url: str,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        encoding: str | None = None,
+        ttl: int | None = None,
+    ) -> bool:
+        """Store a response. Returns False if the response is not cacheable."""
+        if status != 200:
+            return False
+        if ttl is None:
+            ttl = self.ttl_for(url, headers.get("Cache-Control") or headers.get("cache-control"))
+        if ttl is None:
+            return False
+
+        etag = headers.get("ETag") or headers.get("etag")
+        last_modified = headers.get("Last-Modified") or headers.get("last-modified")
+        # Entries that are stale on arrival are only useful if they can be revalidated
+        if ttl <= 0 and not (etag or last_modified):
+            return False
+        if len(body) > self.max_bytes:
+            return False
+
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            # Delete and insert rather than REPLACE, so the triggers keep the size total right
+            conn.execute("DELETE FROM response_meta WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO response_meta VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(dict(headers)), encoding, len(body), now + ttl, etag, last_modified, now),
+            )
+            conn.execute("INSERT INTO response_bodies VALUES (?, ?)", (key, body))
+        self._evict()
+        return True
+
+    def refresh(self, key: str, url: str, headers: dict[str, str] | None = None) -> None:
+        """Extend the lifetime of an entry after a successful revalidation (HTTP 304)."""
+        ttl = self.ttl_for(url, (headers or {}).get("Cache-Control") or (headers or {}).get("cache-control")) or 0
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "UPDATE response_meta SET expires = ?, last_access = ? WHERE key = ?",
+                (now + ttl, now, key),
+            )
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is below 90% of its size cap."""
+        with self._evict_lock:
+            conn = self._connection()
+            total = conn.execute("SELECT total FROM response_size").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            target = int(self.max_bytes * 0.9)
+            with conn:
+                for key, size in conn.execute("SELECT key, size FROM response_meta ORDER BY last_access").fetchall():
+                    if total <= target:
+                        break
+                    conn.execute("DELETE FROM response_meta WHERE key = ?", (key,))
+                    total -= size
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM response_meta")
+
+    def stats(self) -> dict:
+        """Return entry count, stored bytes and hit/miss counters for this process."""
+        conn = self._connection()
+        entries = conn.execute("SELECT COUNT(*) FROM response_meta").fetchone()[0]
+        size = conn.execute("SELECT total FROM response_size").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache:
+    """Return the process-wide HTTP response cache, creating it on first use."""
+    global _http_cache
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                _http_cache = HTTPCache()
+    return _http_cache
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a natural language prompt for use as a cache key.
+
+    Only whitespace and trailing punctuation are normalized. Case is kept because it carries
+    meaning in gene and protein names (mouse Cd4 vs human CD4).
+    """
+    return " ".join(prompt.split()).rstrip(".?!")
+
+
+class TranslationCache:
+    """SQLite-backed memo of LLM translations from natural language prompts to API queries.
+
+    Translations are made at temperature 0 and are deterministic for a given database,
+    prompt, schema version and model. Entries still expire after a TTL, since the APIs they
+    target change, and callers evict a translation whose API call failed. The number of
+    entries is capped with least-recently-used eviction.
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int = 100_000, ttl: int | None = None):
+        self.path = path or os.path.join(_cache_dir(), "translations.sqlite")
+        self.max_entries = max_entries
+        self.ttl = ttl if ttl is not None else default_config.llm_translation_cache_ttl
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    database TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    raw_response TEXT,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS translations_last_access ON translations (last_access)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(database: str, prompt: str, schema_version: str, model: str | None = None) -> str:
+        """Build a cache key from the database, normalized prompt, schema version and model."""
+        parts = (database, normalize_prompt(prompt), schema_version, model or "")
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Return {"data": ..., "raw_response": ...} for a cached translation, or None if absent or expired."""
+        conn = self._connection()
+        row = conn.execute("SELECT data, raw_response, created FROM translations WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[2] + self.ttl <= time.time():
+            self.delete(key)
+            row = None
+        with self._counter_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        with conn:
+            conn.execute("UPDATE translations SET last_access = ? WHERE key = ?", (time.time(), key))
+        return {"data": json.loads(row[0]), "raw_response": row[1]}
+
+    def set(self, key: str, database: str, prompt: str, data: dict, raw_response: str | None = None) -> None:
+        """Store a translation."""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, database, normalize_prompt(prompt), json.dumps(data), raw_response, now, now),
+            )
+            count = conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM translations WHERE key IN (SELECT key FROM translations ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def delete(self, key: str) -> None:
+        """Remove a translation, e.g. one that produced a failing API call."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every cached translation."""
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM translations")
+
+    def stats(self) -> dict:
+        """Return entry count and hit/miss counters for this process."""
+        entries = self._connection().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_translation_cache = None
+_translation_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    """Return the process-wide translation cache, creating it on first use."""
+    global _translation_cache
+    if _translation_cache is None:
+        with _translation_cache_lock:
+            if _translation_cache is None:
+                _translation_cache = TranslationCache()
+    return _translation_cache
+
+
+# Linux ioctl that clones a file's extents (copy-on-write) on Btrfs, XFS and similar filesystems
+_FICLONE = 0x40049409
+
+
+def _copy_file(source: str, dest: str) -> None:
+    """Copy source to a new, writable dest, as a reflink where the filesystem supports it."""
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        if fcntl is not None:
+            with contextlib.suppress(OSError):
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return
+        shutil.copyfileobj(src, dst)
+
+
+class ArtifactCache:
+    """Content-addressed store for downloaded files, indexed by source URL.
+
+    Each file's content is stored once under objects/<sha256[:2]>/<sha256>, however
+    many URLs or output directories refer to it, and a SQLite index maps source URLs
+    to content hashes. Downloads are streamed to a temporary file and renamed into
+    place, so a crash never leaves a partial object behind. Objects are read-only and
+    are copied (reflinked where the filesystem supports it) into callers' output
+    directories, so editing a placed file never touches the store. The total size is
+    capped with least-recently-used eviction; evicting an object does not affect
+    files already placed elsewhere.
+    """
+
+    def __init__(self, root: str | None = None, max_bytes: int | None = None):
+        self.root = root or os.path.join(_cache_dir(), "artifacts")
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.path = os.path.join(self.root, "index.sqlite")
+        self.max_bytes = max_bytes if max_bytes is not None else default_config.artifact_cache_max_mb * 1024**2
+        self._local = threading.local()
+        self._evict_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS artifacts (
+                    url TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_type TEXT,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS artifacts_sha256 ON artifacts (sha256)")
+            conn.execute("CREATE INDEX IF NOT EXISTS artifacts_last_access ON artifacts (last_access)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def object_path(self, digest: str) -> str:
+        """Path of the stored object with the given SHA-256 hex digest."""
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def lookup(self, url: str) -> str | None:
+        """Return the path of the object downloaded from url, or None if it is not cached."""
+        conn = self._connection()
+        row = conn.execute("SELECT sha256 FROM artifacts WHERE url = ?", (url,)).fetchone()
+        path = self.object_path(row[0]) if row is not None else None
+        if path is not None and not os.path.exists(path):
+            # The object was removed behind the index's back
+            with conn:
+                conn.execute("DELETE FROM artifacts WHERE url = ?", (url,))
+            path = None
+
+        with self._counter_lock:
+            if path is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if path is not None:
+            with conn:
+                conn.execute("UPDATE artifacts SET last_access = ? WHERE url = ?", (time.time(), url))
+        return path
+
+    def store(self, url: str, chunks: Iterable[bytes], content_type: str | None = None) -> str:
+        """Stream chunks into the store, index them under url and return the object path."""
+        fd, partial = tempfile.mkstemp(dir=self.objects_dir, prefix=".partial-")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in chunks:
+                    if chunk:
+                        handle.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+            sha256 = digest.hexdigest()
+            path = self.object_path(sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                # Same content already stored, e.g. under another URL
+                os.remove(partial)
+            else:
+                os.chmod(partial, 0o444)
+                os.replace(partial, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial)
+            raise
+
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)",
+                (url, sha256, size, content_type, now, now),
+            )
+        self._evict(keep=sha256)
+        return path
+
+    @staticmethod
+    def place(source: str, dest: str, link: bool = False) -> str:
+        """Make a stored object available at dest, replacing any existing file.
+
+        Copies the object, as a reflink on filesystems that support copy-on-write
+        clones, so dest is an independent, writable file. With link=True, hardlinks
+        when source and dest are on the same filesystem instead; the placed file then
+        shares the stored object's read-only inode and must not be modified. Symlinks
+        are not used because evicting the object would leave them dangling.
+        """
+        dest_dir = os.path.dirname(dest) or "."
+        os.makedirs(dest_dir, exist_ok=True)
+        if os.path.exists(dest) and os.path.samefile(source, dest):
+            return dest
+
+        fd, partial = tempfile.mkstemp(dir=dest_dir, prefix=f".{os.path.basename(dest)}.")
+        os.close(fd)
+        os.remove(partial)
+        try:
+            linked = False
+            if link:
+                with contextlib.suppress(OSError):
+                    os.link(source, partial)
+                    linked = True
+            if not linked:
+                _copy_file(source, partial)
+            os.replace(partial, dest)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial)
+            raise
+        return dest
+
+    def _remove_object(self, sha256: str) -> None:
+        path = self.object_path(sha256)
+        with contextlib.suppress(FileNotFoundError):
+            try:
+                os.remove(path)
+            except PermissionError:
+                # Read-only files cannot be removed on Windows. Only then is the mode changed,
+                # since a hardlinked copy placed elsewhere shares it.
+                os.chmod(path, 0o644)
+                os.remove(path)
+
+    def _evict(self, keep: str | None = None) -> None:
+        """Drop least recently used objects until the store is below 90% of its size cap.
+
+        The object named by keep is never evicted, so a file larger than the cap can still be handed to
+        the caller that just downloaded it.
+        """
+        with self._evict_lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT sha256, MAX(size), MAX(last_access) FROM artifacts GROUP BY sha256 ORDER BY 3"
+            ).fetchall()
+            total = sum(size for _, size, _ in rows)
+            if total <= self.max_bytes:
+                return
+            target = int(self.max_bytes * 0.9)
+            for sha256, size, _ in rows:
+                if total <= target:
+                    break
+                if sha256 == keep:
+                    continue
+                with conn:
+                    conn.execute("DELETE FROM artifacts WHERE sha256 = ?", (sha256,))
+                self._remove_object(sha256)
+                total -= size
+
+    def clear(self) -> None:
+        """Remove every stored object. Files already placed in output directories are kept."""
+        conn = self._connection()
+        with conn:
+            for (sha256,) in conn.execute("SELECT DISTINCT sha256 FROM artifacts").fetchall():
+                self._remove_object(sha256)
+            conn.execute("DELETE FROM artifacts")
+
+    def stats(self) -> dict:
+        """Return URL and object counts, stored bytes and hit/miss counters for this process."""
+        conn = self._connection()
+        urls = conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+        objects, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM artifacts GROUP BY sha256)"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "urls": urls,
+            "objects": objects,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_artifact_cache = None
+_artifact_cache_lock = threading.Lock()
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Return the process-wide artifact cache, creating it on first use."""
+    global _artifact_cache
+    if _artifact_cache is None:
+        with _artifact_cache_lock:
+            if _artifact_cache is None:
+                _artifact_cache = ArtifactCache()
+    return _artifact_cache
@@ -47,6 +47,26 @@ class BiomniConfig:
     # LLM source (auto-detected if None)
     source: str | None = None
 
+    # HTTP settings for database, literature and download helpers
+    http_timeout: float = 60.0  # read timeout in seconds
+    http_connect_timeout: float = 10.0
+    http_max_retries: int = 3
+    http_max_connections_per_host: int = 8
+
+    # Persistent on-disk caches
+    cache_dir: str = "~/.cache/biomni"
+    http_cache: bool = True
+    http_cache_ttl: int = 86400  # default freshness lifetime in seconds
+    http_cache_max_mb: int = 1024
+    http_cache_ttl_overrides: dict[str, int] = field(default_factory=dict)  # host substring -> TTL in seconds
+    llm_translation_cache: bool = True  # memoize natural language -> API query translations
+    llm_translation_cache_ttl: int = 30 * 86400  # seconds a memoized translation is reused
+    artifact_cache: bool = True  # keep downloaded files (structures, diagrams, supplements) for reuse
+    artifact_cache_max_mb: int = 10240
+    artifact_cache_hardlinks: bool = False  # hardlink cached files into output dirs instead of copying them
+    data_lake_parquet: bool = True  # convert large text data lake tables to Parquet on first access
+    data_lake_parquet_eager: bool = False  # convert all of them in the background when an agent starts
+
     def __post_init__(self):
         """Load any environment variable overrides if they exist."""
         # Check for environment variable overrides (optional)
@@ -67,6 +87,36 @@ class BiomniConfig:
             self.api_key = os.getenv("BIOMNI_CUSTOM_API_KEY")
         if os.getenv("BIOMNI_SOURCE"):
             self.source = os.getenv("BIOMNI_SOURCE")
+        if os.getenv("BIOMNI_HTTP_TIMEOUT"):
+            self.http_timeout = float(os.getenv("BIOMNI_HTTP_TIMEOUT"))
+        if os.getenv("BIOMNI_HTTP_CONNECT_TIMEOUT"):
+            self.http_connect_timeout = float(os.getenv("BIOMNI_HTTP_CONNECT_TIMEOUT"))
+        if os.getenv("BIOMNI_HTTP_MAX_RETRIES"):
+            self.http_max_retries = int(os.getenv("BIOMNI_HTTP_MAX_RETRIES"))
+        if os.getenv("BIOMNI_HTTP_MAX_CONNECTIONS_PER_HOST"):
+            self.http_max_connections_per_host = int(os.getenv("BIOMNI_HTTP_MAX_CONNECTIONS_PER_HOST"))
+        if os.getenv("BIOMNI_CACHE_DIR"):
+            self.cache_dir = os.getenv("BIOMNI_CACHE_DIR")
+        if os.getenv("BIOMNI_HTTP_CACHE"):
+            self.http_cache = os.getenv("BIOMNI_HTTP_CACHE").lower() == "true"
+        if os.getenv("BIOMNI_HTTP_CACHE_TTL"):
+            self.http_cache_ttl = int(os.getenv("BIOMNI_HTTP_CACHE_TTL"))
+        if os.getenv("BIOMNI_HTTP_CACHE_MAX_MB"):
+            self.http_cache_max_mb = int(os.getenv("BIOMNI_HTTP_CACHE_MAX_MB"))
+        if os.getenv("BIOMNI_TRANSLATION_CACHE"):
+            self.llm_translation_cache = os.getenv("BIOMNI_TRANSLATION_CACHE").lower() == "true"
+        if os.getenv("BIOMNI_TRANSLATION_CACHE_TTL"):
+            self.llm_translation_cache_ttl = int(os.getenv("BIOMNI_TRANSLATION_CACHE_TTL"))
+        if os.getenv("BIOMNI_ARTIFACT_CACHE"):
+            self.artifact_cache = os.getenv("BIOMNI_ARTIFACT_CACHE").lower() == "true"
+        if os.getenv("BIOMNI_ARTIFACT_CACHE_MAX_MB"):
+            self.artifact_cache_max_mb = int(os.getenv("BIOMNI_ARTIFACT_CACHE_MAX_MB"))
+        if os.getenv("BIOMNI_ARTIFACT_CACHE_HARDLINKS"):
+            self.artifact_cache_hardlinks = os.getenv("BIOMNI_ARTIFACT_CACHE_HARDLINKS").lower() == "true"
+        if os.getenv("BIOMNI_DATA_LAKE_PARQUET"):
+            self.data_lake_parquet = os.getenv("BIOMNI_DATA_LAKE_PARQUET").lower() == "true"
+        if os.getenv("BIOMNI_DATA_LAKE_PARQUET_EAGER"):
+            self.data_lake_parquet_eager = os.getenv("BIOMNI_DATA_LAKE_PARQUET_EAGER").lower() == "true"
 
     def to_dict(self) -> dict:
         """Convert config to dictionary for easy access."""
@@ -79,6 +129,22 @@ class BiomniConfig:
             "base_url": self.base_url,
             "api_key": self.api_key,
             "source": self.source,
+            "http_timeout": self.http_timeout,
+            "http_connect_timeout": self.http_connect_timeout,
+            "http_max_retries": self.http_max_retries,
+            "http_max_connections_per_host": self.http_max_connections_per_host,
+            "cache_dir": self.cache_dir,
+            "http_cache": self.http_cache,
+            "http_cache_ttl": self.http_cache_ttl,
+            "http_cache_max_mb": self.http_cache_max_mb,
+            "http_cache_ttl_overrides": self.http_cache_ttl_overrides,
+            "llm_translation_cache": self.llm_translation_cache,
+            "llm_translation_cache_ttl": self.llm_translation_cache_ttl,
+            "artifact_cache": self.artifact_cache,
+            "artifact_cache_max_mb": self.artifact_cache_max_mb,
+            "artifact_cache_hardlinks": self.artifact_cache_hardlinks,
+            "data_lake_parquet": self.data_lake_parquet,
+            "data_lake_parquet_eager": self.data_lake_parquet_eager,
         }
 
 
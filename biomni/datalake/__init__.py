@@ -0,0 +1,75 @@
+"""Indexed access to the Biomni data lake.
+
+Data lake files are large flat files (OBO, CSV, parquet) that tools used to parse on
+every call. The stores in this package build compact on-disk indexes from them once,
+under <cache_dir>/datalake, and memory-map those indexes on later loads. Indexes are
+keyed by the source file's path, size and modification time, so an updated data lake
+file is re-indexed automatically. Tabular files can also be queried in place with
+column projection and predicate pushdown (query_table); large text tables are read
+from a one-time Parquet conversion (convert_table), and rows about given genes are
+found across all tables through a gene-keyed inverted index (find_gene_rows). The
+knowledge graph (kg.csv) is served from memory-mapped CSR adjacency arrays
+(get_knowledge_graph), and gene lists are tested for over-representation in the
+MSigDB/MouseMine gene set libraries offline (enrich_gene_sets). GTEx and DepMap
+matrices are served as memory-mapped float32 arrays (get_expression_matrix), and
+knockout guides come from a gene-indexed sgRNA store (get_sgrna_library). TxGNN
+drug repurposing scores are held as a disease-by-drug matrix (get_txgnn_predictions),
+and DDInter drug-drug interactions as an integer-coded sparse matrix (get_ddinter_store).
+Drug names are resolved against the DDInter vocabulary by a trigram-indexed fuzzy
+matcher (get_drug_name_resolver). openFDA bulk FAERS downloads are mirrored locally as
+report-by-drug and report-by-event incidence matrices for vectorized disproportionality
+analysis (get_faers_store).
+"""
+
+from biomni.datalake.convert import convert_data_lake, convert_table
+from biomni.datalake.ddinter import DDInterStore, get_ddinter_store
+from biomni.datalake.drugnames import (
+    DrugNameMatch,
+    DrugNameResolver,
+    get_drug_name_resolver,
+    normalize_drug_name,
+)
+from biomni.datalake.faers import FAERSStore, get_faers_store
+from biomni.datalake.genes import GeneIndex, find_gene_rows, get_gene_index
+from biomni.datalake.genesets import GeneSetLibrary, enrich_gene_sets, get_gene_set_library, list_gene_set_libraries
+from biomni.datalake.graph import KnowledgeGraph, get_knowledge_graph
+from biomni.datalake.hpo import HPOIndex, get_hpo_index
+from biomni.datalake.matrices import ExpressionMatrix, get_expression_matrix
+from biomni.datalake.sgrna import SgRNALibrary, get_sgrna_library
+from biomni.datalake.tables import count_rows, iter_table_batches, open_table, query_table, table_schema
+from biomni.datalake.txgnn import TxGNNPredictions, get_txgnn_predictions
+
+__all__ = [
+    "DDInterStore",
+    "DrugNameMatch",
+    "DrugNameResolver",
+    "ExpressionMatrix",
+    "FAERSStore",
+    "GeneIndex",
+    "GeneSetLibrary",
+    "HPOIndex",
+    "KnowledgeGraph",
+    "SgRNALibrary",
+    "TxGNNPredictions",
+    "convert_data_lake",
+    "convert_table",
+    "count_rows",
+    "enrich_gene_sets",
+    "find_gene_rows",
+    "get_ddinter_store",
+    "get_drug_name_resolver",
+    "get_expression_matrix",
+    "get_faers_store",
+    "get_gene_index",
+    "get_gene_set_library",
+    "get_hpo_index",
+    "get_knowledge_graph",
+    "get_sgrna_library",
+    "get_txgnn_predictions",
+    "iter_table_batches",
+    "list_gene_set_libraries",
+    "normalize_drug_name",
+    "open_table",
+    "query_table",
+    "table_schema",
+]
@@ -0,0 +1,116 @@
+"""Helpers for the on-disk indexes built from data lake files.
+
+Indexes live under <cache_dir>/datalake/<kind>/<fingerprint>, where the fingerprint
+covers the source files' paths, sizes and modification times and the index format
+version, so a changed source file or format gets a fresh index and stale ones are
+simply never read again. Each index is built in a temporary directory and renamed
+into place, so concurrent builders and crashed builds never expose a partial index.
+"""
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+
+from biomni.config import default_config
+
+
+def source_fingerprint(paths: Iterable[str], version: int) -> str:
+    """Hash the identity of the source files and the index format version."""
+    digest = hashlib.sha256(f"v{version}".encode())
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"\0{os.path.realpath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def index_directory(kind: str, paths: Iterable[str], version: int) -> str:
+    """Directory holding the index of the given kind for the given source files."""
+    root = os.path.join(os.path.expanduser(default_config.cache_dir), "datalake", kind)
+    return os.path.join(root, source_fingerprint(paths, version))
+
+
+@contextlib.contextmanager
+def building(directory: str) -> Iterator[str]:
+    """Yield a scratch directory that becomes `directory` when the block exits without error.
+
+    If another process finished the same index first, its copy is kept and the scratch
+    directory is discarded.
+    """
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    scratch = tempfile.mkdtemp(dir=parent, prefix=".build-")
+    try:
+        yield scratch
+        try:
+            os.rename(scratch, directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def write_array(directory: str, name: str, typecode: str, values: Iterable) -> None:
+    """Write values as a raw native-endian array file that map_array can read back.
+
+    numpy arrays are written as they are and must already have the dtype matching typecode.
+    """
+    with open(os.path.join(directory, name), "wb") as handle:
+        if hasattr(values, "tofile"):
+            values.tofile(handle)
+        else:
+            array(typecode, values).tofile(handle)
+
+
+def write_json(directory: str, name: str, data) -> None:
+    with open(os.path.join(directory, name), "w") as handle:
+        json.dump(data, handle)
+
+
+def read_json(directory: str, name: str):
+    with open(os.path.join(directory, name)) as handle:
+        return json.load(handle)
+
+
+def map_file(directory: str, name: str) -> memoryview:
+    """Memory-map a file read-only. The mapping stays valid after the file is closed."""
+    with open(os.path.join(directory, name), "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            # mmap cannot map empty files
+            return memoryview(b"")
+        return memoryview(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def map_array(directory: str, name: str, typecode: str) -> memoryview:
+    """Memory-map an array file written by write_array as a read-only sequence of numbers."""
+    return map_file(directory, name).cast(typecode)
+
+
+class StringTable:
+    """Read-only table of UTF-8 strings stored as one blob plus an offsets array."""
+
+    def __init__(self, directory: str, name: str):
+        self._blob = map_file(directory, f"{name}.txt")
+        self._offsets = map_array(directory, f"{name}.off", "q")
+
+    @staticmethod
+    def write(directory: str, name: str, strings: Iterable[str]) -> None:
+        offsets = [0]
+        with open(os.path.join(directory, f"{name}.txt"), "wb") as handle:
+            for string in strings:
+                encoded = string.encode()
+                handle.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+        write_array(directory, f"{name}.off", "q", offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self._blob[self._offsets[index] : self._offsets[index + 1]]).decode()
@@ -0,0 +1,297 @@
+"""One-time conversion of large text data lake tables to Parquet.
+
+The biggest data lake tables ship as CSV/TSV text, so every read re-parses
+gigabytes. convert_table streams such a file once into a typed, zstd-compressed
+Parquet copy under <cache_dir>/datalake/parquet, sorted on the table's natural
+key (gene, chromosome/position, sample) when it fits in memory, so that
+predicate pushdown can skip most row groups. query_table and the other data lake
+readers use the converted copy transparently when one exists.
+
+Conversion happens on first access (see default_config.data_lake_parquet), or
+for all known large tables at once with convert_data_lake, which the agent runs
+in the background at startup when default_config.data_lake_parquet_eager is set.
+Every conversion, successful or not, is recorded in manifest.json next to the
+converted files; a failed conversion is not retried until the source changes.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+from biomni.config import default_config
+from biomni.datalake._store import building, index_directory
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # optional: conversion needs pyarrow
+    pa = None
+    pa_csv = None
+    pq = None
+
+# Bump when the conversion output changes so existing copies are rebuilt
+_FORMAT_VERSION = 2
+
+# Large text tables converted by convert_data_lake
+LARGE_TEXT_TABLES = [
+    "BindingDB_All_202409.tsv",
+    "Cosmic_CompleteGeneExpression_v101_GRCh38.tsv.gz",
+    "Cosmic_GenomeScreensMutant_v101_GRCh38.tsv.gz",
+    "Cosmic_CompleteCNA_v101_GRCh38.tsv.gz",
+    "Cosmic_CompleteDifferentialMethylation_v101_GRCh38.tsv.gz",
+    "DepMap_CRISPRGeneDependency.csv",
+    "DepMap_CRISPRGeneEffect.csv",
+    "DepMap_OmicsExpressionProteinCodingGenesTPMLogp1.csv",
+    "kg.csv",
+    "proteinatlas.tsv",
+    "sgRNA_KO_SP_human.txt",
+    "sgRNA_KO_SP_mouse.txt",
+]
+
+# Natural sort keys of known tables; columns missing from a file are ignored
+_SORT_KEYS = {
+    "Cosmic_CompleteGeneExpression_v101_GRCh38.tsv.gz": ["GENE_SYMBOL", "SAMPLE_NAME"],
+    "Cosmic_GenomeScreensMutant_v101_GRCh38.tsv.gz": ["CHROMOSOME", "GENOME_START"],
+    "Cosmic_CompleteCNA_v101_GRCh38.tsv.gz": ["GENE_SYMBOL", "SAMPLE_NAME"],
+    "Cosmic_CompleteDifferentialMethylation_v101_GRCh38.tsv.gz": ["CHROMOSOME", "POSITION"],
+    "kg.csv": ["x_type", "x_name"],
+    "proteinatlas.tsv": ["Gene"],
+    "sgRNA_KO_SP_human.txt": ["Target Gene Symbol"],
+    "sgRNA_KO_SP_mouse.txt": ["Target Gene Symbol"],
+    # DepMap matrices have one row per model and one column per gene; their file order is kept
+    "DepMap_CRISPRGeneDependency.csv": [],
+    "DepMap_CRISPRGeneEffect.csv": [],
+    "DepMap_OmicsExpressionProteinCodingGenesTPMLogp1.csv": [],
+}
+
+# For other tables, sort on the first of these columns present (compared case-insensitively)
+_GENERIC_SORT_KEYS = ["gene_symbol", "gene", "gene_name", "symbol", "chromosome", "chr", "sample_name", "sample"]
+
+# Text files smaller than this are cheap to parse and are not converted on first access
+MIN_CONVERT_BYTES = 32 * 1024**2
+
+# Tables whose decoded size exceeds this are converted without sorting
+_MAX_SORT_BYTES = 4 * 1024**3
+
+_ROW_GROUP_SIZE = 128 * 1024
+_CSV_BLOCK_SIZE = 64 * 1024**2
+
+# Start of pyarrow's message for a value that does not fit the type inferred for its column
+_CONVERSION_ERROR_COLUMN = re.compile(r"In CSV column #(\d+):")
+
+_conversion_locks: dict[str, threading.Lock] = {}
+_manifest_lock = threading.Lock()
+
+
+def _parquet_root() -> str:
+    return os.path.join(os.path.expanduser(default_config.cache_dir), "datalake", "parquet")
+
+
+def _manifest_path() -> str:
+    return os.path.join(_parquet_root(), "manifest.json")
+
+
+def read_manifest() -> dict[str, dict]:
+    """Conversion records keyed by the source file's real path."""
+    try:
+        with open(_manifest_path()) as handle:
+            return json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _record(source: str, entry: dict) -> None:
+    with _manifest_lock:
+        manifest = read_manifest()
+        manifest[source] = entry
+        os.makedirs(_parquet_root(), exist_ok=True)
+        partial = f"{_manifest_path()}.{os.getpid()}.tmp"
+        with open(partial, "w") as handle:
+            json.dump(manifest, handle, indent=1, sort_keys=True)
+        os.replace(partial, _manifest_path())
+
+
+def is_text_table(path: str) -> bool:
+    name = path[:-3] if path.endswith(".gz") else path
+    return os.path.splitext(name)[1].lower() in (".csv", ".tsv", ".txt")
+
+
+def converted_path(path: str) -> str | None:
+    """Path of the current Parquet copy of a text table, or None if it has not been converted."""
+    target = os.path.join(index_directory("parquet", [path], _FORMAT_VERSION), "data.parquet")
+    return target if os.path.exists(target) else None
+
+
+def _sort_keys(name: str, columns: list[str]) -> list[str]:
+    if name in _SORT_KEYS:
+        return [column for column in _SORT_KEYS[name] if column in columns]
+    lowered = {column.lower(): column for column in columns}
+    for candidate in _GENERIC_SORT_KEYS:
+        if candidate in lowered:
+            return [lowered[candidate]]
+    return []
+
+
+def _stream_to_parquet(path: str, dest: str, text_columns: list[int] | None = None) -> tuple[int, int, list[str]]:
+    """Stream a delimited text file into a Parquet file. Returns (rows, skipped rows, columns).
+
+    Column types are inferred from the first block, except for the columns at the positions in
+    text_columns, which are kept as strings.
+    """
+    delimiter = "," if path.removesuffix(".gz").lower().endswith(".csv") else "\t"
+    skipped = 0
+
+    def skip_invalid_row(row) -> str:
+        nonlocal skipped
+        skipped += 1
+        return "skip"
+
+    source = pa.input_stream(path, compression="detect")
+    read_options = pa_csv.ReadOptions(block_size=_CSV_BLOCK_SIZE)
+    # Tab-separated exports do not quote fields, and stray quote characters must stay literal
+    parse_options = pa_csv.ParseOptions(
+        delimiter=delimiter, quote_char='"' if delimiter == "," else False, invalid_row_handler=skip_invalid_row
+    )
+    convert_options = pa_csv.ConvertOptions()
+    if text_columns:
+        with pa.input_stream(path, compression="detect") as header_source:
+            names = pa_csv.open_csv(header_source, read_options=read_options, parse_options=parse_options).schema.names
+        convert_options = pa_csv.ConvertOptions(column_types={names[i]: pa.string() for i in text_columns})
+        # Rows skipped while reading the first block for the header are counted again below
+        skipped = 0
+
+    rows = 0
+    with source, pa_csv.open_csv(source, read_options, parse_options, convert_options) as reader:
+        with pq.ParquetWriter(dest, reader.schema, compression="zstd") as writer:
+            for batch in reader:
+                writer.write_batch(batch, row_group_size=_ROW_GROUP_SIZE)
+                rows += batch.num_rows
+        return rows, skipped, reader.schema.names
+
+
+def _write_parquet(path: str, directory: str) -> dict:
+    unsorted = os.path.join(directory, "unsorted.parquet")
+    text_columns = []
+    while True:
+        try:
+            rows, skipped, columns = _stream_to_parquet(path, unsorted, text_columns)
+            break
+        except pa.ArrowInvalid as e:
+            # The type inferred from the first block did not hold further down; keep that column as text
+            match = _CONVERSION_ERROR_COLUMN.match(str(e))
+            if match is None or int(match.group(1)) in text_columns:
+                raise
+            text_columns.append(int(match.group(1)))
+
+    final = os.path.join(directory, "data.parquet")
+    keys = _sort_keys(os.path.basename(path), columns)
+    metadata = pq.ParquetFile(unsorted).metadata
+    decoded_size = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    if keys and decoded_size <= _MAX_SORT_BYTES:
+        table = pq.read_table(unsorted).sort_by([(key, "ascending") for key in keys])
+        pq.write_table(table, final, compression="zstd", row_group_size=_ROW_GROUP_SIZE)
+        del table
+        os.remove(unsorted)
+    else:
+        keys = []
+        os.replace(unsorted, final)
+    return {
+        "rows": rows,
+        "skipped_rows": skipped,
+        "columns": len(columns),
+        "typed": not text_columns,
+        "text_columns": [columns[i] for i in sorted(text_columns)],
+        "sorted_by": keys,
+    }
+
+
+def convert_table(path: str, force: bool = False) -> str | None:
+    """Convert a delimited text table to Parquet once and return the path of the copy.
+
+    Args:
+        path: Path of a .csv, .tsv or tab-separated .txt file, optionally gzipped
+        force: Retry even if converting this version of the file failed before
+
+    Returns:
+        Path of the Parquet copy, or None if pyarrow is missing or the conversion failed
+    """
+    if pa is None or not is_text_table(path):
+        return None
+    target = converted_path(path)
+    if target is not None:
+        return target
+
+    source = os.path.realpath(path)
+    with _manifest_lock:
+        lock = _conversion_locks.setdefault(source, threading.Lock())
+    with lock:
+        # Another thread may have finished the conversion while we waited
+        target = converted_path(path)
+        if target is not None:
+            return target
+
+        directory = index_directory("parquet", [path], _FORMAT_VERSION)
+        fingerprint = os.path.basename(directory)
+        previous = read_manifest().get(source)
+        if previous and previous.get("fingerprint") == fingerprint and previous["status"] == "failed" and not force:
+            return None
+
+        stat = os.stat(path)
+        entry = {"fingerprint": fingerprint, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        start = time.time()
+        try:
+            with building(directory) as scratch:
+                entry.update(_write_parquet(path, scratch))
+        except (pa.ArrowException, OSError) as e:
+            entry.update({"status": "failed", "error": str(e), "attempted_at": start})
+            _record(source, entry)
+            return None
+
+        target = os.path.join(directory, "data.parquet")
+        entry.update(
+            {
+                "status": "converted",
+                "parquet": target,
+                "parquet_size": os.path.getsize(target),
+                "converted_at": start,
+                "seconds": round(time.time() - start, 1),
+            }
+        )
+        _record(source, entry)
+        return target
+
+
+def convert_data_lake(data_lake_path: str, tables: list[str] | None = None) -> dict[str, str | None]:
+    """Convert the large text tables of a data lake to Parquet, skipping those already converted.
+
+    Args:
+        data_lake_path: Data lake directory
+        tables: File names to convert. Defaults to LARGE_TEXT_TABLES.
+
+    Returns:
+        Map from file name to the Parquet copy's path (None where conversion failed); files missing
+        from the data lake are left out
+    """
+    results = {}
+    for name in tables or LARGE_TEXT_TABLES:
+        path = os.path.join(data_lake_path, name)
+        if os.path.isfile(path):
+            results[name] = convert_table(path)
+    return results
+
+
+def prefer_parquet(path: str) -> str:
+    """Return the Parquet copy of a text table if there is one, converting large tables on first use.
+
+    Falls back to the original path when conversion is disabled, the file is small or conversion
+    failed, so callers can read whatever this returns.
+    """
+    if not default_config.data_lake_parquet or not is_text_table(path):
+        return path
+    target = converted_path(path)
+    if target is None and os.path.getsize(path) >= MIN_CONVERT_BYTES:
+        target = convert_table(path)
+    return target or path
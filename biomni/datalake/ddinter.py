@@ -0,0 +1,370 @@
+"""Integer-coded store of the DDInter drug-drug interaction tables.
+
+The DDInter 2.0 CSVs in the data lake (ddinter_<category>.csv) list interacting
+drug pairs with a severity level. DDInterStore converts them once, with vectorized
+pandas/numpy code, into integer drug codes, an interaction record table, a sparse
+drug-by-drug matrix of interacting pairs and a category-to-drug index, stored under
+the data lake index cache and loaded once per process. Checking every pair of a
+polypharmacy list is a slice of the sparse matrix, and finding alternatives scores
+all candidate drugs of a category at once.
+
+Interactions are keyed by standardized drug name (lower case, common salt suffixes
+removed), so drugs that share a standardized name share their interactions.
+
+Usage:
+    from biomni.datalake import get_ddinter_store
+
+    store = get_ddinter_store(data_lake_path)
+    codes = [store.name_code(name) for name in ["warfarin", "aspirin", "omeprazole"]]
+    store.pairwise(codes)  # [(i, j, [interaction records])]
+"""
+
+import os
+import threading
+from difflib import get_close_matches
+
+import pandas as pd
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_array,
+    read_json,
+    write_array,
+    write_json,
+)
+from biomni.datalake.tables import default_data_lake_path
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional: the DDInter store needs numpy and scipy
+    np = None
+    sparse = None
+
+# Bump when the on-disk layout changes so existing stores are rebuilt
+_FORMAT_VERSION = 2
+
+# DDInter category files, in the order their rows are read
+CATEGORY_FILES = [
+    "ddinter_alimentary_tract_metabolism.csv",
+    "ddinter_antineoplastic.csv",
+    "ddinter_antiparasitic.csv",
+    "ddinter_blood_organs.csv",
+    "ddinter_dermatological.csv",
+    "ddinter_hormonal.csv",
+    "ddinter_respiratory.csv",
+    "ddinter_various.csv",
+]
+
+# Salt and ester words dropped when standardizing drug names, here and by drugnames.normalize_drug_name
+SALT_SUFFIXES = [
+    "hydrochloride",
+    "sulfate",
+    "sodium",
+    "potassium",
+    "calcium",
+    "magnesium",
+    "phosphate",
+    "acetate",
+    "citrate",
+]
+
+
+def standardize_drug_names(names: pd.Series) -> pd.Series:
+    """Standardize drug names for matching: lower case, stripped, common salt suffixes removed."""
+    standardized = names.astype(str).str.strip().str.lower()
+    for suffix in SALT_SUFFIXES:
+        standardized = standardized.str.replace(f" {suffix}", "", regex=False)
+    return standardized.where(names.notna(), "")
+
+
+def _codes(values: pd.Series, order) -> tuple:
+    """Integer codes for values, numbered by first appearance in `order`, with the numbered values."""
+    _, uniques = pd.factorize(order)
+    return pd.Index(uniques).get_indexer(values).astype(np.int32), uniques
+
+
+def _first_positions(order) -> "np.ndarray":
+    """Position of the first appearance of each distinct value of `order`, in order of appearance."""
+    codes, _ = pd.factorize(order)
+    return np.unique(codes, return_index=True)[1]
+
+
+def _build_store(paths: list[str], directory: str) -> None:
+    frames = []
+    for path in paths:
+        frame = pd.read_csv(path, usecols=["DDInterID_A", "Drug_A", "DDInterID_B", "Drug_B", "Level"])
+        frame["category"] = os.path.basename(path).removeprefix("ddinter_").removesuffix(".csv")
+        frames.append(frame)
+    records = pd.concat(frames, ignore_index=True)
+    categories = list(dict.fromkeys(records["category"]))
+    record_categories = pd.Index(categories).get_indexer(records["category"]).astype(np.uint8)
+    level_names = records["Level"].fillna("Unknown")
+    record_levels, levels = _codes(level_names, level_names)
+
+    # Drugs in order of first appearance, drug A before drug B of each row
+    interleaved_ids = np.column_stack([records["DDInterID_A"].to_numpy(), records["DDInterID_B"].to_numpy()]).ravel()
+    drug_a, drug_ids = _codes(records["DDInterID_A"], interleaved_ids)
+    drug_b, _ = _codes(records["DDInterID_B"], interleaved_ids)
+    first_seen = _first_positions(interleaved_ids)
+    interleaved_names = np.column_stack([records["Drug_A"].to_numpy(), records["Drug_B"].to_numpy()]).ravel()
+    drug_names = pd.Series(interleaved_names[first_seen]).astype(str)
+
+    # Interactions are keyed by standardized name; names are numbered by first appearance too
+    standardized_a = standardize_drug_names(records["Drug_A"])
+    standardized_b = standardize_drug_names(records["Drug_B"])
+    interleaved_standardized = np.column_stack([standardized_a.to_numpy(), standardized_b.to_numpy()]).ravel()
+    name_a, names = _codes(standardized_a, interleaved_standardized)
+    name_b, _ = _codes(standardized_b, interleaved_standardized)
+    drug_name_codes = pd.Index(names).get_indexer(interleaved_standardized[first_seen]).astype(np.int32)
+
+    # Category bitmask and number of distinct interaction partners per drug
+    num_drugs = len(drug_ids)
+    masks = np.zeros(num_drugs, dtype=np.uint32)
+    np.bitwise_or.at(masks, drug_a, np.left_shift(1, record_categories.astype(np.uint32)))
+    np.bitwise_or.at(masks, drug_b, np.left_shift(1, record_categories.astype(np.uint32)))
+    a, b = drug_a.astype(np.int64), drug_b.astype(np.int64)
+    partners = np.unique(np.concatenate([a * num_drugs + b, b * num_drugs + a]))
+    partner_counts = np.bincount(partners // num_drugs, minlength=num_drugs).astype(np.int32)
+
+    # Directed pairs in both directions; a record of a drug with itself is listed twice, as before
+    num_names = len(names)
+    count = len(records)
+    sources = np.concatenate([name_a, name_b]).astype(np.int64)
+    targets = np.concatenate([name_b, name_a]).astype(np.int64)
+    record_ids = np.concatenate([np.arange(count), np.arange(count)])
+    order = np.lexsort((record_ids, sources * num_names + targets))
+    keys = (sources * num_names + targets)[order]
+    pair_keys, pair_starts = np.unique(keys, return_index=True)
+    pair_pointers = np.append(pair_starts, len(keys)).astype(np.int64)
+
+    category_drugs = [np.flatnonzero(masks & (1 << index)) for index in range(len(categories))]
+    category_pointers = np.cumsum([0] + [len(drugs) for drugs in category_drugs]).astype(np.int64)
+
+    with building(directory) as scratch:
+        StringTable.write(scratch, "drug_ids", (str(drug_id) for drug_id in drug_ids))
+        StringTable.write(scratch, "drug_names", drug_names)
+        StringTable.write(scratch, "names", (str(name) for name in names))
+        write_array(scratch, "drug.name", "i", drug_name_codes)
+        write_array(scratch, "drug.categories", "I", masks)
+        write_array(scratch, "drug.partners", "i", partner_counts)
+        write_array(scratch, "record.drug_a", "i", drug_a)
+        write_array(scratch, "record.drug_b", "i", drug_b)
+        write_array(scratch, "record.level", "B", record_levels.astype(np.uint8))
+        write_array(scratch, "record.category", "B", record_categories)
+        write_array(scratch, "pair.key", "q", pair_keys.astype(np.int64))
+        write_array(scratch, "pair.ptr", "q", pair_pointers)
+        write_array(scratch, "pair.record", "i", record_ids[order].astype(np.int32))
+        write_array(scratch, "category.ptr", "q", category_pointers)
+        write_array(scratch, "category.drug", "i", np.concatenate(category_drugs or [[]]).astype(np.int32))
+        write_json(
+            scratch,
+            "meta.json",
+            {
+                "version": _FORMAT_VERSION,
+                "sources": paths,
+                "drugs": num_drugs,
+                "names": num_names,
+                "records": count,
+                "levels": [str(level) for level in levels],
+                "categories": categories,
+            },
+        )
+
+
+def _array(directory: str, name: str, typecode: str, dtype):
+    return np.asarray(map_array(directory, name, typecode), dtype=dtype)
+
+
+class DDInterStore:
+    """DDInter interactions with integer drug codes, loaded once per process.
+
+    Drugs (DDInter IDs) are numbered 0..num_drugs-1 in order of first appearance in the
+    CSVs; standardized names, which key the interactions, are numbered separately
+    ("name codes"). name_mapping maps lower-cased and standardized drug names to
+    DDInter IDs, as the former pickled mapping did.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        self.levels = self.meta["levels"]
+        self.categories = self.meta["categories"]
+        ids, names, standardized = (
+            StringTable(directory, "drug_ids"),
+            StringTable(directory, "drug_names"),
+            StringTable(directory, "names"),
+        )
+        self.drug_ids = [ids[i] for i in range(len(ids))]
+        self.drug_names = [names[i] for i in range(len(names))]
+        self.names = [standardized[i] for i in range(len(standardized))]
+        self._drug_codes = {drug_id: code for code, drug_id in enumerate(self.drug_ids)}
+        self._name_codes = {name: code for code, name in enumerate(self.names)}
+        self._drug_name = _array(directory, "drug.name", "i", np.int64)
+        self._drug_categories = _array(directory, "drug.categories", "I", np.uint32)
+        self._drug_partners = _array(directory, "drug.partners", "i", np.int64)
+        self._record_drug_a = _array(directory, "record.drug_a", "i", np.int64)
+        self._record_drug_b = _array(directory, "record.drug_b", "i", np.int64)
+        self._record_level = _array(directory, "record.level", "B", np.int64)
+        self._record_category = _array(directory, "record.category", "B", np.int64)
+        self._pair_pointers = _array(directory, "pair.ptr", "q", np.int64)
+        self._pair_records = _array(directory, "pair.record", "i", np.int64)
+        self._category_pointers = _array(directory, "category.ptr", "q", np.int64)
+        self._category_drugs = _array(directory, "category.drug", "i", np.int64)
+
+        # Sparse name-by-name matrix whose entries are pair index + 1
+        keys = _array(directory, "pair.key", "q", np.int64)
+        num_names = len(self.names)
+        self.pairs = sparse.csr_matrix(
+            (np.arange(1, len(keys) + 1), (keys // num_names, keys % num_names)), shape=(num_names, num_names)
+        )
+        # Records per pair and per pair and severity level
+        self.pair_counts = np.diff(self._pair_pointers)
+        pair_of_record = np.repeat(np.arange(len(keys)), self.pair_counts)
+        self.pair_levels = np.zeros((len(keys), len(self.levels)), dtype=np.int64)
+        np.add.at(self.pair_levels, (pair_of_record, self._record_level[self._pair_records]), 1)
+
+        self.name_mapping = {}
+        for drug_id, name, code in zip(self.drug_ids, self.drug_names, self._drug_name, strict=True):
+            self.name_mapping[name.lower()] = drug_id
+            self.name_mapping[self.names[code]] = drug_id
+
+    @classmethod
+    def open(cls, paths: list[str]) -> "DDInterStore":
+        """Open the store for the DDInter CSVs, building it first if they are new or have changed."""
+        directory = index_directory("ddinter", paths, _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_store(paths, directory)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self.drug_ids)
+
+    def standardize(self, drug_name: str, cutoff: float = 0.8) -> str | None:
+        """The name_mapping key for a drug name: exact (case-insensitive), else the closest fuzzy match."""
+        if drug_name.lower() in self.name_mapping:
+            return drug_name.lower()
+        matches = get_close_matches(drug_name.lower(), self.name_mapping.keys(), n=1, cutoff=cutoff)
+        return matches[0] if matches else None
+
+    def drug_code(self, key: str) -> int:
+        """Drug code of a name_mapping key."""
+        return self._drug_codes[self.name_mapping[key]]
+
+    def name_code(self, key: str) -> int:
+        """Name code (interaction key) of a name_mapping key."""
+        if key in self._name_codes:
+            return self._name_codes[key]
+        return int(self._drug_name[self.drug_code(key)])
+
+    def drug(self, code: int) -> dict:
+        """Registry entry of a drug: DDInter ID, name, standardized name, categories and partner count."""
+        mask = int(self._drug_categories[code])
+        return {
+            "id": self.drug_ids[code],
+            "name": self.drug_names[code],
+            "standardized_name": self.names[self._drug_name[code]],
+            "categories": [category for index, category in enumerate(self.categories) if mask & (1 << index)],
+            "interaction_count": int(self._drug_partners[code]),
+        }
+
+    def _records(self, pair: int) -> list[dict]:
+        records = self._pair_records[self._pair_pointers[pair] : self._pair_pointers[pair + 1]]
+        return [
+            {
+                "level": self.levels[self._record_level[record]],
+                "category": self.categories[self._record_category[record]],
+                "drug_a_id": self.drug_ids[self._record_drug_a[record]],
+                "drug_b_id": self.drug_ids[self._record_drug_b[record]],
+                "drug_a_name": self.drug_names[self._record_drug_a[record]],
+                "drug_b_name": self.drug_names[self._record_drug_b[record]],
+            }
+            for record in records
+        ]
+
+    def interactions(self, name_a: int, name_b: int) -> list[dict]:
+        """Interaction records between two name codes (empty if they do not interact)."""
+        pair = self.pairs[name_a, name_b]
+        return self._records(pair - 1) if pair else []
+
+    def pairwise(self, names: list[int]) -> list[tuple[int, int, list[dict]]]:
+        """Interactions among all pairs of a list of name codes, as (i, j, records) for positions i < j."""
+        if len(names) < 2:
+            return []
+        block = sparse.triu(self.pairs[names][:, names], k=1).tocoo()
+        order = np.lexsort((block.col, block.row))
+        return [(int(block.row[k]), int(block.col[k]), self._records(int(block.data[k]) - 1)) for k in order]
+
+    def category_drugs(self, categories: list[str]):
+        """Codes of the drugs in any of the given categories, in registry order."""
+        chunks = [
+            self._category_drugs[self._category_pointers[index] : self._category_pointers[index + 1]]
+            for index, category in enumerate(self.categories)
+            if category in categories
+        ]
+        return np.unique(np.concatenate(chunks)) if chunks else np.empty(0, dtype=np.int64)
+
+    def alternatives(self, target: int, avoid: list[int], therapeutic_class: str | None = None) -> list[dict]:
+        """Drugs that could replace a drug without Major interactions with the drugs to avoid.
+
+        Args:
+            target: Drug code of the drug to replace
+            avoid: Name codes of the drugs whose interactions matter
+            therapeutic_class: Only consider drugs in categories containing this text; by
+                default, drugs sharing a category with the target
+
+        Returns:
+            Registry entries (see drug()) with "interaction_count" replaced by the number of
+            interaction records with the drugs to avoid and "total_interactions" holding the
+            drug's partner count, fewest interactions first (registry order among ties)
+        """
+        if therapeutic_class:
+            categories = [category for category in self.categories if therapeutic_class.lower() in category.lower()]
+        else:
+            categories = self.drug(target)["categories"]
+        candidates = self.category_drugs(categories)
+        candidates = candidates[candidates != target]
+
+        counts = np.zeros(len(candidates), dtype=np.int64)
+        major = np.zeros(len(candidates), dtype=bool)
+        if avoid and len(candidates):
+            block = self.pairs[self._drug_name[candidates]][:, avoid].tocoo()
+            pair = block.data - 1
+            np.add.at(counts, block.row, self.pair_counts[pair])
+            if "Major" in self.levels:
+                np.logical_or.at(major, block.row, self.pair_levels[pair, self.levels.index("Major")] > 0)
+
+        keep = np.flatnonzero(~major)
+        keep = keep[np.argsort(counts[keep], kind="stable")]
+        results = []
+        for index in keep:
+            entry = self.drug(int(candidates[index]))
+            entry["total_interactions"] = entry["interaction_count"]
+            entry["interaction_count"] = int(counts[index])
+            results.append(entry)
+        return results
+
+
+_stores: dict[tuple[str, ...], DDInterStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_ddinter_store(data_lake_path: str | None = None) -> DDInterStore:
+    """Return the process-wide DDInter store for a data lake, building it on first use."""
+    if np is None or sparse is None:
+        raise ImportError("The DDInter store requires numpy and scipy: pip install numpy scipy")
+    data_lake_path = data_lake_path or default_data_lake_path()
+    paths = [os.path.join(data_lake_path, name) for name in CATEGORY_FILES]
+    paths = tuple(path for path in paths if os.path.exists(path))
+    if not paths:
+        raise FileNotFoundError("No DDInter CSV files found in data lake")
+    directory = index_directory("ddinter", paths, _FORMAT_VERSION)
+    store = _stores.get(paths)
+    if store is None or store.directory != directory:
+        with _stores_lock:
+            store = _stores.get(paths)
+            if store is None or store.directory != directory:
+                store = _stores[paths] = DDInterStore.open(list(paths))
+    return store
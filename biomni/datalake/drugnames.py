@@ -0,0 +1,208 @@
+"""Trigram-indexed fuzzy resolver for drug names.
+
+Drug names typed by users or agents are matched against a vocabulary of known
+names (generic names, salt forms and any synonyms such as brand names) with
+difflib's similarity ratio, as the pharmacology tools always did. Scoring every
+vocabulary entry for every unmatched name is slow, so DrugNameResolver keeps a
+sparse name-by-trigram matrix and only scores the entries sharing the most
+character trigrams with a query. Many names are resolved with one sparse
+product, and recent results are kept in an LRU cache.
+
+The resolver for the data lake's DDInter vocabulary is shared by all
+pharmacology tools (get_drug_name_resolver).
+
+Usage:
+    from biomni.datalake import get_drug_name_resolver
+
+    resolver = get_drug_name_resolver(data_lake_path)
+    resolver.resolve("asprin")  # DrugNameMatch(query="asprin", name="aspirin", score=0.92...)
+    resolver.resolve_many(["warfarin", "metformin hcl", "omeprazol"])
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from difflib import SequenceMatcher
+from typing import NamedTuple
+
+from biomni.datalake.ddinter import SALT_SUFFIXES, get_ddinter_store
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional: the resolver needs numpy and scipy
+    np = None
+    sparse = None
+
+
+def normalize_drug_name(drug_name: str | None) -> str:
+    """Lower-case and strip a drug name and drop trailing salt words (e.g. "Metformin Hydrochloride" -> "metformin").
+
+    The salt words are ddinter.SALT_SUFFIXES; a name that is only a salt word (e.g. "calcium") is kept.
+    """
+    if not drug_name:
+        return ""
+    words = drug_name.strip().lower().split()
+    while len(words) > 1 and words[-1] in SALT_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _trigrams(name: str) -> set[str]:
+    padded = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class DrugNameMatch(NamedTuple):
+    """A resolved drug name: the vocabulary name for a query and its similarity (1.0 for exact matches)."""
+
+    query: str
+    name: str
+    score: float
+
+
+class DrugNameResolver:
+    """Fuzzy drug name matching over a fixed vocabulary.
+
+    Args:
+        names: Vocabulary names; each resolves to itself
+        synonyms: Extra names (brand names, abbreviations) mapped to the vocabulary name they stand for
+        candidates: Number of entries with the most shared trigrams scored per query
+        cache_size: Number of resolved queries kept in the LRU cache
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        synonyms: dict[str, str] | None = None,
+        candidates: int = 50,
+        cache_size: int = 4096,
+    ):
+        if np is None or sparse is None:
+            raise ImportError("The drug name resolver requires numpy and scipy: pip install numpy scipy")
+        self._targets = {name.lower(): name for name in names}
+        for synonym, name in (synonyms or {}).items():
+            self._targets.setdefault(synonym.lower(), name)
+        self.keys = list(self._targets)
+        self.candidates = candidates
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._trigram_ids: dict[str, int] = {}
+        rows, columns = [], []
+        for row, key in enumerate(self.keys):
+            for trigram in _trigrams(key):
+                rows.append(row)
+                columns.append(self._trigram_ids.setdefault(trigram, len(self._trigram_ids)))
+        self._matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=(len(self.keys), len(self._trigram_ids))
+        )
+        self._sizes = np.asarray(self._matrix.sum(axis=1)).ravel()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._targets
+
+    def resolve(self, drug_name: str, cutoff: float = 0.8) -> DrugNameMatch | None:
+        """Resolve one drug name; see resolve_many."""
+        return self.resolve_many([drug_name], cutoff)[0]
+
+    def resolve_many(self, drug_names: Iterable[str], cutoff: float = 0.8) -> list[DrugNameMatch | None]:
+        """Resolve drug names to vocabulary names.
+
+        Names are matched case-insensitively; names without an exact match get the candidate
+        with the highest difflib similarity ratio, if it reaches the cutoff.
+
+        Args:
+            drug_names: Names to resolve
+            cutoff: Minimum similarity ratio (0-1) of a fuzzy match
+
+        Returns:
+            One DrugNameMatch per name, or None where nothing is similar enough
+        """
+        drug_names = list(drug_names)
+        results: list[DrugNameMatch | None] = [None] * len(drug_names)
+        pending: dict[str, list[int]] = {}
+        with self._lock:
+            for position, drug_name in enumerate(drug_names):
+                query = drug_name.lower()
+                if query in self._targets:
+                    results[position] = DrugNameMatch(drug_name, self._targets[query], 1.0)
+                elif (query, cutoff) in self._cache:
+                    self._cache.move_to_end((query, cutoff))
+                    match = self._cache[(query, cutoff)]
+                    results[position] = match and match._replace(query=drug_name)
+                else:
+                    pending.setdefault(query, []).append(position)
+        if not pending:
+            return results
+
+        queries = list(pending)
+        for query, match in zip(queries, self._fuzzy(queries, cutoff), strict=True):
+            for position in pending[query]:
+                results[position] = match and match._replace(query=drug_names[position])
+            with self._lock:
+                self._cache[(query, cutoff)] = match
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return results
+
+    def _fuzzy(self, queries: list[str], cutoff: float) -> list[DrugNameMatch | None]:
+        # Dice similarity of trigram sets picks the candidates to score with difflib
+        rows, columns, sizes = [], [], []
+        for row, query in enumerate(queries):
+            trigrams = _trigrams(query)
+            sizes.append(len(trigrams))
+            for trigram in trigrams:
+                if trigram in self._trigram_ids:
+                    rows.append(row)
+                    columns.append(self._trigram_ids[trigram])
+        query_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=(len(queries), len(self._trigram_ids))
+        )
+        shared = (query_matrix @ self._matrix.T).tocsr()
+
+        matches = []
+        for row, query in enumerate(queries):
+            entries = shared.indices[shared.indptr[row] : shared.indptr[row + 1]]
+            counts = shared.data[shared.indptr[row] : shared.indptr[row + 1]]
+            if len(entries) > self.candidates:
+                dice = counts / (self._sizes[entries] + sizes[row])
+                entries = entries[np.argpartition(-dice, self.candidates - 1)[: self.candidates]]
+            best, best_score = None, cutoff
+            matcher = SequenceMatcher()
+            matcher.set_seq2(query)
+            for entry in entries:
+                key = self.keys[entry]
+                matcher.set_seq1(key)
+                if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                    continue
+                score = matcher.ratio()
+                # Ties go to the greater name, as with difflib.get_close_matches
+                if score > best_score or (score == best_score and (best is None or key > best)):
+                    best, best_score = key, score
+            matches.append(DrugNameMatch(query, self._targets[best], best_score) if best is not None else None)
+        return matches
+
+
+_resolvers: dict[str, DrugNameResolver] = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_drug_name_resolver(data_lake_path: str | None = None) -> DrugNameResolver:
+    """Return the process-wide resolver over the DDInter drug names of a data lake.
+
+    The vocabulary is the DDInter name mapping: every drug name, lower-cased, and its
+    standardized form; resolved names are keys of DDInterStore.name_mapping.
+    """
+    store = get_ddinter_store(data_lake_path)
+    resolver = _resolvers.get(store.directory)
+    if resolver is None:
+        with _resolvers_lock:
+            resolver = _resolvers.get(store.directory)
+            if resolver is None:
+                resolver = _resolvers[store.directory] = DrugNameResolver(store.name_mapping)
+    return resolver
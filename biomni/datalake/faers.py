@@ -0,0 +1,425 @@
+"""Local mirror of the FDA Adverse Event Reporting System (FAERS).
+
+openFDA publishes the complete drug adverse event data as bulk JSON downloads
+(https://open.fda.gov/data/downloads/, drug-event-NNNN-of-NNNN.json.zip). FAERSStore
+loads a directory of those files once into a columnar store under the data lake index
+cache: report dates and seriousness flags, plus report-to-drug and report-to-event
+incidence lists, with drug and MedDRA reaction names as string tables. Drugs are keyed
+by active ingredient: the normalized ingredients of the openFDA generic name where the
+product was harmonized (a combination product counts for each of its ingredients), else
+the normalized reported product name. Product, brand and substance names seen with
+harmonized products are kept as synonyms, so unharmonized reports of a brand name are
+counted for its ingredient and match_drug() finds a drug by any of its names.
+
+On top of the incidence matrices, disproportionality() computes the 2x2 contingency
+tables of all drug-event pairs, or of selected drugs and events, with one sparse
+product, and from them the proportional reporting ratio (PRR), reporting odds ratio
+(ROR) and information component (IC) with their confidence bounds.
+
+Usage:
+    from biomni.datalake import get_faers_store
+
+    faers = get_faers_store("/data/openfda/drug_event")
+    faers.disproportionality(drugs=["atorvastatin"], min_count=3)
+    faers.disproportionality()  # every drug-event pair
+"""
+
+import glob
+import io
+import json
+import os
+import re
+import threading
+import zipfile
+from array import array
+from collections import Counter
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_array,
+    read_json,
+    write_array,
+    write_json,
+)
+from biomni.datalake.drugnames import DrugNameResolver, normalize_drug_name
+from biomni.datalake.tables import default_data_lake_path
+
+try:
+    import numpy as np
+    import pandas as pd
+    from scipy import sparse
+except ImportError:  # optional: the FAERS store needs numpy, pandas and scipy
+    np = None
+    pd = None
+    sparse = None
+
+# Bump when the on-disk layout changes so existing stores are rebuilt
+_FORMAT_VERSION = 2
+
+# Report flags, one bit each
+SERIOUS = 1
+DEATH = 2
+LIFE_THREATENING = 4
+HOSPITALIZATION = 8
+
+_FLAG_FIELDS = {
+    "serious": SERIOUS,
+    "seriousnessdeath": DEATH,
+    "seriousnesslifethreatening": LIFE_THREATENING,
+    "seriousnesshospitalization": HOSPITALIZATION,
+}
+
+
+# Separates the active ingredients in the generic name of a combination product
+_INGREDIENT_SEPARATOR = re.compile(r"\s*,\s*|\s+and\s+|\s*/\s*", re.IGNORECASE)
+
+
+def default_faers_path() -> str:
+    """Directory of the default data lake where the openFDA bulk FAERS downloads are looked for."""
+    return os.path.join(default_data_lake_path(), "faers")
+
+
+def faers_files(path: str) -> list[str]:
+    """The openFDA bulk drug event files (.json or .json.zip) at a path, in name order."""
+    if os.path.isfile(path):
+        return [path]
+    return sorted(glob.glob(os.path.join(path, "*.json.zip")) + glob.glob(os.path.join(path, "*.json")))
+
+
+def _iter_reports(paths: list[str]):
+    for path in paths:
+        if path.endswith(".zip"):
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.namelist():
+                    if member.endswith(".json"):
+                        with archive.open(member) as handle:
+                            yield from json.load(io.TextIOWrapper(handle, encoding="utf-8")).get("results", [])
+        else:
+            with open(path, encoding="utf-8") as handle:
+                yield from json.load(handle).get("results", [])
+
+
+def _report_date(report: dict) -> int:
+    date = str(report.get("receiptdate") or "")[:8]
+    return int(date) if len(date) == 8 and date.isdigit() else 0
+
+
+def _ingredients(generic_name: str | None) -> tuple[str, ...]:
+    """Normalized active ingredients of an openFDA generic name, e.g.
+    "AMLODIPINE BESYLATE AND ATORVASTATIN CALCIUM" -> ("amlodipine besylate", "atorvastatin")."""
+    names = (normalize_drug_name(part) for part in _INGREDIENT_SEPARATOR.split(generic_name or ""))
+    return tuple(sorted({name for name in names if name}))
+
+
+def _build_store(paths: list[str], directory: str) -> None:
+    dates, flags = array("i"), array("B")
+    drug_counts, drug_codes = array("i"), array("i")
+    event_counts, event_codes = array("i"), array("i")
+    # Reported names: active ingredients of harmonized products, else normalized product names
+    names: dict[str, int] = {}
+    ingredients: set[str] = set()
+    # Product, brand, substance and generic names -> how often each ingredient set was given for them
+    synonyms: dict[str, Counter] = {}
+    events: dict[str, int] = {}
+    rows: dict[str, int] = {}
+    superseded = []
+
+    for report in _iter_reports(paths):
+        # Later versions of a report replace earlier ones
+        report_id = report.get("safetyreportid")
+        if report_id is not None:
+            if report_id in rows:
+                superseded.append(rows[report_id])
+            rows[report_id] = len(dates)
+
+        dates.append(_report_date(report))
+        flags.append(sum(bit for field, bit in _FLAG_FIELDS.items() if str(report.get(field)) == "1"))
+        patient = report.get("patient") or {}
+        codes = set()
+        for drug in patient.get("drug") or []:
+            openfda = drug.get("openfda") or {}
+            product = normalize_drug_name(drug.get("medicinalproduct"))
+            generic_names = openfda.get("generic_name")
+            drug_ingredients = _ingredients(generic_names[0]) if generic_names else ()
+            if drug_ingredients:
+                ingredients.update(drug_ingredients)
+                given = [product, *generic_names, *(openfda.get("brand_name") or [])]
+                given += openfda.get("substance_name") or []
+                for alias in {normalize_drug_name(name) for name in given}:
+                    if alias:
+                        synonyms.setdefault(alias, Counter())[drug_ingredients] += 1
+            else:
+                drug_ingredients = (product,) if product else ()
+            codes.update(names.setdefault(name, len(names)) for name in drug_ingredients)
+        reactions = {
+            events.setdefault(reaction["reactionmeddrapt"].strip(), len(events))
+            for reaction in patient.get("reaction") or []
+            if (reaction.get("reactionmeddrapt") or "").strip()
+        }
+        drug_counts.append(len(codes))
+        drug_codes.extend(sorted(codes))
+        event_counts.append(len(reactions))
+        event_codes.extend(sorted(reactions))
+
+    # Drugs are ingredients; unharmonized product names reported elsewhere with their ingredients
+    # (e.g. a brand name) are mapped onto those, and the remaining ones are kept as drugs of their own
+    aliases = {alias: counts.most_common(1)[0][0] for alias, counts in synonyms.items()}
+    targets = [(name,) if name in ingredients else aliases.get(name, (name,)) for name in names]
+    drugs: dict[str, int] = {}
+    name_rows, name_columns = [], []
+    for code, target in enumerate(targets):
+        for name in target:
+            name_rows.append(code)
+            name_columns.append(drugs.setdefault(name, len(drugs)))
+    name_drugs = sparse.csr_matrix(
+        (np.ones(len(name_rows), dtype=np.int32), (name_rows, name_columns)), shape=(len(names), len(drugs))
+    )
+    # Single-ingredient aliases that differ from the drug name resolve queries like "lipitor"
+    drug_synonyms = {alias: target[0] for alias, target in aliases.items() if len(target) == 1 and alias != target[0]}
+
+    keep = np.ones(len(dates), dtype=bool)
+    keep[superseded] = False
+    with building(directory) as scratch:
+        for name, counts, codes in (("drug", drug_counts, drug_codes), ("event", event_counts, event_codes)):
+            counts = np.frombuffer(counts, dtype=np.int32) if counts else np.zeros(0, dtype=np.int32)
+            codes = np.frombuffer(codes, dtype=np.int32) if codes else np.zeros(0, dtype=np.int32)
+            codes = codes[np.repeat(keep, counts)]
+            pointers = np.zeros(int(keep.sum()) + 1, dtype=np.int64)
+            np.cumsum(counts[keep], out=pointers[1:])
+            if name == "drug":
+                reported = sparse.csr_matrix(
+                    (np.ones(len(codes), dtype=np.int32), codes, pointers), shape=(len(pointers) - 1, len(names))
+                )
+                incidence = (reported @ name_drugs).tocsr()
+                incidence.sort_indices()
+                pointers, codes = incidence.indptr.astype(np.int64), incidence.indices.astype(np.int32)
+            write_array(scratch, f"{name}.ptr", "q", pointers)
+            write_array(scratch, f"{name}.idx", "i", codes)
+        write_array(scratch, "report.date", "i", np.frombuffer(dates, dtype=np.int32)[keep] if dates else dates)
+        write_array(scratch, "report.flags", "B", np.frombuffer(flags, dtype=np.uint8)[keep] if flags else flags)
+        StringTable.write(scratch, "drugs", drugs)
+        StringTable.write(scratch, "events", events)
+        StringTable.write(scratch, "synonyms", drug_synonyms)
+        write_array(scratch, "synonym.drug", "i", [drugs[name] for name in drug_synonyms.values()])
+        write_json(
+            scratch,
+            "meta.json",
+            {
+                "version": _FORMAT_VERSION,
+                "sources": paths,
+                "reports": int(keep.sum()),
+                "drugs": len(drugs),
+                "synonyms": len(drug_synonyms),
+                "events": len(events),
+            },
+        )
+
+
+def _parse_date(date: str | int | None, default: int) -> int:
+    """YYYYMMDD integer of a date given as YYYY-MM-DD, YYYYMMDD or YYYY."""
+    if not date:
+        return default
+    digits = str(date).replace("-", "")
+    return int(digits.ljust(8, "0" if default == 0 else "9"))
+
+
+class FAERSStore:
+    """Read-only FAERS reports as report-by-drug and report-by-event incidence matrices."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        drugs, events = StringTable(directory, "drugs"), StringTable(directory, "events")
+        self.drugs = [drugs[i] for i in range(len(drugs))]
+        self.events = [events[i] for i in range(len(events))]
+        self._drug_codes = {drug: code for code, drug in enumerate(self.drugs)}
+        synonyms, synonym_drugs = StringTable(directory, "synonyms"), map_array(directory, "synonym.drug", "i")
+        self.synonyms = {synonyms[i]: self.drugs[synonym_drugs[i]] for i in range(len(synonyms))}
+        self._event_codes = {event: code for code, event in enumerate(self.events)}
+        self.dates = np.asarray(map_array(directory, "report.date", "i"), dtype=np.int32)
+        self.flags = np.asarray(map_array(directory, "report.flags", "B"), dtype=np.uint8)
+        self.report_drugs = self._incidence("drug", len(self.drugs))
+        self.report_events = self._incidence("event", len(self.events))
+        self._resolver = None
+
+    def _incidence(self, name: str, columns: int):
+        pointers = np.asarray(map_array(self.directory, f"{name}.ptr", "q"), dtype=np.int64)
+        codes = np.asarray(map_array(self.directory, f"{name}.idx", "i"), dtype=np.int32)
+        return sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.int64), codes, pointers), shape=(len(self.dates), columns)
+        )
+
+    @classmethod
+    def open(cls, paths: list[str]) -> "FAERSStore":
+        """Open the store for bulk FAERS files, building it first if they are new or have changed."""
+        directory = index_directory("faers", paths, _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_store(paths, directory)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def match_drug(self, drug_name: str, cutoff: float = 0.9) -> str | None:
+        """The store's name for a drug (its active ingredient), found by normalized name, by product,
+        brand or substance name (e.g. "Lipitor" -> "atorvastatin"), or else by the closest fuzzy
+        match among all of those (None if none)."""
+        name = normalize_drug_name(drug_name)
+        if name in self._drug_codes:
+            return name
+        if name in self.synonyms:
+            return self.synonyms[name]
+        if self._resolver is None:
+            self._resolver = DrugNameResolver(self.drugs, self.synonyms)
+        match = self._resolver.resolve(name, cutoff)
+        return match.name if match else None
+
+    def report_rows(
+        self,
+        drug: str | None = None,
+        date_range: tuple[str, str] | None = None,
+        flags: int = 0,
+        without: int = 0,
+    ):
+        """Row indices of the reports mentioning a drug, received in a date range, with all
+        of the `flags` bits set and none of the `without` bits (e.g. flags=SERIOUS)."""
+        if drug is None:
+            mask = np.ones(len(self.dates), dtype=bool)
+        else:
+            mask = np.zeros(len(self.dates), dtype=bool)
+            if drug in self._drug_codes:
+                mask[self.report_drugs[:, self._drug_codes[drug]].nonzero()[0]] = True
+        if date_range:
+            start, end = _parse_date(date_range[0], 0), _parse_date(date_range[1], 99999999)
+            mask &= (self.dates >= start) & (self.dates <= end)
+        if flags:
+            mask &= (self.flags & flags) == flags
+        if without:
+            mask &= (self.flags & without) == 0
+        return np.flatnonzero(mask)
+
+    def summary(self, rows, top_k: int = 10) -> dict:
+        """Report counts by outcome and the most frequent reactions among reports."""
+        flags = self.flags[rows]
+        counts = np.asarray(self.report_events[rows].sum(axis=0)).ravel()
+        top = np.argsort(-counts, kind="stable")[:top_k]
+        return {
+            "total_reports": len(rows),
+            "serious_reports": int(np.count_nonzero(flags & SERIOUS)),
+            "death_reports": int(np.count_nonzero(flags & DEATH)),
+            "life_threatening_reports": int(np.count_nonzero(flags & LIFE_THREATENING)),
+            "hospitalization_reports": int(np.count_nonzero(flags & HOSPITALIZATION)),
+            "top_reactions": [(self.events[event], int(counts[event])) for event in top if counts[event] > 0],
+        }
+
+    def disproportionality(
+        self,
+        drugs: list[str] | None = None,
+        events: list[str] | None = None,
+        date_range: tuple[str, str] | None = None,
+        min_count: int = 1,
+    ):
+        """Disproportionality statistics of drug-event pairs.
+
+        For each pair reported together at least min_count times, the 2x2 table counts
+        reports with the drug and the event (a), the drug without the event (b), the event
+        without the drug (c) and neither (d), over all reports in the date range. PRR and
+        ROR of tables with an empty cell use the Haldane-Anscombe correction.
+
+        Args:
+            drugs: Store drug names (see match_drug); all drugs by default
+            events: MedDRA reaction terms; all events by default
+            date_range: Optional (start, end) receipt dates as YYYY-MM-DD
+            min_count: Minimum number of reports of a pair (a)
+
+        Returns:
+            DataFrame with drug, event, a, b, c, d, prr with its 95% bounds (prr_lower,
+            prr_upper), chi2 (Yates-corrected), ror with its 95% bounds, ic and ic025
+            (lower 95% bound of the shrunk information component)
+        """
+        report_drugs, report_events = self.report_drugs, self.report_events
+        if date_range:
+            rows = self.report_rows(date_range=date_range)
+            report_drugs, report_events = report_drugs[rows], report_events[rows]
+        drug_codes = np.arange(len(self.drugs)) if drugs is None else self._codes(self._drug_codes, drugs)
+        event_codes = np.arange(len(self.events)) if events is None else self._codes(self._event_codes, events)
+        total = report_drugs.shape[0]
+        drug_reports = np.asarray(report_drugs.sum(axis=0)).ravel()[drug_codes]
+        event_reports = np.asarray(report_events.sum(axis=0)).ravel()[event_codes]
+        if drugs is not None:
+            report_drugs = report_drugs[:, drug_codes]
+        if events is not None:
+            report_events = report_events[:, event_codes]
+
+        pairs = (report_drugs.T.tocsr() @ report_events).tocoo()
+        keep = pairs.data >= min_count
+        drug_index, event_index = pairs.row[keep], pairs.col[keep]
+        a = pairs.data[keep].astype(np.float64)
+        b = drug_reports[drug_index] - a
+        c = event_reports[event_index] - a
+        d = total - a - b - c
+
+        # Ratios use the Haldane-Anscombe correction (0.5 added to every cell) where a cell is empty
+        correction = np.where((b == 0) | (c == 0) | (d == 0), 0.5, 0.0)
+        ca, cb, cc, cd = a + correction, b + correction, c + correction, d + correction
+        prr = (ca / (ca + cb)) / (cc / (cc + cd))
+        prr_se = np.sqrt(1 / ca - 1 / (ca + cb) + 1 / cc - 1 / (cc + cd))
+        ror = (ca * cd) / (cb * cc)
+        ror_se = np.sqrt(1 / ca + 1 / cb + 1 / cc + 1 / cd)
+        prr_bounds = np.exp(np.log(prr) + np.multiply.outer([-1.96, 1.96], prr_se))
+        ror_bounds = np.exp(np.log(ror) + np.multiply.outer([-1.96, 1.96], ror_se))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            chi2 = total * (np.abs(a * d - b * c) - total / 2) ** 2 / ((a + b) * (c + d) * (a + c) * (b + d))
+        expected = (a + b) * (a + c) / total
+        ic = np.log2((a + 0.5) / (expected + 0.5))
+        ic025 = ic - 3.3 * (a + 0.5) ** -0.5 - 2 * (a + 0.5) ** -1.5
+
+        drug_names = np.asarray(self.drugs, dtype=object)[drug_codes[drug_index]]
+        event_names = np.asarray(self.events, dtype=object)[event_codes[event_index]]
+        return pd.DataFrame(
+            {
+                "drug": drug_names,
+                "event": event_names,
+                "a": a.astype(np.int64),
+                "b": b.astype(np.int64),
+                "c": c.astype(np.int64),
+                "d": d.astype(np.int64),
+                "prr": prr,
+                "prr_lower": prr_bounds[0],
+                "prr_upper": prr_bounds[1],
+                "chi2": chi2,
+                "ror": ror,
+                "ror_lower": ror_bounds[0],
+                "ror_upper": ror_bounds[1],
+                "ic": ic,
+                "ic025": ic025,
+            }
+        )
+
+    @staticmethod
+    def _codes(codes: dict[str, int], names: list[str]):
+        return np.array([codes[name] for name in dict.fromkeys(names) if name in codes], dtype=np.int64)
+
+
+_stores: dict[tuple[str, ...], FAERSStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_faers_store(path: str | None = None) -> FAERSStore:
+    """Return the process-wide FAERS store for a directory (or file) of openFDA bulk
+    drug event downloads, building it on first use; by default <data lake>/faers."""
+    if np is None or pd is None or sparse is None:
+        raise ImportError("The FAERS store requires numpy, pandas and scipy: pip install numpy pandas scipy")
+    paths = tuple(faers_files(path or default_faers_path()))
+    if not paths:
+        raise FileNotFoundError(f"No openFDA bulk drug event files found in {path or default_faers_path()}")
+    directory = index_directory("faers", paths, _FORMAT_VERSION)
+    store = _stores.get(paths)
+    if store is None or store.directory != directory:
+        with _stores_lock:
+            store = _stores.get(paths)
+            if store is None or store.directory != directory:
+                store = _stores[paths] = FAERSStore.open(list(paths))
+    return store
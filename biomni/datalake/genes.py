@@ -0,0 +1,403 @@
+"""Gene-keyed inverted index across data lake tables.
+
+"Everything about gene X" used to mean scanning dozens of tables one by one. The
+GeneIndex records, for every tabular data lake file, which rows mention each gene
+symbol, Entrez ID or Ensembl ID in the file's gene columns, so a lookup reads only
+the Parquet row groups that contain matches. Gene-by-column matrices (DepMap) are
+indexed by column instead and return the gene's column for every row.
+
+Each table has its own index directory keyed by the file's path, size and mtime,
+so when a file changes only that table is re-indexed. Text tables are indexed and
+read through their Parquet conversion (see biomni.datalake.convert).
+
+Usage:
+    from biomni.datalake import find_gene_rows
+
+    hits = find_gene_rows(["TP53", "MDM2"], data_lake_path)
+    hits["DisGeNET.parquet"]  # pyarrow.Table of the matching rows
+"""
+
+import bisect
+import os
+import re
+import threading
+from collections.abc import Iterable
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_array,
+    read_json,
+    write_array,
+    write_json,
+)
+from biomni.datalake.convert import convert_table, is_text_table
+from biomni.datalake.tables import default_data_lake_path
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional: the gene index needs pyarrow and numpy
+    np = None
+    pa = None
+    pc = None
+    pq = None
+
+# Bump when the on-disk layout or the column detection changes so tables are re-indexed
+_FORMAT_VERSION = 1
+
+# Column names that may hold gene identifiers; candidates are then checked against their values
+_GENE_COLUMN_PATTERN = re.compile(r"gene|symbol|entrez|ensembl|hgnc|^target$|target.gene", re.IGNORECASE)
+
+# Integer columns are only indexed when their name says they hold Entrez IDs
+_ENTREZ_COLUMN_PATTERN = re.compile(r"entrez|ncbi|gene.?id", re.IGNORECASE)
+
+# Gene columns of tables whose values cannot be recognized by sampling (mixed node types)
+_GENE_COLUMNS = {
+    "kg.csv": ["x_name", "y_name"],
+}
+
+# A sampled value looks like a gene identifier: a symbol, Entrez ID or Ensembl ID without spaces
+_IDENTIFIER_PATTERN = r"^[A-Z0-9][A-Z0-9\-\.\_@/]{0,24}$"
+
+# Share of sampled values that must look like identifiers for a column to be indexed
+_MIN_IDENTIFIER_SHARE = 0.8
+
+# Wide matrices name their gene columns "SYMBOL (ENTREZ)", e.g. "TP53 (7157)"
+_MATRIX_COLUMN_PATTERN = re.compile(r"^([A-Za-z0-9\-\.\_@/]+) \((\d+)\)$")
+_MATRIX_MIN_COLUMNS = 500
+
+_TABLE_EXTENSIONS = (".parquet", ".csv", ".tsv", ".txt", ".csv.gz", ".tsv.gz", ".txt.gz")
+
+
+def _normalize(values):
+    """Uppercase string identifiers and drop Ensembl version suffixes (ENSG00000141510.17)."""
+    values = pc.utf8_upper(pc.utf8_trim_whitespace(values))
+    return pc.replace_substring_regex(values, r"^(ENS[A-Z]*[GTP]\d+)\.\d+$", r"\1")
+
+
+def normalize_gene_key(gene: str | int) -> str:
+    """Normalize a gene symbol, Entrez ID or Ensembl ID the way index keys are normalized."""
+    key = str(gene).strip().upper()
+    return re.sub(r"^(ENS[A-Z]*[GTP]\d+)\.\d+$", r"\1", key)
+
+
+def _key_values(column):
+    """String keys for a column, or None if it cannot hold gene identifiers."""
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+    if pa.types.is_integer(column.type):
+        return column.cast(pa.string())
+    if pa.types.is_floating(column.type):
+        # Entrez IDs read from text with missing values become floats
+        return pc.cast(column, pa.int64(), safe=False).cast(pa.string())
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return _normalize(column)
+    return None
+
+
+def _gene_columns(name: str, parquet_file) -> list[str]:
+    schema = parquet_file.schema_arrow
+    if name in _GENE_COLUMNS:
+        return [column for column in _GENE_COLUMNS[name] if column in schema.names]
+
+    candidates = []
+    for field in schema:
+        if not _GENE_COLUMN_PATTERN.search(field.name):
+            continue
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            if _ENTREZ_COLUMN_PATTERN.search(field.name):
+                candidates.append(field.name)
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            candidates.append(field.name)
+        elif pa.types.is_dictionary(field.type) and pa.types.is_string(field.type.value_type):
+            candidates.append(field.name)
+    if not candidates or parquet_file.metadata.num_row_groups == 0:
+        return candidates
+
+    # Keep string columns whose sampled values look like identifiers, not free text or names
+    sample = parquet_file.read_row_group(0, columns=candidates).slice(0, 2000)
+    columns = []
+    for column in candidates:
+        values = _key_values(sample.column(column))
+        if values is None:
+            continue
+        values = values.drop_null()
+        if pa.types.is_string(sample.schema.field(column).type) and len(values):
+            share = pc.sum(pc.match_substring_regex(values, _IDENTIFIER_PATTERN)).as_py() / len(values)
+            if share < _MIN_IDENTIFIER_SHARE:
+                continue
+        columns.append(column)
+    return columns
+
+
+def _matrix_columns(schema) -> dict[str, str] | None:
+    """Map from gene key to column name for gene-by-column matrices, None for other tables."""
+    if len(schema.names) < _MATRIX_MIN_COLUMNS:
+        return None
+    mapping = {}
+    for column in schema.names:
+        match = _MATRIX_COLUMN_PATTERN.match(column)
+        if match:
+            mapping[normalize_gene_key(match.group(1))] = column
+            mapping[match.group(2)] = column
+    # Two keys per gene column: at least half of the columns must be genes
+    return mapping if len(mapping) >= len(schema.names) else None
+
+
+def _build_table_index(name: str, source: str, directory: str) -> None:
+    parquet_file = pq.ParquetFile(source)
+    metadata = parquet_file.metadata
+    row_group_offsets = [0]
+    for i in range(metadata.num_row_groups):
+        row_group_offsets.append(row_group_offsets[-1] + metadata.row_group(i).num_rows)
+    meta = {
+        "version": _FORMAT_VERSION,
+        "table": name,
+        "source": source,
+        "row_group_offsets": row_group_offsets,
+        "columns": [],
+        "matrix": None,
+    }
+
+    matrix = _matrix_columns(parquet_file.schema_arrow)
+    key_ids: dict[str, int] = {}
+    key_chunks = []
+    row_chunks = []
+    if matrix is not None:
+        meta["matrix"] = {"id_column": parquet_file.schema_arrow.names[0], "columns": matrix}
+    else:
+        meta["columns"] = columns = _gene_columns(name, parquet_file)
+        for group in range(metadata.num_row_groups if columns else 0):
+            table = parquet_file.read_row_group(group, columns=columns)
+            for column in columns:
+                values = _key_values(table.column(column))
+                if values is None:
+                    continue
+                if isinstance(values, pa.ChunkedArray):
+                    values = values.combine_chunks()
+                encoded = pc.dictionary_encode(values)
+                valid = np.flatnonzero(encoded.is_valid().to_numpy(zero_copy_only=False))
+                if not len(valid):
+                    continue
+                # Map this chunk's distinct values to global key ids
+                local_to_global = np.fromiter(
+                    (key_ids.setdefault(key, len(key_ids)) for key in encoded.dictionary.to_pylist()),
+                    dtype=np.int64,
+                    count=len(encoded.dictionary),
+                )
+                indices = encoded.indices.to_numpy(zero_copy_only=False)[valid]
+                key_chunks.append(local_to_global[indices])
+                row_chunks.append(valid.astype(np.int64) + row_group_offsets[group])
+
+    keys = sorted(key for key in key_ids if key)
+    order = np.full(len(key_ids), -1, dtype=np.int64)
+    for position, key in enumerate(keys):
+        order[key_ids[key]] = position
+    if key_chunks:
+        key_positions = order[np.concatenate(key_chunks)]
+        rows = np.concatenate(row_chunks)
+        keep = key_positions >= 0
+        # One posting per (key, row), even if several gene columns of the row hold the key;
+        # sorting the combined value orders postings by key, then row
+        width = row_group_offsets[-1] + 1
+        combined = np.sort(key_positions[keep] * width + rows[keep])
+        combined = combined[np.concatenate(([True], combined[1:] != combined[:-1]))]
+        posting_keys, posting_rows = np.divmod(combined, width)
+    else:
+        posting_keys = posting_rows = np.empty(0, dtype=np.int64)
+    pointers = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(posting_keys, minlength=len(keys)), out=pointers[1:])
+
+    with building(directory) as scratch:
+        StringTable.write(scratch, "keys", keys)
+        write_array(scratch, "postings.ptr", "q", pointers)
+        write_array(scratch, "postings.rows", "q", posting_rows.astype(np.int64))
+        write_json(scratch, "meta.json", meta)
+
+
+class _TableIndex:
+    def __init__(self, directory: str):
+        self.meta = read_json(directory, "meta.json")
+        self.name = self.meta["table"]
+        self._keys = StringTable(directory, "keys")
+        self._pointers = map_array(directory, "postings.ptr", "q")
+        self._rows = map_array(directory, "postings.rows", "q")
+        self._parquet_file = None
+
+    def rows(self, keys: Iterable[str]):
+        """Sorted row numbers mentioning any of the normalized keys."""
+        chunks = []
+        for key in keys:
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                start, end = self._pointers[position], self._pointers[position + 1]
+                chunks.append(np.frombuffer(self._rows[start:end], dtype=np.int64))
+        if not chunks:
+            return np.empty(0, dtype=np.int64)
+        rows = np.sort(np.concatenate(chunks))
+        return rows[np.concatenate(([True], rows[1:] != rows[:-1]))]
+
+    def read(self, keys: list[str], columns: list[str] | None):
+        if self._parquet_file is None:
+            self._parquet_file = pq.ParquetFile(self.meta["source"])
+        matrix = self.meta["matrix"]
+        if matrix is not None:
+            gene_columns = list(dict.fromkeys(matrix["columns"][key] for key in keys if key in matrix["columns"]))
+            if not gene_columns:
+                return None
+            return self._parquet_file.read(columns=[matrix["id_column"], *gene_columns])
+
+        rows = self.rows(keys)
+        if not len(rows):
+            return None
+        offsets = np.asarray(self.meta["row_group_offsets"], dtype=np.int64)
+        groups = np.searchsorted(offsets, rows, side="right") - 1
+        parts = []
+        for group in np.unique(groups):
+            local = rows[groups == group] - offsets[group]
+            parts.append(self._parquet_file.read_row_group(int(group), columns=columns).take(pa.array(local)))
+        return pa.concat_tables(parts)
+
+
+class GeneIndex:
+    """Inverted index from gene identifiers to rows of the data lake's tabular files.
+
+    Args:
+        data_lake_path: Data lake directory. Defaults to the one under default_config.path.
+        tables: File names to index. Defaults to every .parquet, .csv, .tsv and .txt file
+            (optionally gzipped) in the data lake.
+    """
+
+    def __init__(self, data_lake_path: str | None = None, tables: list[str] | None = None):
+        if pq is None or np is None:
+            raise ImportError("The gene index requires pyarrow and numpy: pip install pyarrow numpy")
+        self.data_lake_path = data_lake_path or default_data_lake_path()
+        self._table_names = tables
+        self._tables: dict[str, _TableIndex] = {}
+        self._directories: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _table_files(self) -> list[str]:
+        if self._table_names is not None:
+            return [name for name in self._table_names if os.path.isfile(os.path.join(self.data_lake_path, name))]
+        return sorted(
+            name
+            for name in os.listdir(self.data_lake_path)
+            if name.lower().endswith(_TABLE_EXTENSIONS) and os.path.isfile(os.path.join(self.data_lake_path, name))
+        )
+
+    def refresh(self) -> list[str]:
+        """Index new and changed tables and drop removed ones. Returns the names of the tables indexed now."""
+        with self._lock:
+            indexed = []
+            names = self._table_files()
+            for name in names:
+                path = os.path.join(self.data_lake_path, name)
+                directory = index_directory("genes", [path], _FORMAT_VERSION)
+                if self._directories.get(name) == directory:
+                    continue
+                if not os.path.exists(os.path.join(directory, "meta.json")):
+                    source = convert_table(path) if is_text_table(path) else path
+                    if source is None:
+                        continue
+                    try:
+                        _build_table_index(name, source, directory)
+                    except (pa.ArrowException, OSError):
+                        # Not a readable table (e.g. free text with a .txt extension)
+                        continue
+                    indexed.append(name)
+                self._tables[name] = _TableIndex(directory)
+                self._directories[name] = directory
+
+            for name in set(self._tables) - set(names):
+                del self._tables[name]
+                del self._directories[name]
+            return indexed
+
+    def tables(self) -> dict[str, list[str]]:
+        """Indexed tables and the gene columns of each ("*" for gene-by-column matrices)."""
+        self.refresh()
+        return {
+            name: table.meta["columns"] if table.meta["matrix"] is None else ["*"]
+            for name, table in sorted(self._tables.items())
+        }
+
+    def count(self, genes: str | Iterable[str]) -> dict[str, int]:
+        """Number of matching rows per table (matching columns for matrices), without reading the tables."""
+        keys = [normalize_gene_key(gene) for gene in ([genes] if isinstance(genes, str) else genes)]
+        self.refresh()
+        counts = {}
+        for name, table in self._tables.items():
+            matrix = table.meta["matrix"]
+            if matrix is not None:
+                count = len({matrix["columns"][key] for key in keys if key in matrix["columns"]})
+            else:
+                count = len(table.rows(keys))
+            if count:
+                counts[name] = count
+        return counts
+
+    def lookup(
+        self,
+        genes: str | Iterable[str],
+        tables: list[str] | None = None,
+        columns: dict[str, list[str]] | None = None,
+        as_pandas: bool = False,
+    ) -> dict:
+        """Rows of every indexed table that mention any of the given genes.
+
+        Args:
+            genes: Gene symbol, Entrez ID or Ensembl ID, or a list of them. Matching is
+                case-insensitive and ignores Ensembl version suffixes. IDs are matched as
+                given; a symbol does not match rows that only carry its Entrez ID.
+            tables: Restrict the lookup to these file names
+            columns: Optional columns to return per table, e.g. {"omim.parquet": ["gene", "phenotype"]}
+            as_pandas: Return pandas DataFrames instead of pyarrow Tables
+
+        Returns:
+            Map from file name to the matching rows, for tables with at least one match.
+            For gene-by-column matrices the rows are all of the matrix's rows, restricted
+            to its ID column and the genes' columns.
+        """
+        keys = list(dict.fromkeys(normalize_gene_key(gene) for gene in ([genes] if isinstance(genes, str) else genes)))
+        self.refresh()
+        results = {}
+        for name, table in sorted(self._tables.items()):
+            if tables is not None and name not in tables:
+                continue
+            rows = table.read(keys, (columns or {}).get(name))
+            if rows is not None:
+                results[name] = rows.to_pandas() if as_pandas else rows
+        return results
+
+
+_indexes: dict[str, GeneIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_gene_index(data_lake_path: str | None = None) -> GeneIndex:
+    """Return the process-wide gene index for a data lake directory."""
+    data_lake_path = os.path.realpath(data_lake_path or default_data_lake_path())
+    with _indexes_lock:
+        index = _indexes.get(data_lake_path)
+        if index is None:
+            index = _indexes[data_lake_path] = GeneIndex(data_lake_path)
+    return index
+
+
+def find_gene_rows(
+    genes: str | list[str],
+    data_lake_path: str | None = None,
+    tables: list[str] | None = None,
+    as_pandas: bool = False,
+) -> dict:
+    """Collect the rows about one or more genes from every tabular data lake file.
+
+    The first call builds the index (this scans each table's gene columns once); later
+    calls read only the row groups that contain matches. See GeneIndex.lookup.
+    """
+    return get_gene_index(data_lake_path).lookup(genes, tables=tables, as_pandas=as_pandas)
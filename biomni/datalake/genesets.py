@@ -0,0 +1,404 @@
+"""Offline over-representation analysis against the data lake's gene set libraries.
+
+The data lake ships MSigDB (msigdb_human_*_geneset.parquet) and MouseMine
+(mousemine_*_geneset.parquet) gene set collections. Each library is indexed once
+into a sparse set-by-gene membership matrix (CSR arrays under the data lake index
+cache, memory-mapped on later loads). Enrichment of any number of query gene lists
+is then one sparse matrix product for the overlaps plus vectorized hypergeometric
+tail probabilities, with Benjamini-Hochberg FDR per query and library, so batch
+enrichment runs locally in seconds instead of one web request per list.
+
+Usage:
+    from biomni.datalake import enrich_gene_sets
+
+    df = enrich_gene_sets({"up": up_genes, "down": down_genes}, libraries=["hallmark", "c2_curated"])
+"""
+
+import os
+import re
+import threading
+from collections.abc import Iterable
+
+import pandas as pd
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_file,
+    read_json,
+    write_array,
+    write_json,
+)
+from biomni.datalake.tables import default_data_lake_path
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    from scipy import sparse, stats
+except ImportError:  # optional: enrichment needs pyarrow, numpy and scipy
+    np = None
+    pa = None
+    pc = None
+    pq = None
+    sparse = None
+    stats = None
+
+# Bump when the on-disk layout or the column detection changes so libraries are re-indexed
+_FORMAT_VERSION = 1
+
+_LIBRARY_PATTERN = re.compile(r"^(msigdb_human_|mousemine_).+\.parquet$")
+_SPECIES_PREFIXES = {"human": "msigdb_human_", "mouse": "mousemine_"}
+
+# Column names holding the gene set name and its member genes
+_SET_COLUMN_PATTERN = re.compile(r"standard_name|gene_?set|set_?name|^name$|^term$|pathway", re.IGNORECASE)
+_GENE_COLUMN_PATTERN = re.compile(r"gene|symbol|member", re.IGNORECASE)
+
+# Genes in one string value are separated by commas, semicolons or whitespace
+_GENE_SEPARATORS = r"[,;\s]+"
+
+
+def _is_string(data_type) -> bool:
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def _is_string_list(data_type) -> bool:
+    return (pa.types.is_list(data_type) or pa.types.is_large_list(data_type)) and _is_string(data_type.value_type)
+
+
+def _detect_columns(schema) -> tuple[str, str]:
+    """Pick the (set name column, gene column) of a gene set table."""
+    set_columns = [field.name for field in schema if _is_string(field.type)]
+    gene_columns = [field.name for field in schema if _is_string_list(field.type)]
+    gene_columns += [
+        name for name in set_columns if _GENE_COLUMN_PATTERN.search(name) and not _SET_COLUMN_PATTERN.search(name)
+    ]
+    gene_columns.sort(key=lambda name: not _GENE_COLUMN_PATTERN.search(name))
+    named_sets = [name for name in set_columns if _SET_COLUMN_PATTERN.search(name) and name not in gene_columns]
+    set_columns = named_sets or [name for name in set_columns if name not in gene_columns]
+    if not set_columns or not gene_columns:
+        raise ValueError(f"Cannot find gene set name and gene columns in {schema.names}")
+    return set_columns[0], gene_columns[0]
+
+
+def _build_library(path: str, directory: str) -> None:
+    schema = pq.read_schema(path)
+    set_column, gene_column = _detect_columns(schema)
+    table = pq.read_table(path, columns=[set_column, gene_column])
+    set_names = table.column(set_column).combine_chunks()
+    genes = table.column(gene_column).combine_chunks()
+
+    if not _is_string_list(genes.type):
+        # One gene per row (long format) or a delimited list of genes per row
+        genes = pc.split_pattern_regex(pc.utf8_trim_whitespace(genes), _GENE_SEPARATORS)
+    rows = pc.list_parent_indices(genes).to_numpy(zero_copy_only=False)
+    members = pc.utf8_upper(pc.utf8_trim_whitespace(pc.list_flatten(genes)))
+    valid = pc.and_(pc.is_valid(members), pc.not_equal(members, "")).to_numpy(zero_copy_only=False)
+    valid &= set_names.is_valid().to_numpy(zero_copy_only=False)[rows]
+    rows = rows[valid]
+    members = members.filter(pa.array(valid))
+
+    # Sets are numbered by sorted name, genes by sorted symbol; a set listed on several rows is merged
+    set_encoded = pc.dictionary_encode(set_names)
+    set_dictionary = set_encoded.dictionary.to_pylist()
+    set_order = np.argsort(np.array(set_dictionary, dtype=object)).astype(np.int64)
+    set_rank = np.empty(len(set_dictionary), dtype=np.int64)
+    set_rank[set_order] = np.arange(len(set_dictionary))
+    set_ids = set_rank[set_encoded.indices.to_numpy(zero_copy_only=False)[rows]]
+
+    gene_encoded = pc.dictionary_encode(members)
+    gene_dictionary = gene_encoded.dictionary.to_pylist()
+    gene_order = np.argsort(np.array(gene_dictionary, dtype=object)).astype(np.int64)
+    gene_rank = np.empty(len(gene_dictionary), dtype=np.int64)
+    gene_rank[gene_order] = np.arange(len(gene_dictionary))
+    gene_ids = gene_rank[gene_encoded.indices.to_numpy(zero_copy_only=False)]
+
+    width = max(len(gene_dictionary), 1)
+    combined = np.unique(set_ids * width + gene_ids)
+    set_ids, gene_ids = np.divmod(combined, width)
+    pointers = np.zeros(len(set_dictionary) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(set_ids, minlength=len(set_dictionary)), out=pointers[1:])
+
+    with building(directory) as scratch:
+        StringTable.write(scratch, "sets", (set_dictionary[i] for i in set_order))
+        StringTable.write(scratch, "genes", (gene_dictionary[i] for i in gene_order))
+        write_array(scratch, "members.ptr", "i", pointers)
+        write_array(scratch, "members.idx", "i", gene_ids.astype(np.int32))
+        write_json(
+            scratch,
+            "meta.json",
+            {
+                "version": _FORMAT_VERSION,
+                "library": os.path.basename(path).removesuffix(".parquet"),
+                "source": path,
+                "set_column": set_column,
+                "gene_column": gene_column,
+                "sets": len(set_dictionary),
+                "genes": len(gene_dictionary),
+            },
+        )
+
+
+def _benjamini_hochberg(p_values, groups, tests: int):
+    """BH-adjusted p-values within each group, where each group ran `tests` tests.
+
+    Only the given p-values are stored; the group's remaining tests are taken to have p = 1.
+    """
+    if not len(p_values):
+        return p_values
+    order = np.lexsort((p_values, groups))
+    grouped = groups[order]
+    starts = np.flatnonzero(np.concatenate(([True], grouped[1:] != grouped[:-1])))
+    ends = np.append(starts[1:], len(order))
+    ranks = np.arange(len(order)) - np.repeat(starts, ends - starts) + 1
+    adjusted = p_values[order] * tests / ranks
+    for start, end in zip(starts, ends, strict=True):
+        adjusted[start:end] = np.minimum.accumulate(adjusted[start:end][::-1])[::-1]
+    result = np.empty_like(adjusted)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+class GeneSetLibrary:
+    """One gene set library held as a sparse set-by-gene membership matrix.
+
+    Gene symbols are matched case-insensitively (stored upper-cased).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        self.name = self.meta["library"]
+        self._sets = StringTable(directory, "sets")
+        self._genes = StringTable(directory, "genes")
+        pointers = np.frombuffer(map_file(directory, "members.ptr"), dtype=np.int32)
+        indices = np.frombuffer(map_file(directory, "members.idx"), dtype=np.int32)
+        self._membership = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, pointers), shape=(len(self._sets), len(self._genes))
+        )
+        self.set_sizes = np.diff(pointers)
+        self._gene_ids = None
+        self._set_names = None
+
+    @classmethod
+    def open(cls, path: str) -> "GeneSetLibrary":
+        """Open the library for a gene set parquet file, indexing it first if it is new or has changed."""
+        directory = index_directory("genesets", [path], _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_library(path, directory)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def gene_ids(self, genes: Iterable[str]):
+        """Sorted IDs of the library genes among the given symbols."""
+        if self._gene_ids is None:
+            self._gene_ids = {self._genes[i]: i for i in range(len(self._genes))}
+        ids = {self._gene_ids.get(str(gene).strip().upper()) for gene in genes}
+        ids.discard(None)
+        return np.array(sorted(ids), dtype=np.int64)
+
+    def set_names(self) -> list[str]:
+        if self._set_names is None:
+            self._set_names = [self._sets[i] for i in range(len(self._sets))]
+        return self._set_names
+
+    def genes(self, gene_set: int) -> list[str]:
+        start, end = self._membership.indptr[gene_set], self._membership.indptr[gene_set + 1]
+        return [self._genes[i] for i in self._membership.indices[start:end]]
+
+    def enrich(
+        self,
+        queries: dict[str, list[str]],
+        background: Iterable[str] | None = None,
+        min_size: int = 5,
+        max_size: int = 2000,
+    ) -> pd.DataFrame:
+        """Hypergeometric over-representation of every set for every query list.
+
+        Args:
+            queries: Map from query name to gene symbols
+            background: Gene universe. Defaults to all genes of the library. Query and set
+                genes outside the background are ignored.
+            min_size: Skip sets with fewer background genes than this
+            max_size: Skip sets with more background genes than this
+
+        Returns:
+            One row per (query, set) with at least one overlapping gene: overlap, set_size,
+            query_size, background_size, fold_enrichment, p_value and adj_p_value (BH over
+            all tested sets of the library, per query). Set indices are in column "set_id".
+        """
+        if background is None:
+            in_background = np.ones(len(self._genes), dtype=bool)
+            background_size = len(self._genes)
+            universe = None
+        else:
+            universe = {str(gene).strip().upper() for gene in background}
+            in_background = np.zeros(len(self._genes), dtype=bool)
+            in_background[self.gene_ids(universe)] = True
+            background_size = len(universe)
+        set_sizes = np.asarray(self._membership @ in_background.astype(np.int32)).ravel()
+        tested = (set_sizes >= min_size) & (set_sizes <= max_size)
+        tests = int(tested.sum())
+
+        names = list(queries)
+        query_rows, query_genes, query_sizes = [], [], []
+        for row, name in enumerate(names):
+            symbols = {str(gene).strip().upper() for gene in queries[name]}
+            if universe is not None:
+                symbols &= universe
+            ids = self.gene_ids(symbols)
+            ids = ids[in_background[ids]]
+            query_rows.append(np.full(len(ids), row))
+            query_genes.append(ids)
+            # Query genes in a custom background count even when no set of this library has them
+            query_sizes.append(len(symbols) if universe is not None else len(ids))
+        query_matrix = sparse.csr_matrix(
+            (
+                np.ones(sum(len(ids) for ids in query_genes), dtype=np.int32),
+                (np.concatenate(query_rows or [[]]).astype(np.int64), np.concatenate(query_genes or [[]])),
+            ),
+            shape=(len(names), len(self._genes)),
+        )
+        query_sizes = np.array(query_sizes, dtype=np.int64)
+
+        overlaps = (self._membership @ query_matrix.T).tocoo()
+        keep = tested[overlaps.row]
+        set_ids, query_ids, overlap = overlaps.row[keep], overlaps.col[keep], overlaps.data[keep].astype(np.int64)
+        sizes, totals = set_sizes[set_ids], query_sizes[query_ids]
+        # Many (overlap, set size, query size) triples repeat; evaluate each distinct one once
+        triples, inverse = np.unique(
+            (overlap * (sizes.max(initial=0) + 1) + sizes) * (totals.max(initial=0) + 1) + totals,
+            return_inverse=True,
+        )
+        distinct_sizes, distinct_totals = np.divmod(triples, totals.max(initial=0) + 1)
+        distinct_overlap, distinct_sizes = np.divmod(distinct_sizes, sizes.max(initial=0) + 1)
+        p_values = stats.hypergeom.sf(distinct_overlap - 1, background_size, distinct_sizes, distinct_totals)[inverse]
+        adjusted = _benjamini_hochberg(p_values, query_ids, tests)
+
+        return pd.DataFrame(
+            {
+                "query": pd.Categorical.from_codes(query_ids, categories=names),
+                "library": self.name,
+                "set_id": set_ids,
+                "gene_set": pd.Categorical.from_codes(set_ids, categories=self.set_names()),
+                "overlap": overlap,
+                "set_size": sizes,
+                "query_size": totals,
+                "background_size": background_size,
+                "fold_enrichment": overlap * background_size / np.maximum(sizes * totals, 1),
+                "p_value": p_values,
+                "adj_p_value": adjusted,
+            }
+        )
+
+
+_libraries: dict[str, GeneSetLibrary] = {}
+_libraries_lock = threading.Lock()
+
+
+def get_gene_set_library(path: str) -> GeneSetLibrary:
+    """Return the process-wide library for a gene set parquet file, indexing it on first use."""
+    if np is None or sparse is None:
+        raise ImportError("Gene set enrichment requires pyarrow, numpy and scipy: pip install pyarrow numpy scipy")
+    directory = index_directory("genesets", [path], _FORMAT_VERSION)
+    library = _libraries.get(path)
+    if library is None or library.directory != directory:
+        with _libraries_lock:
+            library = _libraries.get(path)
+            if library is None or library.directory != directory:
+                library = _libraries[path] = GeneSetLibrary.open(path)
+    return library
+
+
+def list_gene_set_libraries(data_lake_path: str | None = None, species: str | None = None) -> list[str]:
+    """Names of the gene set libraries in the data lake (file names without .parquet)."""
+    data_lake_path = data_lake_path or default_data_lake_path()
+    prefix = _SPECIES_PREFIXES.get(species, "") if species else ""
+    if species and not prefix:
+        raise ValueError(f"species must be one of {sorted(_SPECIES_PREFIXES)}")
+    return sorted(
+        name.removesuffix(".parquet")
+        for name in os.listdir(data_lake_path)
+        if _LIBRARY_PATTERN.match(name) and name.startswith(prefix)
+    )
+
+
+def _resolve_libraries(libraries: str | list[str] | None, data_lake_path: str, species: str) -> list[str]:
+    available = list_gene_set_libraries(data_lake_path, species)
+    if libraries is None:
+        return available
+    resolved = []
+    for library in [libraries] if isinstance(libraries, str) else libraries:
+        key = library.removesuffix(".parquet").lower()
+        matches = [name for name in available if name.lower() == key] or [
+            name for name in available if key in name.lower()
+        ]
+        if not matches:
+            raise ValueError(f"No {species} gene set library matches {library!r}; available: {available}")
+        resolved.extend(match for match in matches if match not in resolved)
+    return resolved
+
+
+def enrich_gene_sets(
+    gene_lists: list[str] | dict[str, list[str]],
+    libraries: str | list[str] | None = None,
+    species: str = "human",
+    background: list[str] | None = None,
+    data_lake_path: str | None = None,
+    min_size: int = 5,
+    max_size: int = 2000,
+    top_k: int | None = None,
+    max_fdr: float | None = None,
+    include_genes: bool = True,
+) -> pd.DataFrame:
+    """Over-representation analysis of one or many gene lists against local gene set libraries.
+
+    Args:
+        gene_lists: A list of gene symbols, or a map from query name to gene symbols
+        libraries: Library names or name fragments, e.g. "hallmark", "c2_curated" or
+            "msigdb_human_c5_ontology_geneset". Defaults to all libraries of the species.
+        species: "human" (MSigDB) or "mouse" (MouseMine)
+        background: Gene universe; defaults to the genes of each library
+        data_lake_path: Data lake directory. Defaults to the one under default_config.path.
+        min_size: Skip sets with fewer background genes than this
+        max_size: Skip sets with more background genes than this
+        top_k: Keep the k most significant sets per query (over all libraries)
+        max_fdr: Keep sets with adj_p_value at most this
+        include_genes: Add an "overlapping_genes" column
+
+    Returns:
+        DataFrame sorted by query and p-value; see GeneSetLibrary.enrich for the columns.
+        FDR is computed per query within each library.
+    """
+    data_lake_path = data_lake_path or default_data_lake_path()
+    queries = gene_lists if isinstance(gene_lists, dict) else {"query": gene_lists}
+    frames = []
+    for name in _resolve_libraries(libraries, data_lake_path, species):
+        library = get_gene_set_library(os.path.join(data_lake_path, f"{name}.parquet"))
+        frames.append(library.enrich(queries, background=background, min_size=min_size, max_size=max_size))
+    results = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if results.empty:
+        return results
+
+    if max_fdr is not None:
+        results = results[results["adj_p_value"] <= max_fdr]
+    results = results.sort_values(["query", "p_value", "adj_p_value"], kind="stable")
+    if top_k is not None:
+        results = results.groupby("query", sort=False).head(top_k)
+    results = results.reset_index(drop=True)
+
+    if include_genes:
+        query_genes = {name: {str(gene).strip().upper() for gene in genes} for name, genes in queries.items()}
+        if background is not None:
+            universe = {str(gene).strip().upper() for gene in background}
+            query_genes = {name: genes & universe for name, genes in query_genes.items()}
+        overlapping = []
+        for query, library, set_id in zip(results["query"], results["library"], results["set_id"], strict=True):
+            members = get_gene_set_library(os.path.join(data_lake_path, f"{library}.parquet")).genes(set_id)
+            overlapping.append(sorted(query_genes[query].intersection(members)))
+        results["overlapping_genes"] = overlapping
+    return results
@@ -0,0 +1,460 @@
+"""Memory-mapped graph engine for the precision medicine knowledge graph (kg.csv).
+
+kg.csv lists about 4 million typed relationships between 130k nodes (genes,
+diseases, drugs, phenotypes, pathways, ...). Loading it into pandas and filtering
+with boolean masks costs seconds per question. KnowledgeGraph converts it once into
+compressed sparse row (CSR) adjacency arrays with integer node IDs and relation
+codes, stored under the data lake index cache and memory-mapped on later loads, so
+neighbor, k-hop, shortest path, metapath and degree queries touch only the edges
+they need.
+
+Usage:
+    from biomni.datalake import get_knowledge_graph
+
+    kg = get_knowledge_graph(data_lake_path)
+    tp53 = kg.find("TP53", node_type="gene/protein")[0]
+    kg.neighbors(tp53, relation="disease_protein")
+    kg.shortest_path(tp53, kg.find("breast cancer")[0])
+    kg.metapath(tp53, ["disease_protein", "indication"])  # genes -> diseases -> drugs
+"""
+
+import bisect
+import os
+import threading
+from collections.abc import Iterable
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_file,
+    read_json,
+    write_array,
+    write_json,
+)
+from biomni.datalake.convert import convert_table
+from biomni.datalake.tables import default_data_lake_path
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # optional: the graph engine needs pyarrow and numpy
+    np = None
+    pa = None
+    pc = None
+    pa_csv = None
+    pq = None
+
+# Bump when the on-disk layout changes so existing graphs are rebuilt
+_FORMAT_VERSION = 1
+
+_NODE_FIELDS = ("index", "id", "type", "name", "source")
+_COLUMNS = ["relation", "display_relation"] + [f"{side}_{field}" for side in "xy" for field in _NODE_FIELDS]
+
+_DIRECTIONS = ("out", "in", "both")
+
+
+def _read_edges(kg_path: str):
+    source = convert_table(kg_path)
+    if source is not None:
+        return pq.read_table(source, columns=_COLUMNS)
+    return pa_csv.read_csv(kg_path, convert_options=pa_csv.ConvertOptions(include_columns=_COLUMNS))
+
+
+def _encode(column) -> tuple:
+    """Dictionary-encode a column into (codes as numpy array, list of distinct values)."""
+    encoded = pc.dictionary_encode(column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column)
+    codes = encoded.indices.to_numpy(zero_copy_only=False)
+    return codes, [str(value) for value in encoded.dictionary.to_pylist()]
+
+
+def _write_csr(directory: str, prefix: str, rows, columns, relations, num_nodes: int) -> None:
+    # Within a node's slice, edges are grouped by relation and then by neighbor
+    order = np.lexsort((columns, relations, rows))
+    pointers = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=pointers[1:])
+    write_array(directory, f"{prefix}.ptr", "q", pointers)
+    write_array(directory, f"{prefix}.nbr", "i", columns[order].astype(np.int32))
+    write_array(directory, f"{prefix}.rel", "B", relations[order].astype(np.uint8))
+
+
+def _build_graph(kg_path: str, directory: str) -> None:
+    table = _read_edges(kg_path)
+
+    # Node identities come from x_index/y_index; renumber them 0..n-1
+    raw_ids = np.concatenate(
+        [table.column("x_index").to_numpy().astype(np.int64), table.column("y_index").to_numpy().astype(np.int64)]
+    )
+    node_keys, first_seen, inverse = np.unique(raw_ids, return_index=True, return_inverse=True)
+    num_edges = table.num_rows
+    num_nodes = len(node_keys)
+    sources, targets = inverse[:num_edges], inverse[num_edges:]
+
+    def node_attribute(field: str):
+        values = pa.concat_arrays(
+            [table.column(f"x_{field}").combine_chunks(), table.column(f"y_{field}").combine_chunks()]
+        )
+        return values.take(pa.array(first_seen))
+
+    names = [str(name) for name in node_attribute("name").to_pylist()]
+    source_ids = [str(value) for value in node_attribute("id").to_pylist()]
+    type_codes, node_types = _encode(node_attribute("type"))
+    database_codes, databases = _encode(node_attribute("source"))
+    relation_codes, relations = _encode(table.column("relation"))
+    _, first_use = np.unique(relation_codes, return_index=True)
+    display_relations = dict(
+        zip(relations, table.column("display_relation").take(pa.array(first_use)).to_pylist(), strict=True)
+    )
+    if len(relations) > 255 or len(node_types) > 255 or len(databases) > 255:
+        raise ValueError("kg.csv has more relation, node type or source values than the graph format supports")
+
+    # Case-insensitive name lookup: names sorted with their node ids
+    lowered = [name.lower() for name in names]
+    by_name = sorted(range(num_nodes), key=lowered.__getitem__)
+
+    with building(directory) as scratch:
+        StringTable.write(scratch, "names", names)
+        StringTable.write(scratch, "source_ids", source_ids)
+        StringTable.write(scratch, "lookup", (lowered[node] for node in by_name))
+        write_array(scratch, "lookup.node", "i", by_name)
+        write_array(scratch, "node.type", "B", type_codes.astype(np.uint8))
+        write_array(scratch, "node.source", "B", database_codes.astype(np.uint8))
+        write_array(scratch, "node.index", "q", node_keys)
+        _write_csr(scratch, "out", sources, targets, relation_codes, num_nodes)
+        _write_csr(scratch, "in", targets, sources, relation_codes, num_nodes)
+        write_json(
+            scratch,
+            "meta.json",
+            {
+                "version": _FORMAT_VERSION,
+                "source": kg_path,
+                "nodes": num_nodes,
+                "edges": num_edges,
+                "node_types": node_types,
+                "sources": databases,
+                "relations": relations,
+                "display_relations": display_relations,
+            },
+        )
+
+
+def _numpy(directory: str, name: str, dtype):
+    return np.frombuffer(map_file(directory, name), dtype=dtype)
+
+
+class KnowledgeGraph:
+    """Read-only CSR view of kg.csv with typed edges.
+
+    Nodes are integers 0..num_nodes-1; find() turns names into node IDs and node() turns
+    IDs back into records. Methods that take a node accept either form, and names are
+    resolved to all nodes with that name. Relation and node type filters take the
+    names used in kg.csv ("protein_protein", "gene/protein", ...), see relations and
+    node_types. Edges are stored as listed in kg.csv (which lists most relationships
+    in both directions); direction="both" follows them either way.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        self.node_types = self.meta["node_types"]
+        self.relations = self.meta["relations"]
+        self._names = StringTable(directory, "names")
+        self._source_ids = StringTable(directory, "source_ids")
+        self._lookup = StringTable(directory, "lookup")
+        self._lookup_nodes = _numpy(directory, "lookup.node", np.int32)
+        self._node_types = _numpy(directory, "node.type", np.uint8)
+        self._node_sources = _numpy(directory, "node.source", np.uint8)
+        self._adjacency = {
+            direction: (
+                _numpy(directory, f"{direction}.ptr", np.int64),
+                _numpy(directory, f"{direction}.nbr", np.int32),
+                _numpy(directory, f"{direction}.rel", np.uint8),
+            )
+            for direction in ("out", "in")
+        }
+
+    @classmethod
+    def open(cls, kg_path: str) -> "KnowledgeGraph":
+        """Open the graph for a kg.csv file, building it first if the file is new or has changed."""
+        directory = index_directory("kg", [kg_path], _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_graph(kg_path, directory)
+        return cls(directory)
+
+    @property
+    def num_nodes(self) -> int:
+        return self.meta["nodes"]
+
+    @property
+    def num_edges(self) -> int:
+        return self.meta["edges"]
+
+    def _codes(self, values: str | Iterable[str] | None, known: list[str], kind: str):
+        if values is None:
+            return None
+        values = [values] if isinstance(values, str) else list(values)
+        unknown = [value for value in values if value not in known]
+        if unknown:
+            raise ValueError(f"Unknown {kind} {unknown}; expected one of {known}")
+        return np.array([known.index(value) for value in values], dtype=np.uint8)
+
+    def find(self, name: str, node_type: str | None = None) -> list[int]:
+        """IDs of the nodes with a name (case-insensitive), optionally of one node type."""
+        key = name.lower()
+        start = bisect.bisect_left(self._lookup, key)
+        end = bisect.bisect_right(self._lookup, key, lo=start)
+        nodes = [int(node) for node in self._lookup_nodes[start:end]]
+        if node_type is not None:
+            type_code = self._codes(node_type, self.node_types, "node type")[0]
+            nodes = [node for node in nodes if self._node_types[node] == type_code]
+        return nodes
+
+    def _resolve(self, node: int | str) -> list[int]:
+        if isinstance(node, str):
+            nodes = self.find(node)
+            if not nodes:
+                raise KeyError(f"No node named {node!r} in the knowledge graph")
+            return nodes
+        if not 0 <= int(node) < self.num_nodes:
+            raise KeyError(f"Node ID {node} is out of range")
+        return [int(node)]
+
+    def _resolve_all(self, nodes: int | str | Iterable[int | str]):
+        if isinstance(nodes, int | str | np.integer):
+            nodes = [nodes]
+        return np.unique(np.array([resolved for node in nodes for resolved in self._resolve(node)], dtype=np.int64))
+
+    def node(self, node: int) -> dict:
+        """Record of a node: ID, name, type, and its ID in the source database."""
+        return {
+            "node": int(node),
+            "name": self._names[node],
+            "type": self.node_types[self._node_types[node]],
+            "source": self.meta["sources"][self._node_sources[node]],
+            "source_id": self._source_ids[node],
+        }
+
+    def nodes(self, nodes: Iterable[int]) -> list[dict]:
+        return [self.node(node) for node in nodes]
+
+    def _expand(self, frontier, relation_codes, direction: str):
+        """All edges leaving the frontier nodes: (origin, neighbor, relation) arrays."""
+        origins, neighbors, relations = [], [], []
+        for side in ("out", "in") if direction == "both" else (direction,):
+            pointers, targets, codes = self._adjacency[side]
+            starts, ends = pointers[frontier], pointers[frontier + 1]
+            counts = ends - starts
+            total = int(counts.sum())
+            if not total:
+                continue
+            # Positions of every edge of every frontier node, without a Python loop
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            origin = np.repeat(frontier, counts)
+            neighbor = targets[offsets]
+            relation = codes[offsets]
+            if relation_codes is not None:
+                keep = np.isin(relation, relation_codes)
+                origin, neighbor, relation = origin[keep], neighbor[keep], relation[keep]
+            origins.append(origin)
+            neighbors.append(neighbor)
+            relations.append(relation)
+        if not origins:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.uint8)
+        return np.concatenate(origins), np.concatenate(neighbors).astype(np.int64), np.concatenate(relations)
+
+    def degree(self, node: int | str, relation: str | Iterable[str] | None = None, direction: str = "out") -> int:
+        """Number of edges of a node (summed over all nodes of that name), optionally of given relations."""
+        _check_direction(direction)
+        nodes = self._resolve_all(node)
+        if relation is None and direction != "both":
+            pointers = self._adjacency[direction][0]
+            return int((pointers[nodes + 1] - pointers[nodes]).sum())
+        return len(self._expand(nodes, self._codes(relation, self.relations, "relation"), direction)[0])
+
+    def degrees(self, node_type: str | None = None, direction: str = "out"):
+        """Degree of every node (or every node of a type) as a numpy array indexed by node ID.
+
+        Nodes of other types get degree 0, so argsort()[::-1] ranks the hubs of a type.
+        """
+        _check_direction(direction)
+        result = np.zeros(self.num_nodes, dtype=np.int64)
+        for side in ("out", "in") if direction == "both" else (direction,):
+            result += np.diff(self._adjacency[side][0])
+        if node_type is not None:
+            result[self._node_types != self._codes(node_type, self.node_types, "node type")[0]] = 0
+        return result
+
+    def neighbors(
+        self,
+        node: int | str,
+        relation: str | Iterable[str] | None = None,
+        node_type: str | Iterable[str] | None = None,
+        direction: str = "both",
+    ) -> list[dict]:
+        """Direct neighbors of a node, each with the relation that links them.
+
+        Args:
+            node: Node ID or name
+            relation: Only follow edges of these relations
+            node_type: Only return neighbors of these node types
+            direction: "out", "in" or "both"
+
+        Returns:
+            Node records (see node()) with an added "relation" key, one per distinct
+            (neighbor, relation) pair
+        """
+        _check_direction(direction)
+        _, neighbors, relations = self._expand(
+            self._resolve_all(node), self._codes(relation, self.relations, "relation"), direction
+        )
+        type_codes = self._codes(node_type, self.node_types, "node type")
+        if type_codes is not None:
+            keep = np.isin(self._node_types[neighbors], type_codes)
+            neighbors, relations = neighbors[keep], relations[keep]
+        pairs = np.unique(np.stack([neighbors, relations.astype(np.int64)], axis=1), axis=0) if len(neighbors) else []
+        return [{**self.node(neighbor), "relation": self.relations[code]} for neighbor, code in pairs]
+
+    def k_hop(
+        self,
+        nodes: int | str | Iterable[int | str],
+        k: int = 2,
+        relation: str | Iterable[str] | None = None,
+        direction: str = "both",
+    ) -> dict[int, int]:
+        """All nodes within k hops of the given nodes, mapped to their hop distance (0 for the start nodes)."""
+        _check_direction(direction)
+        relation_codes = self._codes(relation, self.relations, "relation")
+        distance = np.full(self.num_nodes, -1, dtype=np.int32)
+        frontier = self._resolve_all(nodes)
+        distance[frontier] = 0
+        for hop in range(1, k + 1):
+            neighbors = self._expand(frontier, relation_codes, direction)[1]
+            frontier = np.unique(neighbors[distance[neighbors] < 0])
+            if not len(frontier):
+                break
+            distance[frontier] = hop
+        reached = np.flatnonzero(distance >= 0)
+        return dict(zip(reached.tolist(), distance[reached].tolist(), strict=True))
+
+    def shortest_path(
+        self,
+        source: int | str,
+        target: int | str,
+        relation: str | Iterable[str] | None = None,
+        direction: str = "both",
+        max_hops: int = 6,
+    ) -> list[dict] | None:
+        """A shortest path between two nodes (names resolve to all nodes of that name).
+
+        Returns:
+            Node records along the path; every record after the first has the "relation"
+            of the edge that leads to it. None if no path within max_hops exists.
+        """
+        _check_direction(direction)
+        relation_codes = self._codes(relation, self.relations, "relation")
+        targets = self._resolve_all(target)
+        parent = np.full(self.num_nodes, -1, dtype=np.int64)
+        parent_relation = np.zeros(self.num_nodes, dtype=np.uint8)
+        frontier = self._resolve_all(source)
+        parent[frontier] = frontier
+        is_target = np.zeros(self.num_nodes, dtype=bool)
+        is_target[targets] = True
+
+        reached = frontier[is_target[frontier]]
+        for _ in range(max_hops):
+            if len(reached):
+                break
+            origins, neighbors, relations = self._expand(frontier, relation_codes, direction)
+            new = parent[neighbors] < 0
+            origins, neighbors, relations = origins[new], neighbors[new], relations[new]
+            # Keep the first edge found for each newly reached node
+            neighbors, first = np.unique(neighbors, return_index=True)
+            parent[neighbors] = origins[first]
+            parent_relation[neighbors] = relations[first]
+            frontier = neighbors
+            reached = frontier[is_target[frontier]]
+            if not len(frontier):
+                break
+        if not len(reached):
+            return None
+
+        path = [int(reached[0])]
+        while parent[path[-1]] != path[-1]:
+            path.append(int(parent[path[-1]]))
+        path.reverse()
+        records = [self.node(path[0])]
+        for node in path[1:]:
+            records.append({**self.node(node), "relation": self.relations[parent_relation[node]]})
+        return records
+
+    def metapath(
+        self,
+        source: int | str | Iterable[int | str],
+        relations: list[str],
+        node_types: list[str | None] | None = None,
+        direction: str = "out",
+        limit: int | None = 100,
+    ) -> list[dict]:
+        """Nodes reachable by following a sequence of relation types, ranked by number of paths.
+
+        For example ["disease_protein", "indication"] goes from genes to their diseases and
+        then to drugs indicated for those diseases.
+
+        Args:
+            source: Start node ID(s) or name(s)
+            relations: Relation to follow at each step
+            node_types: Optional node type required after each step (None to allow any)
+            direction: "out", "in" or "both". kg.csv lists most relationships both ways, so
+                "both" counts those paths twice.
+            limit: Return at most this many end nodes (None for all)
+
+        Returns:
+            End node records with a "paths" count, most connected first
+        """
+        _check_direction(direction)
+        if node_types is not None and len(node_types) != len(relations):
+            raise ValueError("node_types must have one entry per relation")
+        frontier = self._resolve_all(source)
+        counts = np.ones(len(frontier), dtype=np.int64)
+        for step, relation in enumerate(relations):
+            origins, neighbors, _ = self._expand(frontier, self._codes(relation, self.relations, "relation"), direction)
+            weights = counts[np.searchsorted(frontier, origins)]
+            if node_types is not None and node_types[step] is not None:
+                keep = self._node_types[neighbors] == self._codes(node_types[step], self.node_types, "node type")[0]
+                neighbors, weights = neighbors[keep], weights[keep]
+            # Path counts per node reached at this step; frontier stays sorted for searchsorted
+            frontier, inverse = np.unique(neighbors, return_inverse=True)
+            counts = np.bincount(inverse, weights=weights, minlength=len(frontier)).astype(np.int64)
+            if not len(frontier):
+                return []
+
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return [{**self.node(frontier[i]), "paths": int(counts[i])} for i in order]
+
+
+def _check_direction(direction: str) -> None:
+    if direction not in _DIRECTIONS:
+        raise ValueError(f"direction must be one of {_DIRECTIONS}")
+
+
+_graphs: dict[str, KnowledgeGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_knowledge_graph(data_lake_path: str | None = None) -> KnowledgeGraph:
+    """Return the process-wide graph for a data lake's kg.csv, building it on first use."""
+    if np is None or pa is None:
+        raise ImportError("The knowledge graph engine requires pyarrow and numpy: pip install pyarrow numpy")
+    kg_path = os.path.join(data_lake_path or default_data_lake_path(), "kg.csv")
+    directory = index_directory("kg", [kg_path], _FORMAT_VERSION)
+    graph = _graphs.get(kg_path)
+    if graph is None or graph.directory != directory:
+        with _graphs_lock:
+            graph = _graphs.get(kg_path)
+            if graph is None or graph.directory != directory:
+                graph = _graphs[kg_path] = KnowledgeGraph.open(kg_path)
+    return graph
@@ -0,0 +1,343 @@
+"""Indexed store for the Human Phenotype Ontology (hp.obo).
+
+The OBO file is parsed once into compact array files (term IDs, names, synonyms,
+alternative IDs and parent/child edges) under the data lake index cache. Later
+loads memory-map those files, so opening the index costs a few system calls and
+lookups never re-read the ontology.
+
+Usage:
+    from biomni.datalake import get_hpo_index
+
+    hpo = get_hpo_index(data_lake_path + "/hp.obo")
+    hpo.names(["HP:0001250", "HP:0001263"])
+    hpo.ancestors("HP:0001250")
+    hpo.search("seizures")
+"""
+
+import bisect
+import difflib
+import os
+import re
+import threading
+from collections.abc import Iterable
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_array,
+    read_json,
+    write_array,
+    write_json,
+)
+
+# Bump when the on-disk layout changes so existing indexes are rebuilt
+_FORMAT_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _format_id(number: int) -> str:
+    return f"HP:{number:07d}"
+
+
+def _parse_id(term_id: str) -> int | None:
+    if not isinstance(term_id, str) or not term_id.startswith("HP:"):
+        return None
+    digits = term_id[3:].strip()
+    return int(digits) if digits.isdigit() else None
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _parse_obo(path: str) -> list[dict]:
+    """Read the [Term] stanzas of an OBO file that have an HP ID and a name."""
+    terms = []
+    term = None
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line.startswith("["):
+                term = None
+                if line == "[Term]":
+                    term = {"id": None, "name": None, "synonyms": [], "parents": [], "alt_ids": [], "obsolete": False}
+                    terms.append(term)
+                continue
+            if term is None or not line:
+                continue
+
+            tag, _, value = line.partition(": ")
+            if tag == "id":
+                term["id"] = _parse_id(value)
+            elif tag == "name":
+                term["name"] = value
+            elif tag == "synonym" and value.count('"') >= 2:
+                term["synonyms"].append(value.split('"')[1])
+            elif tag == "is_a":
+                parent = _parse_id(value.split(" ! ")[0].split()[0])
+                if parent is not None:
+                    term["parents"].append(parent)
+            elif tag == "alt_id":
+                alt_id = _parse_id(value)
+                if alt_id is not None:
+                    term["alt_ids"].append(alt_id)
+            elif tag == "is_obsolete":
+                term["obsolete"] = value.strip() == "true"
+
+    return [term for term in terms if term["id"] is not None and term["name"]]
+
+
+def _build_index(obo_path: str, directory: str) -> None:
+    terms = sorted(_parse_obo(obo_path), key=lambda term: term["id"])
+    row_of = {term["id"]: row for row, term in enumerate(terms)}
+
+    parents = [[row_of[parent] for parent in term["parents"] if parent in row_of] for term in terms]
+    children = [[] for _ in terms]
+    for row, term_parents in enumerate(parents):
+        for parent in term_parents:
+            children[parent].append(row)
+
+    alt_ids = sorted(
+        (alt_id, row) for row, term in enumerate(terms) for alt_id in term["alt_ids"] if alt_id not in row_of
+    )
+
+    with building(directory) as scratch:
+        write_array(scratch, "ids.i32", "i", (term["id"] for term in terms))
+        write_array(scratch, "obsolete.u8", "B", (term["obsolete"] for term in terms))
+        StringTable.write(scratch, "names", (term["name"] for term in terms))
+
+        write_array(scratch, "synonyms.ptr", "i", _pointers(len(term["synonyms"]) for term in terms))
+        StringTable.write(scratch, "synonyms", (synonym for term in terms for synonym in term["synonyms"]))
+
+        for name, edges in (("parents", parents), ("children", children)):
+            write_array(scratch, f"{name}.ptr", "i", _pointers(len(targets) for targets in edges))
+            write_array(scratch, f"{name}.idx", "i", (target for targets in edges for target in targets))
+
+        write_array(scratch, "alt_ids.i32", "i", (alt_id for alt_id, _ in alt_ids))
+        write_array(scratch, "alt_rows.i32", "i", (row for _, row in alt_ids))
+        write_json(scratch, "meta.json", {"version": _FORMAT_VERSION, "source": obo_path, "terms": len(terms)})
+
+
+def _pointers(lengths: Iterable[int]) -> list[int]:
+    """CSR row pointers: entry i is where row i starts, the last entry is the total length."""
+    pointers = [0]
+    for length in lengths:
+        pointers.append(pointers[-1] + length)
+    return pointers
+
+
+class HPOIndex:
+    """Memory-mapped HPO term index with batch lookups, ontology closures and fuzzy search.
+
+    Term IDs are accepted in their "HP:0001250" form; alternative (merged) IDs resolve
+    to their primary term. Obsolete terms are kept so that old annotations still
+    resolve to a name, but they are left out of search results.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        self._ids = map_array(directory, "ids.i32", "i")
+        self._obsolete = map_array(directory, "obsolete.u8", "B")
+        self._names = StringTable(directory, "names")
+        self._synonym_ptr = map_array(directory, "synonyms.ptr", "i")
+        self._synonyms = StringTable(directory, "synonyms")
+        self._parent_ptr = map_array(directory, "parents.ptr", "i")
+        self._parent_idx = map_array(directory, "parents.idx", "i")
+        self._child_ptr = map_array(directory, "children.ptr", "i")
+        self._child_idx = map_array(directory, "children.idx", "i")
+        self._alt_ids = map_array(directory, "alt_ids.i32", "i")
+        self._alt_rows = map_array(directory, "alt_rows.i32", "i")
+        self._search_index = None
+        self._search_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, obo_path: str) -> "HPOIndex":
+        """Open the index for an OBO file, building it first if the file is new or has changed."""
+        directory = index_directory("hpo", [obo_path], _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_index(obo_path, directory)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, term_id: str) -> bool:
+        return self._row(term_id) is not None
+
+    def _row(self, term_id: str) -> int | None:
+        number = _parse_id(term_id)
+        if number is None:
+            return None
+        for ids, rows in ((self._ids, None), (self._alt_ids, self._alt_rows)):
+            position = bisect.bisect_left(ids, number)
+            if position < len(ids) and ids[position] == number:
+                return position if rows is None else rows[position]
+        return None
+
+    def _rows(self, term_ids: str | Iterable[str]) -> list[int]:
+        if isinstance(term_ids, str):
+            term_ids = [term_ids]
+        return [row for row in map(self._row, term_ids) if row is not None]
+
+    def _closure(self, rows: list[int], pointers: memoryview, targets: memoryview) -> set[int]:
+        seen = set()
+        stack = list(rows)
+        while stack:
+            row = stack.pop()
+            for target in targets[pointers[row] : pointers[row + 1]]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def canonical_id(self, term_id: str) -> str | None:
+        """Primary ID for a term or alternative ID, or None if unknown."""
+        row = self._row(term_id)
+        return _format_id(self._ids[row]) if row is not None else None
+
+    def name(self, term_id: str, default: str | None = None) -> str | None:
+        """Name of a term, or default if the ID is unknown."""
+        row = self._row(term_id)
+        return self._names[row] if row is not None else default
+
+    def names(self, term_ids: Iterable[str], default: str | None = None) -> list[str | None]:
+        """Names of several terms, in order, with default for unknown IDs."""
+        return [self.name(term_id, default) for term_id in term_ids]
+
+    def synonyms(self, term_id: str) -> list[str]:
+        """Synonyms of a term (empty for unknown IDs)."""
+        row = self._row(term_id)
+        if row is None:
+            return []
+        return [self._synonyms[i] for i in range(self._synonym_ptr[row], self._synonym_ptr[row + 1])]
+
+    def is_obsolete(self, term_id: str) -> bool:
+        row = self._row(term_id)
+        return row is not None and bool(self._obsolete[row])
+
+    def parents(self, term_id: str) -> list[str]:
+        """Direct is_a parents of a term."""
+        row = self._row(term_id)
+        if row is None:
+            return []
+        return [_format_id(self._ids[i]) for i in self._parent_idx[self._parent_ptr[row] : self._parent_ptr[row + 1]]]
+
+    def children(self, term_id: str) -> list[str]:
+        """Direct is_a children of a term."""
+        row = self._row(term_id)
+        if row is None:
+            return []
+        return [_format_id(self._ids[i]) for i in self._child_idx[self._child_ptr[row] : self._child_ptr[row + 1]]]
+
+    def ancestors(self, term_ids: str | Iterable[str], include_self: bool = False) -> set[str]:
+        """All terms reachable through is_a edges from one or more terms.
+
+        Args:
+            term_ids: A term ID or an iterable of term IDs; unknown IDs are ignored
+            include_self: Also include the given terms themselves
+
+        Returns:
+            Set of primary term IDs
+        """
+        rows = self._rows(term_ids)
+        closure = self._closure(rows, self._parent_ptr, self._parent_idx)
+        if include_self:
+            closure.update(rows)
+        return {_format_id(self._ids[row]) for row in closure}
+
+    def descendants(self, term_ids: str | Iterable[str], include_self: bool = False) -> set[str]:
+        """All terms below one or more terms in the is_a hierarchy. See ancestors."""
+        rows = self._rows(term_ids)
+        closure = self._closure(rows, self._child_ptr, self._child_idx)
+        if include_self:
+            closure.update(rows)
+        return {_format_id(self._ids[row]) for row in closure}
+
+    def _get_search_index(self) -> tuple[list[tuple[int, str]], dict[str, list[int]], list[str]]:
+        """Labels (row, text), postings from token to label positions and the sorted token vocabulary."""
+        with self._search_lock:
+            if self._search_index is None:
+                labels = []
+                for row in range(len(self)):
+                    if self._obsolete[row]:
+                        continue
+                    labels.append((row, self._names[row]))
+                    for i in range(self._synonym_ptr[row], self._synonym_ptr[row + 1]):
+                        labels.append((row, self._synonyms[i]))
+
+                postings: dict[str, list[int]] = {}
+                for position, (_, text) in enumerate(labels):
+                    for token in set(_tokens(text)):
+                        postings.setdefault(token, []).append(position)
+                self._search_index = (labels, postings, sorted(postings))
+            return self._search_index
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """Find terms whose name or a synonym approximately matches a free-text phrase.
+
+        Query words match label words by prefix ("seiz" finds "seizure"); words with no
+        prefix match are corrected to the closest vocabulary words to tolerate typos.
+        Candidates are ranked by the share of query words they contain and by overall
+        string similarity.
+
+        Args:
+            query: Phenotype description, e.g. "generalized seizures"
+            limit: Maximum number of terms to return
+
+        Returns:
+            List of {"id", "name", "matched", "score"} dicts, best first, where "matched"
+            is the name or synonym that matched and score is between 0 and 1
+        """
+        query_tokens = list(dict.fromkeys(_tokens(query)))
+        if not query_tokens:
+            return []
+        labels, postings, vocabulary = self._get_search_index()
+
+        # Count, per label, how many query words it contains
+        coverage: dict[int, int] = {}
+        for token in query_tokens:
+            start = bisect.bisect_left(vocabulary, token)
+            end = bisect.bisect_left(vocabulary, token + "\uffff", lo=start)
+            expansions = vocabulary[start:end] or difflib.get_close_matches(token, vocabulary, n=5, cutoff=0.8)
+            matched = set()
+            for expansion in expansions:
+                matched.update(postings[expansion])
+            for position in matched:
+                coverage[position] = coverage.get(position, 0) + 1
+
+        # String similarity is comparatively slow, so only score the best-covered candidates
+        candidates = sorted(coverage, key=lambda position: (-coverage[position], len(labels[position][1])))[:500]
+        normalized_query = " ".join(query_tokens)
+        best: dict[int, tuple[float, str]] = {}
+        for position in candidates:
+            row, text = labels[position]
+            similarity = difflib.SequenceMatcher(None, normalized_query, " ".join(_tokens(text))).ratio()
+            score = 0.5 * coverage[position] / len(query_tokens) + 0.5 * similarity
+            if row not in best or score > best[row][0]:
+                best[row] = (score, text)
+
+        ranked = sorted(best.items(), key=lambda item: -item[1][0])[:limit]
+        return [
+            {"id": _format_id(self._ids[row]), "name": self._names[row], "matched": text, "score": round(score, 3)}
+            for row, (score, text) in ranked
+        ]
+
+
+_indexes: dict[str, HPOIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_hpo_index(obo_path: str) -> HPOIndex:
+    """Return the process-wide index for an hp.obo file, building or reopening it if the file changed."""
+    directory = index_directory("hpo", [obo_path], _FORMAT_VERSION)
+    index = _indexes.get(obo_path)
+    if index is None or index.directory != directory:
+        with _indexes_lock:
+            index = _indexes.get(obo_path)
+            if index is None or index.directory != directory:
+                index = HPOIndex.open(obo_path)
+                _indexes[obo_path] = index
+    return index
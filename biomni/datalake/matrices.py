@@ -0,0 +1,407 @@
+"""Memory-mapped gene-by-sample matrices for GTEx and DepMap.
+
+gtex_tissue_gene_tpm.parquet and the DepMap expression, gene effect and gene
+dependency tables are dense matrices that co-expression and dependency questions
+used to re-read as DataFrames every time. ExpressionMatrix converts each one once
+into a float32 gene-by-sample array with gene and sample index sidecars, stored
+under the data lake index cache. The array is memory-mapped read-only, so row and
+column slices are views created in constant time and worker processes share the
+pages through the OS page cache. Correlation and ranking queries run over blocks
+of rows with vectorized, missing-value aware arithmetic.
+
+Usage:
+    from biomni.datalake import get_expression_matrix
+
+    effect = get_expression_matrix("depmap_effect")
+    effect.top_correlated("TP53", k=20)  # genes with the most similar dependency profile
+    get_expression_matrix("gtex").rank_samples("ALB")  # tissues ranked by ALB expression
+"""
+
+import bisect
+import os
+import re
+import threading
+from collections.abc import Iterable
+
+import pandas as pd
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_file,
+    read_json,
+    write_array,
+    write_json,
+)
+from biomni.datalake.convert import convert_table, is_text_table
+from biomni.datalake.genes import _MATRIX_COLUMN_PATTERN, normalize_gene_key
+from biomni.datalake.tables import default_data_lake_path
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional: the matrices need pyarrow and numpy
+    np = None
+    pa = None
+    pc = None
+    pq = None
+
+# Bump when the on-disk layout changes so existing matrices are rebuilt
+_FORMAT_VERSION = 1
+
+# Matrices by short name
+MATRICES = {
+    "gtex": "gtex_tissue_gene_tpm.parquet",
+    "depmap_expression": "DepMap_OmicsExpressionProteinCodingGenesTPMLogp1.csv",
+    "depmap_effect": "DepMap_CRISPRGeneEffect.csv",
+    "depmap_dependency": "DepMap_CRISPRGeneDependency.csv",
+}
+
+# Columns naming genes and samples in long (one value per row) or gene-by-sample tables
+_GENE_LABEL_PATTERN = re.compile(r"symbol|description|gene_?name|^gene$", re.IGNORECASE)
+_SAMPLE_COLUMN_PATTERN = re.compile(r"tissue|sample|model|cell", re.IGNORECASE)
+_VALUE_COLUMN_PATTERN = re.compile(r"tpm|value|expression|effect|score", re.IGNORECASE)
+
+# Columns read at once when transposing sample-by-gene tables
+_COLUMN_BATCH = 512
+
+# Rows per block of correlation and ranking queries, sized for ~64 MB of float64 per block
+_BLOCK_VALUES = 8 * 1024**2
+
+
+def _numeric(data_type) -> bool:
+    return pa.types.is_integer(data_type) or pa.types.is_floating(data_type)
+
+
+def _string(data_type) -> bool:
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def _as_float32(column):
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    return column.cast(pa.float64()).to_numpy(zero_copy_only=False).astype(np.float32)
+
+
+def _write_values(directory: str, shape: tuple[int, int]):
+    return np.memmap(os.path.join(directory, "values.f32"), dtype=np.float32, mode="w+", shape=shape)
+
+
+def _build_sample_by_gene(parquet_file, gene_columns: list[str], directory: str) -> tuple[list[str], list[str]]:
+    """DepMap layout: one row per model, one "SYMBOL (ENTREZ)" column per gene."""
+    id_column = parquet_file.schema_arrow.names[0]
+    samples = [str(value) for value in parquet_file.read(columns=[id_column]).column(0).to_pylist()]
+    values = _write_values(directory, (len(gene_columns), len(samples)))
+    for start in range(0, len(gene_columns), _COLUMN_BATCH):
+        batch = parquet_file.read(columns=gene_columns[start : start + _COLUMN_BATCH])
+        for offset, column in enumerate(batch.columns):
+            values[start + offset] = _as_float32(column)
+    values.flush()
+    return gene_columns, samples
+
+
+def _build_gene_by_sample(table, sample_columns: list[str], directory: str) -> None:
+    """GTEx layout: one row per gene with identifier columns, one numeric column per tissue or sample."""
+    values = _write_values(directory, (table.num_rows, len(sample_columns)))
+    for index, column in enumerate(sample_columns):
+        values[:, index] = _as_float32(table.column(column))
+    values.flush()
+
+
+def _build_long(table, gene_column: str, sample_column: str, value_column: str, directory: str):
+    """One (gene, sample, value) per row; duplicate pairs are averaged."""
+    genes = pc.dictionary_encode(table.column(gene_column).combine_chunks())
+    samples = pc.dictionary_encode(table.column(sample_column).combine_chunks())
+    rows = genes.indices.to_numpy(zero_copy_only=False)
+    columns = samples.indices.to_numpy(zero_copy_only=False)
+    data = table.column(value_column).cast(pa.float64()).to_numpy()
+    shape = (len(genes.dictionary), len(samples.dictionary))
+    sums = np.zeros(shape)
+    counts = np.zeros(shape)
+    keep = ~np.isnan(data)
+    np.add.at(sums, (rows[keep], columns[keep]), data[keep])
+    np.add.at(counts, (rows[keep], columns[keep]), 1)
+    values = _write_values(directory, shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values[:] = np.where(counts > 0, sums / counts, np.nan)
+    values.flush()
+    labels = [str(gene) for gene in genes.dictionary.to_pylist()]
+    return labels, [str(sample) for sample in samples.dictionary.to_pylist()]
+
+
+def _gene_keys(labels: list[str], identifiers: list[list[str]]) -> list[tuple[str, int]]:
+    """(normalized key, row) pairs for every identifier of every row."""
+    pairs = set()
+    for row, label in enumerate(labels):
+        match = _MATRIX_COLUMN_PATTERN.match(label)
+        names = [match.group(1), match.group(2)] if match else [label]
+        names.extend(values[row] for values in identifiers if values[row])
+        pairs.update((normalize_gene_key(name), row) for name in names)
+    return sorted(pairs)
+
+
+def _build_matrix(path: str, directory: str) -> None:
+    source = convert_table(path) if is_text_table(path) else path
+    if source is None:
+        raise ValueError(f"Cannot convert {path} to Parquet for indexing")
+    parquet_file = pq.ParquetFile(source)
+    schema = parquet_file.schema_arrow
+    identifiers: list[list[str]] = []
+
+    with building(directory) as scratch:
+        gene_columns = [name for name in schema.names if _MATRIX_COLUMN_PATTERN.match(name)]
+        numeric = [field.name for field in schema if _numeric(field.type)]
+        strings = [field.name for field in schema if _string(field.type)]
+        if len(gene_columns) >= len(schema.names) // 2:
+            layout = "sample_by_gene"
+            labels, samples = _build_sample_by_gene(parquet_file, gene_columns, scratch)
+        elif len(numeric) >= 2 and strings:
+            layout = "gene_by_sample"
+            table = parquet_file.read()
+            label_column = next((name for name in strings if _GENE_LABEL_PATTERN.search(name)), strings[0])
+            identifiers = [[str(value or "") for value in table.column(name).to_pylist()] for name in strings]
+            labels = [str(value) for value in table.column(label_column).to_pylist()]
+            samples = numeric
+            _build_gene_by_sample(table, samples, scratch)
+        elif numeric and len(strings) >= 2:
+            layout = "long"
+            table = parquet_file.read()
+            gene_column = next((name for name in strings if _GENE_LABEL_PATTERN.search(name)), strings[0])
+            sample_column = next(
+                (name for name in strings if name != gene_column and _SAMPLE_COLUMN_PATTERN.search(name)),
+                next(name for name in strings if name != gene_column),
+            )
+            value_column = next((name for name in numeric if _VALUE_COLUMN_PATTERN.search(name)), numeric[-1])
+            labels, samples = _build_long(table, gene_column, sample_column, value_column, scratch)
+        else:
+            raise ValueError(f"{path} does not look like a gene-by-sample matrix")
+
+        keys = _gene_keys(labels, identifiers)
+        StringTable.write(scratch, "genes", labels)
+        StringTable.write(scratch, "samples", samples)
+        StringTable.write(scratch, "gene_keys", (key for key, _ in keys))
+        write_array(scratch, "gene_keys.row", "i", (row for _, row in keys))
+        write_json(
+            scratch,
+            "meta.json",
+            {
+                "version": _FORMAT_VERSION,
+                "source": path,
+                "layout": layout,
+                "genes": len(labels),
+                "samples": len(samples),
+            },
+        )
+
+
+def _pearson(targets, block, min_samples: int):
+    """Pairwise-complete Pearson correlation between target rows and block rows (NaN = missing)."""
+    target_mask = ~np.isnan(targets)
+    block_mask = ~np.isnan(block)
+    x = np.where(target_mask, targets, 0.0)
+    y = np.where(block_mask, block, 0.0)
+    mx, my = target_mask.astype(np.float64), block_mask.astype(np.float64)
+    count = mx @ my.T
+    sum_x, sum_y = x @ my.T, mx @ y.T
+    sum_xx, sum_yy = (x * x) @ my.T, mx @ (y * y).T
+    sum_xy = x @ y.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = (count * sum_xy - sum_x * sum_y) / np.sqrt((count * sum_xx - sum_x**2) * (count * sum_yy - sum_y**2))
+    result[count < min_samples] = np.nan
+    return result
+
+
+class ExpressionMatrix:
+    """Read-only float32 gene-by-sample matrix backed by a memory-mapped file.
+
+    Rows are genes and columns are samples (GTEx tissues, DepMap models), whatever the
+    orientation of the source table. Genes can be given by symbol, Entrez ID or Ensembl
+    ID where the source provides them, matched case-insensitively; missing values are NaN.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        self._genes = StringTable(directory, "genes")
+        self._samples = StringTable(directory, "samples")
+        self._gene_keys = StringTable(directory, "gene_keys")
+        self._gene_key_rows = np.frombuffer(map_file(directory, "gene_keys.row"), dtype=np.int32)
+        self.values = np.frombuffer(map_file(directory, "values.f32"), dtype=np.float32).reshape(
+            self.meta["genes"], self.meta["samples"]
+        )
+        self._sample_columns = None
+
+    @classmethod
+    def open(cls, path: str) -> "ExpressionMatrix":
+        """Open the matrix for a data lake file, converting it first if it is new or has changed."""
+        directory = index_directory("matrix", [path], _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_matrix(path, directory)
+        return cls(directory)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    @property
+    def genes(self) -> list[str]:
+        return [self._genes[i] for i in range(len(self._genes))]
+
+    @property
+    def samples(self) -> list[str]:
+        return [self._samples[i] for i in range(len(self._samples))]
+
+    def gene_rows(self, gene: str | int) -> list[int]:
+        """Rows of a gene; several when a symbol is shared by more than one row."""
+        key = normalize_gene_key(gene)
+        start = bisect.bisect_left(self._gene_keys, key)
+        end = bisect.bisect_right(self._gene_keys, key, lo=start)
+        return [int(row) for row in self._gene_key_rows[start:end]]
+
+    def gene_row(self, gene: str | int) -> int:
+        rows = self.gene_rows(gene)
+        if not rows:
+            raise KeyError(f"Gene {gene!r} is not in the matrix")
+        return rows[0]
+
+    def sample_column(self, sample: str) -> int:
+        if self._sample_columns is None:
+            self._sample_columns = {name: index for index, name in enumerate(self.samples)}
+        if sample not in self._sample_columns:
+            raise KeyError(f"Sample {sample!r} is not in the matrix")
+        return self._sample_columns[sample]
+
+    def row(self, gene: str | int):
+        """A gene's values across all samples (read-only view)."""
+        return self.values[self.gene_row(gene)]
+
+    def column(self, sample: str):
+        """A sample's values across all genes (read-only strided view)."""
+        return self.values[:, self.sample_column(sample)]
+
+    def get(self, genes: Iterable[str] | None = None, samples: Iterable[str] | None = None) -> pd.DataFrame:
+        """Sub-matrix as a DataFrame with genes as rows and samples as columns."""
+        rows = np.arange(self.shape[0]) if genes is None else [self.gene_row(gene) for gene in genes]
+        columns = np.arange(self.shape[1]) if samples is None else [self.sample_column(s) for s in samples]
+        return pd.DataFrame(
+            self.values[np.ix_(rows, columns)],
+            index=[self._genes[i] for i in rows],
+            columns=[self._samples[i] for i in columns],
+        )
+
+    def _blocks(self):
+        size = max(1, _BLOCK_VALUES // max(self.shape[1], 1))
+        for start in range(0, self.shape[0], size):
+            yield start, self.values[start : start + size].astype(np.float64)
+
+    def correlation(self, genes: Iterable[str], min_samples: int = 3) -> pd.DataFrame:
+        """Pearson correlation matrix of the given genes over samples where both are measured."""
+        genes = list(genes)
+        profiles = self.values[[self.gene_row(gene) for gene in genes]].astype(np.float64)
+        return pd.DataFrame(_pearson(profiles, profiles, min_samples), index=genes, columns=genes)
+
+    def top_correlated(self, gene: str, k: int = 20, min_samples: int = 10, absolute: bool = False) -> pd.DataFrame:
+        """Genes whose profiles correlate best with a gene's profile across samples.
+
+        Args:
+            gene: Gene symbol or ID
+            k: Number of genes to return
+            min_samples: Ignore genes measured together with the query in fewer samples
+            absolute: Rank by absolute correlation, so anti-correlated genes are included
+
+        Returns:
+            DataFrame with gene, correlation and samples (number of samples used), best first
+        """
+        query_row = self.gene_row(gene)
+        target = self.values[query_row : query_row + 1].astype(np.float64)
+        target_mask = (~np.isnan(target)).astype(np.float64)
+        correlations = np.empty(self.shape[0])
+        counts = np.empty(self.shape[0])
+        for start, block in self._blocks():
+            correlations[start : start + len(block)] = _pearson(target, block, min_samples)[0]
+            counts[start : start + len(block)] = (~np.isnan(block)) @ target_mask[0]
+        correlations[query_row] = np.nan
+        scores = np.abs(correlations) if absolute else correlations.copy()
+        scores[np.isnan(scores)] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return pd.DataFrame(columns=["gene", "correlation", "samples"])
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return pd.DataFrame(
+            {
+                "gene": [self._genes[i] for i in best],
+                "correlation": correlations[best],
+                "samples": counts[best].astype(np.int64),
+            }
+        )
+
+    def rank_samples(self, gene: str, ascending: bool = False, top: int | None = None) -> pd.Series:
+        """Samples (e.g. GTEx tissues) ordered by a gene's value, highest first by default."""
+        values = self.row(gene)
+        present = np.flatnonzero(~np.isnan(values))
+        order = present[np.argsort(values[present] if ascending else -values[present], kind="stable")][:top]
+        return pd.Series(values[order], index=[self._samples[i] for i in order], name=self._genes[self.gene_row(gene)])
+
+    def rank_genes(self, sample: str, k: int = 20, specificity: bool = False) -> pd.DataFrame:
+        """Genes with the highest values in a sample.
+
+        Args:
+            sample: Sample name (GTEx tissue, DepMap model ID)
+            k: Number of genes to return
+            specificity: Rank by z-score of the sample's value against the gene's values in
+                all samples (tissue-specific genes) instead of by raw value
+
+        Returns:
+            DataFrame with gene, value and (with specificity) z_score, best first
+        """
+        column = self.sample_column(sample)
+        values = self.values[:, column].astype(np.float64)
+        if specificity:
+            scores = np.empty(self.shape[0])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                for start, block in self._blocks():
+                    measured = (~np.isnan(block)).sum(axis=1)
+                    mean = np.nansum(block, axis=1) / measured
+                    std = np.sqrt(np.nansum((block - mean[:, None]) ** 2, axis=1) / measured)
+                    scores[start : start + len(block)] = (block[:, column] - mean) / std
+        else:
+            scores = values.copy()
+        scores[~np.isfinite(scores)] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return pd.DataFrame(columns=["gene", "value"])
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        result = pd.DataFrame({"gene": [self._genes[i] for i in best], "value": values[best]})
+        if specificity:
+            result["z_score"] = scores[best]
+        return result
+
+
+_matrices: dict[str, ExpressionMatrix] = {}
+_matrices_lock = threading.Lock()
+
+
+def get_expression_matrix(name: str, data_lake_path: str | None = None) -> ExpressionMatrix:
+    """Return the process-wide matrix for a data lake file, building it on first use.
+
+    Args:
+        name: A key of MATRICES ("gtex", "depmap_expression", "depmap_effect",
+            "depmap_dependency") or a data lake file name
+        data_lake_path: Data lake directory. Defaults to the one under default_config.path.
+    """
+    if np is None or pq is None:
+        raise ImportError("Expression matrices require pyarrow and numpy: pip install pyarrow numpy")
+    path = os.path.join(data_lake_path or default_data_lake_path(), MATRICES.get(name, name))
+    directory = index_directory("matrix", [path], _FORMAT_VERSION)
+    matrix = _matrices.get(path)
+    if matrix is None or matrix.directory != directory:
+        with _matrices_lock:
+            matrix = _matrices.get(path)
+            if matrix is None or matrix.directory != directory:
+                matrix = _matrices[path] = ExpressionMatrix.open(path)
+    return matrix
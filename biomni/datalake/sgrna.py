@@ -0,0 +1,180 @@
+"""Gene-indexed store of the pre-computed CRISPR knockout sgRNA libraries.
+
+sgRNA_KO_SP_human.txt and sgRNA_KO_SP_mouse.txt hold ranked SpCas9 knockout
+guides for every gene. SgRNALibrary converts a library once into guide sequences
+sorted by target gene and Combined Rank, with a sorted gene symbol index, stored
+under the data lake index cache. Looking up the best guides of a gene is then a
+binary search and a slice, and guides for hundreds of genes come from one call.
+
+Usage:
+    from biomni.datalake import get_sgrna_library
+
+    library = get_sgrna_library(os.path.join(data_lake_path, "sgRNA_KO_SP_human.txt"))
+    library.guides("EGFR", 4)
+    library.design(["EGFR", "TP53", "KRAS"], 4)  # {gene: [guides]}
+"""
+
+import bisect
+import os
+import threading
+from collections.abc import Iterable
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_array,
+    read_json,
+    write_array,
+    write_json,
+)
+from biomni.datalake.convert import convert_table
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # optional: the sgRNA store needs pyarrow and numpy
+    np = None
+    pa = None
+    pc = None
+    pa_csv = None
+    pq = None
+
+# Bump when the on-disk layout changes so existing stores are rebuilt
+_FORMAT_VERSION = 1
+
+_GENE_COLUMN = "Target Gene Symbol"
+_SEQUENCE_COLUMN = "sgRNA Sequence"
+_RANK_COLUMN = "Combined Rank"
+
+
+def _read_library(path: str):
+    columns = [_GENE_COLUMN, _SEQUENCE_COLUMN, _RANK_COLUMN]
+    source = convert_table(path)
+    if source is not None:
+        return pq.read_table(source, columns=columns)
+    return pa_csv.read_csv(
+        path,
+        parse_options=pa_csv.ParseOptions(delimiter="\t"),
+        convert_options=pa_csv.ConvertOptions(include_columns=columns),
+    )
+
+
+def _build_library(path: str, directory: str) -> None:
+    table = _read_library(path)
+    table = table.filter(pc.is_valid(table.column(_GENE_COLUMN)))
+    genes = pc.utf8_upper(table.column(_GENE_COLUMN).cast(pa.string())).combine_chunks()
+    ranks = table.column(_RANK_COLUMN).cast(pa.float64()).to_numpy()
+
+    # Guides of a gene are contiguous and in Combined Rank order (missing ranks last)
+    encoded = pc.dictionary_encode(genes)
+    symbols = encoded.dictionary.to_pylist()
+    symbol_order = np.argsort(np.array(symbols, dtype=object)).astype(np.int64)
+    symbol_rank = np.empty(len(symbols), dtype=np.int64)
+    symbol_rank[symbol_order] = np.arange(len(symbols))
+    gene_ids = symbol_rank[encoded.indices.to_numpy(zero_copy_only=False)]
+    order = np.lexsort((ranks, gene_ids))
+    pointers = np.zeros(len(symbols) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(gene_ids, minlength=len(symbols)), out=pointers[1:])
+
+    sequences = table.column(_SEQUENCE_COLUMN).cast(pa.string()).take(pa.array(order)).to_pylist()
+    with building(directory) as scratch:
+        StringTable.write(scratch, "genes", (symbols[i] for i in symbol_order))
+        StringTable.write(scratch, "sequences", (sequence or "" for sequence in sequences))
+        write_array(scratch, "guides.ptr", "q", pointers)
+        write_array(scratch, "guides.rank", "d", ranks[order])
+        write_json(
+            scratch,
+            "meta.json",
+            {"version": _FORMAT_VERSION, "source": path, "genes": len(symbols), "guides": len(order)},
+        )
+
+
+class SgRNALibrary:
+    """Read-only sgRNA library indexed by upper-cased target gene symbol."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        self._genes = StringTable(directory, "genes")
+        self._sequences = StringTable(directory, "sequences")
+        self._pointers = map_array(directory, "guides.ptr", "q")
+        self._ranks = map_array(directory, "guides.rank", "d")
+        self._symbols = None
+
+    @classmethod
+    def open(cls, path: str) -> "SgRNALibrary":
+        """Open the store for a library file, building it first if the file is new or has changed."""
+        directory = index_directory("sgrna", [path], _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_library(path, directory)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self._genes)
+
+    def __contains__(self, gene: str) -> bool:
+        return self._position(gene.upper()) is not None
+
+    def _position(self, symbol: str) -> int | None:
+        position = bisect.bisect_left(self._genes, symbol)
+        if position < len(self._genes) and self._genes[position] == symbol:
+            return position
+        return None
+
+    def guides(self, gene: str, num_guides: int = 1, partial: bool = True) -> list[str]:
+        """Best guides for a gene by Combined Rank.
+
+        Args:
+            gene: Target gene symbol, matched case-insensitively
+            num_guides: Number of guides to return
+            partial: If the symbol has no exact match, rank the guides of every gene whose
+                symbol contains it, as design_knockout_sgrna always did
+
+        Returns:
+            Guide sequences, best first (empty if the gene is not in the library)
+        """
+        symbol = gene.upper()
+        position = self._position(symbol)
+        if position is not None:
+            start = self._pointers[position]
+            end = min(self._pointers[position + 1], start + max(num_guides, 0))
+            return [self._sequences[row] for row in range(start, end)]
+        if not partial or not symbol:
+            return []
+
+        if self._symbols is None:
+            self._symbols = [self._genes[i] for i in range(len(self._genes))]
+        rows = [
+            row
+            for position, candidate in enumerate(self._symbols)
+            if symbol in candidate
+            for row in range(self._pointers[position], self._pointers[position + 1])
+        ]
+        rows.sort(key=lambda row: (np.isnan(self._ranks[row]), self._ranks[row]))
+        return [self._sequences[row] for row in rows[: max(num_guides, 0)]]
+
+    def design(self, genes: Iterable[str], num_guides: int = 1, partial: bool = True) -> dict[str, list[str]]:
+        """Best guides for many genes at once, keyed by upper-cased symbol."""
+        return {gene.upper(): self.guides(gene, num_guides, partial) for gene in genes}
+
+
+_libraries: dict[str, SgRNALibrary] = {}
+_libraries_lock = threading.Lock()
+
+
+def get_sgrna_library(path: str) -> SgRNALibrary:
+    """Return the process-wide store for an sgRNA library file, building it on first use."""
+    if np is None or pa is None:
+        raise ImportError("The sgRNA store requires pyarrow and numpy: pip install pyarrow numpy")
+    directory = index_directory("sgrna", [path], _FORMAT_VERSION)
+    library = _libraries.get(path)
+    if library is None or library.directory != directory:
+        with _libraries_lock:
+            library = _libraries.get(path)
+            if library is None or library.directory != directory:
+                library = _libraries[path] = SgRNALibrary.open(path)
+    return library
@@ -0,0 +1,179 @@
+"""Columnar queries over data lake tables.
+
+Reading a whole parquet or CSV file with pandas to keep a handful of rows costs
+seconds and gigabytes. The functions here scan data lake tables with pyarrow
+datasets instead: only the requested columns are read, filters are pushed down to
+skip parquet row groups whose statistics cannot match, and results come back as
+Arrow tables (convert with .to_pandas() when needed). Memory use follows the
+selected rows, not the file size.
+
+Usage:
+    from biomni.datalake import query_table
+
+    df = query_table(
+        "DisGeNET.parquet",
+        columns=["geneSymbol", "diseaseName", "score"],
+        filters=[("geneSymbol", "in", ["TP53", "BRCA1"]), ("score", ">=", 0.3)],
+        as_pandas=True,
+    )
+"""
+
+import os
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from biomni.config import default_config
+from biomni.datalake.convert import prefer_parquet
+
+try:
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # optional: columnar queries need pyarrow
+    pa_csv = None
+    ds = None
+    pq = None
+
+# Delimiters of the text formats that can be scanned, by extension (a trailing .gz is allowed)
+_TEXT_DELIMITERS = {".csv": ",", ".tsv": "\t", ".txt": "\t"}
+
+_datasets: dict[tuple[str, int, int], Any] = {}
+_datasets_lock = threading.Lock()
+
+
+def default_data_lake_path() -> str:
+    """Data lake directory of the default agent path."""
+    return os.path.join(default_config.path, "biomni_data", "data_lake")
+
+
+def resolve_table_path(table: str, data_lake_path: str | None = None) -> str:
+    """Resolve a data lake file name (e.g. "omim.parquet") or a path to an existing file."""
+    if os.path.isfile(table):
+        return table
+    path = os.path.join(data_lake_path or default_data_lake_path(), table)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Data lake table not found: {path}")
+    return path
+
+
+def _file_format(path: str):
+    name = path[:-3] if path.endswith(".gz") else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".parquet":
+        return "parquet"
+    if extension in _TEXT_DELIMITERS:
+        parse_options = pa_csv.ParseOptions(delimiter=_TEXT_DELIMITERS[extension])
+        return ds.CsvFileFormat(parse_options=parse_options)
+    raise ValueError(
+        f"{os.path.basename(path)} is not a tabular data lake file; "
+        "only .parquet, .csv, .tsv and tab-separated .txt files can be queried"
+    )
+
+
+def open_table(table: str, data_lake_path: str | None = None):
+    """Open a data lake table as a pyarrow Dataset without reading its rows.
+
+    Text tables are served from their Parquet conversion when there is one (see
+    biomni.datalake.convert). Datasets are cached per file and reopened when the file
+    changes, so repeated queries do not re-read parquet footers.
+
+    Args:
+        table: File name in the data lake (e.g. "gene_info.parquet") or a path to a file
+        data_lake_path: Data lake directory. Defaults to the one under default_config.path.
+
+    Returns:
+        pyarrow.dataset.Dataset
+    """
+    if ds is None:
+        raise ImportError("Columnar data lake queries require pyarrow: pip install pyarrow")
+    # Large text tables are read from their Parquet copy, converting them on first use
+    path = prefer_parquet(resolve_table_path(table, data_lake_path))
+    stat = os.stat(path)
+    key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    dataset = _datasets.get(key)
+    if dataset is None:
+        dataset = ds.dataset(path, format=_file_format(path))
+        with _datasets_lock:
+            _datasets[key] = dataset
+    return dataset
+
+
+def table_schema(table: str, data_lake_path: str | None = None) -> dict[str, str]:
+    """Column names and Arrow types of a data lake table, without reading its rows."""
+    return {field.name: str(field.type) for field in open_table(table, data_lake_path).schema}
+
+
+def _to_expression(filters):
+    """Convert filters to a pyarrow dataset expression.
+
+    Accepts an expression as is, a dict of {column: value} (equality) or {column: [values]}
+    (membership), or DNF tuples as in pandas.read_parquet: a list of (column, op, value)
+    tuples that must all hold, or a list of such lists of which any may hold.
+    """
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    if isinstance(filters, dict):
+        filters = [
+            (column, "in", list(value)) if isinstance(value, list | tuple | set) else (column, "==", value)
+            for column, value in filters.items()
+        ]
+    if not filters:
+        return None
+    return pq.filters_to_expression(filters)
+
+
+def query_table(
+    table: str,
+    columns: list[str] | None = None,
+    filters=None,
+    limit: int | None = None,
+    data_lake_path: str | None = None,
+    as_pandas: bool = False,
+):
+    """Read selected columns and rows of a data lake table.
+
+    Only the listed columns are read, and for parquet files row groups whose min/max
+    statistics rule out the filters are skipped without being decoded.
+
+    Args:
+        table: File name in the data lake (e.g. "omim.parquet") or a path to a file
+        columns: Columns to return. Defaults to all columns.
+        filters: Row filter as a dict ({"gene": "TP53"}, {"gene": ["TP53", "MDM2"]}), a list of
+            (column, op, value) tuples combined with AND (ops: ==, !=, <, <=, >, >=, in, not in),
+            or a pyarrow.dataset expression such as ds.field("score") > 0.5
+        limit: Stop after this many matching rows
+        data_lake_path: Data lake directory. Defaults to the one under default_config.path.
+        as_pandas: Return a pandas DataFrame instead of a pyarrow Table
+
+    Returns:
+        pyarrow.Table, or pandas.DataFrame if as_pandas is True
+    """
+    dataset = open_table(table, data_lake_path)
+    expression = _to_expression(filters)
+    if limit is not None:
+        result = dataset.head(limit, columns=columns, filter=expression)
+    else:
+        result = dataset.to_table(columns=columns, filter=expression)
+    return result.to_pandas() if as_pandas else result
+
+
+def iter_table_batches(
+    table: str,
+    columns: list[str] | None = None,
+    filters=None,
+    batch_size: int = 131_072,
+    data_lake_path: str | None = None,
+) -> Iterator:
+    """Stream the selected columns and rows of a data lake table as pyarrow RecordBatches.
+
+    Use this to aggregate over tables whose selected rows would not fit in memory at once.
+    Arguments are as in query_table.
+    """
+    dataset = open_table(table, data_lake_path)
+    yield from dataset.to_batches(columns=columns, filter=_to_expression(filters), batch_size=batch_size)
+
+
+def count_rows(table: str, filters=None, data_lake_path: str | None = None) -> int:
+    """Number of rows matching the filters; answered from parquet metadata when there are none."""
+    return open_table(table, data_lake_path).count_rows(filter=_to_expression(filters))
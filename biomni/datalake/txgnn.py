@@ -0,0 +1,160 @@
+"""Resident store of the TxGNN drug repurposing predictions.
+
+txgnn_prediction.pkl maps every disease to a {drug ID: raw score} dict, and
+txgnn_name_mapping.pkl maps drug IDs to names. Unpickling both takes seconds, so
+TxGNNPredictions converts them once into a float32 disease-by-drug score matrix
+with disease and drug name tables, stored under the data lake index cache and
+memory-mapped on later loads. Top-k drugs for one or many diseases come from
+argpartition over the matching rows.
+
+Usage:
+    from biomni.datalake import get_txgnn_predictions
+
+    predictions = get_txgnn_predictions(data_lake_path)
+    predictions.top_drugs(["alzheimer disease", "psoriasis"], k=10)
+"""
+
+import os
+import pickle
+import threading
+from difflib import get_close_matches
+
+from biomni.datalake._store import (
+    StringTable,
+    building,
+    index_directory,
+    map_file,
+    read_json,
+    write_json,
+)
+from biomni.datalake.tables import default_data_lake_path
+
+try:
+    import numpy as np
+except ImportError:  # optional: the prediction store needs numpy
+    np = None
+
+# Bump when the on-disk layout changes so existing stores are rebuilt
+_FORMAT_VERSION = 1
+
+
+def _build_predictions(prediction_path: str, mapping_path: str, directory: str) -> None:
+    with open(mapping_path, "rb") as f:
+        mapping = pickle.load(f)
+    with open(prediction_path, "rb") as f:
+        result = pickle.load(f)
+
+    # Drugs are numbered in first-seen order, so ties rank as in the source dicts
+    drug_ids: dict = {}
+    for predictions in result.values():
+        for drug_id in predictions:
+            drug_ids.setdefault(drug_id, len(drug_ids))
+    drug_order = tuple(drug_ids)
+
+    with building(directory) as scratch:
+        scores = np.memmap(
+            os.path.join(scratch, "scores.f32"), dtype=np.float32, mode="w+", shape=(len(result), len(drug_ids))
+        )
+        for row, predictions in enumerate(result.values()):
+            if tuple(predictions) == drug_order:
+                scores[row] = np.fromiter(predictions.values(), dtype=np.float32, count=len(drug_order))
+            else:
+                scores[row] = np.nan
+                columns = np.fromiter((drug_ids[drug_id] for drug_id in predictions), dtype=np.int64)
+                scores[row, columns] = np.fromiter(predictions.values(), dtype=np.float32, count=len(columns))
+        scores.flush()
+        del scores
+
+        id2name = mapping["id2name_drug"]
+        StringTable.write(scratch, "diseases", (str(disease) for disease in result))
+        StringTable.write(scratch, "drug_ids", (str(drug_id) for drug_id in drug_order))
+        StringTable.write(scratch, "drug_names", (str(id2name.get(drug_id, "Unknown Drug")) for drug_id in drug_order))
+        write_json(
+            scratch,
+            "meta.json",
+            {"version": _FORMAT_VERSION, "source": prediction_path, "diseases": len(result), "drugs": len(drug_ids)},
+        )
+
+
+class TxGNNPredictions:
+    """Read-only disease-by-drug matrix of raw TxGNN scores.
+
+    Scores are reported after the sigmoid transform, which does not change the ranking.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.meta = read_json(directory, "meta.json")
+        self.scores = np.frombuffer(map_file(directory, "scores.f32"), dtype=np.float32).reshape(
+            self.meta["diseases"], self.meta["drugs"]
+        )
+        diseases = StringTable(directory, "diseases")
+        self.diseases = [diseases[i] for i in range(len(diseases))]
+        self._rows = {disease: row for row, disease in enumerate(self.diseases)}
+        self._drug_ids = StringTable(directory, "drug_ids")
+        self._drug_names = StringTable(directory, "drug_names")
+
+    @classmethod
+    def open(cls, prediction_path: str, mapping_path: str) -> "TxGNNPredictions":
+        """Open the store for the prediction pickles, building it first if they are new or have changed."""
+        directory = index_directory("txgnn", [prediction_path, mapping_path], _FORMAT_VERSION)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            _build_predictions(prediction_path, mapping_path, directory)
+        return cls(directory)
+
+    def match_disease(self, disease_name: str, cutoff: float = 0.6) -> str | None:
+        """The disease with this exact name, or else the closest fuzzy match (None if none is close enough)."""
+        if disease_name in self._rows:
+            return disease_name
+        matches = get_close_matches(disease_name, self.diseases, n=1, cutoff=cutoff)
+        return matches[0] if matches else None
+
+    def top_drugs(self, diseases: str | list[str], k: int = 5) -> dict[str, list[dict]]:
+        """Top-k predicted drugs for one or many diseases.
+
+        Args:
+            diseases: Disease name(s) as used by TxGNN; see match_disease for other spellings
+            k: Number of drugs per disease
+
+        Returns:
+            Map from disease name to drugs (drug_id, drug_name, score after sigmoid), best first
+        """
+        diseases = [diseases] if isinstance(diseases, str) else list(diseases)
+        rows = self.scores[[self._rows[disease] for disease in diseases]]
+        k = min(k, self.scores.shape[1])
+        if k <= 0:
+            return {disease: [] for disease in diseases}
+        # Missing predictions (NaN) rank last
+        ranked = np.where(np.isnan(rows), -np.inf, rows)
+        best = np.argpartition(-ranked, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(ranked, best, axis=1), axis=1, kind="stable")
+        best = np.take_along_axis(best, order, axis=1)
+        probabilities = 1 / (1 + np.exp(-np.take_along_axis(rows, best, axis=1).astype(np.float64)))
+        return {
+            disease: [
+                {"drug_id": self._drug_ids[column], "drug_name": self._drug_names[column], "score": float(score)}
+                for column, score in zip(columns, scores, strict=True)
+            ]
+            for disease, columns, scores in zip(diseases, best, probabilities, strict=True)
+        }
+
+
+_stores: dict[str, TxGNNPredictions] = {}
+_stores_lock = threading.Lock()
+
+
+def get_txgnn_predictions(data_lake_path: str | None = None) -> TxGNNPredictions:
+    """Return the process-wide TxGNN prediction store for a data lake, building it on first use."""
+    if np is None:
+        raise ImportError("The TxGNN prediction store requires numpy: pip install numpy")
+    data_lake_path = data_lake_path or default_data_lake_path()
+    prediction_path = os.path.join(data_lake_path, "txgnn_prediction.pkl")
+    mapping_path = os.path.join(data_lake_path, "txgnn_name_mapping.pkl")
+    directory = index_directory("txgnn", [prediction_path, mapping_path], _FORMAT_VERSION)
+    store = _stores.get(prediction_path)
+    if store is None or store.directory != directory:
+        with _stores_lock:
+            store = _stores.get(prediction_path)
+            if store is None or store.directory != directory:
+                store = _stores[prediction_path] = TxGNNPredictions.open(prediction_path, mapping_path)
+    return store
@@ -0,0 +1,199 @@
+"""
+Biomni NCBI E-utilities Client
+
+Client for the NCBI Entrez E-utilities (ESearch, EPost, ESummary, EFetch) used by the
+ClinVar, GEO and dbSNP tools. Requests go through the shared HTTP client and are paced
+to NCBI's limit of 3 requests per second, or 10 per second when an API key is set in the
+NCBI_API_KEY environment variable. Large ID lists are uploaded once with EPost and then
+paged from the history server, and ESummary/EFetch results are yielded batch by batch so
+callers can process them as they arrive.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+
+import requests
+
+from biomni.http_client import http_get, http_post, set_host_rate_limit
+
+EUTILS_HOST = "eutils.ncbi.nlm.nih.gov"
+EUTILS_BASE_URL = f"https://{EUTILS_HOST}/entrez/eutils"
+
+# ID lists longer than this are sent with EPost rather than inline
+EPOST_THRESHOLD = 200
+
+# Records requested per ESummary/EFetch page
+DEFAULT_BATCH_SIZE = 500
+
+
+class EUtilsError(RuntimeError):
+    """Raised when an E-utility reports an error in an otherwise successful response."""
+
+
+def _api_key() -> str | None:
+    return os.getenv("NCBI_API_KEY") or None
+
+
+def requests_per_second() -> int:
+    """NCBI's request-rate limit for this client: 10 with an API key, 3 without."""
+    return 10 if _api_key() else 3
+
+
+def _request(utility: str, params: dict, post: bool = False, cache: bool = False) -> requests.Response:
+    """Send one paced E-utility request and raise for HTTP errors."""
+    params = {**params, "tool": "biomni"}
+    api_key = _api_key()
+    if api_key:
+        params["api_key"] = api_key
+    if os.getenv("NCBI_EMAIL"):
+        params["email"] = os.getenv("NCBI_EMAIL")
+
+    # Re-applied on every call so that setting NCBI_API_KEY at runtime takes effect
+    set_host_rate_limit(EUTILS_HOST, requests_per_second())
+
+    url = f"{EUTILS_BASE_URL}/{utility}.fcgi"
+    if post:
+        response = http_post(url, data=params, cache=cache, idempotent=True)
+    else:
+        response = http_get(url, params=params, cache=cache)
+    response.raise_for_status()
+    return response
+
+
+def esearch(db: str, term: str, retmax: int = 20, retstart: int = 0, usehistory: bool = True, **params) -> dict:
+    """Run an ESearch query.
+
+    Args:
+        db: Entrez database, e.g. "clinvar", "gds" or "snp"
+        term: Entrez query string
+        retmax: Maximum number of IDs to return in "ids"
+        retstart: Index of the first ID to return
+        usehistory: Store the full result set on the history server so it can be paged with
+            iter_esummary/iter_efetch
+        **params: Additional ESearch parameters (e.g. sort, datetype)
+
+    Returns:
+        Dict with "count", "ids", "webenv", "query_key" and "translation" (the query as NCBI interpreted it)
+    """
+    search_params = {"db": db, "term": term, "retmax": retmax, "retstart": retstart, "retmode": "json", **params}
+    if usehistory:
+        search_params["usehistory"] = "y"
+    result = _request("esearch", search_params).json().get("esearchresult", {})
+    if "ERROR" in result:
+        raise EUtilsError(result["ERROR"])
+    return {
+        "count": int(result.get("count", 0)),
+        "ids": result.get("idlist", []),
+        "webenv": result.get("webenv"),
+        "query_key": result.get("querykey"),
+        "translation": result.get("querytranslation"),
+    }
+
+
+def epost(db: str, ids: Iterable) -> tuple[str, str]:
+    """Upload an ID list to the history server.
+
+    Returns:
+        (webenv, query_key) referencing the uploaded set
+    """
+    response = _request("epost", {"db": db, "id": ",".join(str(i) for i in ids)}, post=True)
+    root = ET.fromstring(response.content)
+    error = root.findtext("ERROR")
+    if error:
+        raise EUtilsError(error)
+    return root.findtext("WebEnv"), root.findtext("QueryKey")
+
+
+def _iter_pages(
+    utility: str,
+    db: str,
+    ids: Iterable | None,
+    webenv: str | None,
+    query_key: str | None,
+    max_records: int | None,
+    batch_size: int,
+    params: dict,
+) -> Iterator[requests.Response]:
+    """Yield one response per page of an ID list or history server result set."""
+    if ids is not None:
+        ids = [str(i) for i in ids][:max_records]
+        if len(ids) <= EPOST_THRESHOLD:
+            # Short lists are sent inline; the responses are tied to the IDs alone, so they can be cached
+            for start in range(0, len(ids), batch_size):
+                page = {"db": db, "id": ",".join(ids[start : start + batch_size]), **params}
+                yield _request(utility, page, post=True, cache=True)
+            return
+        webenv, query_key = epost(db, ids)
+        total = len(ids)
+    elif webenv and query_key:
+        if max_records is None:
+            raise ValueError("max_records is required when paging a history server result set")
+        total = max_records
+    else:
+        raise ValueError("Either ids or webenv and query_key must be provided")
+
+    for start in range(0, total, batch_size):
+        page = {
+            "db": db,
+            "WebEnv": webenv,
+            "query_key": query_key,
+            "retstart": start,
+            "retmax": min(batch_size, total - start),
+            **params,
+        }
+        yield _request(utility, page)
+
+
+def iter_esummary(
+    db: str,
+    ids: Iterable | None = None,
+    webenv: str | None = None,
+    query_key: str | None = None,
+    max_records: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[dict]:
+    """Yield ESummary document summaries page by page.
+
+    Pass either an ID list (uploaded with EPost when it is long) or the webenv/query_key of an
+    earlier ESearch or EPost together with max_records (typically the ESearch count).
+
+    Yields:
+        One summary dict per record, each including its "uid"
+    """
+    for response in _iter_pages("esummary", db, ids, webenv, query_key, max_records, batch_size, {"retmode": "json"}):
+        data = response.json()
+        if "error" in data:
+            raise EUtilsError(data["error"])
+        result = data.get("result", {})
+        for uid in result.get("uids", []):
+            record = result.get(uid)
+            if record:
+                record.setdefault("uid", uid)
+                yield record
+
+
+def esummary(db: str, ids: Iterable | None = None, **kwargs) -> list[dict]:
+    """Fetch all ESummary records for an ID list or history reference. See iter_esummary."""
+    return list(iter_esummary(db, ids, **kwargs))
+
+
+def iter_efetch(
+    db: str,
+    ids: Iterable | None = None,
+    webenv: str | None = None,
+    query_key: str | None = None,
+    max_records: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    rettype: str | None = None,
+    retmode: str = "xml",
+) -> Iterator[str]:
+    """Yield EFetch output one page at a time, as text in the requested rettype/retmode.
+
+    Accepts the same ID list or history reference arguments as iter_esummary.
+    """
+    params = {"retmode": retmode}
+    if rettype:
+        params["rettype"] = rettype
+    for response in _iter_pages("efetch", db, ids, webenv, query_key, max_records, batch_size, params):
+        yield response.text
@@ -0,0 +1,363 @@
+"""
+Biomni HTTP Client
+
+Shared HTTP layer used by the database, literature and download helpers.
+All requests go through one pooled requests.Session (keep-alive), get connect
+and read timeouts by default, are retried with jittered exponential backoff on
+connection errors, 429 and 5xx responses, and are limited to a fixed number of
+concurrent requests per host (a streamed response keeps its slot until it is
+closed). Requests that are not idempotent, such as most POSTs, are only retried
+when they certainly never reached the server, unless marked idempotent=True. Hosts with a published request-rate limit (such as
+NCBI E-utilities) can additionally be paced with set_host_rate_limit. Requests made with cache=True are served from and
+stored in the persistent HTTP cache (see biomni.cache). File downloads go through
+download_file, which streams to disk and reuses earlier downloads from the
+artifact cache.
+"""
+
+import contextlib
+import os
+import random
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import NewConnectionError
+
+from biomni.cache import get_artifact_cache, get_http_cache
+from biomni.config import default_config
+
+# Status codes that are worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Methods that can be repeated without changing the result (RFC 9110); others are retried only when safe
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+
+# Upper bound for a single backoff sleep, in seconds
+_MAX_BACKOFF_SECONDS = 30.0
+
+# Bytes read per chunk when streaming downloads to disk
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+_host_rate_limiters: dict[str, "_RateLimiter"] = {}
+
+
+class _RateLimiter:
+    """Spaces out requests so that no more than `rate` are started per second."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries are handled in http_request so they can use jitter and honour Retry-After
+                adapter = HTTPAdapter(
+                    pool_connections=32,
+                    pool_maxsize=default_config.http_max_connections_per_host,
+                    max_retries=0,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(default_config.http_max_connections_per_host)
+            _host_semaphores[host] = semaphore
+    return semaphore
+
+
+def set_host_rate_limit(host: str, requests_per_second: float | None) -> None:
+    """Limit how many requests per second this process sends to a host.
+
+    Applies to requests that reach the network, including retries; cache hits are not paced.
+
+    Args:
+        host: Host name as it appears in request URLs, e.g. "eutils.ncbi.nlm.nih.gov"
+        requests_per_second: Maximum request rate, or None to remove the limit
+    """
+    host = host.lower()
+    with _host_semaphores_lock:
+        if requests_per_second is None:
+            _host_rate_limiters.pop(host, None)
+            return
+        limiter = _host_rate_limiters.get(host)
+        if limiter is None or limiter.rate != requests_per_second:
+            _host_rate_limiters[host] = _RateLimiter(requests_per_second)
+
+
+def _hold_until_closed(response: requests.Response, semaphore: threading.BoundedSemaphore) -> None:
+    """Release a host slot when a streamed response is closed, or garbage collected without being closed."""
+    lock = threading.Lock()
+    held = [True]
+
+    def release():
+        with lock:
+            if not held[0]:
+                return
+            held[0] = False
+        semaphore.release()
+
+    close = response.close
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            release()
+
+    response.close = close_and_release
+    weakref.finalize(response, release)
+
+
+def _request_not_sent(error: requests.exceptions.RequestException) -> bool:
+    """Whether a failed request certainly never reached the server, because no connection was opened."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _backoff_delay(attempt: int, response: requests.Response | None = None) -> float:
+    """Full-jitter exponential backoff, honouring a numeric Retry-After header when present."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), _MAX_BACKOFF_SECONDS)
+    return random.uniform(0, min(_MAX_BACKOFF_SECONDS, 0.5 * 2**attempt))
+
+
+def _response_from_cache(entry: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = entry["encoding"]
+    response.url = entry["url"]
+    response._content = entry["body"]
+    response.from_cache = True
+    return response
+
+
+def _cached_request(
+    method: str, url: str, ttl: int | None, cacheable: Callable[[requests.Response], bool] | None, **kwargs
+) -> requests.Response:
+    """Serve a request from the HTTP cache, revalidating or refetching stale entries."""
+    cache = get_http_cache()
+    prepared = requests.Request(
+        method,
+        url,
+        params=kwargs.get("params"),
+        data=kwargs.get("data"),
+        json=kwargs.get("json"),
+        headers=kwargs.get("headers"),
+    ).prepare()
+    key = cache.make_key(method, prepared.url, prepared.body, prepared.headers.get("Accept"))
+
+    entry = cache.get(key)
+    if entry is not None and entry["fresh"]:
+        return _response_from_cache(entry)
+
+    if entry is not None and (entry["etag"] or entry["last_modified"]):
+        headers = dict(kwargs.get("headers") or {})
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        kwargs["headers"] = headers
+
+    response = http_request(method, url, cache=False, **kwargs)
+    if response.status_code == 304 and entry is not None:
+        cache.refresh(key, prepared.url, response.headers)
+        return _response_from_cache(entry)
+
+    response.from_cache = False
+    if cacheable is not None and not cacheable(response):
+        return response
+    # Store the final URL so callers that inspect response.url after redirects see the same value
+    cache.set(key, response.url, response.status_code, response.headers, response.content, response.encoding, ttl)
+    return response
+
+
+def http_request(
+    method: str,
+    url: str,
+    timeout: float | tuple[float, float] | None = None,
+    retries: int | None = None,
+    cache: bool = False,
+    cache_ttl: int | None = None,
+    cacheable: Callable[[requests.Response], bool] | None = None,
+    idempotent: bool | None = None,
+    **kwargs,
+) -> requests.Response:
+    """Send an HTTP request through the shared session.
+
+    Accepts the same keyword arguments as requests.request (params, headers, json,
+    data, stream, ...) and returns the final requests.Response. Like requests, it does
+    not raise for HTTP error statuses; call raise_for_status() on the result.
+
+    A streamed response (stream=True) holds its per-host slot until it is closed, so use it
+    as a context manager or close it once its body has been read.
+
+    Args:
+        method: HTTP method, e.g. "GET" or "POST"
+        url: Full URL to request
+        timeout: Seconds, or a (connect, read) tuple. Defaults to the configured HTTP timeouts.
+        retries: Number of retries after the first attempt. Defaults to default_config.http_max_retries.
+        cache: Serve the request from the persistent HTTP cache when possible, and store successful
+            responses. Ignored for streamed requests or when default_config.http_cache is False.
+        cache_ttl: Freshness lifetime in seconds for the stored response, overriding the
+            Cache-Control and per-host defaults.
+        cacheable: Called with a successful response before it is stored; return False to keep it
+            out of the cache (e.g. an API that reports errors in a 200 body).
+        idempotent: Whether the request may be repeated safely. Defaults to True for GET, HEAD,
+            OPTIONS, PUT, DELETE and TRACE. Other requests (e.g. a POST that submits a job) are only
+            retried when the connection could not be opened, or after a 429 response; pass True for
+            POSTs that only query data.
+
+    Returns:
+        The requests.Response of the last attempt
+
+    Raises:
+        requests.exceptions.RequestException: If the request still fails after all retries
+    """
+    if cache and default_config.http_cache and not kwargs.get("stream"):
+        return _cached_request(
+            method, url, cache_ttl, cacheable, timeout=timeout, retries=retries, idempotent=idempotent, **kwargs
+        )
+
+    if timeout is None:
+        timeout = (default_config.http_connect_timeout, default_config.http_timeout)
+    if retries is None:
+        retries = default_config.http_max_retries
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+    session = get_http_session()
+    semaphore = _host_semaphore(url)
+    rate_limiter = _host_rate_limiters.get(urlsplit(url).netloc.lower())
+
+    for attempt in range(retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        semaphore.acquire()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            semaphore.release()
+            if attempt == retries or not (idempotent or _request_not_sent(e)):
+                raise
+            time.sleep(_backoff_delay(attempt))
+            continue
+        except BaseException:
+            semaphore.release()
+            raise
+
+        if kwargs.get("stream"):
+            # The body is read after we return, so the connection stays in use until the response is closed
+            _hold_until_closed(response, semaphore)
+        else:
+            semaphore.release()
+
+        # A 429 means the request was turned away without being processed
+        retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUS_CODES)
+        if retryable and attempt < retries:
+            delay = _backoff_delay(attempt, response)
+            response.close()
+            time.sleep(delay)
+            continue
+
+        return response
+
+    # Unreachable: the last attempt either returns or raises
+    raise RuntimeError("HTTP retry loop exited unexpectedly")
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """Send a GET request through the shared session. See http_request."""
+    return http_request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """Send a POST request through the shared session. See http_request."""
+    return http_request("POST", url, **kwargs)
+
+
+def download_file(url: str, dest: str, cache: bool = True, link: bool | None = None, **kwargs) -> str:
+    """Download a URL to a file, streaming the body to disk.
+
+    With the artifact cache enabled, a URL that was downloaded before is not fetched
+    again: the stored copy is copied (or reflinked) to dest. New downloads are stored
+    by content hash, so identical files from different URLs share one copy. Either
+    way dest is replaced atomically and never holds a partial download.
+
+    Args:
+        url: URL of the file
+        dest: Path to write, including the file name. Parent directories are created.
+        cache: Use the artifact cache. Ignored when default_config.artifact_cache is False.
+        link: Hardlink the cached copy to dest instead of copying it, saving space; dest is then
+            read-only and shares the cached file. Defaults to default_config.artifact_cache_hardlinks.
+        **kwargs: Passed to http_get (headers, timeout, ...)
+
+    Returns:
+        dest
+
+    Raises:
+        requests.exceptions.HTTPError: If the server answers with an error status
+        requests.exceptions.RequestException: If the download fails after all retries
+    """
+    artifacts = get_artifact_cache() if cache and default_config.artifact_cache else None
+    if artifacts is not None:
+        source = artifacts.lookup(url)
+        if source is None:
+            with http_get(url, stream=True, **kwargs) as response:
+                response.raise_for_status()
+                source = artifacts.store(
+                    url, response.iter_content(_DOWNLOAD_CHUNK_SIZE), response.headers.get("Content-Type")
+                )
+        return artifacts.place(source, dest, link=default_config.artifact_cache_hardlinks if link is None else link)
+
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    partial = f"{dest}.partial"
+    try:
+        with http_get(url, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            with open(partial, "wb") as handle:
+                for chunk in response.iter_content(_DOWNLOAD_CHUNK_SIZE):
+                    handle.write(chunk)
+        os.replace(partial, dest)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(partial)
+        raise
+    return dest
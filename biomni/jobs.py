@@ -0,0 +1,309 @@
+"""
+Biomni Background Jobs
+
+Small job manager for slow remote services that work by submit-then-poll (NCBI
+BLAST, EBI HMMER, ...). Tools that support it take background=True and return a
+JobHandle immediately; the job runs in a background thread that polls the service
+with exponential backoff. The agent can keep working and later check, await or
+gather several handles, so independent remote jobs overlap instead of running
+one after another.
+
+Usage:
+    from biomni.jobs import gather_jobs
+
+    jobs = [blast_sequence(seq, "core_nt", "blastn", background=True) for seq in sequences]
+    results = gather_jobs(jobs, timeout=900)
+
+Jobs are tracked until their result is collected with await_job or gather_jobs, or
+they are dropped with forget_job; at most _MAX_FINISHED_JOBS finished jobs that
+nobody collected are kept, oldest dropped first.
+"""
+
+import itertools
+import random
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+# Returned by a poll function while the remote job is still running
+PENDING = object()
+
+# Background threads shared by all jobs; pollers spend most of their time sleeping
+_MAX_WORKERS = 32
+_MAX_POLLERS = 32
+
+# Uncollected finished jobs kept in the registry (their results stay in memory until dropped)
+_MAX_FINISHED_JOBS = 256
+
+
+class JobHandle:
+    """Handle to a job running in the background.
+
+    Attributes:
+        id: Short identifier, unique within this process (e.g. "job-3")
+        name: Human readable description of the job
+        submitted_at: Submission time (time.time())
+    """
+
+    def __init__(self, job_id: str, name: str, future: Future, cancel_event: threading.Event | None = None):
+        self.id = job_id
+        self.name = name
+        self.submitted_at = time.time()
+        self._future = future
+        self._cancel_event = cancel_event
+
+    @property
+    def status(self) -> str:
+        """One of "running", "done", "failed" or "cancelled"."""
+        if self._future.cancelled() or (
+            self._cancel_event is not None and self._cancel_event.is_set() and self._future.done()
+        ):
+            return "cancelled"
+        if not self._future.done():
+            return "running"
+        return "failed" if self._future.exception() is not None else "done"
+
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self._future.done()
+
+    def result(self, timeout: float | None = None) -> Any:
+        """Wait for the job and return its result, re-raising its exception if it failed.
+
+        Raises:
+            TimeoutError: If the job is still running after `timeout` seconds
+        """
+        return self._future.result(timeout)
+
+    def exception(self, timeout: float | None = None) -> BaseException | None:
+        """Wait for the job and return its exception, or None if it succeeded."""
+        return self._future.exception(timeout)
+
+    def cancel(self) -> bool:
+        """Stop the job and discard it.
+
+        Jobs still queued and polling jobs can always be stopped; a blocking call that has
+        already started cannot be interrupted. Returns False if the job has already finished
+        or could not be stopped.
+        """
+        if self._future.done():
+            return False
+        if self._future.cancel():
+            return True
+        if self._cancel_event is None:
+            return False
+        self._cancel_event.set()
+        return True
+
+    def info(self) -> dict:
+        """Summary of the job's state, suitable for printing."""
+        info = {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "elapsed_seconds": round(time.time() - self.submitted_at, 1),
+        }
+        if info["status"] == "failed":
+            info["error"] = str(self._future.exception())
+        return info
+
+    def __repr__(self) -> str:
+        return f"<JobHandle {self.id} {self.name!r}: {self.status}>"
+
+
+class JobManager:
+    """Runs blocking calls and submit/poll jobs in background threads and keeps track of their handles.
+
+    Polling jobs run in their own pool, so a blocking job may submit a polling job and wait
+    for it (as the background mode of the BLAST and HMMER tools does) without being able to
+    starve it of threads.
+    """
+
+    def __init__(
+        self, max_workers: int = _MAX_WORKERS, max_pollers: int = _MAX_POLLERS, max_finished: int = _MAX_FINISHED_JOBS
+    ):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="biomni-job")
+        self._poll_pool = ThreadPoolExecutor(max_workers=max_pollers, thread_name_prefix="biomni-poll")
+        self._jobs: dict[str, JobHandle] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.max_finished = max_finished
+
+    def _register(self, name: str, future: Future, cancel_event: threading.Event | None = None) -> JobHandle:
+        with self._lock:
+            handle = JobHandle(f"job-{next(self._ids)}", name, future, cancel_event)
+            self._jobs[handle.id] = handle
+            self._prune()
+        return handle
+
+    def _prune(self) -> None:
+        # Called with the lock held; the registry is in submission order, so the oldest go first
+        finished = [job_id for job_id, handle in self._jobs.items() if handle.done()]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def submit(self, func: Callable, *args, name: str | None = None, **kwargs) -> JobHandle:
+        """Run func(*args, **kwargs) in the background and return its handle."""
+        future = self._pool.submit(func, *args, **kwargs)
+        return self._register(name or getattr(func, "__name__", "job"), future)
+
+    def submit_polling(
+        self,
+        start: Callable[[], Any],
+        poll: Callable[[Any], Any],
+        finish: Callable[[Any], Any] | None = None,
+        name: str = "remote job",
+        initial_delay: float = 2.0,
+        max_delay: float = 60.0,
+        backoff: float = 2.0,
+        timeout: float | None = None,
+    ) -> JobHandle:
+        """Submit a remote job and poll it in the background with exponential backoff.
+
+        Args:
+            start: Submits the job and returns whatever poll needs to check on it (e.g. a request ID)
+            poll: Called with the value returned by start; returns PENDING while the job is running,
+                otherwise the job's raw result
+            finish: Optional post-processing applied to the raw result in the background thread
+            name: Description shown in the handle
+            initial_delay: Seconds to wait before the first poll
+            max_delay: Upper bound for the delay between polls
+            backoff: Factor by which the delay grows after each pending poll
+            timeout: Give up after this many seconds; the job then fails with TimeoutError
+
+        Returns:
+            JobHandle whose result is finish(raw_result), or the raw result if finish is None
+        """
+        cancel_event = threading.Event()
+        future = self._poll_pool.submit(
+            _run_polling, start, poll, finish, initial_delay, max_delay, backoff, timeout, cancel_event, name
+        )
+        return self._register(name, future, cancel_event)
+
+    def get(self, job_id: str) -> JobHandle:
+        """Look up a handle by its id."""
+        with self._lock:
+            return self._jobs[job_id]
+
+    def forget(self, job_id: str) -> bool:
+        """Drop a job from the registry so its result can be freed. Returns False if it was not registered.
+
+        A running job keeps running; only its handle (held by the caller, if any) can still reach it.
+        """
+        with self._lock:
+            return self._jobs.pop(job_id, None) is not None
+
+    def list(self) -> list[dict]:
+        """Info for every registered job (running, or finished and not yet collected), oldest first."""
+        with self._lock:
+            handles = list(self._jobs.values())
+        return [handle.info() for handle in handles]
+
+
+def _run_polling(start, poll, finish, initial_delay, max_delay, backoff, timeout, cancel_event, name):
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    state = start()
+    delay = initial_delay
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"{name} did not finish within {timeout} seconds")
+            delay = min(delay, remaining)
+        if cancel_event.wait(delay):
+            raise CancelledError()
+
+        result = poll(state)
+        if result is not PENDING:
+            return finish(result) if finish is not None else result
+        # Jitter keeps many jobs submitted together from polling in lockstep
+        delay = min(max_delay, delay * backoff) * random.uniform(0.8, 1.2)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, creating it on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
+
+
+def submit_job(func: Callable, *args, name: str | None = None, **kwargs) -> JobHandle:
+    """Run a blocking call in the background. See JobManager.submit."""
+    return get_job_manager().submit(func, *args, name=name, **kwargs)
+
+
+def submit_polling_job(start: Callable[[], Any], poll: Callable[[Any], Any], **kwargs) -> JobHandle:
+    """Submit and poll a remote job in the background. See JobManager.submit_polling."""
+    return get_job_manager().submit_polling(start, poll, **kwargs)
+
+
+def _handle(job: JobHandle | str) -> JobHandle:
+    return job if isinstance(job, JobHandle) else get_job_manager().get(job)
+
+
+def forget_job(job: JobHandle | str) -> bool:
+    """Drop a job (by handle or id) from the registry. See JobManager.forget."""
+    return get_job_manager().forget(job.id if isinstance(job, JobHandle) else job)
+
+
+def check_job(job: JobHandle | str) -> dict:
+    """Return the current state of a job (by handle or id) without waiting."""
+    return _handle(job).info()
+
+
+def await_job(job: JobHandle | str, timeout: float | None = None) -> Any:
+    """Wait for a job (by handle or id) and return its result.
+
+    Once the job has finished it is dropped from the registry; keep the returned result (or the handle).
+    """
+    handle = _handle(job)
+    try:
+        return handle.result(timeout)
+    finally:
+        if handle.done():
+            get_job_manager().forget(handle.id)
+
+
+def gather_jobs(
+    jobs: Iterable[JobHandle | str], timeout: float | None = None, return_exceptions: bool = True
+) -> list[Any]:
+    """Wait for several jobs and return their results in the order given.
+
+    Args:
+        jobs: Handles or job ids
+        timeout: Maximum total seconds to wait. Jobs still running afterwards keep running and
+            contribute a TimeoutError.
+        return_exceptions: Put each failed job's exception in the result list instead of raising
+            the first one
+
+    Returns:
+        One result (or exception) per job. Finished jobs are dropped from the registry.
+    """
+    handles = [_handle(job) for job in jobs]
+    wait([handle._future for handle in handles], timeout=timeout)
+    for handle in handles:
+        if handle.done():
+            get_job_manager().forget(handle.id)
+
+    results = []
+    for handle in handles:
+        if not handle.done():
+            error = TimeoutError(f"{handle.name} ({handle.id}) is still running")
+        else:
+            error = handle._future.exception() if not handle._future.cancelled() else CancelledError()
+        if error is None:
+            results.append(handle.result())
+        elif return_exceptions:
+            results.append(error)
+        else:
+            raise error
+    return results
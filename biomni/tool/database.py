@@ -1,16 +1,41 @@
+import copy
+import functools
+import hashlib
+import io
 import json
 import os
 import pickle
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Any
 
 import requests
-from Bio.Blast import NCBIWWW, NCBIXML
+from Bio.Blast import NCBIXML
 from Bio.Seq import Seq
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from biomni import eutils
+from biomni.cache import get_http_cache, get_translation_cache
+from biomni.config import default_config
+from biomni.datalake import get_hpo_index
+from biomni.http_client import download_file, http_get, http_post
+from biomni.jobs import PENDING, JobHandle, submit_job, submit_polling_job
 from biomni.llm import get_llm
-from biomni.utils import parse_hpo_obo
+
+try:
+    import ijson
+except ImportError:  # optional: enables streaming summarization of large responses
+    ijson = None
+
+# Errors raised when a response body is not valid JSON
+_JSON_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
 
 
 # Function to map HPO terms to names
@@ -24,16 +49,452 @@ def get_hpo_names(hpo_terms: list[str], data_lake_path: str) -> list[str]:
         List[str]: A list of corresponding HPO term names.
 
     """
-    hp_dict = parse_hpo_obo(data_lake_path + "/hp.obo")
+    # The ontology is indexed once and memory-mapped, so repeated calls do not re-parse hp.obo
+    hpo = get_hpo_index(os.path.join(data_lake_path, "hp.obo"))
+    return [hpo.name(term, f"Unknown term: {term}") for term in hpo_terms]
+
+
+_SCHEMA_DIR = os.path.join(os.path.dirname(__file__), "schema_db")
+
+# Schemas whose JSON form is larger than this many characters are pruned to the
+# sections relevant to the prompt before being placed in the system prompt.
+_SCHEMA_PROMPT_CHAR_BUDGET = 8000
+# A dict with at least this many named entries (endpoints, fields, categories, ...) is prunable
+_SCHEMA_COLLECTION_MIN_SIZE = 6
+# Maximum number of entries kept from each prunable collection
+_SCHEMA_MAX_ENTRIES = 8
+
+_SCHEMA_STOPWORDS = set(
+    "about and are can find for from get give how information list please retrieve search show "
+    "that the their this what which with".split()
+)
+
+
+@functools.cache
+def _load_schema(name):
+    """Load an API schema from schema_db once per process.
+
+    Parameters
+    ----------
+    name (str): Schema name without extension (e.g., "uniprot")
+
+    Returns
+    -------
+    dict or str: The unpickled schema, or None if the schema file does not exist
+
+    """
+    schema_path = os.path.join(_SCHEMA_DIR, f"{name}.pkl")
+    if not os.path.exists(schema_path):
+        return None
+    with open(schema_path, "rb") as f:
+        return pickle.load(f)
+
+
+def _prompt_terms(prompt):
+    """Extract lowercase search terms from a natural language prompt."""
+    terms = set()
+    for word in re.findall(r"[a-z0-9_]+", prompt.lower()):
+        if len(word) < 3 or word in _SCHEMA_STOPWORDS:
+            continue
+        terms.add(word)
+        # Crude singularization so "pathways" also matches "pathway"
+        if len(word) > 4 and word.endswith("s"):
+            terms.add(word[:-1])
+    return terms
+
+
+def _schema_relevance(terms, key, value):
+    """Score a schema entry by how many prompt terms occur as words in its name and content."""
+    key_words = set(re.findall(r"[a-z0-9_]+", str(key).lower()))
+    value_text = value if isinstance(value, str) else json.dumps(value, default=str)
+    value_words = set(re.findall(r"[a-z0-9_]+", value_text.lower()))
+    return 3 * len(terms & key_words) + len((terms - key_words) & value_words)
+
+
+# Start of a top-level GraphQL SDL definition
+_GRAPHQL_DEFINITION = re.compile(
+    r"^(?:extend\s+)?(type|input|enum|interface|union|scalar|schema|directive)\b(?:\s+@?(\w+))?", re.MULTILINE
+)
+# GraphQL root operation types, which are always kept when pruning SDL
+_GRAPHQL_ROOT_TYPES = {"Query", "Mutation", "Subscription"}
+
+
+def _graphql_definitions(text):
+    """Split GraphQL SDL into whole definitions, each with its leading description.
+
+    Returns
+    -------
+    list of (str, str): (type name, definition text) pairs
+
+    """
+    definitions = []
+    lines, name, depth = [], None, 0
+    for line in text.split("\n"):
+        # A definition ends where the next description or definition starts at column 0
+        if name is not None and depth <= 0 and line[:1] not in ("", " ", "\t", "}"):
+            definitions.append((name, "\n".join(lines).strip()))
+            lines, name, depth = [], None, 0
+        if not lines and not line.strip():
+            continue
+        lines.append(line)
+        if name is None:
+            match = _GRAPHQL_DEFINITION.match(line)
+            name = (match.group(2) or match.group(1)) if match else None
+        # Braces inside description strings do not delimit anything
+        code = re.sub(r'"[^"]*"', "", line)
+        depth += code.count("{") - code.count("}")
+    if lines:
+        definitions.append((name or "", "\n".join(lines).strip()))
+    return definitions
+
+
+def _prune_schema_text(text, terms):
+    """Keep the sections of a text schema most relevant to the prompt terms.
+
+    GraphQL SDL is pruned by whole type definitions, keeping the root Query type and
+    listing the names of omitted types; other text is pruned by blank-line separated
+    blocks, always keeping the leading block.
+    """
+    definitions = _graphql_definitions(text) if _GRAPHQL_DEFINITION.search(text) else None
+    if definitions:
+        names = [name for name, _ in definitions]
+        blocks = [definition for _, definition in definitions]
+        required = [i for i, name in enumerate(names) if name in _GRAPHQL_ROOT_TYPES]
+    else:
+        blocks = text.split("\n\n")
+        names = [""] * len(blocks)
+        required = [0]
+    scores = [_schema_relevance(terms, names[i], block) for i, block in enumerate(blocks)]
+    ranked = sorted((i for i in range(len(blocks)) if i not in required), key=lambda i: -scores[i])
+
+    keep = set(required)
+    size = sum(len(blocks[i]) for i in keep)
+    for i in ranked:
+        if scores[i] == 0 or size + len(blocks[i]) > _SCHEMA_PROMPT_CHAR_BUDGET:
+            break
+        keep.add(i)
+        size += len(blocks[i])
+
+    pruned = "\n\n".join(blocks[i] for i in sorted(keep))
+    omitted = [i for i in range(len(blocks)) if i not in keep]
+    if omitted and definitions:
+        pruned += "\n\n# Other types, omitted as less relevant: " + ", ".join(names[i] for i in omitted)
+    elif omitted:
+        pruned += f"\n\n# ... {len(omitted)} less relevant sections omitted"
+    return pruned
+
+
+def _prune_schema_node(node, terms):
+    """Recursively drop entries of large schema collections that are unrelated to the prompt terms."""
+    if isinstance(node, str):
+        return _prune_schema_text(node, terms) if len(node) > _SCHEMA_PROMPT_CHAR_BUDGET else node
+    if not isinstance(node, dict):
+        return node
+
+    # Only homogeneous mappings of named entries are pruned; mixed dicts hold metadata like base_url
+    is_collection = len(node) >= _SCHEMA_COLLECTION_MIN_SIZE and (
+        all(isinstance(value, dict) for value in node.values())
+        or all(isinstance(value, str) for value in node.values())
+    )
+    if not is_collection:
+        return {key: _prune_schema_node(value, terms) for key, value in node.items()}
+
+    scores = {key: _schema_relevance(terms, key, value) for key, value in node.items()}
+    relevant = sorted((key for key in node if scores[key] > 0), key=lambda k: -scores[k])
+    # Keep a few entries even when nothing matches so the LLM still sees the format
+    keep = set(relevant[:_SCHEMA_MAX_ENTRIES] or list(node)[:3])
 
-    hpo_names = []
-    for term in hpo_terms:
-        name = hp_dict.get(term, f"Unknown term: {term}")
-        hpo_names.append(name)
-    return hpo_names
+    pruned = {key: _prune_schema_node(value, terms) for key, value in node.items() if key in keep}
+    omitted = [key for key in node if key not in keep]
+    if omitted:
+        pruned["_omitted_entries"] = omitted
+    return pruned
 
 
-def _query_llm_for_api(prompt, schema, system_template):
+def _select_schema_sections(schema, prompt):
+    """Return the parts of an API schema that are relevant to a prompt.
+
+    Small schemas are returned unchanged. For large schemas, every collection of
+    named entries (endpoints, categories, query fields, ...) is reduced to the entries
+    that mention terms from the prompt; the names of the omitted entries are kept so
+    the LLM still knows they exist.
+
+    Parameters
+    ----------
+    schema (dict or str): API schema as loaded by _load_schema
+    prompt (str): Natural language query
+
+    Returns
+    -------
+    dict or str: The pruned schema
+
+    """
+    if schema is None or not prompt:
+        return schema
+    size = len(schema) if isinstance(schema, str) else len(json.dumps(schema, default=str))
+    if size <= _SCHEMA_PROMPT_CHAR_BUDGET:
+        return schema
+    terms = _prompt_terms(prompt)
+    if not terms:
+        return schema
+    return _prune_schema_node(schema, terms)
+
+
+# Rule-based fast path for prompts that are just a structured identifier (an accession,
+# PDB ID, rsID, Ensembl ID, gene symbol, ...). These are translated directly into the
+# same output the LLM would produce, skipping one LLM round trip.
+_RULE_ID_PATTERNS = {
+    "uniprot_accession": re.compile(r"[OPQ][0-9][A-Z0-9]{3}[0-9]|[A-NR-Z][0-9](?:[A-Z][A-Z0-9]{2}[0-9]){1,2}"),
+    # A digit followed by three characters, at least one a letter, so years like "2020" do not match
+    "pdb_id": re.compile(r"[0-9](?=[A-Za-z0-9]{0,2}[A-Za-z])[A-Za-z0-9]{3}"),
+    "rsid": re.compile(r"rs[0-9]+", re.IGNORECASE),
+    "ensembl_id": re.compile(r"ENS[A-Z]*[GTPER][0-9]{11}(?:\.[0-9]+)?"),
+    "kegg_pathway": re.compile(r"(?:map|hsa|mmu|ko)[0-9]{5}"),
+    "kegg_gene": re.compile(r"(?:hsa|mmu):[0-9]+"),
+    "kegg_compound": re.compile(r"(?:cpd:)?C[0-9]{5}"),
+    "kegg_drug": re.compile(r"(?:dr:)?D[0-9]{5}"),
+    "interpro_id": re.compile(r"IPR[0-9]{6}"),
+    "pfam_id": re.compile(r"PF[0-9]{5}"),
+    "reactome_id": re.compile(r"R-[A-Z]{3}-[0-9]+"),
+    # Official symbols are written in upper case; lower-case words are left to the LLM
+    "gene_symbol": re.compile(r"[A-Z][A-Z0-9]{1,9}(?:-[A-Z0-9]{1,4})?"),
+}
+
+# Words that carry no intent beyond "look this identifier up". Words naming what to look up
+# (variant, pathway, structure, ...) are left in, so such prompts go to the LLM.
+_RULE_FILLER_WORDS = set(
+    "a about all an and any can data database describe detail details do entry fetch find for gene get give "
+    "i id identifier in info information is know known look lookup me of on please record retrieve search "
+    "show summary tell the what clinvar dbsnp ensembl interpro kegg pdb reactome uniprot".split()
+)
+
+# Species words and their NCBI taxonomy IDs
+_RULE_ORGANISM_WORDS = {
+    **dict.fromkeys(["human", "homo", "sapiens"], 9606),
+    **dict.fromkeys(["mouse", "mice", "murine", "mus", "musculus"], 10090),
+    **dict.fromkeys(["rat", "rattus", "norvegicus"], 10116),
+    **dict.fromkeys(["zebrafish", "danio", "rerio"], 7955),
+    **dict.fromkeys(["fly", "drosophila", "melanogaster"], 7227),
+    **dict.fromkeys(["worm", "caenorhabditis", "elegans"], 6239),
+    **dict.fromkeys(["yeast", "saccharomyces", "cerevisiae"], 559292),
+}
+_HUMAN_TAXON_ID = 9606
+
+# Rules that take the taxon ID of the species named in the prompt. The other rules look names up
+# in human, so prompts naming another species are left to the LLM.
+_RULE_TAXON_AWARE = {("uniprot", "gene_symbol")}
+
+_RULE_EXCLUDED_SYMBOLS = {"DNA", "RNA", "MRNA", "ATP", "PDB", "API", "ID", "SNP", "GWAS", "HUMAN"}
+
+_RULE_RESOLVERS = {
+    "uniprot": [
+        (
+            "uniprot_accession",
+            lambda acc: {
+                "full_url": f"https://rest.uniprot.org/uniprotkb/{acc}",
+                "description": f"Retrieve UniProtKB entry {acc}",
+            },
+        ),
+        (
+            "gene_symbol",
+            lambda symbol, taxon_id=_HUMAN_TAXON_ID: {
+                "full_url": "https://rest.uniprot.org/uniprotkb/search?query="
+                f"gene_exact:{symbol}+AND+organism_id:{taxon_id}+AND+reviewed:true",
+                "description": f"Search reviewed UniProtKB entries of taxon {taxon_id} for gene {symbol}",
+            },
+        ),
+    ],
+    "pdb": [
+        (
+            "pdb_id",
+            lambda pdb_id: {
+                "query": {
+                    "type": "terminal",
+                    "service": "text",
+                    "parameters": {
+                        "attribute": "rcsb_entry_container_identifiers.entry_id",
+                        "operator": "exact_match",
+                        "value": pdb_id.upper(),
+                    },
+                },
+            },
+        ),
+    ],
+    "kegg": [
+        (
+            "kegg_pathway",
+            lambda pid: {"full_url": f"https://rest.kegg.jp/get/{pid}", "description": f"Retrieve KEGG pathway {pid}"},
+        ),
+        (
+            "kegg_gene",
+            lambda gid: {"full_url": f"https://rest.kegg.jp/get/{gid}", "description": f"Retrieve KEGG gene {gid}"},
+        ),
+        (
+            "kegg_compound",
+            lambda cid: {
+                "full_url": f"https://rest.kegg.jp/get/cpd:{cid.split(':')[-1]}",
+                "description": f"Retrieve KEGG compound {cid}",
+            },
+        ),
+        (
+            "kegg_drug",
+            lambda did: {
+                "full_url": f"https://rest.kegg.jp/get/dr:{did.split(':')[-1]}",
+                "description": f"Retrieve KEGG drug {did}",
+            },
+        ),
+    ],
+    "interpro": [
+        (
+            "interpro_id",
+            lambda ipr: {
+                "full_url": f"https://www.ebi.ac.uk/interpro/api/entry/interpro/{ipr}",
+                "description": f"Retrieve InterPro entry {ipr}",
+            },
+        ),
+        (
+            "pfam_id",
+            lambda pfam: {
+                "full_url": f"https://www.ebi.ac.uk/interpro/api/entry/pfam/{pfam}",
+                "description": f"Retrieve Pfam entry {pfam}",
+            },
+        ),
+        (
+            "uniprot_accession",
+            lambda acc: {
+                "full_url": f"https://www.ebi.ac.uk/interpro/api/entry/interpro/protein/uniprot/{acc}",
+                "description": f"Retrieve InterPro entries matching protein {acc}",
+            },
+        ),
+    ],
+    "clinvar": [
+        ("rsid", lambda rsid: {"search_term": f"{rsid.lower()}[rsid]"}),
+        ("gene_symbol", lambda symbol: {"search_term": f"{symbol}[gene]"}),
+    ],
+    "dbsnp": [
+        ("rsid", lambda rsid: {"search_term": f"{rsid.lower()}[rs]"}),
+        ("gene_symbol", lambda symbol: {"search_term": f"{symbol}[Gene Name]"}),
+    ],
+    "ensembl": [
+        (
+            "ensembl_id",
+            lambda eid: {
+                "endpoint": f"lookup/id/{eid.split('.')[0]}",
+                "params": {},
+                "description": f"Look up Ensembl identifier {eid}",
+            },
+        ),
+        (
+            "rsid",
+            lambda rsid: {
+                "endpoint": f"variation/homo_sapiens/{rsid.lower()}",
+                "params": {},
+                "description": f"Retrieve variant {rsid} in human",
+            },
+        ),
+        (
+            "gene_symbol",
+            lambda symbol: {
+                "endpoint": f"lookup/symbol/homo_sapiens/{symbol}",
+                "params": {},
+                "description": f"Look up human gene {symbol}",
+            },
+        ),
+    ],
+    "reactome": [
+        (
+            "reactome_id",
+            lambda stid: {
+                "endpoint": f"data/query/{stid}",
+                "base": "content",
+                "params": {},
+                "description": f"Retrieve Reactome entry {stid}",
+            },
+        ),
+    ],
+}
+
+_rule_resolver_lock = threading.Lock()
+_rule_resolver_hits = Counter()
+_rule_resolver_misses = Counter()
+
+
+def _resolve_query_with_rules(database, prompt):
+    """Translate a prompt that only names a structured identifier without calling the LLM.
+
+    Parameters
+    ----------
+    database (str): Database the prompt is for (e.g., "uniprot")
+    prompt (str): Natural language query
+
+    Returns
+    -------
+    dict or None: The query fields the LLM would have returned, or None if no rule matches
+
+    """
+    rules = _RULE_RESOLVERS.get(database)
+    if not rules or not prompt:
+        return None
+
+    # Reduce the prompt to the words that are not filler, noting any species it names
+    tokens = [token.strip(".,;!?\"'()[]") for token in prompt.split()]
+    taxa = {_RULE_ORGANISM_WORDS[token.lower()] for token in tokens if token.lower() in _RULE_ORGANISM_WORDS}
+    remaining = [
+        token
+        for token in tokens
+        if token and token.lower() not in _RULE_FILLER_WORDS and token.lower() not in _RULE_ORGANISM_WORDS
+    ]
+    if len(remaining) != 1 or len(taxa) > 1:
+        return None
+    taxon_id = taxa.pop() if taxa else _HUMAN_TAXON_ID
+
+    identifier = remaining[0]
+    for pattern_name, build in rules:
+        if not _RULE_ID_PATTERNS[pattern_name].fullmatch(identifier):
+            continue
+        if pattern_name == "gene_symbol" and identifier in _RULE_EXCLUDED_SYMBOLS:
+            return None
+        if (database, pattern_name) in _RULE_TAXON_AWARE:
+            return build(identifier, taxon_id=taxon_id)
+        if taxon_id != _HUMAN_TAXON_ID:
+            return None
+        return build(identifier)
+    return None
+
+
+def get_rule_resolver_stats():
+    """Report how often database prompts were resolved by rules instead of the LLM.
+
+    Returns
+    -------
+    dict: Overall and per-database hit counts, miss counts and hit rates
+
+    """
+    with _rule_resolver_lock:
+        databases = sorted(set(_rule_resolver_hits) | set(_rule_resolver_misses))
+        by_database = {}
+        for database in databases:
+            hits, misses = _rule_resolver_hits[database], _rule_resolver_misses[database]
+            by_database[database] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+        total_hits = sum(_rule_resolver_hits.values())
+        total_misses = sum(_rule_resolver_misses.values())
+
+    total = total_hits + total_misses
+    return {
+        "hits": total_hits,
+        "misses": total_misses,
+        "hit_rate": total_hits / total if total else 0.0,
+        "by_database": by_database,
+    }
+
+
+def _schema_version(schema, system_template):
+    """Fingerprint a schema and system prompt template so cached translations are invalidated when either changes."""
+    payload = schema if isinstance(schema, str) else json.dumps(schema, sort_keys=True, default=str)
+    return hashlib.sha256(f"{payload}\0{system_template}".encode()).hexdigest()[:16]
+
+
+def _query_llm_for_api(prompt, schema, system_template, database=None):
     """Helper function to query LLMs for generating API calls based on natural language prompts.
 
     Supports multiple model providers including Claude, Gemini, GPT, and others via the unified get_llm interface.
@@ -43,12 +504,24 @@ def _query_llm_for_api(prompt, schema, system_template):
     prompt (str): Natural language query to process
     schema (dict): API schema to include in the system prompt
     system_template (str): Template string for the system prompt (should have {schema} placeholder)
+    database (str, optional): Database the query is for; enables the rule-based fast path for structured
+        identifiers and the persistent translation cache
 
     Returns
     -------
     dict: Dictionary with 'success', 'data' (if successful), 'error' (if failed), and optional 'raw_response'
 
     """
+    _pending_translation.entry = None
+
+    # Structured identifiers are translated directly, without an LLM round trip
+    if database is not None:
+        rule_data = _resolve_query_with_rules(database, prompt)
+        with _rule_resolver_lock:
+            (_rule_resolver_hits if rule_data is not None else _rule_resolver_misses)[database] += 1
+        if rule_data is not None:
+            return {"success": True, "data": rule_data, "raw_response": "Resolved by rule-based fast path"}
+
     # Use global config for model and api_key
     try:
         from biomni.config import default_config
@@ -59,11 +532,31 @@ def _query_llm_for_api(prompt, schema, system_template):
         model = "claude-3-5-haiku-20241022"
         api_key = None
 
+    # Translations are deterministic at temperature 0, so reuse an earlier one for the same prompt
+    cache_key = None
+    if database is not None and default_config.llm_translation_cache:
+        try:
+            schema_version = _schema_version(schema, system_template)
+            cache_key = get_translation_cache().make_key(database, prompt, schema_version, model)
+            cached = get_translation_cache().get(cache_key)
+            if cached is not None:
+                _pending_translation.entry = (cache_key, None)
+                return {"success": True, "data": cached["data"], "raw_response": cached["raw_response"]}
+        except Exception as e:
+            print(f"Warning: translation cache unavailable: {e}")
+            cache_key = None
+
     try:
         # Format the system prompt with schema if provided
         if schema is not None:
-            schema_json = json.dumps(schema, indent=2)
+            schema = _select_schema_sections(schema, prompt)
+            schema_json = schema if isinstance(schema, str) else json.dumps(schema, indent=2)
             system_prompt = system_template.format(schema=schema_json)
+        elif "{schema}" in system_template:
+            # The template expects a schema but its file is missing from schema_db
+            system_prompt = system_template.format(
+                schema="(schema unavailable; use your knowledge of this API's documented endpoints)"
+            )
         else:
             system_prompt = system_template
 
@@ -96,6 +589,11 @@ def _query_llm_for_api(prompt, schema, system_template):
             # If no JSON found, try the whole response
             result = json.loads(llm_text)
 
+        if cache_key is not None and isinstance(result, dict):
+            # Snapshot the translation: callers fill in per-call options (e.g. query_pdb's return_type and
+            # max_results) on the returned dict, and those must not be cached with it
+            _pending_translation.entry = (cache_key, (database, prompt, copy.deepcopy(result), llm_text))
+
         return {"success": True, "data": result, "raw_response": llm_text}
 
     except (json.JSONDecodeError, KeyError, IndexError) as e:
@@ -108,7 +606,96 @@ def _query_llm_for_api(prompt, schema, system_template):
         return {"success": False, "error": f"Error querying LLM: {str(e)}"}
 
 
-def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data=None, description=None):
+# Translation made on this thread by _query_llm_for_api: (cache key, arguments for
+# TranslationCache.set, or None if it came from the cache). It is only stored once the API call
+# built from it succeeds, and a cached translation whose API call fails is evicted.
+_pending_translation = threading.local()
+
+
+def _settle_translation(success):
+    """Store (on success) or evict (on failure) the translation behind the current API call."""
+    key, entry = getattr(_pending_translation, "entry", None) or (None, None)
+    if key is None:
+        return
+    _pending_translation.entry = None
+    try:
+        if not success:
+            get_translation_cache().delete(key)
+        elif entry is not None:
+            get_translation_cache().set(key, *entry)
+    except Exception as e:
+        print(f"Warning: failed to update translation cache: {e}")
+
+
+class _RecordingReader:
+    """File-like wrapper that keeps the first bytes read from a stream, for error fallbacks."""
+
+    def __init__(self, stream, limit=64 * 1024):
+        self._stream = stream
+        self._limit = limit
+        self.recorded = b""
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        if len(self.recorded) < self._limit:
+            self.recorded += data[: self._limit - len(self.recorded)]
+        return data
+
+
+# Top-level keys of a JSON body that reports an error despite a successful status
+_ERROR_BODY_KEYS = {"error", "errors", "fault"}
+_ERROR_BODY_START = re.compile(
+    rb'\s*(?:\{\s*"(?:error|errors|fault)"\s*:|<\?xml[^>]*>\s*<error|error\b)', re.IGNORECASE
+)
+
+
+def _looks_like_error(body, content_type=""):
+    """Whether a successful response body is really an error message, which must not be cached.
+
+    `body` may be just the start of a long response, in which case only its beginning is checked.
+    """
+    if not body.strip():
+        return True
+    if "json" in content_type or body.lstrip()[:1] == b"{":
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return any(data.get(key) for key in _ERROR_BODY_KEYS) or str(data.get("status", "")).lower() == "error"
+    return _ERROR_BODY_START.match(body[:1024]) is not None
+
+
+def _cacheable_response(response):
+    return not _looks_like_error(response.content, response.headers.get("Content-Type", ""))
+
+
+def _summary_cache_key(method, endpoint, params, headers, json_data):
+    """HTTP cache key under which the summarized result of a request is stored."""
+    prepared = requests.Request(method, endpoint, params=params, json=json_data, headers=headers).prepare()
+    return get_http_cache().make_key(f"{method} summary", prepared.url, prepared.body, prepared.headers.get("Accept"))
+
+
+def _store_summary(key, response, result):
+    """Keep a summarized result in the HTTP cache for as long as the response it came from is fresh."""
+    cache = get_http_cache()
+    ttl = cache.ttl_for(response.url, response.headers.get("Cache-Control"))
+    if ttl is not None and ttl > 0:
+        body = json.dumps(result, default=str).encode()
+        cache.set(key, response.url, response.status_code, {"Content-Type": "application/json"}, body, "utf-8", ttl)
+
+
+def _query_rest_api(
+    endpoint,
+    method="GET",
+    params=None,
+    headers=None,
+    json_data=None,
+    description=None,
+    cache=True,
+    summarize=False,
+    idempotent=False,
+):
     """General helper function to query REST APIs with consistent error handling.
 
     Parameters
@@ -119,6 +706,11 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
     headers (dict, optional): HTTP headers for the request
     json_data (dict, optional): JSON data for POST requests
     description (str, optional): Description of this query for error messages
+    cache (bool): Whether to serve and store the response in the persistent HTTP cache. Only GET requests,
+        and POSTs marked idempotent, are cached; bodies that report an error are never stored.
+    summarize (bool): Return a condensed result (see _format_query_results), built while the JSON body is
+        parsed so large responses are never fully materialized
+    idempotent (bool): Whether a POST only queries data, so it may be retried after a failed attempt
 
     Returns
     -------
@@ -134,33 +726,86 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
         description = f"{method} request to {endpoint}"
 
     url_error = None
+    query_info = {
+        "endpoint": endpoint,
+        "method": method,
+        "description": description,
+    }
+
+    # A POST is only as cacheable as it is safe to repeat
+    cache = cache and (method.upper() == "GET" or idempotent)
 
     try:
+        # Summarized responses are streamed straight into the formatter, and the summary rather
+        # than the body is kept in the HTTP cache
+        stream = summarize
+        summary_key = None
+        if summarize and cache and default_config.http_cache:
+            summary_key = _summary_cache_key(method, endpoint, params, headers, json_data)
+            entry = get_http_cache().get(summary_key)
+            if entry is not None and entry["fresh"]:
+                _settle_translation(True)
+                return {"success": True, "query_info": query_info, "result": json.loads(entry["body"])}
+
         # Make the API request
         if method.upper() == "GET":
-            response = requests.get(endpoint, params=params, headers=headers)
+            response = http_get(
+                endpoint,
+                params=params,
+                headers=headers,
+                cache=cache,
+                cacheable=_cacheable_response,
+                stream=stream,
+            )
         elif method.upper() == "POST":
-            response = requests.post(endpoint, params=params, headers=headers, json=json_data)
+            response = http_post(
+                endpoint,
+                params=params,
+                headers=headers,
+                json=json_data,
+                cache=cache,
+                cacheable=_cacheable_response,
+                stream=stream,
+                idempotent=idempotent,
+            )
         else:
+            _settle_translation(False)
             return {"error": f"Unsupported HTTP method: {method}"}
 
-        url_error = str(response.text)
+        if not response.ok:
+            url_error = str(response.text)
         response.raise_for_status()
 
-        # Try to parse JSON response
-        try:
-            result = response.json()
-        except ValueError:
-            # Return raw text if not JSON
-            result = {"raw_text": response.text}
-
+        if summarize and "json" in response.headers.get("Content-Type", ""):
+            response.raw.decode_content = True
+            body = _RecordingReader(response.raw)
+            try:
+                result = _format_json_stream(body)
+            except _JSON_ERRORS:
+                # Not valid JSON after all; summarize the start of the body as text
+                text = body.recorded.decode(response.encoding or "utf-8", "replace")
+                result = _format_query_results({"raw_text": text})
+            finally:
+                # The formatter may stop before the end of the body
+                response.close()
+            if summary_key is not None and not _looks_like_error(body.recorded, "json"):
+                _store_summary(summary_key, response, result)
+        else:
+            # Try to parse JSON response
+            try:
+                result = response.json()
+            except ValueError:
+                # Return raw text if not JSON
+                result = {"raw_text": response.text}
+            if summarize:
+                result = _format_query_results(result)
+                if summary_key is not None and _cacheable_response(response):
+                    _store_summary(summary_key, response, result)
+
+        _settle_translation(True)
         return {
             "success": True,
-            "query_info": {
-                "endpoint": endpoint,
-                "method": method,
-                "description": description,
-            },
+            "query_info": query_info,
             "result": result,
         }
 
@@ -183,6 +828,7 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
             except Exception:
                 response_text = e.response.text
 
+        _settle_translation(False)
         return {
             "success": False,
             "error": f"API error: {error_msg}",
@@ -195,6 +841,7 @@ def _query_rest_api(endpoint, method="GET", params=None, headers=None, json_data
             "response_text": response_text,
         }
     except Exception as e:
+        _settle_translation(False)
         return {
             "success": False,
             "error": f"Error: {str(e)}",
@@ -212,116 +859,85 @@ def _query_ncbi_database(
     result_formatter=None,
     max_results: int = 3,
 ) -> dict[str, Any]:
-    """Core function to query NCBI databases using Claude for query interpretation and NCBI eutils.
+    """Core function to query NCBI databases through the E-utilities client.
 
     Parameters
     ----------
-    database (str): NCBI database to query (e.g., "clinvar", "gds", "geoprofiles")
+    database (str): NCBI database to query (e.g., "clinvar", "gds", "snp")
+    search_term (str): Entrez search term
     result_formatter (callable): Function to format results from the database
-    api_key (str): Anthropic API key. If None, will look for ANTHROPIC_API_KEY environment variable
-    model (str): Anthropic model to use
     max_results (int): Maximum number of results to return
-    verbose (bool): Whether to return verbose results
 
     Returns
     -------
     dict: Dictionary containing both the structured query and the results
 
     """
-    # Query NCBI API using the structured search term
-    esearch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-    esearch_params = {
-        "db": database,
-        "term": search_term,
-        "retmode": "json",
-        "retmax": 100,
-        "usehistory": "y",  # Use history server to store results
-    }
+    query_info = {"endpoint": f"{eutils.EUTILS_BASE_URL}/esearch.fcgi", "method": "GET", "description": "NCBI query"}
 
-    # Get IDs of matching entries
-    search_response = _query_rest_api(
-        endpoint=esearch_url,
-        method="GET",
-        params=esearch_params,
-        description="NCBI ESearch API query",
-    )
+    try:
+        # Keep the full result set on the history server and page summaries from it
+        search = eutils.esearch(database, search_term, retmax=max_results)
 
-    if not search_response["success"]:
-        return search_response
-
-    search_data = search_response["result"]
-
-    # If we have results, fetch the details
-    if "esearchresult" in search_data and int(search_data["esearchresult"]["count"]) > 0:
-        # Extract WebEnv and query_key from the search results
-        webenv = search_data["esearchresult"].get("webenv", "")
-        query_key = search_data["esearchresult"].get("querykey", "")
-
-        # Use WebEnv and query_key if available
-        if webenv and query_key:
-            # Get details using eSummary
-            esummary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-            esummary_params = {
-                "db": database,
-                "query_key": query_key,
-                "WebEnv": webenv,
-                "retmode": "json",
-                "retmax": max_results,
+        if search["count"] == 0:
+            # Most likely a poor translation, so it is not kept
+            _settle_translation(False)
+            return {
+                "database": database,
+                "query_interpretation": search_term,
+                "total_results": 0,
+                "formatted_results": [],
             }
 
-            details_response = _query_rest_api(
-                endpoint=esummary_url,
-                method="GET",
-                params=esummary_params,
-                description="NCBI ESummary API query",
+        n_records = min(max_results, search["count"])
+        if search["webenv"] and search["query_key"]:
+            records = eutils.esummary(
+                database, webenv=search["webenv"], query_key=search["query_key"], max_records=n_records
             )
-
-            if not details_response["success"]:
-                return details_response
-
-            results = details_response["result"]
-
         else:
-            # Fall back to direct ID fetch
-            id_list = search_data["esearchresult"]["idlist"][:max_results]
-
-            # Get details for each ID
-            esummary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-            esummary_params = {
-                "db": database,
-                "id": ",".join(id_list),
-                "retmode": "json",
-            }
-
-            details_response = _query_rest_api(
-                endpoint=esummary_url,
-                method="GET",
-                params=esummary_params,
-                description="NCBI ESummary API query",
-            )
+            records = eutils.esummary(database, ids=search["ids"][:n_records])
+    except (requests.exceptions.RequestException, eutils.EUtilsError, ValueError) as e:
+        _settle_translation(False)
+        return {"success": False, "error": f"API error: {str(e)}", "query_info": query_info}
+
+    _settle_translation(True)
+
+    # Same layout as a raw ESummary JSON response
+    results = {"result": {"uids": [record["uid"] for record in records]}}
+    results["result"].update({record["uid"]: record for record in records})
+
+    # Format results using the provided formatter
+    formatted_results = result_formatter(results) if result_formatter else results
+
+    # Return the combined information
+    return {
+        "database": database,
+        "query_interpretation": search_term,
+        "total_results": search["count"],
+        "formatted_results": formatted_results,
+    }
 
-            if not details_response["success"]:
-                return details_response
 
-            results = details_response["result"]
+def _format_options(options=None):
+    """Merge formatting options for _format_query_results with their defaults."""
+    if options is None:
+        options = {}
 
-        # Format results using the provided formatter
-        formatted_results = result_formatter(results) if result_formatter else results
+    # Default options
+    default_options = {
+        "max_items": 5,
+        "max_depth": 20,
+        "include_keys": None,
+        "exclude_keys": ["raw_response", "debug_info", "request_details"],
+        "summarize_lists": True,
+        "truncate_strings": 100,
+    }
 
-        # Return the combined information
-        return {
-            "database": database,
-            "query_interpretation": search_term,
-            "total_results": int(search_data["esearchresult"]["count"]),
-            "formatted_results": formatted_results,
-        }
-    else:
-        return {
-            "database": database,
-            "query_interpretation": search_term,
-            "total_results": 0,
-            "formatted_results": [],
-        }
+    # Merge provided options with defaults
+    for key, value in default_options.items():
+        if key not in options:
+            options[key] = value
+    return options
 
 
 def _format_query_results(result, options=None):
@@ -432,29 +1048,225 @@ def _format_query_results(result, options=None):
             "_sample": sample_formatted,
         }
 
-    if options is None:
-        options = {}
-
-    # Default options
-    default_options = {
-        "max_items": 5,
-        "max_depth": 20,
-        "include_keys": None,
-        "exclude_keys": ["raw_response", "debug_info", "request_details"],
-        "summarize_lists": True,
-        "truncate_strings": 100,
-    }
-
-    # Merge provided options with defaults
-    for key, value in default_options.items():
-        if key not in options:
-            options[key] = value
+    options = _format_options(options)
 
     # Filter and format the result
     formatted = _format_value(result, 0, options)
     return formatted
 
 
+# Returned by _StreamValue.feed to have the parse loop discard a value without building it:
+# either the value whose first event was just fed, or the value that starts with the next event
+_SKIP_CURRENT = "skip_current"
+_SKIP_NEXT = "skip_next"
+
+
+class _SkipValue:
+    """Consumes the parse events of one JSON value without building it."""
+
+    def __init__(self):
+        self.level = 0
+
+    def feed(self, event, value):
+        if event in ("start_map", "start_array"):
+            self.level += 1
+        elif event in ("end_map", "end_array"):
+            self.level -= 1
+        return self.level == 0
+
+    def result(self):
+        return None
+
+
+class _StreamValue:
+    """Builds the formatted form of one JSON value from parse events, within the formatting budget.
+
+    Mirrors _format_query_results: containers at or below max_depth become summaries, lists keep at most
+    max_items formatted items (or a summary with a 3-item sample), and strings are truncated. Content
+    outside the budget is handed back to the parse loop to skip instead of being materialized.
+    """
+
+    def __init__(self, depth, options, inline_skip=False):
+        self.depth = depth
+        self.options = options
+        # Values that feed two builders at once (list items that are both sampled and kept) cannot
+        # delegate skipping to the parse loop, so they skip internally
+        self.inline_skip = inline_skip
+        self.kind = None
+        self.value = None
+        self.children = []
+        self.count = 0
+        self.keys = []
+        self.items = {}
+        self.samples = []
+        self.first_type = None
+        self.homogeneous = True
+
+    def feed(self, event, value):
+        if self.kind is None:
+            return self._start(event, value)
+        if len(self.children) == 1:
+            status = self.children[0][1].feed(event, value)
+            if status is True:
+                self._collect()
+                return False
+            return status
+        if self.children:
+            finished = [child.feed(event, value) for _, child in self.children]
+            if finished[0] is True:
+                self._collect()
+            return False
+        if event in ("end_map", "end_array"):
+            return True
+        if self.kind == "dict":
+            return self._start_entry(value)
+        return self._start_item(event, value)
+
+    def _start(self, event, value):
+        if event == "start_map":
+            self.kind = "dict"
+            return False
+        if event == "start_array":
+            self.kind = "list"
+            return False
+        self.kind = "scalar"
+        if isinstance(value, str) and len(value) > self.options["truncate_strings"]:
+            value = value[: self.options["truncate_strings"]] + "... (truncated)"
+        self.value = value
+        return True
+
+    def _skip(self, status):
+        if self.inline_skip:
+            self.children = [(None, _SkipValue())]
+            return False
+        return status
+
+    def _start_entry(self, key):
+        # The event was "map_key"; the entry's value starts with the next event
+        self.count += 1
+        options = self.options
+        if self.depth >= options["max_depth"]:
+            if len(self.keys) < options["max_items"]:
+                self.keys.append(key)
+            return self._skip(_SKIP_NEXT)
+        if self.depth == 0 and options["include_keys"]:
+            if key not in options["include_keys"]:
+                return self._skip(_SKIP_NEXT)
+        elif self.depth == 0 and key in (options["exclude_keys"] or ()):
+            return self._skip(_SKIP_NEXT)
+        self.children = [(key, _StreamValue(self.depth + 1, options, self.inline_skip))]
+        return False
+
+    def _start_item(self, event, value):
+        options = self.options
+        item_type = _stream_type_name(event, value)
+        if self.first_type is None:
+            self.first_type = item_type
+        elif item_type != self.first_type and not (self.first_type == "int" and item_type == "bool"):
+            # bool is a subclass of int, matching the isinstance check in _format_query_results
+            self.homogeneous = False
+
+        sampled = self.count < 3
+        kept = self.depth < options["max_depth"] and self.count < options["max_items"]
+        self.count += 1
+        if not sampled and not kept:
+            status = self._skip(_SKIP_CURRENT)
+            if status is not False:
+                return status
+        else:
+            inline_skip = self.inline_skip or (sampled and kept)
+            if sampled:
+                self.children.append(("sample", _StreamValue(options["max_depth"], options, inline_skip)))
+            if kept:
+                self.children.append(("item", _StreamValue(self.depth + 1, options, inline_skip)))
+
+        finished = [child.feed(event, value) for _, child in self.children]
+        if finished[0] is True:
+            self._collect()
+        return False
+
+    def _collect(self):
+        for tag, child in self.children:
+            if self.kind == "dict" and tag is not None:
+                self.items[tag] = child.result()
+            elif tag == "sample":
+                self.samples.append(child.result())
+            elif tag == "item":
+                self.items[len(self.items)] = child.result()
+        self.children = []
+
+    def result(self):
+        options = self.options
+        if self.kind == "scalar":
+            return self.value
+        if self.kind == "dict":
+            if self.depth >= options["max_depth"]:
+                return {"_summary": f"Nested dictionary with {self.count} keys", "_keys": self.keys}
+            return self.items
+        if self.count == 0:
+            return []
+        if self.depth >= options["max_depth"] or (options["summarize_lists"] and self.count > options["max_items"]):
+            type_info = f"all {self.first_type}" if self.homogeneous else "mixed types"
+            return {"_summary": f"List with {self.count} items ({type_info})", "_sample": self.samples}
+        items = list(self.items.values())
+        if self.count > options["max_items"]:
+            items.append(f"... {self.count - options['max_items']} more items (omitted)")
+        return items
+
+
+def _stream_type_name(event, value):
+    """Python type name of the value a parse event starts, as used in list summaries."""
+    if event == "start_map":
+        return "dict"
+    if event == "start_array":
+        return "list"
+    return type(value).__name__
+
+
+def _format_json_stream(source, options=None):
+    """Format a JSON document like _format_query_results while it is being parsed.
+
+    Only the parts of the document that survive the max_items, max_depth and truncate_strings budgets
+    are built, so memory and CPU scale with the formatted output rather than with the response size.
+
+    Parameters
+    ----------
+    source (file-like): Binary stream containing a JSON document (e.g., a response body)
+    options (dict, optional): Formatting options, as for _format_query_results
+
+    Returns
+    -------
+    dict | list: The condensed document
+
+    """
+    options = _format_options(options)
+
+    if ijson is None:
+        # Streaming parser not installed: parse the whole document, then format it
+        return _format_query_results(json.load(source), options)
+
+    builder = _StreamValue(0, options)
+    events = ijson.basic_parse(source, use_float=True)
+    for event, value in events:
+        status = builder.feed(event, value)
+        if status is True:
+            break
+        if status == _SKIP_NEXT:
+            event, value = next(events)
+            status = _SKIP_CURRENT
+        if status == _SKIP_CURRENT and event in ("start_map", "start_array"):
+            # Discard the rest of the value in a tight loop
+            level = 1
+            for event, _ in events:
+                if event in ("start_map", "start_array"):
+                    level += 1
+                elif event in ("end_map", "end_array"):
+                    level -= 1
+                    if level == 0:
+                        break
+    return builder.result()
+
+
 def query_uniprot(
     prompt=None,
     endpoint=None,
@@ -489,9 +1301,7 @@ def query_uniprot(
     # If using prompt, parse with Claude
     if prompt:
         # Load UniProt schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "uniprot.pkl")
-        with open(schema_path, "rb") as f:
-            uniprot_schema = pickle.load(f)
+        uniprot_schema = _load_schema("uniprot")
 
         # Create system prompt template
         system_template = """
@@ -522,6 +1332,7 @@ def query_uniprot(
             prompt=prompt,
             schema=uniprot_schema,
             system_template=system_template,
+            database="uniprot",
         )
 
         if not llm_result["success"]:
@@ -551,6 +1362,107 @@ def query_uniprot(
     return api_result
 
 
+_UNIPROT_BATCH_FIELDS = ["accession", "id", "reviewed", "gene_primary", "organism_id", "protein_name", "length"]
+
+
+def _chunk_identifiers(identifiers, chunk_size):
+    """De-duplicate identifiers (keeping order) and split them into provider-sized chunks."""
+    unique = list(dict.fromkeys(str(i).strip() for i in identifiers if i is not None and str(i).strip()))
+    return [unique[i : i + chunk_size] for i in range(0, len(unique), chunk_size)]
+
+
+def _map_chunks(func, chunks, max_workers=4):
+    """Apply func to each chunk concurrently and return the results in chunk order.
+
+    Per-host concurrency is still bounded by the shared HTTP client, so max_workers only caps
+    how many chunks are in flight from this call.
+    """
+    if len(chunks) <= 1 or max_workers <= 1:
+        return [func(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+        return list(pool.map(func, chunks))
+
+
+def query_uniprot_batch(identifiers, id_type="accession", organism_id=9606, fields=None, chunk_size=100):
+    """Look up many UniProt entries at once using the UniProtKB stream endpoint.
+
+    Identifiers are OR-joined into one search query per chunk, so a list of several hundred
+    accessions or gene symbols needs only a handful of requests.
+
+    Parameters
+    ----------
+    identifiers (list[str]): UniProt accessions (e.g., ["P01308", "P04637"]) or gene symbols
+    id_type (str): "accession" or "gene" (exact primary gene name)
+    organism_id (int, optional): NCBI taxonomy ID used to restrict gene symbol lookups (default human, 9606).
+        Ignored for accessions.
+    fields (list[str], optional): UniProt return fields (e.g., ["accession", "gene_primary", "cc_function"]).
+        Accession and primary gene name are always included, and secondary accessions for accession lookups.
+    chunk_size (int): Number of identifiers per request
+
+    Returns
+    -------
+    pandas.DataFrame: One row per matching entry with a "query" column holding the input identifier and a
+        "found" column that is False for identifiers without a match
+
+    Examples
+    --------
+    - query_uniprot_batch(["P01308", "P04637", "P38398"])
+    - query_uniprot_batch(["TP53", "BRCA1", "EGFR"], id_type="gene", fields=["accession", "cc_function"])
+
+    """
+    import pandas as pd
+
+    if id_type not in ("accession", "gene"):
+        raise ValueError("id_type must be 'accession' or 'gene'")
+
+    required = ["accession", "gene_primary", "sec_acc"] if id_type == "accession" else ["accession", "gene_primary"]
+    fields = list(dict.fromkeys([*required, *(fields or _UNIPROT_BATCH_FIELDS)]))
+    chunks = _chunk_identifiers(identifiers, chunk_size)
+
+    def fetch(chunk):
+        if id_type == "accession":
+            query = " OR ".join(f"accession:{acc}" for acc in chunk)
+        else:
+            query = "(" + " OR ".join(f"gene_exact:{gene}" for gene in chunk) + ") AND reviewed:true"
+            if organism_id is not None:
+                query += f" AND organism_id:{organism_id}"
+        result = _query_rest_api(
+            endpoint="https://rest.uniprot.org/uniprotkb/stream",
+            params={"query": query, "format": "tsv", "fields": ",".join(fields)},
+            headers={"Accept": "text/plain"},
+            description=f"UniProt batch lookup of {len(chunk)} identifiers",
+        )
+        if not result["success"]:
+            return pd.DataFrame({"query": chunk, "error": result["error"]})
+        text = result["result"].get("raw_text", "")
+        if not text.strip():
+            return pd.DataFrame(columns=["query"])
+        entries = pd.read_csv(io.StringIO(text), sep="\t", dtype=str)
+        if id_type == "accession":
+            # An accession query also matches entries that list it as a secondary accession (e.g. after
+            # entries were merged), so match inputs against both; columns follow the order of `fields`
+            secondary = entries.columns[fields.index("sec_acc")]
+            keys = (entries["Entry"].fillna("") + ";" + entries[secondary].fillna("")).str.split(r";\s*")
+        else:
+            keys = entries["Gene Names (primary)"]
+        # Map each entry back to the identifier(s) that matched it
+        lookup = {value.upper(): value for value in chunk}
+        entries = entries.assign(query=keys).explode("query", ignore_index=True)
+        entries["query"] = entries["query"].str.upper().map(lookup)
+        entries = entries.dropna(subset=["query"])
+        return entries[["query", *entries.columns.drop("query")]]
+
+    frames = [frame for frame in _map_chunks(fetch, chunks) if not frame.empty]
+    queries = pd.DataFrame({"query": [identifier for chunk in chunks for identifier in chunk]})
+    if not frames:
+        return queries.assign(found=False)
+
+    results = pd.concat(frames, ignore_index=True)
+    results = queries.merge(results.dropna(subset=["query"]), on="query", how="left")
+    results["found"] = results["Entry"].notna() if "Entry" in results else False
+    return results
+
+
 def query_alphafold(
     uniprot_id,
     endpoint="prediction",
@@ -611,7 +1523,7 @@ def query_alphafold(
 
     try:
         # Make the API request
-        response = requests.get(url)
+        response = http_get(url)
         response.raise_for_status()
 
         # Parse the response as JSON
@@ -633,20 +1545,18 @@ def query_alphafold(
             # Construct download URL
             download_url = f"https://alphafold.ebi.ac.uk/files/{filename}"
 
-            # Download the file
-            download_response = requests.get(download_url)
-            if download_response.status_code == 200:
-                with open(file_path, "wb") as f:
-                    f.write(download_response.content)
+            # Download the file, reusing an earlier download of the same model when possible
+            try:
+                download_file(download_url, file_path)
                 download_info = {
                     "success": True,
                     "file_path": file_path,
                     "url": download_url,
                 }
-            else:
+            except requests.exceptions.HTTPError as e:
                 download_info = {
                     "success": False,
-                    "error": f"Failed to download file (status code: {download_response.status_code})",
+                    "error": f"Failed to download file (status code: {e.response.status_code})",
                     "url": download_url,
                 }
 
@@ -737,9 +1647,7 @@ def query_interpro(
     # If using prompt, parse with Claude
     if prompt:
         # Load InterPro schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "interpro.pkl")
-        with open(schema_path, "rb") as f:
-            interpro_schema = pickle.load(f)
+        interpro_schema = _load_schema("interpro")
 
         # Create system prompt template
         system_template = """
@@ -769,6 +1677,7 @@ def query_interpro(
             prompt=prompt,
             schema=interpro_schema,
             system_template=system_template,
+            database="interpro",
         )
 
         if not llm_result["success"]:
@@ -837,11 +1746,8 @@ def query_pdb(
 
     # Generate search query from natural language if prompt is provided and query is not
     if prompt and not query:
-        # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pdb.pkl")
-
-        with open(schema_path, "rb") as f:
-            schema = pickle.load(f)
+        # Load PDB schema
+        schema = _load_schema("pdb")
 
         # Create system prompt template
         system_template = """
@@ -876,6 +1782,7 @@ def query_pdb(
             prompt=prompt,
             schema=schema,
             system_template=system_template,
+            database="pdb",
         )
 
         if not llm_result["success"]:
@@ -919,6 +1826,7 @@ def query_pdb(
         method="POST",
         json_data=query_json,
         description="PDB Search API query",
+        idempotent=True,
     )
 
     return api_result
@@ -971,7 +1879,7 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
                     data_url = f"https://data.rcsb.org/rest/v1/core/chem_comp/{identifier}"
 
                 # Fetch data
-                data_response = requests.get(data_url)
+                data_response = http_get(data_url)
                 data_response.raise_for_status()
                 entity_data = data_response.json()
 
@@ -1010,22 +1918,13 @@ def query_pdb_identifiers(identifiers, return_type="entry", download=False, attr
                 try:
                     # Download PDB file
                     pdb_url = f"https://files.rcsb.org/download/{pdb_id}.pdb"
-                    pdb_response = requests.get(pdb_url)
-
-                    if pdb_response.status_code == 200:
-                        # Create data directory if it doesn't exist
-                        data_dir = os.path.join(os.path.dirname(__file__), "data", "pdb")
-                        os.makedirs(data_dir, exist_ok=True)
-
-                        # Save PDB file
-                        pdb_file_path = os.path.join(data_dir, f"{pdb_id}.pdb")
-                        with open(pdb_file_path, "wb") as pdb_file:
-                            pdb_file.write(pdb_response.content)
-
-                        # Add download information to results
-                        for result in detailed_results:
-                            if result["identifier"] == identifier or result["identifier"].startswith(pdb_id):
-                                result["pdb_file_path"] = pdb_file_path
+                    data_dir = os.path.join(os.path.dirname(__file__), "data", "pdb")
+                    pdb_file_path = download_file(pdb_url, os.path.join(data_dir, f"{pdb_id}.pdb"))
+
+                    # Add download information to results
+                    for result in detailed_results:
+                        if result["identifier"] == identifier or result["identifier"].startswith(pdb_id):
+                            result["pdb_file_path"] = pdb_file_path
                 except Exception as e:
                     for result in detailed_results:
                         if result["identifier"] == identifier or result["identifier"].startswith(pdb_id):
@@ -1057,10 +1956,8 @@ def query_kegg(prompt, endpoint=None, verbose=True):
         return {"error": "Either a prompt or an endpoint must be provided"}
 
     if prompt:
-        # Load schema from pickle file
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "kegg.pkl")
-        with open(schema_path, "rb") as f:
-            kegg_schema = pickle.load(f)
+        # Load KEGG schema
+        kegg_schema = _load_schema("kegg")
 
         # Create system prompt template
         system_template = """
@@ -1094,6 +1991,7 @@ def query_kegg(prompt, endpoint=None, verbose=True):
             prompt=prompt,
             schema=kegg_schema,
             system_template=system_template,
+            database="kegg",
         )
 
         if not llm_result["success"]:
@@ -1118,10 +2016,10 @@ def query_kegg(prompt, endpoint=None, verbose=True):
         description = "Direct query to KEGG API"
 
     # Execute the KEGG API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -1162,9 +2060,7 @@ def query_stringdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load STRING schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "stringdb.pkl")
-        with open(schema_path, "rb") as f:
-            stringdb_schema = pickle.load(f)
+        stringdb_schema = _load_schema("stringdb")
 
         # Create system prompt template
         system_template = """
@@ -1194,6 +2090,7 @@ def query_stringdb(
             prompt=prompt,
             schema=stringdb_schema,
             system_template=system_template,
+            database="stringdb",
         )
 
         if not llm_result["success"]:
@@ -1230,24 +2127,24 @@ def query_stringdb(
         if download_image:
             # For images, we need to handle the download manually
             try:
-                response = requests.get(endpoint, stream=True)
-                response.raise_for_status()
+                with http_get(endpoint, stream=True) as response:
+                    response.raise_for_status()
 
-                # Create output directory if needed
-                if not output_dir:
-                    output_dir = "."
-                os.makedirs(output_dir, exist_ok=True)
+                    # Create output directory if needed
+                    if not output_dir:
+                        output_dir = "."
+                    os.makedirs(output_dir, exist_ok=True)
 
-                # Generate filename based on endpoint
-                endpoint_parts = endpoint.split("/")
-                filename = f"string_{endpoint_parts[-2]}_{int(time.time())}.{output_format}"
-                file_path = os.path.join(output_dir, filename)
+                    # Generate filename based on endpoint
+                    endpoint_parts = endpoint.split("/")
+                    filename = f"string_{endpoint_parts[-2]}_{int(time.time())}.{output_format}"
+                    file_path = os.path.join(output_dir, filename)
 
-                # Save the image
-                with open(file_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=1024):
-                        if chunk:
-                            f.write(chunk)
+                    # Save the image
+                    with open(file_path, "wb") as f:
+                        for chunk in response.iter_content(chunk_size=1024):
+                            if chunk:
+                                f.write(chunk)
 
                 return {
                     "success": True,
@@ -1285,10 +2182,10 @@ def query_stringdb(
             }
 
     # For non-image requests, use the REST API helper
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -1332,9 +2229,7 @@ def query_iucn(
     # If using prompt, parse with Claude
     if prompt:
         # Load IUCN schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "iucn.pkl")
-        with open(schema_path, "rb") as f:
-            iucn_schema = pickle.load(f)
+        iucn_schema = _load_schema("iucn")
 
         # Create system prompt template
         system_template = """
@@ -1363,6 +2258,7 @@ def query_iucn(
             prompt=prompt,
             schema=iucn_schema,
             system_template=system_template,
+            database="iucn",
         )
 
         if not llm_result["success"]:
@@ -1388,14 +2284,20 @@ def query_iucn(
     params = {"token": token}
 
     # Execute the IUCN API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", params=params, description=description)
+    api_result = _query_rest_api(
+        endpoint=endpoint,
+        method="GET",
+        params=params,
+        description=description,
+        summarize=not verbose,
+    )
 
     # For security, remove token from the results
     if "query_info" in api_result and "endpoint" in api_result["query_info"]:
         api_result["query_info"]["endpoint"] = api_result["query_info"]["endpoint"].replace(token, "TOKEN_HIDDEN")
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -1433,9 +2335,7 @@ def query_paleobiology(
     # If using prompt, parse with Claude
     if prompt:
         # Load PBDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pbdb.pkl")
-        with open(schema_path, "rb") as f:
-            pbdb_schema = pickle.load(f)
+        pbdb_schema = _load_schema("paleobiology")
 
         # Create system prompt template
         system_template = """
@@ -1466,6 +2366,7 @@ def query_paleobiology(
             prompt=prompt,
             schema=pbdb_schema,
             system_template=system_template,
+            database="paleobiology",
         )
 
         if not llm_result["success"]:
@@ -1495,7 +2396,7 @@ def query_paleobiology(
     if is_image:
         # For image queries, we need special handling
         try:
-            response = requests.get(endpoint)
+            response = http_get(endpoint)
             response.raise_for_status()
 
             # Return image metadata without the binary data
@@ -1520,10 +2421,10 @@ def query_paleobiology(
             }
 
     # For non-image requests, use the REST API helper
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -1561,9 +2462,7 @@ def query_jaspar(
     # If using prompt, parse with Claude
     if prompt:
         # Load JASPAR schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "jaspar.pkl")
-        with open(schema_path, "rb") as f:
-            jaspar_schema = pickle.load(f)
+        jaspar_schema = _load_schema("jaspar")
 
         # Create system prompt template
         system_template = """
@@ -1592,6 +2491,7 @@ def query_jaspar(
             prompt=prompt,
             schema=jaspar_schema,
             system_template=system_template,
+            database="jaspar",
         )
 
         if not llm_result["success"]:
@@ -1624,10 +2524,10 @@ def query_jaspar(
         description = "Direct query to JASPAR API"
 
     # Execute the JASPAR API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -1665,9 +2565,7 @@ def query_worms(
     # If using prompt, parse with Claude
     if prompt:
         # Load WoRMS schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "worms.pkl")
-        with open(schema_path, "rb") as f:
-            worms_schema = pickle.load(f)
+        worms_schema = _load_schema("worms")
 
         # Create system prompt template
         system_template = """
@@ -1697,6 +2595,7 @@ def query_worms(
             prompt=prompt,
             schema=worms_schema,
             system_template=system_template,
+            database="worms",
         )
 
         if not llm_result["success"]:
@@ -1721,10 +2620,10 @@ def query_worms(
         description = "Direct query to WoRMS API"
 
     # Execute the WoRMS API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -1762,9 +2661,7 @@ def query_cbioportal(
     # If using prompt, parse with Claude
     if prompt:
         # Load cBioPortal schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "cbioportal.pkl")
-        with open(schema_path, "rb") as f:
-            cbioportal_schema = pickle.load(f)
+        cbioportal_schema = _load_schema("cbioportal")
 
         # Create system prompt template
         system_template = """
@@ -1795,6 +2692,7 @@ def query_cbioportal(
             prompt=prompt,
             schema=cbioportal_schema,
             system_template=system_template,
+            database="cbioportal",
         )
 
         if not llm_result["success"]:
@@ -1823,10 +2721,10 @@ def query_cbioportal(
         description = "Direct query to cBioPortal API"
 
     # Execute the cBioPortal API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -1854,9 +2752,7 @@ def query_clinvar(
 
     if prompt:
         # Load ClinVar schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "clinvar.pkl")
-        with open(schema_path, "rb") as f:
-            clinvar_schema = pickle.load(f)
+        clinvar_schema = _load_schema("clinvar")
 
         # ClinVar system prompt template
         system_prompt_template = """
@@ -1892,6 +2788,7 @@ def query_clinvar(
             prompt=prompt,
             schema=clinvar_schema,
             system_template=system_prompt_template,
+            database="clinvar",
         )
 
         if not llm_result["success"]:
@@ -1944,9 +2841,7 @@ def query_geo(
 
     if prompt:
         # Load GEO schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "geo.pkl")
-        with open(schema_path, "rb") as f:
-            geo_schema = pickle.load(f)
+        geo_schema = _load_schema("geo")
 
         # Create system prompt template
         system_template = """
@@ -1986,6 +2881,7 @@ def query_geo(
             prompt=prompt,
             schema=geo_schema,
             system_template=system_template,
+            database="geo",
         )
 
         if not llm_result["success"]:
@@ -2040,9 +2936,7 @@ def query_dbsnp(
 
     if prompt:
         # Load dbSNP schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "dbsnp.pkl")
-        with open(schema_path, "rb") as f:
-            dbsnp_schema = pickle.load(f)
+        dbsnp_schema = _load_schema("dbsnp")
 
         # Create system prompt template
         system_template = """
@@ -2075,6 +2969,7 @@ def query_dbsnp(
             prompt=prompt,
             schema=dbsnp_schema,
             system_template=system_template,
+            database="dbsnp",
         )
 
         if not llm_result["success"]:
@@ -2100,6 +2995,62 @@ def query_dbsnp(
     return result
 
 
+def query_dbsnp_batch(rsids, chunk_size=200):
+    """Look up many dbSNP variants at once using paged NCBI ESummary requests.
+
+    Parameters
+    ----------
+    rsids (list[str]): Reference SNP IDs, with or without the "rs" prefix (e.g., ["rs6025", "rs334"])
+    chunk_size (int): Number of IDs per ESummary request
+
+    Returns
+    -------
+    pandas.DataFrame: One row per input rsID with chromosome, position, genes, variant class, functional
+        class, clinical significance and global allele frequencies, plus a "found" column
+
+    Examples
+    --------
+    - query_dbsnp_batch(["rs6025", "rs334", "rs113488022"])
+
+    """
+    import pandas as pd
+
+    uids = list(dict.fromkeys(str(rsid).strip().lower().removeprefix("rs") for rsid in rsids if rsid is not None))
+
+    try:
+        # Long lists are uploaded once with EPost and paged from the history server at NCBI's request rate
+        records = {record["uid"]: record for record in eutils.iter_esummary("snp", ids=uids, batch_size=chunk_size)}
+    except (requests.exceptions.RequestException, eutils.EUtilsError, ValueError) as e:
+        return pd.DataFrame({"rsid": [f"rs{uid}" for uid in uids], "error": str(e), "found": False})
+
+    rows = []
+    for uid in uids:
+        record = records.get(uid)
+        if not record or "error" in record:
+            rows.append({"rsid": f"rs{uid}"})
+            continue
+        chrpos = record.get("chrpos", "")
+        rows.append(
+            {
+                "rsid": f"rs{uid}",
+                "chromosome": record.get("chr", ""),
+                "position": chrpos.split(":")[-1] if chrpos else "",
+                "genes": ",".join(gene.get("name", "") for gene in record.get("genes", [])),
+                "snp_class": record.get("snp_class", ""),
+                "function_class": record.get("fxn_class", ""),
+                "clinical_significance": record.get("clinical_significance", ""),
+                "global_mafs": ";".join(
+                    f"{maf.get('study', '')}:{maf.get('freq', '')}" for maf in record.get("global_mafs", [])
+                ),
+                "spdi": record.get("spdi", ""),
+            }
+        )
+
+    results = pd.DataFrame(rows, columns=None if rows else ["rsid"])
+    results["found"] = results["chromosome"].notna() if "chromosome" in results else False
+    return results
+
+
 def query_ucsc(
     prompt=None,
     endpoint=None,
@@ -2133,9 +3084,7 @@ def query_ucsc(
     # If using prompt, parse with Claude
     if prompt:
         # Load UCSC schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ucsc.pkl")
-        with open(schema_path, "rb") as f:
-            ucsc_schema = pickle.load(f)
+        ucsc_schema = _load_schema("ucsc")
 
         # Create system prompt template
         system_template = """
@@ -2168,6 +3117,7 @@ def query_ucsc(
             prompt=prompt,
             schema=ucsc_schema,
             system_template=system_template,
+            database="ucsc",
         )
 
         if not llm_result["success"]:
@@ -2193,11 +3143,11 @@ def query_ucsc(
         description = "Direct query to UCSC Genome Browser API"
 
     # Execute the UCSC API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     # Format the results if successful
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -2235,9 +3185,7 @@ def query_ensembl(
     # If using prompt, parse with Claude
     if prompt:
         # Load Ensembl schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "ensembl.pkl")
-        with open(schema_path, "rb") as f:
-            ensembl_schema = pickle.load(f)
+        ensembl_schema = _load_schema("ensembl")
 
         # Create system prompt template
         system_template = """
@@ -2270,6 +3218,7 @@ def query_ensembl(
             prompt=prompt,
             schema=ensembl_schema,
             system_template=system_template,
+            database="ensembl",
         )
 
         if not llm_result["success"]:
@@ -2313,15 +3262,72 @@ def query_ensembl(
         params=params,
         headers=headers,
         description=description,
+        summarize=not verbose,
     )
 
     # Format the results if successful
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
 
+def query_ensembl_batch(identifiers, id_type="id", species="homo_sapiens", expand=False, chunk_size=1000):
+    """Look up many Ensembl genes, transcripts or proteins at once using the Ensembl POST lookup endpoints.
+
+    Parameters
+    ----------
+    identifiers (list[str]): Ensembl stable IDs (e.g., ["ENSG00000139618"]) or gene symbols (e.g., ["BRCA2"])
+    id_type (str): "id" for stable IDs (POST lookup/id) or "symbol" for symbols (POST lookup/symbol/:species)
+    species (str): Species for symbol lookups (default "homo_sapiens"). Ignored for stable IDs.
+    expand (bool): Whether to include child features (transcripts, translations) as nested columns
+    chunk_size (int): Number of identifiers per request (Ensembl allows at most 1000)
+
+    Returns
+    -------
+    pandas.DataFrame: One row per input identifier with the lookup fields as columns and a "found" column
+
+    Examples
+    --------
+    - query_ensembl_batch(["ENSG00000139618", "ENSG00000141510"])
+    - query_ensembl_batch(["BRCA2", "TP53", "EGFR"], id_type="symbol")
+
+    """
+    import pandas as pd
+
+    if id_type not in ("id", "symbol"):
+        raise ValueError("id_type must be 'id' or 'symbol'")
+
+    if id_type == "id":
+        url = "https://rest.ensembl.org/lookup/id"
+        payload_key = "ids"
+    else:
+        url = f"https://rest.ensembl.org/lookup/symbol/{species}"
+        payload_key = "symbols"
+    headers = {"Content-Type": "application/json", "Accept": "application/json"}
+    chunks = _chunk_identifiers(identifiers, min(chunk_size, 1000))
+
+    def fetch(chunk):
+        result = _query_rest_api(
+            endpoint=url,
+            method="POST",
+            params={"expand": int(expand)},
+            headers=headers,
+            json_data={payload_key: chunk},
+            description=f"Ensembl batch lookup of {len(chunk)} identifiers",
+            idempotent=True,
+        )
+        if not result["success"]:
+            return [{"query": identifier, "error": result["error"]} for identifier in chunk]
+        records = result["result"] if isinstance(result["result"], dict) else {}
+        return [{"query": identifier, **(records.get(identifier) or {})} for identifier in chunk]
+
+    rows = [row for chunk_rows in _map_chunks(fetch, chunks) for row in chunk_rows]
+    results = pd.DataFrame(rows, columns=None if rows else ["query"])
+    results["found"] = results["id"].notna() if "id" in results else False
+    return results
+
+
 def query_opentarget(
     prompt=None,
     query=None,
@@ -2358,9 +3364,7 @@ def query_opentarget(
     # If using prompt, parse with Claude
     if prompt:
         # Load OpenTargets schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "opentarget.pkl")
-        with open(schema_path, "rb") as f:
-            opentarget_schema = pickle.load(f)
+        opentarget_schema = _load_schema("opentarget")
 
         # Create system prompt template
         system_template = """
@@ -2389,6 +3393,7 @@ def query_opentarget(
             prompt=prompt,
             schema=opentarget_schema,
             system_template=system_template,
+            database="opentarget",
         )
 
         if not llm_result["success"]:
@@ -2413,12 +3418,10 @@ def query_opentarget(
         json_data={"query": query, "variables": variables or {}},
         headers={"Content-Type": "application/json"},
         description="OpenTargets Platform GraphQL query",
+        idempotent=True,
+        summarize=not verbose,
     )
 
-    # Format the results if not verbose and successful
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        api_result["result"] = _format_query_results(api_result["result"])
-
     return api_result
 
 
@@ -2455,12 +3458,7 @@ def query_monarch(
 
     # If using prompt, use Claude to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "monarch.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                monarch_schema = pickle.load(f)
-        else:
-            monarch_schema = None
+        monarch_schema = _load_schema("monarch")
 
         system_template = """
         You are an expert in translating natural language requests into REST API calls for the Monarch Initiative Platform API.
@@ -2501,6 +3499,7 @@ def query_monarch(
             prompt=prompt,
             schema=monarch_schema,
             system_template=system_template,
+            database="monarch",
         )
         if not llm_result["success"]:
             return llm_result
@@ -2527,10 +3526,10 @@ def query_monarch(
     else:
         endpoint += f"?limit={max_results}"
 
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -2567,12 +3566,7 @@ def query_openfda(
 
     # If using prompt, use Claude or Gemini to generate the endpoint
     if prompt:
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "openfda.pkl")
-        if os.path.exists(schema_path):
-            with open(schema_path, "rb") as f:
-                openfda_schema = pickle.load(f)
-        else:
-            openfda_schema = None
+        openfda_schema = _load_schema("openfda")
 
         system_template = """
         You are a biomedical informatics expert specialized in using the OpenFDA API.\n\nBased on the user's natural language request, determine the appropriate OpenFDA API endpoint and parameters.\n\nOPENFDA API SCHEMA:\n{schema}\n\nYour response should be a JSON object with the following fields:\n1. \"full_url\": The complete URL to query (including the base URL \"https://api.fda.gov\" and any parameters)\n2. \"description\": A brief description of what the query is doing\n\nSPECIAL NOTES:\n- For drug event queries, use /drug/event.json?search=...\n- For drug label queries, use /drug/label.json?search=...\n- For recall queries, use /drug/enforcement.json?search=...\n- Use max_results to limit the number of returned items if supported (limit=)\n- Always URL-encode search terms\n- Return ONLY the JSON object with no additional text.\n        """
@@ -2581,6 +3575,7 @@ def query_openfda(
             prompt=prompt,
             schema=openfda_schema,
             system_template=system_template,
+            database="openfda",
         )
         if not llm_result["success"]:
             return llm_result
@@ -2644,6 +3639,7 @@ def query_clinicaltrials(
             prompt=prompt,
             schema=None,
             system_template=system_template,
+            database="clinicaltrials",
         )
         if llm_result.get("success"):
             mapping = llm_result["data"] or {}
@@ -2663,9 +3659,9 @@ def query_clinicaltrials(
         elif not endpoint.startswith("http"):
             endpoint = f"{base_url}/{endpoint.lstrip('/')}"
 
-        api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+        api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
         if not verbose and api_result.get("success") and "result" in api_result:
-            return _format_query_results(api_result["result"])
+            return api_result["result"]
         return api_result
 
     # Otherwise build params for /studies
@@ -2734,10 +3730,10 @@ def query_clinicaltrials(
         return _format_query_results(aggregated)
     return aggregated
 
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -2775,9 +3771,7 @@ def query_gwas_catalog(
     # If using prompt, parse with Claude
     if prompt:
         # Load GWAS Catalog schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gwas_catalog.pkl")
-        with open(schema_path, "rb") as f:
-            gwas_schema = pickle.load(f)
+        gwas_schema = _load_schema("gwas_catalog")
 
         # Create system prompt template
         system_template = """
@@ -2808,6 +3802,7 @@ def query_gwas_catalog(
             prompt=prompt,
             schema=gwas_schema,
             system_template=system_template,
+            database="gwas_catalog",
         )
 
         if not llm_result["success"]:
@@ -2876,9 +3871,7 @@ def query_gnomad(
     # If using prompt, parse with Claude
     if prompt and not gene_symbol:
         # Load gnomAD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gnomad.pkl")
-        with open(schema_path, "rb") as f:
-            gnomad_schema = pickle.load(f)
+        gnomad_schema = _load_schema("gnomad")
 
         # Create system prompt template
         system_template = """
@@ -2909,6 +3902,7 @@ def query_gnomad(
             prompt=prompt,
             schema=gnomad_schema,
             system_template=system_template,
+            database="gnomad",
         )
 
         if not llm_result["success"]:
@@ -2934,114 +3928,412 @@ def query_gnomad(
         json_data={"query": query_str},
         headers={"Content-Type": "application/json"},
         description=description,
+        idempotent=True,
+        summarize=not verbose,
     )
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
 
-def blast_sequence(sequence: str, database: str, program: str) -> dict[str, str | float] | str:
+# Tabular BLAST+ output columns requested from the local backend
+_BLAST_OUTFMT_COLUMNS = [
+    "qseqid",
+    "sseqid",
+    "pident",
+    "length",
+    "mismatch",
+    "gapopen",
+    "qstart",
+    "qend",
+    "sstart",
+    "send",
+    "evalue",
+    "bitscore",
+    "qlen",
+    "slen",
+    "stitle",
+]
+
+_BLAST_PROGRAMS = {"blastn", "blastp", "blastx", "tblastn", "tblastx"}
+_BLAST_NUCLEOTIDE_DB_PROGRAMS = {"blastn", "tblastn", "tblastx"}
+_BLAST_DB_EXTENSIONS = (".nal", ".nin", ".pal", ".pin")
+_blast_db_lock = threading.Lock()
+
+_NCBI_BLAST_URL = "https://blast.ncbi.nlm.nih.gov/Blast.cgi"
+_NCBI_BLAST_TIMEOUT = 600  # seconds
+
+
+def _check_blast_program(program):
+    """Raise ValueError unless `program` is one of the BLAST search programs (it is run as an executable)."""
+    if program not in _BLAST_PROGRAMS:
+        raise ValueError(f"Unsupported BLAST program '{program}'. Use one of: {', '.join(sorted(_BLAST_PROGRAMS))}")
+
+
+def _blast_query_records(sequences):
+    """Normalize one sequence, a list of sequences or an {id: sequence} mapping into (id, sequence) pairs."""
+    if isinstance(sequences, str):
+        sequences = [sequences]
+    if isinstance(sequences, dict):
+        records = list(sequences.items())
+    else:
+        records = [(f"query_{i + 1}", sequence) for i, sequence in enumerate(sequences)]
+    return [(str(query_id).split()[0], "".join(str(sequence).split())) for query_id, sequence in records]
+
+
+def _resolve_local_blast_db(database, program, data_lake_path=None):
+    """Return a local BLAST database prefix for `database`, building it with makeblastdb if needed.
+
+    `database` may be an existing BLAST database prefix, a FASTA file, or the name of a FASTA file in the
+    data lake. Databases built from FASTA files are kept under the cache directory and rebuilt when the
+    FASTA changes. Returns None when `database` does not refer to local data or BLAST+ is not installed.
+    """
+    if shutil.which(program) is None:
+        return None
+
+    candidates = [database]
+    if data_lake_path:
+        candidates.append(os.path.join(data_lake_path, database))
+    for candidate in candidates:
+        candidate = os.path.expanduser(candidate)
+        if any(os.path.exists(candidate + ext) for ext in _BLAST_DB_EXTENSIONS):
+            return candidate
+        if os.path.isfile(candidate):
+            fasta_path = os.path.abspath(candidate)
+            break
+    else:
+        return None
+
+    if shutil.which("makeblastdb") is None:
+        return None
+
+    dbtype = "nucl" if program in _BLAST_NUCLEOTIDE_DB_PROGRAMS else "prot"
+    stat = os.stat(fasta_path)
+    fingerprint = hashlib.sha256(f"{fasta_path}:{stat.st_size}:{stat.st_mtime_ns}:{dbtype}".encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(fasta_path))[0]
+    db_dir = os.path.join(os.path.expanduser(default_config.cache_dir), "blastdb", f"{name}-{fingerprint}")
+    db_prefix = os.path.join(db_dir, name)
+
+    with _blast_db_lock:
+        if not os.path.isdir(db_dir):
+            # Build next to the final location and move it into place so readers never see a partial database
+            build_dir = f"{db_dir}.tmp-{os.getpid()}"
+            os.makedirs(build_dir, exist_ok=True)
+            try:
+                subprocess.run(
+                    [
+                        "makeblastdb",
+                        "-in",
+                        fasta_path,
+                        "-dbtype",
+                        dbtype,
+                        "-out",
+                        os.path.join(build_dir, name),
+                        "-title",
+                        name,
+                    ],
+                    check=True,
+                    capture_output=True,
+                )
+            except subprocess.CalledProcessError:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                raise
+            try:
+                os.rename(build_dir, db_dir)
+            except OSError:
+                # Another process finished first
+                shutil.rmtree(build_dir, ignore_errors=True)
+    return db_prefix
+
+
+def _run_local_blast(records, db_prefix, program, evalue, max_target_seqs, num_threads):
+    """Run a BLAST+ program on all query records in one process and parse its tabular output."""
+    import pandas as pd
+
+    _check_blast_program(program)
+
+    with tempfile.TemporaryDirectory(prefix="biomni-blast-") as tmp_dir:
+        query_path = os.path.join(tmp_dir, "query.fasta")
+        with open(query_path, "w") as f:
+            for query_id, sequence in records:
+                f.write(f">{query_id}\n{sequence}\n")
+
+        completed = subprocess.run(
+            [
+                program,
+                "-query",
+                query_path,
+                "-db",
+                db_prefix,
+                "-outfmt",
+                "6 " + " ".join(_BLAST_OUTFMT_COLUMNS),
+                "-evalue",
+                str(evalue),
+                "-max_target_seqs",
+                str(max_target_seqs),
+                "-num_threads",
+                str(num_threads or os.cpu_count() or 1),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+    if not completed.stdout.strip():
+        return pd.DataFrame(columns=_BLAST_OUTFMT_COLUMNS)
+    # Subject titles may contain quotes, so disable quote handling
+    return pd.read_csv(io.StringIO(completed.stdout), sep="\t", names=_BLAST_OUTFMT_COLUMNS, quoting=3)
+
+
+def _ncbi_blast_put(program, database, query, **params):
+    """Submit a search to the NCBI BLAST URL API and return its request ID (RID)."""
+    data = {"CMD": "Put", "PROGRAM": program, "DATABASE": database, "QUERY": query, **params}
+    response = http_post(_NCBI_BLAST_URL, data=data)
+    response.raise_for_status()
+    match = re.search(r"^\s*RID = (\S+)", response.text, re.MULTILINE)
+    if not match:
+        raise RuntimeError("NCBI BLAST did not return a request ID")
+    return match.group(1)
+
+
+def _ncbi_blast_poll(rid):
+    """Return the XML results of a BLAST request, or PENDING while NCBI is still running it."""
+    response = http_get(_NCBI_BLAST_URL, params={"CMD": "Get", "FORMAT_OBJECT": "SearchInfo", "RID": rid})
+    response.raise_for_status()
+    match = re.search(r"Status=(\w+)", response.text)
+    status = match.group(1) if match else "UNKNOWN"
+    if status == "WAITING":
+        return PENDING
+    if status != "READY":
+        raise RuntimeError(f"NCBI BLAST search {rid} ended with status {status}")
+
+    response = http_get(_NCBI_BLAST_URL, params={"CMD": "Get", "FORMAT_TYPE": "XML", "RID": rid})
+    response.raise_for_status()
+    return response.text
+
+
+def _submit_remote_blast(program, database, query, finish, **params):
+    """Submit a search to NCBI BLAST and poll it in the background; see biomni.jobs."""
+    return submit_polling_job(
+        lambda: _ncbi_blast_put(program, database, query, **params),
+        _ncbi_blast_poll,
+        finish=finish,
+        name=f"NCBI {program} search against {database}",
+        # NCBI asks clients not to poll a request more than once a minute
+        initial_delay=15,
+        max_delay=60,
+        timeout=_NCBI_BLAST_TIMEOUT,
+    )
+
+
+def _parse_blast_xml_hits(xml):
+    """Parse BLAST XML for any number of queries into one row per HSP in the tabular layout."""
+    import pandas as pd
+
+    rows = []
+    for blast_record in NCBIXML.parse(io.StringIO(xml)):
+        query_id = blast_record.query.split()[0] if blast_record.query else blast_record.query_id
+        for alignment in blast_record.alignments:
+            for hsp in alignment.hsps:
+                rows.append(
+                    {
+                        "qseqid": query_id,
+                        "sseqid": alignment.hit_id,
+                        "pident": hsp.identities / float(hsp.align_length) * 100,
+                        "length": hsp.align_length,
+                        "mismatch": hsp.align_length - hsp.identities - (hsp.gaps or 0),
+                        "gapopen": hsp.gaps or 0,
+                        "qstart": hsp.query_start,
+                        "qend": hsp.query_end,
+                        "sstart": hsp.sbjct_start,
+                        "send": hsp.sbjct_end,
+                        "evalue": hsp.expect,
+                        "bitscore": hsp.bits,
+                        "qlen": blast_record.query_length,
+                        "slen": alignment.length,
+                        "stitle": alignment.hit_def,
+                    }
+                )
+    return pd.DataFrame(rows, columns=_BLAST_OUTFMT_COLUMNS)
+
+
+def _run_remote_blast(records, database, program, evalue, max_target_seqs):
+    """Submit all query records to NCBI BLAST in one request and return every HSP in the tabular layout."""
+    query = "".join(f">{query_id}\n{sequence}\n" for query_id, sequence in records)
+    job = _submit_remote_blast(
+        program, database, query, _parse_blast_xml_hits, EXPECT=evalue, HITLIST_SIZE=max_target_seqs
+    )
+    return job.result()
+
+
+def blast_sequences(
+    sequences,
+    database,
+    program="blastn",
+    data_lake_path=None,
+    evalue=10.0,
+    max_target_seqs=50,
+    num_threads=None,
+    background=False,
+):
+    """Search one or many sequences with BLAST, running BLAST+ locally when a local database is available.
+
+    When `database` is a FASTA file (or the name of one in the data lake) or an existing BLAST database
+    prefix and BLAST+ is installed, all queries are searched in a single local run; BLAST databases are
+    built from FASTA files with makeblastdb on first use and cached. Otherwise the queries are submitted
+    together to NCBI BLAST (e.g., database "core_nt" or "nr").
+
+    Parameters
+    ----------
+    sequences (str | list[str] | dict[str, str]): One sequence, a list of sequences, or a mapping of query ID
+        to sequence
+    database (str): FASTA file, data lake FASTA file name, local BLAST database prefix, or NCBI database name
+    program (str): BLAST program (blastn, blastp, blastx, tblastn, tblastx)
+    data_lake_path (str, optional): Data lake directory used to resolve bare FASTA file names
+    evalue (float): E-value threshold
+    max_target_seqs (int): Maximum number of subject sequences reported per query
+    num_threads (int, optional): Threads for local BLAST+ (default: all CPUs)
+    background (bool): Return a biomni.jobs.JobHandle immediately and run the search in the background
+
+    Returns
+    -------
+    pandas.DataFrame: One row per HSP for all queries, in BLAST tabular format (qseqid, sseqid, pident, length,
+        mismatch, gapopen, qstart, qend, sstart, send, evalue, bitscore, qlen, slen, stitle) plus query
+        coverage in percent. The backend used ("local" or "remote") is stored in DataFrame.attrs["backend"].
+
+    Examples
+    --------
+    - blast_sequences({"q1": "ATGGCC...", "q2": "ATGAAA..."}, "/data/refs/plasmids.fasta", program="blastn")
+    - blast_sequences(["MKTAYIAK...", "MSDNE..."], "nr", program="blastp")
+
+    """
+    _check_blast_program(program)
+    records = _blast_query_records(sequences)
+    if not records:
+        raise ValueError("No query sequences provided")
+
+    if background:
+        return submit_job(
+            blast_sequences,
+            sequences,
+            database,
+            program=program,
+            data_lake_path=data_lake_path,
+            evalue=evalue,
+            max_target_seqs=max_target_seqs,
+            num_threads=num_threads,
+            name=f"{program} search of {len(records)} sequences against {database}",
+        )
+
+    db_prefix = None
+    try:
+        db_prefix = _resolve_local_blast_db(database, program, data_lake_path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Could not build a local BLAST database, using NCBI BLAST instead: {e}")
+
+    if db_prefix is not None:
+        hits = _run_local_blast(records, db_prefix, program, evalue, max_target_seqs, num_threads)
+        backend = "local"
+    else:
+        hits = _run_remote_blast(records, database, program, evalue, max_target_seqs)
+        backend = "remote"
+
+    hits["coverage"] = ((hits["qend"] - hits["qstart"]).abs() + 1) / hits["qlen"] * 100
+    hits.attrs["backend"] = backend
+    return hits
+
+
+def blast_sequence(
+    sequence: str, database: str, program: str, background: bool = False
+) -> dict[str, str | float] | str | JobHandle:
     """Identifies a DNA sequence using NCBI BLAST with improved error handling, timeout management, and debugging.
 
+    If `database` is a local FASTA file or BLAST database prefix and BLAST+ is installed, the search runs
+    locally instead (see blast_sequences).
+
     Args:
         sequence (str): The sequence to identify. If DNA, use database: core_nt, program: blastn;
                         if protein, use database: nr, program: blastp
         database (str): The BLAST database to search against
-        program (str): The BLAST program to use
+        program (str): The BLAST program to use (blastn, blastp, blastx, tblastn or tblastx)
+        background (bool): Return a biomni.jobs.JobHandle immediately instead of waiting for the search;
+            its result is the dictionary described below
 
     Returns:
-        dict: A dictionary containing the title, e-value, identity percentage, and coverage percentage of the best alignment
+        dict: A dictionary containing the title, e-value, identity percentage, and coverage percentage of the best alignment,
+            and a "hits" list with the same fields for every HSP
 
     """
-    max_attempts = 1  # One initial attempt plus one retry
-    attempts = 0
-    max_runtime = 600  # 10 minutes in seconds
-
-    while attempts < max_attempts:
+    _check_blast_program(program)
+    try:
+        db_prefix = _resolve_local_blast_db(database, program)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Could not build a local BLAST database, using NCBI BLAST instead: {e}")
+        db_prefix = None
+
+    if db_prefix is not None:
+        if background:
+            # Pass the original database so a failed local run falls back to NCBI with the remote name
+            return submit_job(blast_sequence, sequence, database, program, name=f"local {program} search")
         try:
-            attempts += 1
-            query_sequence = Seq(sequence)
-
-            # Start timer
-            start_time = time.time()
-
-            # Submit BLAST job
-            print(f"Submitting BLAST job (attempt {attempts}/{max_attempts})...")
-            result_handle = NCBIWWW.qblast(
-                program,
-                database,
-                query_sequence,
-                expect=100,
-                word_size=7,
-                megablast=True,
-            )
-
-            # Parse results with timeout check
-            blast_records = NCBIXML.parse(result_handle)
-            blast_record = None
-
-            # Try to get the first record with timeout check
-            while time.time() - start_time < max_runtime:
-                try:
-                    # Set a short timeout for next operation
-                    blast_record = next(blast_records)  # Get first record
-                    break  # Successfully got the record
-                except StopIteration:
-                    # No more records
-                    return "No BLAST results found"
-                except Exception:
-                    # Check if we've exceeded the time limit
-                    if time.time() - start_time >= max_runtime:
-                        if attempts < max_attempts:
-                            print("BLAST job timeout exceeded. Resubmitting...")
-                            break  # Break to retry
-                        else:
-                            return "BLAST search failed after maximum attempts due to timeout"
-                    # Brief pause before trying again
-                    time.sleep(1)
-
-            # Check if we timed out during record retrieval
-            if blast_record is None:
-                if attempts < max_attempts:
-                    continue  # Retry
-                else:
-                    return "BLAST search failed after maximum attempts due to timeout"
-
-            # Debug information
-            print(f"Number of alignments found: {len(blast_record.alignments)}")
-
-            if blast_record.alignments:
-                for alignment in blast_record.alignments:
-                    print("\nAlignment:")
-                    print(f"hit_id: {alignment.hit_id}")
-                    print(f"hit_def: {alignment.hit_def}")
-                    print(f"accession: {alignment.accession}")
-                    for hsp in alignment.hsps:
-                        print(f"E-value: {hsp.expect}")
-                        print(f"Score: {hsp.score}")
-                        print(f"Identities: {hsp.identities}/{hsp.align_length}")
-
-                        return {
-                            "hit_id": alignment.hit_id,
-                            "hit_def": alignment.hit_def,
-                            "accession": alignment.accession,
-                            "e_value": hsp.expect,
-                            "identity": (hsp.identities / float(hsp.align_length)) * 100,
-                            "coverage": len(hsp.query) / len(sequence) * 100,
-                        }
-            else:
+            hits = blast_sequences({"query": sequence}, db_prefix, program=program, evalue=100)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Local BLAST failed, using NCBI BLAST instead: {e}")
+        else:
+            if hits.empty:
                 return "No alignments found - sequence might be too short or low complexity"
+            hits = [
+                {
+                    "hit_id": hit["sseqid"],
+                    "hit_def": hit["stitle"],
+                    "accession": hit["sseqid"],
+                    "e_value": float(hit["evalue"]),
+                    "identity": float(hit["pident"]),
+                    "coverage": float(hit["coverage"]),
+                }
+                for hit in hits.to_dict("records")
+            ]
+            return {**hits[0], "hits": hits}
+
+    def best_alignment(xml):
+        blast_record = next(NCBIXML.parse(io.StringIO(xml)), None)
+        if blast_record is None:
+            return "No BLAST results found"
+        if not blast_record.alignments:
+            return "No alignments found - sequence might be too short or low complexity"
+
+        best = blast_record.alignments[0]
+        print(f"Number of alignments found: {len(blast_record.alignments)}; best: {best.hit_id} {best.hit_def}")
+        hits = [
+            {
+                "hit_id": alignment.hit_id,
+                "hit_def": alignment.hit_def,
+                "accession": alignment.accession,
+                "e_value": hsp.expect,
+                "identity": (hsp.identities / float(hsp.align_length)) * 100,
+                "coverage": len(hsp.query) / len(sequence) * 100,
+            }
+            for alignment in blast_record.alignments
+            for hsp in alignment.hsps
+        ]
+        return {**hits[0], "hits": hits}
 
-        except Exception as e:
-            if attempts < max_attempts:
-                print(f"Error during BLAST search: {str(e)}. Retrying...")
-                time.sleep(2)  # Wait briefly before retrying
-            else:
-                return f"Error during BLAST search after maximum attempts: {str(e)}"
+    # NCBI runs the search asynchronously; the job polls for the result in the background with backoff
+    print("Submitting BLAST job...")
+    job = _submit_remote_blast(
+        program, database, str(Seq(sequence)), best_alignment, EXPECT=100, WORD_SIZE=7, MEGABLAST="on"
+    )
+    if background:
+        return job
 
-    return "BLAST search failed after maximum attempts"
+    try:
+        return job.result()
+    except TimeoutError:
+        return f"BLAST search failed due to timeout after {_NCBI_BLAST_TIMEOUT} seconds"
+    except Exception as e:
+        return f"Error during BLAST search: {str(e)}"
 
 
 def query_reactome(
@@ -3086,9 +4378,7 @@ def query_reactome(
     # If using prompt, parse with Claude
     if prompt:
         # Load Reactome schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "reactome.pkl")
-        with open(schema_path, "rb") as f:
-            reactome_schema = pickle.load(f)
+        reactome_schema = _load_schema("reactome")
 
         # Create system prompt template
         system_template = """
@@ -3120,6 +4410,7 @@ def query_reactome(
             prompt=prompt,
             schema=reactome_schema,
             system_template=system_template,
+            database="reactome",
         )
 
         if not llm_result["success"]:
@@ -3170,7 +4461,13 @@ def query_reactome(
         url = f"{base_url}/{endpoint}"
 
     # Execute the Reactome API request using the helper function
-    api_result = _query_rest_api(endpoint=url, method="GET", params=params, description=description)
+    api_result = _query_rest_api(
+        endpoint=url,
+        method="GET",
+        params=params,
+        description=description,
+        summarize=not verbose,
+    )
 
     # Handle downloading pathway diagrams if requested
     if should_download and api_result.get("success") and "result" in api_result:
@@ -3185,20 +4482,13 @@ def query_reactome(
         if pathway_id and output_dir:
             diagram_url = f"{content_base_url}/data/pathway/{pathway_id}/diagram"
             try:
-                diagram_response = requests.get(diagram_url)
-                diagram_response.raise_for_status()
-
-                # Save diagram file
                 diagram_path = os.path.join(output_dir, f"{pathway_id}_diagram.png")
-                with open(diagram_path, "wb") as f:
-                    f.write(diagram_response.content)
-
-                api_result["diagram_path"] = diagram_path
+                api_result["diagram_path"] = download_file(diagram_url, diagram_path)
             except Exception as e:
                 api_result["diagram_error"] = f"Failed to download diagram: {str(e)}"
 
     if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        return _format_query_results(api_result["result"])
+        return api_result["result"]
 
     return api_result
 
@@ -3261,6 +4551,7 @@ def query_regulomedb(
             prompt=prompt,
             schema=None,
             system_template=system_template,
+            database="regulomedb",
         )
 
         if not llm_result["success"]:
@@ -3282,11 +4573,12 @@ def query_regulomedb(
     endpoint = endpoint
 
     # Execute the RegulomeDB API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", headers={"Accept": "application/json"})
-
-    # Format the results if not verbose and successful
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        api_result["result"] = _format_query_results(api_result["result"])
+    api_result = _query_rest_api(
+        endpoint=endpoint,
+        method="GET",
+        headers={"Accept": "application/json"},
+        summarize=not verbose,
+    )
 
     return api_result
 
@@ -3324,9 +4616,7 @@ def query_pride(
     # If using prompt, parse with Claude
     if prompt:
         # Load PRIDE schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "pride.pkl")
-        with open(schema_path, "rb") as f:
-            pride_schema = pickle.load(f)
+        pride_schema = _load_schema("pride")
 
         # Create system prompt template
         system_template = """
@@ -3356,6 +4646,7 @@ def query_pride(
             prompt=prompt,
             schema=pride_schema,
             system_template=system_template,
+            database="pride",
         )
 
         if not llm_result["success"]:
@@ -3423,9 +4714,7 @@ def query_gtopdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load GtoPdb schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "gtopdb.pkl")
-        with open(schema_path, "rb") as f:
-            gtopdb_schema = pickle.load(f)
+        gtopdb_schema = _load_schema("gtopdb")
 
         # Create system prompt template
         system_template = r"""
@@ -3456,6 +4745,7 @@ def query_gtopdb(
             prompt=prompt,
             schema=gtopdb_schema,
             system_template=system_template,
+            database="gtopdb",
         )
 
         if not llm_result["success"]:
@@ -3483,11 +4773,7 @@ def query_gtopdb(
     description = "Direct query to provided endpoint"
 
     # Execute the GtoPdb API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
-
-    # Format the results if not verbose and successful
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        api_result["result"] = _format_query_results(api_result["result"])
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     return api_result
 
@@ -3524,7 +4810,7 @@ def region_to_ccre_screen(coord_chrom: str, coord_start: int, coord_end: int, as
         steps.append(str(data))
 
         # Make the request
-        response = requests.post(url, json=data)
+        response = http_post(url, json=data, idempotent=True)
 
         # Check if the response is successful
         if not response.ok:
@@ -3623,7 +4909,7 @@ def get_genes_near_ccre(accession: str, assembly: str, chromosome: str, k: int =
     data = {"accession": accession, "assembly": assembly, "coord_chrom": chromosome}
 
     steps_log += "Sending POST request to API with given data.\n"
-    response = requests.post(url, json=data)
+    response = http_post(url, json=data, idempotent=True)
 
     if not response.ok:
         steps_log += f"API request failed with response: {response.text}\n"
@@ -3691,9 +4977,7 @@ def query_remap(
     # If using prompt, parse with Claude
     if prompt:
         # Load ReMap schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "remap.pkl")
-        with open(schema_path, "rb") as f:
-            remap_schema = pickle.load(f)
+        remap_schema = _load_schema("remap")
 
         # Create system prompt template
         system_template = """
@@ -3723,6 +5007,7 @@ def query_remap(
             prompt=prompt,
             schema=remap_schema,
             system_template=system_template,
+            database="remap",
         )
 
         if not llm_result["success"]:
@@ -3750,11 +5035,7 @@ def query_remap(
     description = "Direct query to provided endpoint"
 
     # Execute the ReMap API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
-
-    # Format the results if not verbose and successful
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        api_result["result"] = _format_query_results(api_result["result"])
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     return api_result
 
@@ -3792,9 +5073,7 @@ def query_mpd(
     # If using prompt, parse with Claude
     if prompt:
         # Load MPD schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "mpd.pkl")
-        with open(schema_path, "rb") as f:
-            mpd_schema = pickle.load(f)
+        mpd_schema = _load_schema("mpd")
 
         # Create system prompt template
         system_template = """
@@ -3824,6 +5103,7 @@ def query_mpd(
             prompt=prompt,
             schema=mpd_schema,
             system_template=system_template,
+            database="mpd",
         )
 
         if not llm_result["success"]:
@@ -3851,11 +5131,7 @@ def query_mpd(
     description = "Direct query to provided endpoint"
 
     # Execute the MPD API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description)
-
-    # Format the results if not verbose and successful
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        api_result["result"] = _format_query_results(api_result["result"])
+    api_result = _query_rest_api(endpoint=endpoint, method="GET", description=description, summarize=not verbose)
 
     return api_result
 
@@ -3893,9 +5169,7 @@ def query_emdb(
     # If using prompt, parse with Claude
     if prompt:
         # Load EMDB schema
-        schema_path = os.path.join(os.path.dirname(__file__), "schema_db", "emdb.pkl")
-        with open(schema_path, "rb") as f:
-            emdb_schema = pickle.load(f)
+        emdb_schema = _load_schema("emdb")
 
         # Create system prompt template
         system_template = """
@@ -3927,6 +5201,7 @@ def query_emdb(
             prompt=prompt,
             schema=emdb_schema,
             system_template=system_template,
+            database="emdb",
         )
 
         if not llm_result["success"]:
@@ -3956,10 +5231,177 @@ def query_emdb(
     description = "Direct query to provided endpoint"
 
     # Execute the EMDB API request using the helper function
-    api_result = _query_rest_api(endpoint=endpoint, method="GET", params=params, description=description)
-
-    # Format the results if not verbose and successful
-    if not verbose and "success" in api_result and api_result["success"] and "result" in api_result:
-        api_result["result"] = _format_query_results(api_result["result"])
+    api_result = _query_rest_api(
+        endpoint=endpoint,
+        method="GET",
+        params=params,
+        description=description,
+        summarize=not verbose,
+    )
 
     return api_result
+
+
+# Query tools query_many may dispatch to, by database name (the function is query_<name>)
+_FANOUT_DATABASES = {
+    "uniprot",
+    "uniprot_batch",
+    "alphafold",
+    "interpro",
+    "pdb",
+    "pdb_identifiers",
+    "kegg",
+    "stringdb",
+    "iucn",
+    "paleobiology",
+    "jaspar",
+    "worms",
+    "cbioportal",
+    "clinvar",
+    "geo",
+    "dbsnp",
+    "dbsnp_batch",
+    "ucsc",
+    "ensembl",
+    "ensembl_batch",
+    "opentarget",
+    "monarch",
+    "openfda",
+    "clinicaltrials",
+    "gwas_catalog",
+    "gnomad",
+    "reactome",
+    "regulomedb",
+    "pride",
+    "gtopdb",
+    "remap",
+    "mpd",
+    "emdb",
+}
+
+
+def _normalize_fanout_queries(queries):
+    """Turn the accepted query_many inputs into a list of (label, function, kwargs) jobs."""
+    items = list(queries.items()) if isinstance(queries, dict) else [(None, spec) for spec in queries]
+
+    parsed = []
+    for label, spec in items:
+        if isinstance(spec, str):
+            database, kwargs = spec, {}
+        elif isinstance(spec, tuple | list) and len(spec) == 2:
+            database, kwargs = spec
+            kwargs = {"prompt": kwargs} if isinstance(kwargs, str) else dict(kwargs)
+        elif isinstance(spec, dict):
+            kwargs = dict(spec)
+            database = kwargs.pop("database", None)
+            label = kwargs.pop("label", label)
+        else:
+            raise ValueError(f"Unsupported query specification: {spec!r}")
+
+        if database is None and label is not None:
+            database = label
+        if not database or not isinstance(database, str):
+            raise ValueError(f"Query specification has no database: {spec!r}")
+
+        database = database.removeprefix("query_")
+        if database not in _FANOUT_DATABASES:
+            raise ValueError(f"Unknown database '{database}'. Available: {', '.join(sorted(_FANOUT_DATABASES))}")
+        parsed.append((label, database, globals()[f"query_{database}"], kwargs))
+
+    explicit = Counter(label for label, _, _, _ in parsed if label is not None)
+    duplicates = [label for label, count in explicit.items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate query labels: {', '.join(map(str, duplicates))}")
+
+    # Unlabeled queries are named after their database, numbered on repeats and never taking an explicit label
+    jobs = []
+    seen = Counter()
+    for label, database, func, kwargs in parsed:
+        while label is None:
+            seen[database] += 1
+            candidate = database if seen[database] == 1 else f"{database}#{seen[database]}"
+            if candidate not in explicit:
+                label = candidate
+        jobs.append((label, func, kwargs))
+    return jobs
+
+
+def iter_query_many(queries, timeout=None, max_workers=8):
+    """Run several database queries concurrently and yield each result as soon as it completes.
+
+    Parameters
+    ----------
+    queries (list | dict): Query specifications; see query_many
+    timeout (float, optional): Seconds to wait for all queries. Queries still running when it expires
+        are yielded with a timeout error instead of a result.
+    max_workers (int): Maximum number of queries in flight at once
+
+    Yields
+    ------
+    tuple: (label, result) pairs in completion order
+
+    """
+    jobs = _normalize_fanout_queries(queries)
+    if not jobs:
+        return
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)), thread_name_prefix="biomni-query")
+    futures = {pool.submit(func, **kwargs): label for label, func, kwargs in jobs}
+    pending = set(futures)
+
+    def outcome(future):
+        try:
+            return future.result()
+        except Exception as e:
+            return {"error": f"Error: {str(e)}"}
+
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            pending.discard(future)
+            yield futures[future], outcome(future)
+    except FuturesTimeoutError:
+        for future in list(pending):
+            pending.discard(future)
+            if future.done():
+                yield futures[future], outcome(future)
+            else:
+                future.cancel()
+                yield futures[future], {"error": f"Query timed out after {timeout} seconds", "timed_out": True}
+    finally:
+        # Do not block on stragglers; their results are discarded
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def query_many(queries, timeout=None, max_workers=8):
+    """Query several databases concurrently, e.g. to gather everything known about a gene in one call.
+
+    Queries run in parallel threads, with the number of simultaneous requests to any one host bounded by
+    the shared HTTP client, so the total latency approaches that of the slowest source rather than the sum.
+
+    Parameters
+    ----------
+    queries (list | dict): Query specifications. Each entry is either
+        - a dict with a "database" key (e.g., "uniprot" or "query_uniprot") and the keyword arguments of
+          that query function, plus an optional "label" (labels must be unique),
+        - a (database, prompt) or (database, kwargs) tuple, or
+        - when passing a dict, a mapping of label -> spec, where spec may omit "database" if the label is
+          the database name.
+    timeout (float, optional): Seconds to wait for all queries; slower queries return a timeout error and
+        the results that did complete are still returned
+    max_workers (int): Maximum number of queries in flight at once
+
+    Returns
+    -------
+    dict: Mapping of label (database name by default, with "#2", "#3" ... suffixes for repeats) to that
+        query's result, in the order the queries were given
+
+    Examples
+    --------
+    - query_many([("uniprot", "Find information about human TP53"), ("clinvar", "Pathogenic TP53 variants")])
+    - query_many({"ensembl": {"endpoint": "lookup/symbol/homo_sapiens/TP53"},
+                  "gwas": {"database": "gwas_catalog", "prompt": "GWAS associations for TP53"}}, timeout=60)
+
+    """
+    jobs = _normalize_fanout_queries(queries)
+    results = dict(iter_query_many(queries, timeout=timeout, max_workers=max_workers))
+    return {label: results[label] for label, _, _ in jobs}
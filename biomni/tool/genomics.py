@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import scanpy as sc
 
+from biomni.datalake import enrich_gene_sets, list_gene_set_libraries
 from biomni.llm import get_llm
 
 
@@ -587,6 +588,8 @@ def gene_set_enrichment_analysis(
         - 'celltypes'     (PanglaoDB_Augmented_2021)
         - 'kinase_interactions' (KEA_2015)
         You can use get_gene_set_enrichment_analysis_supported_database_list tool to get the list of supported databases.
+        This queries the Enrichr web service; local_gene_set_enrichment_analysis runs offline against
+        the data lake's MSigDB/MouseMine gene sets and handles many gene lists at once.
 
     - background_list (list, optional): List of background genes to use for enrichment analysis.
     - plot (bool, optional): If True, generates a bar plot of the top K enrichment results.
@@ -635,6 +638,76 @@ def gene_set_enrichment_analysis(
         return f"An error occurred: {e}"
 
 
+def local_gene_set_enrichment_analysis(
+    genes: list | dict,
+    data_lake_path: str,
+    libraries: list = None,
+    species: str = "human",
+    background_list: list = None,
+    top_k: int = 10,
+    max_fdr: float = None,
+) -> str:
+    """Perform offline enrichment analysis of one or many gene lists against the data lake's
+    MSigDB (human) or MouseMine (mouse) gene set libraries, without any web service.
+
+    Parameters
+    ----------
+    - genes (list or dict): List of gene symbols, or a dict mapping query names to gene symbol lists
+        to analyze many lists in one call.
+    - data_lake_path (str): Path to the data lake
+    - libraries (list, optional): Library names or name fragments, e.g. ["hallmark", "c2_curated",
+        "c5_ontology"]. Defaults to all libraries of the species.
+    - species (str): 'human' (MSigDB) or 'mouse' (MouseMine). Default is 'human'.
+    - background_list (list, optional): List of background genes. Defaults to the genes of each library.
+    - top_k (int): Number of top gene sets to return per query. Default is 10.
+    - max_fdr (float, optional): Only report gene sets with an adjusted p-value at most this.
+
+    Returns
+    -------
+    - str: The steps performed and the top K enrichment results per query.
+
+    """
+    queries = genes if isinstance(genes, dict) else {"query": genes}
+    steps_log = f"Starting local enrichment analysis of {len(queries)} gene list(s) against {species} gene sets\n"
+    if background_list:
+        steps_log += f"Using background list with {len(background_list)} genes.\n"
+
+    try:
+        df = enrich_gene_sets(
+            queries,
+            libraries=libraries,
+            species=species,
+            background=background_list,
+            data_lake_path=data_lake_path,
+            top_k=top_k,
+            max_fdr=max_fdr,
+        )
+    except (ValueError, OSError, ImportError) as e:
+        return f"An error occurred: {e}"
+
+    steps_log += "Computed hypergeometric p-values with Benjamini-Hochberg FDR per query and library.\n"
+    if libraries is None:
+        steps_log += "Libraries: " + ", ".join(list_gene_set_libraries(data_lake_path, species)) + "\n"
+    if df.empty:
+        return steps_log + "No gene set overlaps any of the query genes.\n"
+
+    for query, rows in df.groupby("query", sort=False, observed=True):
+        steps_log += f"\nTop {len(rows)} gene sets for {query}:\n"
+        for rank, row in enumerate(rows.itertuples(), start=1):
+            steps_log += (
+                f"Rank: {rank}\n"
+                f"Gene Set: {row.gene_set}\n"
+                f"Library: {row.library}\n"
+                f"Overlap: {row.overlap}/{row.set_size} (query genes: {row.query_size})\n"
+                f"Fold Enrichment: {row.fold_enrichment:.2f}\n"
+                f"P-value: {row.p_value:.2e}\n"
+                f"Adjusted P-value: {row.adj_p_value:.2e}\n"
+                f"Overlapping Genes: {', '.join(row.overlapping_genes)}\n"
+                "----------------------------------------\n"
+            )
+    return steps_log
+
+
 def analyze_chromatin_interactions(hic_file_path, regulatory_elements_bed, output_dir="./output"):
     """Analyze chromatin interactions from Hi-C data to identify enhancer-promoter interactions and TADs.
 
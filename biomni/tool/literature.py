@@ -9,6 +9,8 @@ import requests
 from bs4 import BeautifulSoup
 from googlesearch import search
 
+from biomni.http_client import download_file, http_get
+
 
 def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary_info"):
     """Fetches supplementary information for a paper given its DOI and returns a research log.
@@ -27,7 +29,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     # CrossRef API to resolve DOI to a publisher page
     crossref_url = f"https://doi.org/{doi}"
     headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(crossref_url, headers=headers)
+    response = http_get(crossref_url, headers=headers, cache=True)
 
     if response.status_code != 200:
         log_message = f"Failed to resolve DOI: {doi}. Status Code: {response.status_code}"
@@ -38,7 +40,7 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     research_log.append(f"Resolved DOI to publisher page: {publisher_url}")
 
     # Fetch publisher page
-    response = requests.get(publisher_url, headers=headers)
+    response = http_get(publisher_url, headers=headers, cache=True)
     if response.status_code != 200:
         log_message = f"Failed to access publisher page for DOI {doi}."
         research_log.append(log_message)
@@ -70,14 +72,13 @@ def fetch_supplementary_info_from_doi(doi: str, output_dir: str = "supplementary
     downloaded_files = []
     for link in supplementary_links:
         file_name = os.path.join(output_dir, link.split("/")[-1])
-        file_response = requests.get(link, headers=headers)
-        if file_response.status_code == 200:
-            with open(file_name, "wb") as f:
-                f.write(file_response.content)
-            downloaded_files.append(file_name)
-            research_log.append(f"Downloaded file: {file_name}")
-        else:
+        try:
+            download_file(link, file_name, headers=headers)
+        except requests.exceptions.RequestException:
             research_log.append(f"Failed to download file from {link}")
+            continue
+        downloaded_files.append(file_name)
+        research_log.append(f"Downloaded file: {file_name}")
 
     if downloaded_files:
         research_log.append(f"Successfully downloaded {len(downloaded_files)} file(s).")
@@ -217,7 +218,7 @@ def extract_url_content(url: str) -> str:
         Text content of the webpage
 
     """
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    response = http_get(url, headers={"User-Agent": "Mozilla/5.0"}, cache=True)
 
     # Check if the response is in text format
     if "text/plain" in response.headers.get("Content-Type", "") or "application/json" in response.headers.get(
@@ -261,7 +262,7 @@ def extract_pdf_content(url: str) -> str:
         # Check if the URL ends with .pdf
         if not url.lower().endswith(".pdf"):
             # If not, try to find a PDF link on the page
-            response = requests.get(url, timeout=30)
+            response = http_get(url, timeout=30, cache=True)
             if response.status_code == 200:
                 # Look for PDF links in the HTML content
                 pdf_links = re.findall(r'href=[\'"]([^\'"]+\.pdf)[\'"]', response.text)
@@ -277,7 +278,7 @@ def extract_pdf_content(url: str) -> str:
                     return f"No PDF file found at {url}. Please provide a direct link to a PDF file."
 
         # Download the PDF
-        response = requests.get(url, timeout=30)
+        response = http_get(url, timeout=30, cache=True)
 
         # Check if we actually got a PDF file (by checking content type or magic bytes)
         content_type = response.headers.get("Content-Type", "").lower()
@@ -11,6 +11,8 @@ from Bio.Seq import Seq
 from Bio.SeqUtils import MeltingTemp as mt
 from bs4 import BeautifulSoup
 
+from biomni.datalake import get_sgrna_library
+
 
 def annotate_open_reading_frames(sequence, min_length, search_reverse=False, filter_subsets=False):
     """Find all Open Reading Frames (ORFs) in a DNA sequence using Biopython.
@@ -907,42 +909,67 @@ def design_knockout_sgrna(
     if not os.path.exists(library_path):
         raise FileNotFoundError(f"Library file for {species} not found at path: {library_path}")
 
-    # Load sgRNA library from S3
+    # Guides are served from a gene-indexed store built once per library file
     try:
-        df = pd.read_csv(library_path, delimiter="\t")
+        library = get_sgrna_library(library_path)
     except Exception as e:
         raise RuntimeError(f"Failed to load sgRNA library: {str(e)}") from None
 
-    # Filter for target gene
     gene_name = gene_name.upper()  # Ensure consistent capitalization
-    gene_df = df[df["Target Gene Symbol"].str.upper() == gene_name]
+    # Sorted by combined rank; genes without an exact match fall back to partial matching
+    guides = library.guides(gene_name, num_guides)
 
-    if gene_df.empty:
-        # Try partial matching if exact match fails
-        gene_df = df[df["Target Gene Symbol"].str.upper().str.contains(gene_name)]
+    return {
+        "explanation": "Output contains target gene name, species, and list of sgRNA sequences",
+        "gene_name": gene_name,
+        "species": species,
+        "guides": guides,
+    }
 
-    if gene_df.empty:
-        return {
-            "explanation": "Output contains target gene name, species, and list of sgRNA sequences",
-            "gene_name": gene_name,
-            "species": species,
-            "guides": [],
-        }
 
-    # Sort by combined rank (default priority)
-    gene_df = gene_df.sort_values(by=["Combined Rank"])
+def design_knockout_sgrna_batch(
+    gene_names: list[str],
+    data_lake_path: str,
+    species: str = "human",
+    num_guides: int = 1,
+) -> dict[str, Any]:
+    """Design sgRNAs for CRISPR knockout of many genes at once (e.g. for a library screen)
+    by searching pre-computed sgRNA libraries.
 
-    # Get top guides
-    top_guides = gene_df.head(num_guides)
+    Args:
+        gene_names (list[str]): Target gene symbols (e.g., ["EGFR", "TP53", "KRAS"])
+        species (str): Target organism species (default: "human")
+        num_guides (int): Number of guides to return per gene (default: 1)
 
-    # Extract just the sgRNA sequences
-    guides = top_guides["sgRNA Sequence"].tolist()
+    Returns:
+        Dict: Dictionary containing:
+            - explanation: Explanation of the output fields
+            - species: Target species
+            - guides: Dictionary mapping each gene name to its list of sgRNA sequences
+            - genes_not_found: Gene names without any guides in the library
 
+    """
+    DEFAULT_LIBRARIES = {
+        "human": data_lake_path + "/sgRNA_KO_SP_human.txt",
+        "mouse": data_lake_path + "/sgRNA_KO_SP_mouse.txt",
+    }
+    library_path = DEFAULT_LIBRARIES[species.lower()]
+
+    if not os.path.exists(library_path):
+        raise FileNotFoundError(f"Library file for {species} not found at path: {library_path}")
+
+    try:
+        library = get_sgrna_library(library_path)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load sgRNA library: {str(e)}") from None
+
+    guides = library.design(gene_names, num_guides)
     return {
-        "explanation": "Output contains target gene name, species, and list of sgRNA sequences",
-        "gene_name": gene_name,
+        "explanation": "Output contains the species, a mapping from each target gene name to its list of "
+        "sgRNA sequences (sorted by combined rank), and the genes without guides in the library",
         "species": species,
         "guides": guides,
+        "genes_not_found": [gene for gene, gene_guides in guides.items() if not gene_guides],
     }
 
 
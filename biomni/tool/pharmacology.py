@@ -1,14 +1,21 @@
 import os
-import pickle
 import re
 import subprocess
 import sys
 from datetime import datetime
-from difflib import get_close_matches
 
 import numpy as np
 import pandas as pd
 
+from biomni.datalake import (
+    get_ddinter_store,
+    get_drug_name_resolver,
+    get_faers_store,
+    get_txgnn_predictions,
+    normalize_drug_name,
+)
+from biomni.datalake.faers import DEATH, HOSPITALIZATION, LIFE_THREATENING, SERIOUS, default_faers_path, faers_files
+
 
 def run_diffdock_with_smiles(pdb_path, smiles_string, local_output_dir, gpu_device=0, use_gpu=True):
     try:
@@ -195,56 +202,64 @@ def retrieve_topk_repurposing_drugs_from_disease_txgnn(disease_name, data_lake_p
 
     """
 
-    # Sigmoid function to convert raw prediction scores
-    def sigmoid(x):
-        return 1 / (1 + np.exp(-x))
-
-    # Step 1: Load the mappings and prediction data from the provided paths
-    name_mapping_path = data_lake_path + "/txgnn_name_mapping.pkl"
-    result_path = data_lake_path + "/txgnn_prediction.pkl"
-
-    with open(name_mapping_path, "rb") as f:
-        mapping = pickle.load(f)
-
-    with open(result_path, "rb") as f:
-        result = pickle.load(f)
+    # Step 1: Load the prediction store (converted from the pickles once, then memory-mapped)
+    predictions = get_txgnn_predictions(data_lake_path)
 
     # Step 2: Fuzzy match the disease name to find the closest match
-    possible_diseases = result.keys()
-    matched_disease = get_close_matches(disease_name, possible_diseases, n=1, cutoff=0.6)
+    matched_disease = predictions.match_disease(disease_name)
 
     if not matched_disease:
         return f"Error: No matching disease found for '{disease_name}'. Please try a different name."
 
-    matched_disease = matched_disease[0]
-
-    # Step 3: Retrieve the prediction scores for the matched disease
-    disease_predictions = result[matched_disease]
-
-    # Step 4: Apply the sigmoid function to the raw prediction scores
-    sigmoid_predictions = {drug_id: sigmoid(score) for drug_id, score in disease_predictions.items()}
-
-    # Step 5: Sort the drugs by prediction score in descending order
-    top_k_drugs = sorted(sigmoid_predictions.items(), key=lambda x: x[1], reverse=True)[:k]
+    # Step 3: Select the top K drugs by prediction score and apply the sigmoid function to their scores
+    top_k_drugs = predictions.top_drugs(matched_disease, k)[matched_disease]
 
-    # Step 6: Map drug IDs to their names and format the results
-    top_k_drug_names = [(mapping["id2name_drug"].get(drug_id, "Unknown Drug"), score) for drug_id, score in top_k_drugs]
-
-    # Step 7: Create a human and LLM-friendly summary string
+    # Step 4: Create a human and LLM-friendly summary string
     summary = f"TxGNN Drug Repurposing Predictions for '{matched_disease}':\n"
     summary += f"Top {k} predicted drugs and their corresponding prediction scores (post-sigmoid transformation):\n"
 
-    for i, (drug_name, score) in enumerate(top_k_drug_names, 1):
-        summary += f"{i}. {drug_name} - Prediction Score: {score:.4f}\n"
+    for i, drug in enumerate(top_k_drugs, 1):
+        summary += f"{i}. {drug['drug_name']} - Prediction Score: {drug['score']:.4f}\n"
 
     summary += "\nProcess Summary:\n"
-    summary += "- Fuzzy matching was used to match the input disease name to '{matched_disease}'.\n"
+    summary += f"- Fuzzy matching was used to match the input disease name to '{matched_disease}'.\n"
     summary += "- Sigmoid function was applied to raw prediction scores to convert them into probabilities.\n"
     summary += f"- The top {k} drugs were selected based on their prediction scores.\n"
 
     return summary
 
 
+def retrieve_topk_repurposing_drugs_from_diseases_txgnn(disease_names, data_lake_path, k=5):
+    """Batch version of retrieve_topk_repurposing_drugs_from_disease_txgnn: returns the top K TxGNN
+    predicted drugs for each of several diseases in one call.
+
+    Args:
+    - disease_names (list[str]): The names of the diseases for which the drug predictions are to be retrieved.
+    - data_lake_path (str): The path to the data lake containing the TxGNN predictions.
+    - k (int, optional): The number of top drug predictions to return per disease. Defaults to 5.
+
+    Returns:
+    - str: A summary of the top K drug predictions with their scores for each disease.
+
+    """
+    predictions = get_txgnn_predictions(data_lake_path)
+
+    matches = {name: predictions.match_disease(name) for name in disease_names}
+    matched = list(dict.fromkeys(match for match in matches.values() if match))
+    top_k_drugs = predictions.top_drugs(matched, k)
+
+    summary = f"TxGNN Drug Repurposing Predictions for {len(disease_names)} diseases "
+    summary += f"(top {k} drugs each, prediction scores post-sigmoid transformation):\n"
+    for name, match in matches.items():
+        if not match:
+            summary += f"\n'{name}': Error: No matching disease found. Please try a different name.\n"
+            continue
+        summary += f"\n'{name}' (matched to '{match}'):\n"
+        for i, drug in enumerate(top_k_drugs[match], 1):
+            summary += f"{i}. {drug['drug_name']} - Prediction Score: {drug['score']:.4f}\n"
+    return summary
+
+
 # ADMET prediction function with research log format
 def predict_admet_properties(smiles_list, ADMET_model_type="MPNN"):
     try:
@@ -1969,307 +1984,47 @@ def analyze_western_blot(
 
 def _load_ddinter_data(data_lake_path):
     """
-    Load DDInter datasets from pickle files, processing if needed.
+    Load the process-wide DDInter interaction store, building it from the CSVs if needed.
 
     Parameters
     ----------
     data_lake_path : str
-        Path to data lake directory containing DDInter pickle files
+        Path to data lake directory containing the DDInter CSV files
 
     Returns
     -------
-    tuple
-        (drug_info, interaction_matrix, name_mapping) dictionaries
+    DDInterStore
+        Integer-coded drug registry, interaction records and sparse interaction matrix
     """
-    import os
-    import pickle
-
-    # Define schema directory (following established pattern)
-    schema_dir = os.path.join(os.path.dirname(__file__), "schema_db")
-
-    # Define paths to DDInter pickle files
-    drug_info_path = os.path.join(schema_dir, "ddinter_drugs.pkl")
-    interaction_path = os.path.join(schema_dir, "ddinter_interactions.pkl")
-    mapping_path = os.path.join(schema_dir, "ddinter_name_mapping.pkl")
-
-    # Check if processing is needed (lazy loading pattern)
-    pkl_files = [drug_info_path, interaction_path, mapping_path]
-    if not all(os.path.exists(f) for f in pkl_files):
-        _process_ddinter_data_inline(data_lake_path, schema_dir)
-
-    # Load data
     try:
-        with open(drug_info_path, "rb") as f:
-            drug_info = pickle.load(f)
-
-        with open(interaction_path, "rb") as f:
-            interaction_matrix = pickle.load(f)
-
-        with open(mapping_path, "rb") as f:
-            name_mapping = pickle.load(f)
-
-        return drug_info, interaction_matrix, name_mapping
-
+        return get_ddinter_store(data_lake_path)
     except Exception as e:
         raise FileNotFoundError(f"Error loading DDInter data: {e}") from e
 
 
-def _process_ddinter_data_inline(data_lake_path, output_dir):
+def _resolve_ddinter_names(drug_names, data_lake_path):
     """
-    Process DDInter CSV files into standardized pickle files.
-
-    This function processes raw DDInter 2.0 CSV files and creates standardized
-    data structures for use in Biomni drug-drug interaction analysis.
+    Resolve drug names to DDInter names with the shared trigram-indexed fuzzy resolver.
 
     Parameters
     ----------
+    drug_names : list of str
+        Original drug names
     data_lake_path : str
-        Path to data lake directory containing raw DDInter CSV files
-    output_dir : str
-        Directory to save processed pickle files
-    """
-    import os
-    import pickle
-    from collections import defaultdict
-    from pathlib import Path
-
-    import pandas as pd
-
-    # Create output directory
-    Path(output_dir).mkdir(exist_ok=True)
-
-    # Define CSV files to process
-    csv_files = [
-        "ddinter_alimentary_tract_metabolism.csv",
-        "ddinter_antineoplastic.csv",
-        "ddinter_antiparasitic.csv",
-        "ddinter_blood_organs.csv",
-        "ddinter_dermatological.csv",
-        "ddinter_hormonal.csv",
-        "ddinter_respiratory.csv",
-        "ddinter_various.csv",
-    ]
-
-    # Load and combine all CSV files
-    dataframes = []
-    for csv_file in csv_files:
-        file_path = os.path.join(data_lake_path, csv_file)
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
-            # Add source category
-            category = csv_file.replace("ddinter_", "").replace(".csv", "")
-            df["category"] = category
-            dataframes.append(df)
-
-    if not dataframes:
-        raise FileNotFoundError("No DDInter CSV files found in data lake")
-
-    # Process data
-    drug_info = _build_drug_registry_inline(dataframes)
-    interaction_matrix = _create_interaction_matrix_inline(dataframes)
-    name_mapping = _create_name_mapping_inline(drug_info)
-
-    # Save processed data
-    with open(os.path.join(output_dir, "ddinter_drugs.pkl"), "wb") as f:
-        pickle.dump(drug_info, f)
-
-    with open(os.path.join(output_dir, "ddinter_interactions.pkl"), "wb") as f:
-        pickle.dump(interaction_matrix, f)
-
-    with open(os.path.join(output_dir, "ddinter_name_mapping.pkl"), "wb") as f:
-        pickle.dump(name_mapping, f)
-
-    # Generate and save statistics
-    stats = _generate_ddinter_statistics_inline(drug_info, interaction_matrix)
-    with open(os.path.join(output_dir, "ddinter_statistics.pkl"), "wb") as f:
-        pickle.dump(stats, f)
-
-
-def _standardize_drug_name_processing(drug_name):
-    """Standardize drug names for consistent matching during processing."""
-    import pandas as pd
-
-    if pd.isna(drug_name):
-        return ""
-
-    # Convert to lowercase and strip whitespace
-    standardized = str(drug_name).strip().lower()
-
-    # Remove common suffixes and prefixes
-    standardized = standardized.replace(" hydrochloride", "")
-    standardized = standardized.replace(" sulfate", "")
-    standardized = standardized.replace(" sodium", "")
-    standardized = standardized.replace(" potassium", "")
-    standardized = standardized.replace(" calcium", "")
-    standardized = standardized.replace(" magnesium", "")
-
-    return standardized
-
-
-def _build_drug_registry_inline(dataframes):
-    """Build comprehensive drug registry from all interactions."""
-    import pandas as pd
-
-    drug_registry = {}
-
-    for df in dataframes:
-        for _, row in df.iterrows():
-            drug_a_id = row["DDInterID_A"]
-            drug_a_name = row["Drug_A"]
-            drug_b_id = row["DDInterID_B"]
-            drug_b_name = row["Drug_B"]
-
-            # Add Drug A
-            if drug_a_id not in drug_registry:
-                drug_registry[drug_a_id] = {
-                    "name": drug_a_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_a_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_a_id]["categories"].add(row["category"])
-
-            # Add Drug B
-            if drug_b_id not in drug_registry:
-                drug_registry[drug_b_id] = {
-                    "name": drug_b_name,
-                    "standardized_name": _standardize_drug_name_processing(drug_b_name),
-                    "categories": set(),
-                    "interactions": set(),
-                }
-            drug_registry[drug_b_id]["categories"].add(row["category"])
-
-            # Record interactions
-            drug_registry[drug_a_id]["interactions"].add(drug_b_id)
-            drug_registry[drug_b_id]["interactions"].add(drug_a_id)
-
-    # Convert sets to lists for pickle serialization
-    for drug_id in drug_registry:
-        drug_registry[drug_id]["categories"] = list(drug_registry[drug_id]["categories"])
-        drug_registry[drug_id]["interactions"] = list(drug_registry[drug_id]["interactions"])
-
-    return drug_registry
-
-
-def _create_interaction_matrix_inline(dataframes):
-    """Create interaction matrix for fast lookups using standardized drug names."""
-    from collections import defaultdict
-
-    import pandas as pd
-
-    combined_df = pd.concat(dataframes, ignore_index=True)
-    interaction_matrix = defaultdict(lambda: defaultdict(list))
-
-    # Create bidirectional interaction matrix using standardized names
-    for _, row in combined_df.iterrows():
-        drug_a_std = _standardize_drug_name_processing(row["Drug_A"])
-        drug_b_std = _standardize_drug_name_processing(row["Drug_B"])
-        level = row["Level"]
-        category = row["category"]
-
-        interaction_data = {
-            "level": level,
-            "category": category,
-            "drug_a_id": row["DDInterID_A"],
-            "drug_b_id": row["DDInterID_B"],
-            "drug_a_name": row["Drug_A"],
-            "drug_b_name": row["Drug_B"],
-        }
-
-        # Add both directions using standardized names as keys
-        interaction_matrix[drug_a_std][drug_b_std].append(interaction_data)
-        interaction_matrix[drug_b_std][drug_a_std].append(interaction_data)
-
-    # Convert to regular dict for pickle
-    interaction_matrix = dict(interaction_matrix)
-    for drug in interaction_matrix:
-        interaction_matrix[drug] = dict(interaction_matrix[drug])
-
-    return interaction_matrix
-
-
-def _create_name_mapping_inline(drug_info):
-    """Create drug name to ID mapping for fuzzy matching."""
-    name_mapping = {}
-
-    for drug_id, drug_data in drug_info.items():
-        original_name = drug_data["name"]
-        standardized_name = drug_data["standardized_name"]
-
-        # Map both original and standardized names
-        name_mapping[original_name.lower()] = drug_id
-        name_mapping[standardized_name] = drug_id
-
-    return name_mapping
-
-
-def _generate_ddinter_statistics_inline(drug_info, interaction_matrix):
-    """Generate statistics about the processed data."""
-    from collections import defaultdict
-
-    stats = {
-        "total_drugs": len(drug_info),
-        "total_interactions": 0,
-        "interaction_levels": defaultdict(int),
-        "drug_categories": defaultdict(int),
-        "most_connected_drugs": [],
-    }
-
-    # Count interactions and levels
-    for drug_a in interaction_matrix:
-        for drug_b in interaction_matrix[drug_a]:
-            interactions = interaction_matrix[drug_a][drug_b]
-            stats["total_interactions"] += len(interactions)
-
-            for interaction in interactions:
-                stats["interaction_levels"][interaction["level"]] += 1
-
-    # Count drug categories
-    for drug_data in drug_info.values():
-        for category in drug_data["categories"]:
-            stats["drug_categories"][category] += 1
-
-    # Find most connected drugs
-    connection_counts = []
-    for drug_id, drug_data in drug_info.items():
-        connection_counts.append(
-            {"drug_id": drug_id, "name": drug_data["name"], "connections": len(drug_data["interactions"])}
-        )
-
-    connection_counts.sort(key=lambda x: x["connections"], reverse=True)
-    stats["most_connected_drugs"] = connection_counts[:10]
-
-    return stats
-
-
-def _standardize_drug_name(drug_name, name_mapping):
-    """
-    Standardize drug names using fuzzy matching against DDInter database.
-
-    Parameters
-    ----------
-    drug_name : str
-        Original drug name
-    name_mapping : dict
-        Drug name to ID mapping dictionary
+        Path to data lake directory containing the DDInter CSV files
 
     Returns
     -------
-    str or None
-        Standardized drug name or None if not found
+    tuple
+        (matches, log) where matches holds a DrugNameMatch, or None if not found, per name and
+        log notes the names resolved by fuzzy matching with their similarity
     """
-    from difflib import get_close_matches
-
-    # Direct match
-    if drug_name.lower() in name_mapping:
-        return drug_name.lower()
-
-    # Fuzzy match
-    matches = get_close_matches(drug_name.lower(), name_mapping.keys(), n=1, cutoff=0.8)
-    if matches:
-        return matches[0]
-
-    return None
+    matches = get_drug_name_resolver(data_lake_path).resolve_many(drug_names)
+    log = ""
+    for match in matches:
+        if match and match.score < 1:
+            log += f"Note: '{match.query}' matched to '{match.name}' (similarity {match.score:.2f})\n"
+    return matches, log + "\n" if log else log
 
 
 def _format_interaction_result(interaction_data, drug_name_a, drug_name_b, include_mechanisms=True):
@@ -2349,17 +2104,18 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
+        store = _load_ddinter_data(data_lake_path)
+        log += f"Successfully loaded DDInter database with {len(store)} drugs\n\n"
 
         # Standardize drug names
         standardized_names = []
         missing_drugs = []
 
-        for drug_name in drug_names:
-            standardized = _standardize_drug_name(drug_name, name_mapping)
-            if standardized:
-                standardized_names.append(standardized)
+        matches, resolution_log = _resolve_ddinter_names(drug_names, data_lake_path)
+        log += resolution_log
+        for drug_name, match in zip(drug_names, matches, strict=True):
+            if match:
+                standardized_names.append(match.name)
             else:
                 missing_drugs.append(drug_name)
 
@@ -2373,36 +2129,32 @@ def query_drug_interactions(drug_names, interaction_types=None, severity_levels=
             log += "Error: No valid drugs found in DDInter database\n"
             return log
 
-        # Query interactions
+        # Query interactions of all drug pairs at once
         interactions_found = []
+        name_codes = [store.name_code(name) for name in standardized_names]
 
-        for i, drug_a in enumerate(standardized_names):
-            for j, drug_b in enumerate(standardized_names):
-                if i >= j:  # Avoid duplicate pairs
-                    continue
-
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
-                    # Apply filters
-                    filtered_interactions = interactions
+        for i, j, interactions in store.pairwise(name_codes):
+            # Apply filters
+            filtered_interactions = interactions
 
-                    if severity_levels:
-                        filtered_interactions = [
-                            int_data for int_data in filtered_interactions if int_data.get("level") in severity_levels
-                        ]
+            if severity_levels:
+                filtered_interactions = [
+                    int_data for int_data in filtered_interactions if int_data.get("level") in severity_levels
+                ]
 
-                    if interaction_types:
-                        filtered_interactions = [
-                            int_data
-                            for int_data in filtered_interactions
-                            if int_data.get("category") in interaction_types
-                        ]
+            if interaction_types:
+                filtered_interactions = [
+                    int_data for int_data in filtered_interactions if int_data.get("category") in interaction_types
+                ]
 
-                    if filtered_interactions:
-                        interactions_found.append(
-                            {"drug_a": drug_a, "drug_b": drug_b, "interactions": filtered_interactions}
-                        )
+            if filtered_interactions:
+                interactions_found.append(
+                    {
+                        "drug_a": standardized_names[i],
+                        "drug_b": standardized_names[j],
+                        "interactions": filtered_interactions,
+                    }
+                )
 
         # Format results
         log += "Interaction Analysis Results:\n"
@@ -2477,17 +2229,18 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
+        store = _load_ddinter_data(data_lake_path)
         log += "Successfully loaded DDInter database\n\n"
 
         # Standardize drug names
         standardized_drugs = []
         missing_drugs = []
 
-        for drug in drug_list:
-            standardized = _standardize_drug_name(drug, name_mapping)
-            if standardized:
-                standardized_drugs.append(standardized)
+        matches, resolution_log = _resolve_ddinter_names(drug_list, data_lake_path)
+        log += resolution_log
+        for drug, match in zip(drug_list, matches, strict=True):
+            if match:
+                standardized_drugs.append(match.name)
             else:
                 missing_drugs.append(drug)
 
@@ -2507,24 +2260,20 @@ def check_drug_combination_safety(drug_list, include_mechanisms=True, include_ma
         moderate_interactions = 0
         minor_interactions = 0
 
-        for i, drug_a in enumerate(standardized_drugs):
-            for j, drug_b in enumerate(standardized_drugs):
-                if i >= j:  # Avoid duplicate pairs
-                    continue
-
-                if drug_a in interaction_matrix and drug_b in interaction_matrix[drug_a]:
-                    interactions = interaction_matrix[drug_a][drug_b]
-
-                    for interaction in interactions:
-                        level = interaction.get("level", "Unknown")
-                        if level == "Major":
-                            major_interactions += 1
-                        elif level == "Moderate":
-                            moderate_interactions += 1
-                        elif level == "Minor":
-                            minor_interactions += 1
+        name_codes = [store.name_code(drug) for drug in standardized_drugs]
+        for i, j, interactions in store.pairwise(name_codes):
+            for interaction in interactions:
+                level = interaction.get("level", "Unknown")
+                if level == "Major":
+                    major_interactions += 1
+                elif level == "Moderate":
+                    moderate_interactions += 1
+                elif level == "Minor":
+                    minor_interactions += 1
 
-                    interactions_found.append({"drug_a": drug_a, "drug_b": drug_b, "interactions": interactions})
+            interactions_found.append(
+                {"drug_a": standardized_drugs[i], "drug_b": standardized_drugs[j], "interactions": interactions}
+            )
 
         # Overall safety assessment
         log += "Overall Safety Assessment:\n"
@@ -2641,12 +2390,13 @@ def analyze_interaction_mechanisms(drug_pair, detailed_analysis=True, data_lake_
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
+        store = _load_ddinter_data(data_lake_path)
         log += "Successfully loaded DDInter database\n\n"
 
         # Standardize drug names
-        std_drug_a = _standardize_drug_name(drug_a, name_mapping)
-        std_drug_b = _standardize_drug_name(drug_b, name_mapping)
+        match_a, match_b = get_drug_name_resolver(data_lake_path).resolve_many([drug_a, drug_b])
+        std_drug_a = match_a and match_a.name
+        std_drug_b = match_b and match_b.name
 
         if not std_drug_a:
             log += f"Error: Drug '{drug_a}' not found in DDInter database\n"
@@ -2656,29 +2406,25 @@ def analyze_interaction_mechanisms(drug_pair, detailed_analysis=True, data_lake_
             return log
 
         # Query interactions
-        interactions = []
-        if std_drug_a in interaction_matrix and std_drug_b in interaction_matrix[std_drug_a]:
-            interactions = interaction_matrix[std_drug_a][std_drug_b]
+        interactions = store.interactions(store.name_code(std_drug_a), store.name_code(std_drug_b))
 
         if not interactions:
             log += f"No interactions found between {drug_a} and {drug_b}\n"
             return log
 
         # Get drug information
-        drug_a_id = name_mapping[std_drug_a]
-        drug_b_id = name_mapping[std_drug_b]
-        drug_a_info = drug_info.get(drug_a_id, {})
-        drug_b_info = drug_info.get(drug_b_id, {})
+        drug_a_info = store.drug(store.drug_code(std_drug_a))
+        drug_b_info = store.drug(store.drug_code(std_drug_b))
 
         log += "Drug Profile Analysis:\n"
         log += "-" * 20 + "\n"
         log += f"{drug_a.title()}:\n"
-        log += f"- Categories: {', '.join(drug_a_info.get('categories', ['Unknown']))}\n"
-        log += f"- Total known interactions: {len(drug_a_info.get('interactions', []))}\n\n"
+        log += f"- Categories: {', '.join(drug_a_info['categories'])}\n"
+        log += f"- Total known interactions: {drug_a_info['interaction_count']}\n\n"
 
         log += f"{drug_b.title()}:\n"
-        log += f"- Categories: {', '.join(drug_b_info.get('categories', ['Unknown']))}\n"
-        log += f"- Total known interactions: {len(drug_b_info.get('interactions', []))}\n\n"
+        log += f"- Categories: {', '.join(drug_b_info['categories'])}\n"
+        log += f"- Total known interactions: {drug_b_info['interaction_count']}\n\n"
 
         # Analyze interaction mechanisms
         log += "Interaction Mechanism Analysis:\n"
@@ -2798,23 +2544,24 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
 
     try:
         # Load DDInter data
-        drug_info, interaction_matrix, name_mapping = _load_ddinter_data(data_lake_path)
-        log += f"Successfully loaded DDInter database with {len(drug_info)} drugs\n\n"
+        store = _load_ddinter_data(data_lake_path)
+        log += f"Successfully loaded DDInter database with {len(store)} drugs\n\n"
 
         # Standardize target drug name
-        std_target = _standardize_drug_name(target_drug, name_mapping)
-        if not std_target:
+        matches, resolution_log = _resolve_ddinter_names([target_drug, *contraindicated_drugs], data_lake_path)
+        if not matches[0]:
             log += f"Error: Target drug '{target_drug}' not found in DDInter database\n"
             return log
+        log += resolution_log
+        std_target = matches[0].name
 
         # Standardize contraindicated drug names
         std_contraindicated = []
         missing_contraindicated = []
 
-        for drug in contraindicated_drugs:
-            std_drug = _standardize_drug_name(drug, name_mapping)
-            if std_drug:
-                std_contraindicated.append(std_drug)
+        for drug, match in zip(contraindicated_drugs, matches[1:], strict=True):
+            if match:
+                std_contraindicated.append(match.name)
             else:
                 missing_contraindicated.append(drug)
 
@@ -2825,70 +2572,19 @@ def find_alternative_drugs_ddinter(target_drug, contraindicated_drugs, therapeut
             log += "\n"
 
         # Get target drug information
-        target_id = name_mapping[std_target]
-        target_info = drug_info.get(target_id, {})
-        target_categories = target_info.get("categories", [])
+        target_code = store.drug_code(std_target)
+        target_info = store.drug(target_code)
 
         log += "Target Drug Profile:\n"
         log += f"- Drug: {target_drug}\n"
-        log += f"- Categories: {', '.join(target_categories)}\n"
-        log += f"- Total interactions: {len(target_info.get('interactions', []))}\n\n"
-
-        # Find alternative drugs
-        alternatives = []
-
-        for drug_id, drug_data in drug_info.items():
-            drug_name = drug_data["name"]
-            drug_categories = drug_data.get("categories", [])
-
-            # Skip the target drug itself
-            if drug_id == target_id:
-                continue
-
-            # Apply therapeutic class filter
-            if therapeutic_class:
-                if not any(therapeutic_class.lower() in cat.lower() for cat in drug_categories):
-                    continue
-            else:
-                # Look for drugs in similar categories as target
-                if not any(cat in target_categories for cat in drug_categories):
-                    continue
+        log += f"- Categories: {', '.join(target_info['categories'])}\n"
+        log += f"- Total interactions: {target_info['interaction_count']}\n\n"
 
-            # Check if this drug interacts with any contraindicated drugs
-            has_contraindicated_interactions = False
-            interaction_count = 0
-            major_interactions = 0
-
-            std_drug_name = drug_data["standardized_name"]
-
-            for contraindicated in std_contraindicated:
-                if std_drug_name in interaction_matrix and contraindicated in interaction_matrix[std_drug_name]:
-                    interactions = interaction_matrix[std_drug_name][contraindicated]
-                    interaction_count += len(interactions)
-
-                    # Check for major interactions
-                    for interaction in interactions:
-                        if interaction.get("level") == "Major":
-                            major_interactions += 1
-                            has_contraindicated_interactions = True
-                            break
-
-                    if has_contraindicated_interactions:
-                        break
-
-            # Add to alternatives if no major contraindicated interactions
-            if not has_contraindicated_interactions:
-                alternatives.append(
-                    {
-                        "name": drug_name,
-                        "categories": drug_categories,
-                        "interaction_count": interaction_count,
-                        "total_interactions": len(drug_data.get("interactions", [])),
-                    }
-                )
-
-        # Sort alternatives by interaction count (fewer is better)
-        alternatives.sort(key=lambda x: x["interaction_count"])
+        # Candidates come from the category index and are checked against all
+        # contraindicated drugs at once; fewer interactions rank first
+        alternatives = store.alternatives(
+            target_code, [store.name_code(drug) for drug in std_contraindicated], therapeutic_class
+        )
 
         # Present results
         log += "Alternative Drug Analysis:\n"
@@ -3158,22 +2854,43 @@ class OpenFDAClient:
 
 
 def _standardize_drug_name_fda(drug_name: str) -> str:
-    """Standardize drug names for FDA API queries."""
-    # Handle None/empty values
-    if not drug_name:
-        return ""
+    """Standardize a drug name for FDA API queries (lower case, trailing salt words removed)."""
+    return normalize_drug_name(drug_name)
+
 
-    # Remove common suffixes
-    suffixes = ["sodium", "hydrochloride", "sulfate", "phosphate", "acetate", "citrate"]
+def _query_fda_drug(query, drug_name: str) -> tuple[dict, str]:
+    """Run an openFDA query for a drug, retrying with the closest known drug name if nothing is found.
 
-    # Clean and standardize
-    name = drug_name.strip().lower()
+    The standardized name is always queried first, so only exact and normalized names are used
+    silently. A fuzzy correction from the data lake's DDInter vocabulary (e.g. a misspelling) is
+    only queried when the name itself has no records, and is reported in the returned note.
 
-    for suffix in suffixes:
-        if name.endswith(f" {suffix}"):
-            name = name[: -len(f" {suffix}")]
+    Args:
+        query: Function taking a standardized drug name and returning an openFDA response
+        drug_name: Drug name as given by the user
 
-    return name
+    Returns:
+        The response, and a note describing the correction ("" if none was made)
+    """
+    name = _standardize_drug_name_fda(drug_name)
+    response = query(name)
+    if response.get("results"):
+        return response, ""
+    try:
+        match = get_drug_name_resolver().resolve(name, cutoff=0.9)
+    except (FileNotFoundError, ImportError):
+        return response, ""
+    corrected = normalize_drug_name(match.name) if match else ""
+    if not corrected or corrected == name:
+        return response, ""
+    corrected_response = query(corrected)
+    if not corrected_response.get("results"):
+        return response, ""
+    note = (
+        f"Note: no FDA records were found for '{drug_name}'; showing '{corrected}', "
+        f"the closest known drug name (similarity {match.score:.2f})"
+    )
+    return corrected_response, note
 
 
 def _apply_fda_filters(response_data: dict, filters: dict) -> dict:
@@ -3245,7 +2962,7 @@ def _extract_fda_safety_signals(response_list: list[dict]) -> dict:
             drugs = result.get("patient", {}).get("drug", [])
             for drug in drugs:
                 # Use the existing standardization function
-                drug_name = _standardize_drug_name_fda(drug.get("medicinalproduct", ""))
+                drug_name = normalize_drug_name(drug.get("medicinalproduct", ""))
                 if drug_name:
                     if drug_name not in drug_signals:
                         drug_signals[drug_name] = {"total_reports": 0, "serious_reports": 0, "common_reactions": []}
@@ -3296,7 +3013,7 @@ def _extract_fda_safety_signals(response_list: list[dict]) -> dict:
             for result in response["results"]:
                 drugs = result.get("patient", {}).get("drug", [])
                 has_this_drug = any(
-                    _standardize_drug_name_fda(drug.get("medicinalproduct", "")) == drug_name for drug in drugs
+                    normalize_drug_name(drug.get("medicinalproduct", "")) == drug_name for drug in drugs
                 )
 
                 if has_this_drug:
@@ -3385,7 +3102,11 @@ def _format_adverse_event_summary(response_data: dict, drug_name: str, include_d
         return f"No adverse events found for {drug_name} in the FDA database."
 
     stats = _generate_fda_statistics(response_data)
+    return _format_adverse_event_statistics(stats, drug_name, response_data.get("disclaimer", ""))
+
 
+def _format_adverse_event_statistics(stats: dict, drug_name: str, disclaimer: str, details: str = "") -> str:
+    """Format adverse event statistics (see _generate_fda_statistics) into readable summary."""
     summary = "Adverse Event Summary\n"
     summary += "=" * 21 + "\n"
     summary += f"Drug: {drug_name}\n"
@@ -3411,8 +3132,10 @@ def _format_adverse_event_summary(response_data: dict, drug_name: str, include_d
             for i, (reaction, count) in enumerate(stats["top_reactions"][:5], 1):
                 summary += f"{i}. {reaction} ({count:,} reports)\n"
 
+    summary += details
+
     # Add FDA disclaimer
-    summary += "\n" + response_data.get("disclaimer", "")
+    summary += "\n" + disclaimer
 
     return summary
 
@@ -3565,6 +3288,137 @@ def _format_safety_signal_summary(
     return summary
 
 
+# Local FAERS Mirror Functions
+
+_FAERS_DISCLAIMER = (
+    "FDA Disclaimer: These data do not establish causation. "
+    "Reports are voluntary and subject to reporting bias. "
+    "Data should not be used for regulatory decision-making."
+)
+
+
+def _local_faers_store(faers_path: str | None = None):
+    """The local FAERS mirror to query instead of the openFDA API: the bulk downloads at
+    faers_path, else those in <data lake>/faers if present, else None."""
+    if faers_path is None and not faers_files(default_faers_path()):
+        return None
+    return get_faers_store(faers_path)
+
+
+def _faers_filter_flags(severity_filter: list[str] | None, outcome_filter: list[str] | None) -> tuple[int, int]:
+    """Report flags required and excluded by the severity and outcome filters, as _apply_fda_filters applies them."""
+    flags, without = 0, 0
+    if severity_filter:
+        if "serious" in severity_filter:
+            flags |= SERIOUS
+        elif "non_serious" in severity_filter:
+            without |= SERIOUS
+    if outcome_filter:
+        if "life_threatening" in outcome_filter:
+            flags |= LIFE_THREATENING
+        elif "hospitalization" in outcome_filter:
+            flags |= HOSPITALIZATION
+        elif "death" in outcome_filter:
+            flags |= DEATH
+    return flags, without
+
+
+def _select_faers_signals(table, prr_threshold: float = 2.0, min_reports: int = 3):
+    """Drug-event pairs meeting the Evans criteria (PRR >= threshold, chi-squared >= 4, at least min_reports
+    reports), strongest first."""
+    signals = table[(table["a"] >= min_reports) & (table["prr"] >= prr_threshold) & (table["chi2"] >= 4)]
+    return signals.sort_values(["prr_lower", "a"], ascending=False, kind="stable")
+
+
+def _format_faers_signals(signals, limit: int = 10, include_drug: bool = False) -> str:
+    """Format disproportionality signals, one line per drug-event pair."""
+    text = ""
+    for row in signals.head(limit).itertuples(index=False):
+        drug = f"{row.drug.title()} - " if include_drug else ""
+        text += (
+            f"- {drug}{row.event}: {row.a:,} reports, PRR {row.prr:.2f} ({row.prr_lower:.2f}-{row.prr_upper:.2f}), "
+            f"ROR {row.ror:.2f} ({row.ror_lower:.2f}-{row.ror_upper:.2f}), IC025 {row.ic025:.2f}\n"
+        )
+    return text
+
+
+def _query_local_adverse_events(
+    store, drug_name: str, date_range=None, severity_filter=None, outcome_filter=None
+) -> str:
+    """Adverse event summary of a drug from the local FAERS mirror, with its disproportionality signals."""
+    name = store.match_drug(drug_name)
+    flags, without = _faers_filter_flags(severity_filter, outcome_filter)
+    rows = store.report_rows(name, date_range, flags, without) if name else []
+    if not len(rows):
+        return f"No adverse events found for {drug_name} in the FDA database."
+
+    details = f"\nSource: local FAERS mirror ({len(store):,} reports), matched as '{name}'\n"
+    signals = _select_faers_signals(store.disproportionality(drugs=[name], date_range=date_range))
+    if len(signals):
+        details += "\nDisproportionality Signals (PRR >= 2, chi-squared >= 4, at least 3 reports):\n"
+        details += _format_faers_signals(signals)
+    return _format_adverse_event_statistics(store.summary(rows), drug_name, _FAERS_DISCLAIMER, details)
+
+
+def _analyze_local_safety_signals(
+    store, drug_list: list[str], comparison_period=None, signal_threshold: float = 2.0
+) -> str:
+    """Safety signal analysis of several drugs from the local FAERS mirror."""
+    names = {drug: store.match_drug(drug) for drug in drug_list}
+    matched = [name for name in dict.fromkeys(names.values()) if name]
+    if not matched:
+        return "Error: No adverse event data found for any of the provided drugs"
+
+    drug_signals = {}
+    all_rows = []
+    for drug, name in names.items():
+        rows = store.report_rows(name, comparison_period) if name else []
+        if len(rows):
+            stats = store.summary(rows, top_k=3)
+            drug_signals[drug] = {
+                "total_reports": stats["total_reports"],
+                "serious_reports": stats["serious_reports"],
+                "common_reactions": [reaction for reaction, _ in stats["top_reactions"]],
+            }
+            all_rows.append(rows)
+
+    reaction_patterns = {}
+    if all_rows:
+        rows = np.unique(np.concatenate(all_rows))
+        serious = rows[(store.flags[rows] & SERIOUS) > 0]
+        counts = np.asarray(store.report_events[rows].sum(axis=0)).ravel()
+        serious_counts = np.asarray(store.report_events[serious].sum(axis=0)).ravel()
+        for event in np.flatnonzero(counts):
+            reaction_patterns[store.events[event]] = {
+                "count": int(counts[event]),
+                "severity_counts": {
+                    "serious": int(serious_counts[event]),
+                    "non_serious": int(counts[event] - serious_counts[event]),
+                },
+            }
+
+    summary = _format_safety_signal_summary(
+        {"drug_signals": drug_signals, "reaction_patterns": reaction_patterns},
+        drug_list,
+        comparison_period,
+        signal_threshold,
+    )
+    signals = _select_faers_signals(
+        store.disproportionality(drugs=matched, date_range=comparison_period), prr_threshold=signal_threshold
+    )
+    summary += f"\nDisproportionality Signals (PRR >= {signal_threshold}, chi-squared >= 4, at least 3 reports):\n"
+    if len(signals):
+        for drug in matched:
+            drug_rows = signals[signals["drug"] == drug]
+            summary += f"{drug.title()}: {len(drug_rows):,} signals\n"
+            summary += _format_faers_signals(drug_rows)
+    else:
+        summary += "No disproportionality signals detected\n"
+    summary += f"\nSource: local FAERS mirror ({len(store):,} reports)\n"
+    summary += "\n" + _FAERS_DISCLAIMER
+    return summary
+
+
 # Main OpenFDA Integration Functions
 
 
@@ -3574,16 +3428,23 @@ def query_fda_adverse_events(
     severity_filter: list[str] | None = None,
     outcome_filter: list[str] | None = None,
     limit: int = 100,
+    faers_path: str | None = None,
 ) -> str:
     """
     Query FDA adverse event reports for specific drugs.
 
+    All reports are summarized from a local FAERS mirror (openFDA bulk drug event
+    downloads) when one is available, with disproportionality signals; otherwise a
+    sample of reports is fetched from the openFDA API.
+
     Args:
         drug_name: Name of the drug to query
         date_range: Optional date range as (start_date, end_date) in YYYY-MM-DD format
         severity_filter: Optional filter by severity levels ["serious", "non_serious"]
         outcome_filter: Optional filter by outcomes ["life_threatening", "hospitalization", "death"]
-        limit: Maximum number of results to return
+        limit: Maximum number of results to return from the openFDA API
+        faers_path: Optional directory of openFDA bulk drug event downloads; by default
+            <data lake>/faers is used if present
 
     Returns:
         Formatted string with adverse event analysis
@@ -3593,23 +3454,30 @@ def query_fda_adverse_events(
         if not drug_name or not drug_name.strip():
             return "Error: Drug name cannot be empty"
 
-        client = OpenFDAClient()
+        store = _local_faers_store(faers_path)
+        if store is not None:
+            formatted_result = _query_local_adverse_events(
+                store, drug_name, date_range, severity_filter, outcome_filter
+            )
+        else:
+            client = OpenFDAClient()
 
-        # Standardize drug name
-        standardized_name = _standardize_drug_name_fda(drug_name)
-        if not standardized_name:
-            return f"Error: Unable to standardize drug name '{drug_name}'"
+            # Standardize drug name
+            if not _standardize_drug_name_fda(drug_name):
+                return f"Error: Unable to standardize drug name '{drug_name}'"
 
-        # Query adverse events
-        response = client.query_adverse_events(standardized_name, limit=limit)
+            # Query adverse events
+            response, note = _query_fda_drug(lambda name: client.query_adverse_events(name, limit=limit), drug_name)
 
-        # Apply filters if specified
-        if severity_filter or outcome_filter:
-            filters = {"severity_filter": severity_filter, "outcome_filter": outcome_filter}
-            response = _apply_fda_filters(response, filters)
+            # Apply filters if specified
+            if severity_filter or outcome_filter:
+                filters = {"severity_filter": severity_filter, "outcome_filter": outcome_filter}
+                response = _apply_fda_filters(response, filters)
 
-        # Format results with main function title
-        formatted_result = _format_adverse_event_summary(response, drug_name, include_details=True)
+            # Format results with main function title
+            formatted_result = _format_adverse_event_summary(response, drug_name, include_details=True)
+            if note:
+                formatted_result = formatted_result.replace(f"Drug: {drug_name}\n", f"Drug: {drug_name}\n{note}\n", 1)
 
         # Replace title for main function
         if formatted_result.startswith("Adverse Event Summary"):
@@ -3671,19 +3539,21 @@ def get_fda_drug_label_info(drug_name: str, sections: list[str] | None = None) -
         client = OpenFDAClient()
 
         # Standardize drug name
-        standardized_name = _standardize_drug_name_fda(drug_name)
-        if not standardized_name:
+        if not _standardize_drug_name_fda(drug_name):
             return f"Error: Unable to standardize drug name '{drug_name}'"
 
         # Query drug labels
-        response = client.query_drug_labels(standardized_name, sections=sections)
+        response, note = _query_fda_drug(lambda name: client.query_drug_labels(name, sections=sections), drug_name)
 
         # Check if we got results
         if not response.get("results"):
             return f"No label information found for drug: {drug_name}"
 
         # Format results
-        return _format_drug_label_summary(response, drug_name, sections=sections)
+        formatted_result = _format_drug_label_summary(response, drug_name, sections=sections)
+        if note:
+            formatted_result = formatted_result.replace(f"Drug: {drug_name}\n", f"Drug: {drug_name}\n{note}\n", 1)
+        return formatted_result
 
     except Exception as e:
         return f"Error retrieving FDA drug label for {drug_name}: {str(e)}"
@@ -3711,15 +3581,18 @@ def check_fda_drug_recalls(
         client = OpenFDAClient()
 
         # Standardize drug name
-        standardized_name = _standardize_drug_name_fda(drug_name)
-        if not standardized_name:
+        if not _standardize_drug_name_fda(drug_name):
             return f"Error: Unable to standardize drug name '{drug_name}'"
 
         # Query drug recalls
-        response = client.query_drug_recalls(standardized_name, classification=classification)
+        response, note = _query_fda_drug(
+            lambda name: client.query_drug_recalls(name, classification=classification), drug_name
+        )
 
         # Format results with filter information
         formatted_result = _format_recall_summary(response, drug_name, include_details=True)
+        if note:
+            formatted_result = formatted_result.replace(f"Drug: {drug_name}\n", f"Drug: {drug_name}\n{note}\n", 1)
 
         # Add filter information to the output
         if classification:
@@ -3739,15 +3612,26 @@ def check_fda_drug_recalls(
 
 
 def analyze_fda_safety_signals(
-    drug_list: list[str], comparison_period: tuple[str, str] | None = None, signal_threshold: float = 2.0
+    drug_list: list[str],
+    comparison_period: tuple[str, str] | None = None,
+    signal_threshold: float = 2.0,
+    faers_path: str | None = None,
 ) -> str:
     """
     Analyze safety signals across multiple drugs.
 
+    With a local FAERS mirror (openFDA bulk drug event downloads), all reports of the
+    drugs are analyzed and drug-event pairs are tested for disproportionate reporting
+    (PRR, ROR and IC); otherwise a sample of reports per drug is fetched from the
+    openFDA API.
+
     Args:
         drug_list: List of drug names to analyze
-        comparison_period: Optional comparison time period
-        signal_threshold: Threshold for signal detection
+        comparison_period: Optional comparison time period; restricts the local mirror
+            analysis to reports received in it
+        signal_threshold: Threshold for signal detection (minimum PRR with the local mirror)
+        faers_path: Optional directory of openFDA bulk drug event downloads; by default
+            <data lake>/faers is used if present
 
     Returns:
         Formatted string with safety signal analysis
@@ -3765,15 +3649,21 @@ def analyze_fda_safety_signals(
         if not valid_drugs:
             return "Error: No valid drug names provided"
 
+        store = _local_faers_store(faers_path)
+        if store is not None:
+            return _analyze_local_safety_signals(store, valid_drugs, comparison_period, signal_threshold)
+
         client = OpenFDAClient()
 
         # Collect data for all drugs
         all_responses = []
 
-        for drug in valid_drugs:
-            standardized_name = _standardize_drug_name_fda(drug)
-            if standardized_name:  # Only query if standardization worked
-                response = client.query_adverse_events(standardized_name, limit=200)
+        notes = []
+        for drug_name in valid_drugs:
+            if _standardize_drug_name_fda(drug_name):  # Only query if standardization worked
+                response, note = _query_fda_drug(lambda name: client.query_adverse_events(name, limit=200), drug_name)
+                if note:
+                    notes.append(note)
 
                 if response.get("results"):
                     all_responses.append(response)
@@ -3786,7 +3676,80 @@ def analyze_fda_safety_signals(
         signals = _extract_fda_safety_signals(all_responses)
 
         # Format results with comparison period and threshold info
-        return _format_safety_signal_summary(signals, valid_drugs, comparison_period, signal_threshold)
+        summary = _format_safety_signal_summary(signals, valid_drugs, comparison_period, signal_threshold)
+        if notes:
+            drugs_line = f"Drugs analyzed: {valid_drugs}\n"
+            summary = summary.replace(drugs_line, drugs_line + "".join(f"{note}\n" for note in notes), 1)
+        return summary
 
     except Exception as e:
         return f"Error analyzing FDA safety signals: {str(e)}"
+
+
+def detect_faers_signals(
+    drug_list: list[str] | None = None,
+    faers_path: str | None = None,
+    date_range: tuple[str, str] | None = None,
+    min_reports: int = 3,
+    prr_threshold: float = 2.0,
+    top_k: int = 50,
+) -> str:
+    """
+    Screen a formulary, or every drug in FAERS, for disproportionately reported adverse events.
+
+    Contingency tables of all drug-event pairs are computed at once from a local FAERS
+    mirror (openFDA bulk drug event downloads). Pairs with PRR >= prr_threshold,
+    chi-squared >= 4 and at least min_reports reports are signals, ranked by the lower
+    95% bound of the PRR.
+
+    Args:
+        drug_list: Drugs to screen; every drug in the mirror by default
+        faers_path: Directory of openFDA bulk drug event downloads; by default <data lake>/faers
+        date_range: Optional (start_date, end_date) receipt dates in YYYY-MM-DD format
+        min_reports: Minimum number of reports of a drug-event pair
+        prr_threshold: Minimum proportional reporting ratio of a signal
+        top_k: Number of signals listed
+
+    Returns:
+        Formatted string with the strongest signals and per-drug signal counts
+    """
+    try:
+        store = get_faers_store(faers_path)
+        log = "FAERS Disproportionality Screen\n"
+        log += "=" * 31 + "\n"
+        log += f"Reports in mirror: {len(store):,}\n"
+        if date_range:
+            log += f"Date range: {date_range[0]} to {date_range[1]}\n"
+
+        drugs = None
+        if drug_list:
+            names = {drug: store.match_drug(drug) for drug in drug_list}
+            missing = [drug for drug, name in names.items() if not name]
+            drugs = [name for name in dict.fromkeys(names.values()) if name]
+            log += f"Drugs screened: {len(drugs):,}\n"
+            if missing:
+                log += f"Not found in FAERS: {', '.join(missing)}\n"
+            if not drugs:
+                return log + "Error: None of the drugs were found in the FAERS mirror\n"
+        else:
+            log += f"Drugs screened: all {len(store.drugs):,}\n"
+
+        table = store.disproportionality(drugs=drugs, date_range=date_range, min_count=min_reports)
+        signals = _select_faers_signals(table, prr_threshold, min_reports)
+        log += f"Drug-event pairs tested: {len(table):,}\n"
+        log += f"Signals (PRR >= {prr_threshold}, chi-squared >= 4, at least {min_reports} reports): "
+        log += f"{len(signals):,}\n\n"
+
+        if len(signals):
+            log += f"Top {min(top_k, len(signals))} signals:\n"
+            log += _format_faers_signals(signals, limit=top_k, include_drug=True)
+            counts = signals["drug"].value_counts()
+            log += "\nDrugs with the most signals:\n"
+            for drug, count in counts.head(10).items():
+                log += f"- {drug.title()}: {count:,}\n"
+
+        log += "\n" + _FAERS_DISCLAIMER
+        return log
+
+    except Exception as e:
+        return f"Error screening FAERS for safety signals: {str(e)}"
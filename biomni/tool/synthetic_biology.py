@@ -1143,7 +1143,9 @@ FILES:
     return log
 
 
-def identify_fas_functional_domains(sequence, sequence_type="protein", output_file="fas_domains_report.txt"):
+def identify_fas_functional_domains(
+    sequence, sequence_type="protein", output_file="fas_domains_report.txt", background=False
+):
     """Identifies functional domains within a Fatty Acid Synthase (FAS) sequence and predicts their roles.
 
     Parameters
@@ -1154,6 +1156,9 @@ def identify_fas_functional_domains(sequence, sequence_type="protein", output_fi
         Type of sequence provided - "protein" or "nucleotide" (default: "protein")
     output_file : str
         Name of the output file to save the detailed domain report (default: "fas_domains_report.txt")
+    background : bool
+        If True, return a biomni.jobs.JobHandle immediately and run the HMMER search in the background;
+        the handle's result is the research log (default: False)
 
     Returns
     -------
@@ -1162,11 +1167,21 @@ def identify_fas_functional_domains(sequence, sequence_type="protein", output_fi
 
     """
     import json
-    import time
 
     import requests
     from Bio.Seq import Seq
 
+    from biomni.jobs import PENDING, submit_job, submit_polling_job
+
+    if background:
+        return submit_job(
+            identify_fas_functional_domains,
+            sequence,
+            sequence_type,
+            output_file,
+            name="FAS domain search (HMMER)",
+        )
+
     research_log = "# Fatty Acid Synthase (FAS) Domain Analysis\n\n"
     research_log += "## Input Sequence Analysis\n"
     research_log += f"- Sequence type: {sequence_type}\n"
@@ -1246,17 +1261,28 @@ def identify_fas_functional_domains(sequence, sequence_type="protein", output_fi
             research_log += "- Error: No result URL returned from HMMER API\n"
             return research_log
 
-        # Wait for results to be ready
-        time.sleep(2)
-
-        # Get results
-        result_response = requests.get(f"{result_url}.json")
-        if result_response.status_code != 200:
+        def poll_results(url):
+            result_response = requests.get(f"{url}.json", headers={"Accept": "application/json"})
+            if result_response.status_code == 202:
+                return PENDING
+            if result_response.status_code != 200:
+                return None
+            results = result_response.json()
+            return PENDING if results.get("status") in ("PEND", "RUN") else results
+
+        # Poll for the results with backoff instead of a fixed wait
+        results = submit_polling_job(
+            lambda: result_url,
+            poll_results,
+            name="HMMER hmmscan",
+            initial_delay=1,
+            max_delay=15,
+            timeout=300,
+        ).result()
+        if results is None:
             research_log += "- Error: Could not retrieve results from HMMER API\n"
             return research_log
 
-        results = result_response.json()
-
         # Process results
         domains_found = []
         if "results" in results and "hits" in results["results"]:
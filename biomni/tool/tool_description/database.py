@@ -23,6 +23,40 @@ description = [
             }
         ],
     },
+    {
+        "description": "Look up many UniProt entries at once by accession or gene symbol using the "
+        "UniProtKB stream endpoint. Returns a pandas DataFrame with one row per matching entry.",
+        "name": "query_uniprot_batch",
+        "optional_parameters": [
+            {
+                "default": "accession",
+                "description": '"accession" or "gene" (exact primary gene name)',
+                "name": "id_type",
+                "type": "str",
+            },
+            {
+                "default": 9606,
+                "description": "NCBI taxonomy ID used to restrict gene symbol lookups",
+                "name": "organism_id",
+                "type": "int",
+            },
+            {
+                "default": None,
+                "description": 'UniProt return fields (e.g., ["accession", "gene_primary", "cc_function"])',
+                "name": "fields",
+                "type": "List[str]",
+            },
+            {"default": 100, "description": "Number of identifiers per request", "name": "chunk_size", "type": "int"},
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "UniProt accessions or gene symbols to look up",
+                "name": "identifiers",
+                "type": "List[str]",
+            }
+        ],
+    },
     {
         "description": "Query the AlphaFold Database API for protein structure predictions.",
         "name": "query_alphafold",
@@ -392,6 +426,22 @@ description = [
             }
         ],
     },
+    {
+        "description": "Look up many dbSNP variants at once by rsID using batched NCBI ESummary requests. "
+        "Returns a pandas DataFrame with one row per rsID.",
+        "name": "query_dbsnp_batch",
+        "optional_parameters": [
+            {"default": 200, "description": "Number of IDs per ESummary request", "name": "chunk_size", "type": "int"},
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": 'Reference SNP IDs, with or without the "rs" prefix (e.g., ["rs6025", "rs334"])',
+                "name": "rsids",
+                "type": "List[str]",
+            }
+        ],
+    },
     {
         "description": "Query the UCSC Genome Browser API using natural language or a direct endpoint.",
         "name": "query_ucsc",
@@ -434,6 +484,40 @@ description = [
             }
         ],
     },
+    {
+        "description": "Look up many Ensembl stable IDs or gene symbols at once using the Ensembl POST lookup "
+        "endpoints. Returns a pandas DataFrame with one row per identifier.",
+        "name": "query_ensembl_batch",
+        "optional_parameters": [
+            {
+                "default": "id",
+                "description": '"id" for Ensembl stable IDs or "symbol" for gene symbols',
+                "name": "id_type",
+                "type": "str",
+            },
+            {
+                "default": "homo_sapiens",
+                "description": "Species for symbol lookups",
+                "name": "species",
+                "type": "str",
+            },
+            {
+                "default": False,
+                "description": "Whether to include child features (transcripts, translations)",
+                "name": "expand",
+                "type": "bool",
+            },
+            {"default": 1000, "description": "Number of identifiers per request", "name": "chunk_size", "type": "int"},
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "Ensembl stable IDs or gene symbols to look up",
+                "name": "identifiers",
+                "type": "List[str]",
+            }
+        ],
+    },
     {
         "description": "Query the OpenTargets Platform API using natural language or a direct GraphQL query.",
         "name": "query_opentarget",
@@ -510,7 +594,15 @@ description = [
         "description": "Identifies a DNA sequence using NCBI BLAST with improved "
         "error handling, timeout management, and debugging",
         "name": "blast_sequence",
-        "optional_parameters": [],
+        "optional_parameters": [
+            {
+                "default": False,
+                "description": "Return a job handle immediately and run the search in the background; "
+                "use biomni.jobs.await_job / gather_jobs to collect results",
+                "name": "background",
+                "type": "bool",
+            },
+        ],
         "required_parameters": [
             {
                 "default": None,
@@ -525,6 +617,56 @@ description = [
             {"default": None, "description": "The BLAST program to use", "name": "program", "type": "str"},
         ],
     },
+    {
+        "description": "Search one or many sequences with BLAST and return every hit as a DataFrame in BLAST "
+        "tabular format. Runs BLAST+ locally (building the database from a FASTA file with makeblastdb on "
+        "first use) when the database is a local FASTA file or BLAST database; otherwise submits all queries "
+        "to NCBI BLAST in one request.",
+        "name": "blast_sequences",
+        "optional_parameters": [
+            {"default": "blastn", "description": "BLAST program to use", "name": "program", "type": "str"},
+            {
+                "default": None,
+                "description": "Data lake directory used to resolve bare FASTA file names",
+                "name": "data_lake_path",
+                "type": "str",
+            },
+            {"default": 10.0, "description": "E-value threshold", "name": "evalue", "type": "float"},
+            {
+                "default": 50,
+                "description": "Maximum number of subject sequences reported per query",
+                "name": "max_target_seqs",
+                "type": "int",
+            },
+            {
+                "default": None,
+                "description": "Threads for local BLAST+ (default: all CPUs)",
+                "name": "num_threads",
+                "type": "int",
+            },
+            {
+                "default": False,
+                "description": "Return a job handle immediately and run the search in the background; "
+                "use biomni.jobs.await_job / gather_jobs to collect results",
+                "name": "background",
+                "type": "bool",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "One sequence, a list of sequences, or a dict mapping query IDs to sequences",
+                "name": "sequences",
+                "type": "list",
+            },
+            {
+                "default": None,
+                "description": "FASTA file, local BLAST database prefix, or NCBI database name (core_nt, nr)",
+                "name": "database",
+                "type": "str",
+            },
+        ],
+    },
     {
         "description": "Query ClinicalTrials.gov for studies using natural language, direct endpoint, or structured parameters.",
         "name": "query_clinicaltrials",
@@ -778,4 +920,34 @@ description = [
             }
         ],
     },
+    {
+        "description": "Query several databases concurrently (e.g., UniProt, Ensembl, ClinVar and GWAS Catalog "
+        "for one gene) and return all results together. Total latency is close to the slowest single source; "
+        "queries that exceed the timeout return an error while completed results are kept.",
+        "name": "query_many",
+        "optional_parameters": [
+            {
+                "default": None,
+                "description": "Seconds to wait for all queries before returning partial results",
+                "name": "timeout",
+                "type": "float",
+            },
+            {
+                "default": 8,
+                "description": "Maximum number of queries in flight at once",
+                "name": "max_workers",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "List of (database, prompt) tuples or dicts with a 'database' key and that query "
+                'function\'s arguments, e.g. [("uniprot", "human TP53"), {"database": "clinvar", "prompt": "TP53 '
+                'pathogenic variants"}]',
+                "name": "queries",
+                "type": "list",
+            }
+        ],
+    },
 ]
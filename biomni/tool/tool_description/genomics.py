@@ -280,6 +280,59 @@ description = [
             }
         ],
     },
+    {
+        "description": "Perform offline enrichment analysis of one or many gene lists against the "
+        "data lake's MSigDB (human) or MouseMine (mouse) gene set libraries, with hypergeometric "
+        "p-values and Benjamini-Hochberg FDR.",
+        "name": "local_gene_set_enrichment_analysis",
+        "optional_parameters": [
+            {
+                "default": None,
+                "description": "Library names or name fragments (e.g. hallmark, c2_curated, c5_ontology); "
+                "defaults to all libraries of the species",
+                "name": "libraries",
+                "type": "list",
+            },
+            {
+                "default": "human",
+                "description": "Species of the gene sets: human (MSigDB) or mouse (MouseMine)",
+                "name": "species",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "List of background genes; defaults to the genes of each library",
+                "name": "background_list",
+                "type": "list",
+            },
+            {
+                "default": 10,
+                "description": "Number of top gene sets to return per query",
+                "name": "top_k",
+                "type": "int",
+            },
+            {
+                "default": None,
+                "description": "Only report gene sets with an adjusted p-value at most this",
+                "name": "max_fdr",
+                "type": "float",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "List of gene symbols, or a dict mapping query names to gene symbol lists",
+                "name": "genes",
+                "type": "list",
+            },
+            {
+                "default": None,
+                "description": "Path to the data lake",
+                "name": "data_lake_path",
+                "type": "str",
+            },
+        ],
+    },
     {
         "description": "Analyze chromatin interactions from Hi-C data to identify "
         "enhancer-promoter interactions and TADs.",
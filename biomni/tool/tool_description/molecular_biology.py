@@ -291,6 +291,40 @@ description = [
             },
         ],
     },
+    {
+        "description": "Design sgRNAs for CRISPR knockout of many genes at once (e.g. for a "
+        "library screen) by searching pre-computed sgRNA libraries. Returns the "
+        "top-ranked guide RNAs for each gene.",
+        "name": "design_knockout_sgrna_batch",
+        "optional_parameters": [
+            {
+                "default": "human",
+                "description": "Target organism species",
+                "name": "species",
+                "type": "str",
+            },
+            {
+                "default": 1,
+                "description": "Number of guides to return per gene",
+                "name": "num_guides",
+                "type": "int",
+            },
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": 'Target gene symbols (e.g., ["EGFR", "TP53", "KRAS"])',
+                "name": "gene_names",
+                "type": "List[str]",
+            },
+            {
+                "default": None,
+                "description": "Path to the data lake",
+                "name": "data_lake_path",
+                "type": "str",
+            },
+        ],
+    },
     {
         "description": "Return a standard protocol for annealing oligonucleotides without phosphorylation.",
         "name": "get_oligo_annealing_protocol",
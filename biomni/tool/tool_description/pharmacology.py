@@ -134,6 +134,34 @@ description = [
             },
         ],
     },
+    {
+        "description": "Returns the top TxGNN predicted drugs with their scores for each "
+        "of several diseases in one call (batch version of "
+        "retrieve_topk_repurposing_drugs_from_disease_txgnn).",
+        "name": "retrieve_topk_repurposing_drugs_from_diseases_txgnn",
+        "optional_parameters": [
+            {
+                "default": 5,
+                "description": "The number of top drug predictions to return per disease",
+                "name": "k",
+                "type": "int",
+            }
+        ],
+        "required_parameters": [
+            {
+                "default": None,
+                "description": "The names of the diseases for which to retrieve drug predictions",
+                "name": "disease_names",
+                "type": "List[str]",
+            },
+            {
+                "default": None,
+                "description": "Path to the data lake",
+                "name": "data_lake_path",
+                "type": "str",
+            },
+        ],
+    },
     {
         "description": "Predicts ADMET (Absorption, Distribution, Metabolism, "
         "Excretion, Toxicity) properties for a list of compounds "
@@ -642,10 +670,16 @@ description = [
             },
             {
                 "default": 100,
-                "description": "Maximum number of results to return",
+                "description": "Maximum number of results to return from the openFDA API",
                 "name": "limit",
                 "type": "int",
             },
+            {
+                "default": None,
+                "description": "Optional directory of openFDA bulk drug event downloads (local FAERS mirror); by default <data lake>/faers is used if present, else the openFDA API",
+                "name": "faers_path",
+                "type": "str",
+            },
         ],
     },
     {
@@ -714,10 +748,59 @@ description = [
             },
             {
                 "default": 2.0,
-                "description": "Threshold for signal detection",
+                "description": "Threshold for signal detection (minimum PRR with a local FAERS mirror)",
                 "name": "signal_threshold",
                 "type": "float",
             },
+            {
+                "default": None,
+                "description": "Optional directory of openFDA bulk drug event downloads (local FAERS mirror); by default <data lake>/faers is used if present, else the openFDA API",
+                "name": "faers_path",
+                "type": "str",
+            },
+        ],
+    },
+    {
+        "description": "Screen a drug list, or every drug in FAERS, for disproportionately reported adverse events using a local mirror of the openFDA bulk FAERS downloads. Computes PRR, ROR and IC for all drug-event pairs at once and reports signals meeting the Evans criteria.",
+        "name": "detect_faers_signals",
+        "required_parameters": [],
+        "optional_parameters": [
+            {
+                "default": None,
+                "description": "Drugs to screen; every drug in the mirror by default",
+                "name": "drug_list",
+                "type": "List[str]",
+            },
+            {
+                "default": None,
+                "description": "Directory of openFDA bulk drug event downloads (drug-event-*.json.zip); by default <data lake>/faers",
+                "name": "faers_path",
+                "type": "str",
+            },
+            {
+                "default": None,
+                "description": "Optional (start_date, end_date) receipt date range in YYYY-MM-DD format",
+                "name": "date_range",
+                "type": "Tuple[str, str]",
+            },
+            {
+                "default": 3,
+                "description": "Minimum number of reports of a drug-event pair",
+                "name": "min_reports",
+                "type": "int",
+            },
+            {
+                "default": 2.0,
+                "description": "Minimum proportional reporting ratio of a signal",
+                "name": "prr_threshold",
+                "type": "float",
+            },
+            {
+                "default": 50,
+                "description": "Number of signals listed",
+                "name": "top_k",
+                "type": "int",
+            },
         ],
     },
 ]
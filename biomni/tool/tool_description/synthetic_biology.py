@@ -260,6 +260,13 @@ description = [
                 "name": "output_file",
                 "type": "str",
             },
+            {
+                "default": False,
+                "description": "Return a job handle immediately and run the search in the background; "
+                "use biomni.jobs.await_job / gather_jobs to collect results",
+                "name": "background",
+                "type": "bool",
+            },
         ],
         "required_parameters": [
             {
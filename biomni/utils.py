@@ -12,7 +12,6 @@ from typing import Any, ClassVar
 from urllib.parse import urljoin
 
 import pandas as pd
-import requests
 import tqdm  # Add tqdm for progress bar
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages.base import get_msg_title_repr
@@ -20,6 +19,8 @@ from langchain_core.tools import StructuredTool
 from langchain_core.utils.interactive_env import is_interactive_env
 from pydantic import BaseModel, Field, ValidationError
 
+from biomni.http_client import http_get, http_post
+
 
 # Add these new functions for running R code and CLI commands
 def run_r_code(code: str) -> str:
@@ -345,7 +346,9 @@ def execute_graphql_query(
 ) -> dict:
     """Executes a GraphQL query with variables and returns the data as a dictionary."""
     headers = {"Content-Type": "application/json"}
-    response = requests.post(api_address, json={"query": query, "variables": variables}, headers=headers)
+    response = http_post(
+        api_address, json={"query": query, "variables": variables}, headers=headers, cache=True, idempotent=True
+    )
     if response.status_code == 200:
         return response.json()
     else:
@@ -609,7 +612,7 @@ def _get_gene_id_entrez(gene_symbol: str):
     e.g. 1017 (CDK2).
     """
     api_call = f"https://mygene.info/v3/query?species=human&q=symbol:{gene_symbol}"
-    response = requests.get(api_call)
+    response = http_get(api_call)
     response_json = response.json()
 
     if len(response_json["hits"]) == 0:
@@ -623,7 +626,7 @@ def _get_gene_id_ensembl(gene_symbol):
     e.g. ENSG00000123374.
     """
     api_call = f"https://mygene.info/v3/query?species=human&fields=ensembl&q=symbol:{gene_symbol}"
-    response = requests.get(api_call)
+    response = http_get(api_call)
     response_json = response.json()
 
     if len(response_json["hits"]) == 0:
@@ -644,7 +647,7 @@ def _get_gene_id_ensembl_with_version(gene_symbol):
     """
     api_base = "https://gtexportal.org/api/v2/reference/gene"
     params = {"geneId": gene_symbol}
-    response_json = requests.get(api_base, params=params).json()
+    response_json = http_get(api_base, params=params).json()
 
     if len(response_json["data"]) == 0:
         return None
@@ -886,7 +889,7 @@ def download_and_unzip(url: str, dest_dir: str) -> str:
     try:
         os.makedirs(dest_dir, exist_ok=True)
         print(f"Downloading from {url} ...")
-        with requests.get(url, stream=True) as r:
+        with http_get(url, stream=True) as r:
             r.raise_for_status()
             total_size = int(r.headers.get("content-length", 0))
             chunk_size = 8192
@@ -935,22 +938,22 @@ def check_and_download_s3_files(
     def download_with_progress(url: str, file_path: str, desc: str) -> bool:
         """Download file with progress bar."""
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get("content-length", 0))
-
-            with open(file_path, "wb") as f:
-                if total_size > 0:
-                    with tqdm.tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, ncols=80) as pbar:
+            with http_get(url, stream=True) as response:
+                response.raise_for_status()
+
+                total_size = int(response.headers.get("content-length", 0))
+
+                with open(file_path, "wb") as f:
+                    if total_size > 0:
+                        with tqdm.tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, ncols=80) as pbar:
+                            for chunk in response.iter_content(chunk_size=8192):
+                                if chunk:
+                                    f.write(chunk)
+                                    pbar.update(len(chunk))
+                    else:
                         for chunk in response.iter_content(chunk_size=8192):
                             if chunk:
                                 f.write(chunk)
-                                pbar.update(len(chunk))
-                else:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
             return True
         except Exception as e:
             print(f"✗ Failed to download {desc}: {e}")